@@ -0,0 +1,215 @@
+"""Benchmark EvaClient and EvaTools end to end against the local mock Eva API.
+
+Starts benchmarks/mock_eva.py in a subprocess and runs each scenario
+for a fixed number of operations, reporting throughput, p50/p99 latency and
+request/response bytes on the wire per operation (plus tool output bytes for
+tool scenarios). Sync scenarios run sequentially; async ones keep
+--concurrency operations in flight.
+
+Save a run with --json and pass it to --compare on the next run to print the
+change per scenario.
+
+Usage:
+    python benchmarks/bench_client.py [--ops 2000] [--concurrency 16] [--tasks 10000]
+        [--latency-ms 0] [--jitter-ms 0] [--error-rate 0] [--only client.get]
+        [--json results.json] [--compare baseline.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from eva_client import AsyncEvaClient, EvaClient  # noqa: E402
+from metrics import Metrics, is_error_response  # noqa: E402
+from mock_eva import (  # noqa: E402
+    STATUSES,
+    WORDS,
+    add_server_arguments,
+    code_for,
+    serve_in_process,
+    server_argv,
+)
+from registry import REGISTRY  # noqa: E402
+from tools import AsyncEvaTools, EvaTools  # noqa: E402
+
+
+def _tool(handlers: Dict[str, Callable], name: str, arguments: Dict[str, Any]) -> Callable:
+    """Bind a validated tool call, as call_tool would run it."""
+    arguments = REGISTRY.get(name).validate(arguments)
+    handler = handlers[name]
+    return lambda: handler(**arguments)
+
+
+# Each scenario maps (client, tool handlers, task codes, rng) to a zero-argument operation.
+# Codes are drawn at random so request coalescing does not merge calls.
+SCENARIOS: Dict[str, Callable[..., Callable[[], Any]]] = {
+    "client.get": lambda c, h, codes, rng: lambda: c.get_task(rng.choice(codes)),
+    "client.list": lambda c, h, codes, rng: lambda: c.list_tasks(
+        limit=50, offset=rng.randrange(0, len(codes), 50)
+    ),
+    "client.count": lambda c, h, codes, rng: lambda: c.count_tasks(
+        filters=[["status", "=", rng.choice(STATUSES)]]
+    ),
+    "client.update": lambda c, h, codes, rng: lambda: c.update_task(
+        rng.choice(codes), priority=rng.randint(1, 4)
+    ),
+    "tools.search_tasks": lambda c, h, codes, rng: lambda: _tool(
+        h, "eva_search_tasks", {"query": rng.choice(WORDS), "limit": 20}
+    )(),
+    "tools.get_task": lambda c, h, codes, rng: lambda: _tool(
+        h, "eva_get_task", {"task_code": rng.choice(codes)}
+    )(),
+    "tools.list_projects": lambda c, h, codes, rng: _tool(h, "eva_list_projects", {}),
+}
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def _result(
+    latencies: List[float], elapsed: float, errors: int, output_bytes: int, metrics: Metrics
+) -> Dict[str, Any]:
+    ops = len(latencies)
+    latencies.sort()
+    methods = metrics.snapshot()["methods"].values()
+    return {
+        "ops": ops,
+        "ops_per_sec": round(ops / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+        "errors": errors,
+        "request_bytes_per_op": round(sum(m["request_bytes"] for m in methods) / ops),
+        "response_bytes_per_op": round(sum(m["response_bytes"] for m in methods) / ops),
+        "output_bytes_per_op": round(output_bytes / ops),
+    }
+
+
+def _output_bytes(value: Any) -> int:
+    """Size of a tool result; client results are not counted."""
+    return len(value.encode("utf-8")) if isinstance(value, str) else 0
+
+
+def _failed(value: Any) -> bool:
+    """Tools report errors in their JSON result rather than raising."""
+    return isinstance(value, str) and is_error_response(value)
+
+
+def run_sync(name: str, url: str, codes: List[str], ops: int, seed: int) -> Dict[str, Any]:
+    client = EvaClient(api_url=url, api_token="mock", read_only=False)
+    operation = SCENARIOS[name](client, REGISTRY.bind(EvaTools(client)), codes, random.Random(seed))
+    try:
+        operation()  # open the connection outside the measurement
+        metrics = client.metrics = Metrics()
+        latencies, errors, output = [], 0, 0
+        start = time.perf_counter()
+        for _ in range(ops):
+            began = time.perf_counter()
+            try:
+                value = operation()
+                output += _output_bytes(value)
+                errors += _failed(value)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - began)
+        elapsed = time.perf_counter() - start
+    finally:
+        client.close()
+    return _result(latencies, elapsed, errors, output, metrics)
+
+
+async def run_async(
+    name: str, url: str, codes: List[str], ops: int, concurrency: int, seed: int
+) -> Dict[str, Any]:
+    client = AsyncEvaClient(api_url=url, api_token="mock", read_only=False)
+    handlers = REGISTRY.bind(AsyncEvaTools(client))
+    operation = SCENARIOS[name](client, handlers, codes, random.Random(seed))
+    latencies: List[float] = []
+    errors = output = 0
+    remaining = ops
+
+    async def worker():
+        nonlocal remaining, errors, output
+        while remaining > 0:
+            remaining -= 1
+            began = time.perf_counter()
+            try:
+                value = await operation()
+                output += _output_bytes(value)
+                errors += _failed(value)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - began)
+
+    try:
+        await operation()  # open the connection outside the measurement
+        client.metrics = Metrics()
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    finally:
+        await client.close()
+    return _result(latencies, elapsed, errors, output, client.metrics)
+
+
+def _print(results: Dict[str, Dict[str, Any]], baseline: Optional[Dict[str, Any]]) -> None:
+    header = f"{'scenario':<28}{'ops/s':>10}{'p50 ms':>10}{'p99 ms':>10}"
+    header += f"{'req B/op':>10}{'resp B/op':>11}{'out B/op':>10}{'errors':>8}"
+    if baseline:
+        header += f"{'ops/s vs base':>15}{'p99 vs base':>13}"
+    print(header)
+    for name, r in results.items():
+        line = (
+            f"{name:<28}{r['ops_per_sec']:>10.1f}{r['p50_ms']:>10.3f}{r['p99_ms']:>10.3f}"
+            f"{r['request_bytes_per_op']:>10}{r['response_bytes_per_op']:>11}"
+            f"{r['output_bytes_per_op']:>10}{r['errors']:>8}"
+        )
+        base = (baseline or {}).get(name)
+        if base:
+            line += f"{(r['ops_per_sec'] / base['ops_per_sec'] - 1) * 100:>+14.1f}%"
+            line += f"{(r['p99_ms'] / base['p99_ms'] - 1) * 100:>+12.1f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=2000, help="Operations per scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="In-flight async operations")
+    parser.add_argument("--only", action="append", help="Scenario to run (repeatable)")
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--compare", help="Results file of an earlier run to compare against")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    names = args.only or list(SCENARIOS)
+    codes = [code_for("CmfTask", number) for number in range(1, args.tasks + 1)]
+    results = {}
+    with serve_in_process(server_argv(args)) as url:
+        for name in names:
+            results[f"sync {name}"] = run_sync(name, url, codes, args.ops, args.seed)
+            results[f"async {name}"] = asyncio.run(
+                run_async(name, url, codes, args.ops, args.concurrency, args.seed)
+            )
+
+    _print(results, baseline)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"arguments": vars(args), "results": results}, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
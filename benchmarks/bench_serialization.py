@@ -0,0 +1,84 @@
+"""Benchmark tool response serialization on a 500-task search result.
+
+Compares the previous pretty-printed stdlib output with the compact stdlib and
+orjson serializers used by EvaTools.
+
+Usage:
+    python benchmarks/bench_serialization.py [--tasks 500] [--repeat 200]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from serialization import JSONSerializer, OrjsonSerializer, orjson
+
+
+def make_tasks(count: int):
+    """Build synthetic CmfTask rows resembling Eva's default payload."""
+    return [
+        {
+            "code": f"DEV-{i:06d}",
+            "id": f"CmfTask:00000000-0000-0000-0000-{i:012d}",
+            "name": f"Задача {i}: обновить интеграцию с сервисом",
+            "text": ("<p>Описание задачи с <b>разметкой</b> " "и деталями реализации.</p>") * 3,
+            "status": "in_progress" if i % 3 else "open",
+            "responsible": f"user{i % 40}@example.com",
+            "executors": [f"user{(i + 1) % 40}@example.com"],
+            "priority": i % 5,
+            "parent": "CmfProject:dev",
+            "lists": ["SPR-000929"],
+            "tags": ["backend", "api"],
+            "deadline": "2025-03-01",
+            "cmf_created_at": "2025-01-01T10:00:00",
+            "cmf_modified_at": "2025-01-15T12:30:00",
+        }
+        for i in range(count)
+    ]
+
+
+def bench(name, dumps, payload, repeat):
+    """Measure output size and mean CPU time per call."""
+    text = dumps(payload)
+    start = time.process_time()
+    for _ in range(repeat):
+        dumps(payload)
+    elapsed = (time.process_time() - start) / repeat
+    return name, len(text.encode("utf-8")), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    payload = {"success": True, "count": args.tasks, "tasks": make_tasks(args.tasks)}
+
+    def legacy(obj):
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+
+    results = [
+        bench("json indent=2 (legacy)", legacy, payload, args.repeat),
+        bench("json compact", JSONSerializer().dumps, payload, args.repeat),
+    ]
+    if orjson is not None:
+        results.append(bench("orjson compact", OrjsonSerializer().dumps, payload, args.repeat))
+    else:
+        print("orjson not installed; skipping orjson backend\n")
+
+    _, base_bytes, base_time = results[0]
+    print(f"{'serializer':<26}{'bytes':>12}{'saved':>9}{'ms/call':>10}{'speedup':>9}")
+    for name, size, elapsed in results:
+        print(
+            f"{name:<26}{size:>12,}{1 - size / base_bytes:>9.1%}"
+            f"{elapsed * 1000:>10.3f}{base_time / elapsed:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
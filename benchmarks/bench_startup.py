@@ -0,0 +1,102 @@
+"""Benchmark server startup: time from process spawn to the first list_tools response.
+
+Spawns the server over stdio, performs the MCP handshake and requests the tool
+list. The Eva API is not contacted: the client is created lazily, and the
+background warm-up (EVA_WARM_UP) points at an unreachable local port.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 10] [--no-warm-up]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SERVER = os.path.join(os.path.dirname(__file__), "..", "src", "server.py")
+
+
+def request(process, message):
+    """Send one newline-delimited JSON-RPC message and return the matching response."""
+    process.stdin.write(json.dumps(message) + "\n")
+    process.stdin.flush()
+    if "id" not in message:
+        return None
+    while True:
+        line = process.stdout.readline()
+        if not line:
+            raise RuntimeError("Server exited before responding")
+        response = json.loads(line)
+        if response.get("id") == message["id"]:
+            return response
+
+
+def measure(warm_up: bool):
+    """Spawn the server once and return seconds to initialize and to list_tools responses."""
+    env = dict(
+        os.environ,
+        EVA_API_URL="http://127.0.0.1:9/api",
+        EVA_API_TOKEN="benchmark",
+        EVA_WARM_UP="true" if warm_up else "false",
+    )
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, SERVER],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        env=env,
+    )
+    try:
+        request(
+            process,
+            {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "initialize",
+                "params": {
+                    "protocolVersion": "2024-11-05",
+                    "capabilities": {},
+                    "clientInfo": {"name": "bench_startup", "version": "0"},
+                },
+            },
+        )
+        initialized = time.perf_counter() - start
+        request(process, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+        tools = request(process, {"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+        listed = time.perf_counter() - start
+        if "result" not in tools:
+            raise RuntimeError(f"tools/list failed: {tools}")
+        return initialized, listed, len(tools["result"]["tools"])
+    finally:
+        process.stdin.close()
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--no-warm-up", action="store_true", help="Disable background client warm-up"
+    )
+    args = parser.parse_args()
+
+    results = [measure(not args.no_warm_up) for _ in range(args.runs)]
+    initialize = [r[0] * 1000 for r in results]
+    list_tools = [r[1] * 1000 for r in results]
+
+    print(f"{results[0][2]} tools, {args.runs} runs, warm-up {'off' if args.no_warm_up else 'on'}")
+    print(f"{'response':<14}{'min ms':>10}{'median ms':>12}{'max ms':>10}")
+    for name, values in (("initialize", initialize), ("tools/list", list_tools)):
+        print(
+            f"{name:<14}{min(values):>10.1f}{statistics.median(values):>12.1f}{max(values):>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+"""Load the MCP server end to end over stdio with synthetic or recorded tool-call traces.
+
+Spawns the server (src/server.py, i.e. the run() entry point) against the mock
+Eva API from benchmarks/mock_eva.py, performs the MCP handshake and sends
+tools/call requests with --concurrency calls in flight. It reports throughput,
+p50/p95/p99 latency and response size per tool, and the server's RSS over
+time. Unlike bench_client.py this covers JSON-RPC framing over stdio, the
+dispatcher and TextContent wrapping.
+
+A trace is a JSON-lines file with one {"tool": ..., "arguments": {...}} object
+per call. Without --trace a synthetic read-only mix over codes that exist in the
+mock is generated; --record writes it out so it can be replayed or edited.
+
+Usage:
+    python benchmarks/bench_stdio.py [--calls 2000] [--concurrency 8] [--tasks 10000]
+        [--trace calls.jsonl | --record calls.jsonl] [--latency-ms 0] [--error-rate 0]
+        [--api-url URL] [--command "eva-mcp-server"] [--json results.json]
+        [--compare baseline.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shlex
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from metrics import is_error_response  # noqa: E402
+from mock_eva import (  # noqa: E402
+    STATUSES,
+    WORDS,
+    add_server_arguments,
+    code_for,
+    row_count,
+    serve_in_process,
+    server_argv,
+)
+
+SERVER = os.path.join(os.path.dirname(__file__), "..", "src", "server.py")
+
+# Synthetic mix: tool -> (weight, argument factory taking (rng, tasks))
+MIX = {
+    "eva_search_tasks": (25, lambda rng, n: {"query": rng.choice(WORDS), "limit": 20}),
+    "eva_get_task": (25, lambda rng, n: {"task_code": _code(rng, "CmfTask", n)}),
+    "eva_get_tasks": (
+        5,
+        lambda rng, n: {
+            "task_codes": [_code(rng, "CmfTask", n) for _ in range(10)],
+        },
+    ),
+    "eva_count_tasks": (10, lambda rng, n: {"status": rng.choice(STATUSES)}),
+    "eva_get_comments": (10, lambda rng, n: {"parent_code": _code(rng, "CmfTask", n)}),
+    "eva_list_projects": (5, lambda rng, n: {"limit": 50}),
+    "eva_get_project": (5, lambda rng, n: {"project_code": _code(rng, "CmfProject", n)}),
+    "eva_list_users": (5, lambda rng, n: {"limit": 50}),
+    "eva_search_documents": (5, lambda rng, n: {"query": rng.choice(WORDS), "limit": 20}),
+    "eva_get_document": (5, lambda rng, n: {"document_code": _code(rng, "CmfDocument", n)}),
+}
+
+QUANTILES = (0.50, 0.95, 0.99)
+
+
+def _code(rng: random.Random, entity: str, tasks: int) -> str:
+    return code_for(entity, rng.randint(1, row_count(entity, tasks)))
+
+
+def synthetic_trace(calls: int, tasks: int, seed: int) -> List[Dict[str, Any]]:
+    """Draw calls from MIX with codes that exist in a mock Dataset of the given size."""
+    rng = random.Random(seed)
+    tools = list(MIX)
+    weights = [MIX[tool][0] for tool in tools]
+    return [
+        {"tool": tool, "arguments": MIX[tool][1](rng, tasks)}
+        for tool in rng.choices(tools, weights, k=calls)
+    ]
+
+
+def load_trace(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def save_trace(path: str, trace: List[Dict[str, Any]]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for call in trace:
+            f.write(json.dumps(call, ensure_ascii=False) + "\n")
+
+
+def rss_mb(pid: int) -> Optional[float]:
+    """Resident set size of a process in MB from /proc (Linux only)."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class StdioSession:
+    """Minimal MCP client over a server's stdin/stdout, matching responses to requests by id."""
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self._next_id = 0
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader = asyncio.create_task(self._read())
+
+    async def _read(self) -> None:
+        while True:
+            line = await self.process.stdout.readline()
+            if not line:
+                break
+            message = json.loads(line)
+            future = self._pending.pop(message.get("id"), None)
+            if future is not None and not future.done():
+                future.set_result((message, len(line)))
+        for future in self._pending.values():
+            future.set_exception(RuntimeError("Server exited before responding"))
+
+    async def notify(self, method: str, params: Optional[Dict[str, Any]] = None) -> None:
+        message = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        self.process.stdin.write(json.dumps(message).encode("utf-8") + b"\n")
+        await self.process.stdin.drain()
+
+    async def request(self, method: str, params: Dict[str, Any]) -> tuple:
+        """Send a request and return (response message, response line bytes)."""
+        self._next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[self._next_id] = future
+        message = {"jsonrpc": "2.0", "id": self._next_id, "method": method, "params": params}
+        self.process.stdin.write(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+        await self.process.stdin.drain()
+        return await future
+
+    def close(self) -> None:
+        self._reader.cancel()
+
+    async def initialize(self) -> None:
+        response, _ = await self.request(
+            "initialize",
+            {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {},
+                "clientInfo": {"name": "bench_stdio", "version": "0"},
+            },
+        )
+        if "result" not in response:
+            raise RuntimeError(f"initialize failed: {response}")
+        await self.notify("notifications/initialized")
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> tuple:
+        """Return (failed, response bytes) for one tools/call."""
+        response, size = await self.request("tools/call", {"name": name, "arguments": arguments})
+        result = response.get("result")
+        if result is None or result.get("isError"):
+            return True, size
+        text = "".join(item.get("text", "") for item in result.get("content", []))
+        return is_error_response(text), size
+
+
+class _ToolStats:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.bytes = 0
+
+    def summary(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        stats = {
+            "calls": len(latencies),
+            "errors": self.errors,
+            "bytes_per_call": round(self.bytes / len(latencies)) if latencies else 0,
+        }
+        for q in QUANTILES:
+            index = min(len(latencies) - 1, int(q * len(latencies)))
+            stats[f"p{round(q * 100)}_ms"] = round(latencies[index] * 1000, 3)
+        return stats
+
+
+async def run(
+    command: List[str],
+    env: Dict[str, str],
+    trace: List[Dict[str, Any]],
+    concurrency: int,
+    warm_up: int,
+    rss_interval: float,
+) -> Dict[str, Any]:
+    """Spawn the server, replay the trace and return throughput, per-tool and RSS results."""
+    process = await asyncio.create_subprocess_exec(
+        *command,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+        env=env,
+        limit=64 * 1024 * 1024,
+    )
+    session = StdioSession(process)
+    started = time.perf_counter()
+    rss: List[List[float]] = []
+
+    async def sample_rss():
+        while True:
+            value = rss_mb(process.pid)
+            if value is not None:
+                rss.append([round(time.perf_counter() - started, 2), round(value, 1)])
+            await asyncio.sleep(rss_interval)
+
+    sampler = asyncio.create_task(sample_rss())
+    stats: Dict[str, _ToolStats] = {}
+    try:
+        await session.initialize()
+        # Exclude client creation and first connections from the measurement
+        for call in trace[:warm_up]:
+            await session.call_tool(call["tool"], call["arguments"])
+
+        calls = iter(trace)
+
+        async def worker():
+            for call in calls:
+                began = time.perf_counter()
+                failed, size = await session.call_tool(call["tool"], call["arguments"])
+                series = stats.setdefault(call["tool"], _ToolStats())
+                series.latencies.append(time.perf_counter() - began)
+                series.errors += failed
+                series.bytes += size
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    finally:
+        sampler.cancel()
+        process.stdin.close()
+        try:
+            await asyncio.wait_for(process.wait(), 10)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+        session.close()
+
+    total = _ToolStats()
+    for series in stats.values():
+        total.latencies += series.latencies
+        total.errors += series.errors
+        total.bytes += series.bytes
+    return {
+        "calls": len(total.latencies),
+        "seconds": round(elapsed, 3),
+        "calls_per_sec": round(len(total.latencies) / elapsed, 1),
+        "total": total.summary(),
+        "tools": {tool: stats[tool].summary() for tool in sorted(stats)},
+        "rss_mb": rss,
+    }
+
+
+def _print(results: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    print(f"{results['calls']} calls in {results['seconds']} s: {results['calls_per_sec']} calls/s")
+    if baseline:
+        change = (results["calls_per_sec"] / baseline["calls_per_sec"] - 1) * 100
+        print(f"throughput vs baseline: {change:+.1f}%")
+    header = f"{'tool':<24}{'calls':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    header += f"{'B/call':>9}"
+    if baseline:
+        header += f"{'p99 vs base':>13}"
+    print(header)
+    rows = dict(results["tools"], total=results["total"])
+    base_rows = dict(baseline["tools"], total=baseline["total"]) if baseline else {}
+    for tool, s in rows.items():
+        line = (
+            f"{tool:<24}{s['calls']:>7}{s['errors']:>8}{s['p50_ms']:>10.2f}{s['p95_ms']:>10.2f}"
+            f"{s['p99_ms']:>10.2f}{s['bytes_per_call']:>9}"
+        )
+        base = base_rows.get(tool)
+        if base:
+            line += f"{(s['p99_ms'] / base['p99_ms'] - 1) * 100:>+12.1f}%"
+        print(line)
+
+    rss = results["rss_mb"]
+    if rss:
+        step = max(1, len(rss) // 10)
+        timeline = ", ".join(f"{t:g}s {mb:g}" for t, mb in rss[::step])
+        print(f"RSS MB: {timeline} (peak {max(mb for _, mb in rss):g})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000, help="Synthetic trace length")
+    parser.add_argument("--concurrency", type=int, default=8, help="tools/call requests in flight")
+    parser.add_argument("--warm-up", type=int, default=20, help="Unmeasured calls before the run")
+    parser.add_argument("--trace", help="Replay this JSON-lines trace instead of a synthetic one")
+    parser.add_argument("--record", help="Write the synthetic trace to this file")
+    parser.add_argument("--api-url", help="Use this Eva API instead of starting the mock")
+    parser.add_argument("--command", help="Server command (default: python src/server.py)")
+    parser.add_argument("--rss-interval", type=float, default=0.5, help="Seconds between samples")
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--compare", help="Results file of an earlier run to compare against")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    if args.trace:
+        trace = load_trace(args.trace)
+    else:
+        trace = synthetic_trace(args.calls, args.tasks, args.seed)
+        if args.record:
+            save_trace(args.record, trace)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    command = shlex.split(args.command) if args.command else [sys.executable, SERVER]
+
+    def replay(url: str) -> Dict[str, Any]:
+        env = dict(os.environ, EVA_API_URL=url, EVA_API_TOKEN=os.getenv("EVA_API_TOKEN", "mock"))
+        return asyncio.run(
+            run(command, env, trace, args.concurrency, args.warm_up, args.rss_interval)
+        )
+
+    if args.api_url:
+        results = replay(args.api_url)
+    else:
+        with serve_in_process(server_argv(args)) as url:
+            results = replay(url)
+
+    _print(results, baseline)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"arguments": vars(args), "results": results}, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
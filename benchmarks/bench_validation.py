@@ -0,0 +1,80 @@
+"""Benchmark tool argument validation: microseconds per call_tool argument check.
+
+Runs each registry tool's compiled validator over representative arguments and,
+for comparison, the jsonschema check the MCP SDK performs when input
+validation is left enabled.
+
+Usage:
+    python benchmarks/bench_validation.py [--calls 20000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from registry import REGISTRY  # noqa: E402
+
+ARGUMENTS = {
+    "eva_get_task": {"task_code": "T-123", "view": "full"},
+    "eva_search_tasks": {
+        "query": "login",
+        "project": "P-1",
+        "status": "open",
+        "limit": "50",
+        "view": "minimal",
+        "consistency": "eventual",
+    },
+    "eva_create_task": {
+        "name": "New task",
+        "project_code": "P-1",
+        "description": "<p>Details</p>",
+        "priority": 2,
+    },
+    "eva_list_attachments": {
+        "parent": "T-123",
+        "filters": [["name", "ilike", "%.pdf"], ["size", ">", 0]],
+        "order_by": ["-cmf_created_at"],
+        "fields": ["name", "size"],
+    },
+}
+
+
+def per_call_us(function, arguments, calls):
+    """Return mean microseconds for calling function(arguments) calls times."""
+    start = time.perf_counter()
+    for _ in range(calls):
+        function(arguments)
+    return (time.perf_counter() - start) / calls * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    try:
+        import jsonschema
+    except ImportError:
+        jsonschema = None
+
+    print(f"{'tool':<20}{'compiled us':>14}{'jsonschema us':>16}")
+    for name, arguments in ARGUMENTS.items():
+        spec = REGISTRY.get(name)
+        compiled = per_call_us(spec.validate, arguments, args.calls)
+        if jsonschema is None:
+            reference = "-"
+        else:
+            validated = spec.validate(arguments)
+
+            def check(arguments, schema=spec.input_schema):
+                jsonschema.validate(arguments, schema)
+
+            reference = f"{per_call_us(check, validated, args.calls // 20):.2f}"
+        print(f"{name:<20}{compiled:>14.2f}{reference:>16}")
+
+
+if __name__ == "__main__":
+    main()
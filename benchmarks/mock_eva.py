@@ -0,0 +1,631 @@
+"""Local stand-in for the Eva JSON-RPC API, serving synthetic data for benchmarks.
+
+Answers POST /api/?m=<Entity>.<get|list|count|create|update> (and JSON-RPC batch
+arrays) for every entity in src/api_methods.py, which is generated from
+oas_evateam_v1_9_22.json. Keyword arguments outside the spec are rejected with
+a JSON-RPC error, so the mock also checks the client against the contract.
+
+Latency, jitter and errors can be injected per request. The server keeps
+connections alive like the real API, so client connection pooling is exercised.
+
+Usage:
+    python benchmarks/mock_eva.py [--port 8765] [--tasks 10000] [--latency-ms 20] [--jitter-ms 5]
+        [--error-rate 0.01] [--http-error-rate 0.01]
+
+Then point the server or a benchmark at it:
+    EVA_API_URL=http://127.0.0.1:8765/api EVA_API_TOKEN=mock
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from api_methods import METHODS  # noqa: E402
+
+ACTIONS = ("get", "list", "count", "create", "update")
+
+# Rows per task for every entity; entities not listed get DEFAULT_RATIO
+ENTITY_RATIOS = {
+    "CmfTask": 1.0,
+    "CmfDocument": 0.25,
+    "CmfComment": 2.0,
+    "CmfAudit": 1.0,
+    "CmfProject": 0.01,
+    "CmfPerson": 0.02,
+    "CmfList": 0.02,
+    "CmfStatusHistory": 1.0,
+    "CmfTimeTrackerHistory": 0.5,
+}
+DEFAULT_RATIO = 0.05
+
+CODE_PREFIXES = {"CmfTask": "TASK", "CmfProject": "PRJ", "CmfPerson": "USR", "CmfList": "SPR"}
+
+STATUSES = ("open", "in_progress", "review", "closed")
+WORDS = (
+    "login",
+    "page",
+    "deploy",
+    "report",
+    "api",
+    "timeout",
+    "billing",
+    "search",
+    "mobile",
+    "cache",
+    "вход",
+    "отчёт",
+    "релиз",
+    "ошибка",
+    "поиск",
+    "оплата",
+    "интеграция",
+    "миграция",
+)
+
+# JSON-RPC error codes used by the mock
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INJECTED_ERROR = -32000
+
+_EPOCH = datetime(2024, 1, 1)
+
+
+def code_for(entity: str, number: int) -> str:
+    """Return the code of the number-th row of an entity (1-based), e.g. TASK-000001."""
+    return f"{CODE_PREFIXES.get(entity, entity[3:].upper())}-{number:06d}"
+
+
+def row_count(entity: str, tasks: int) -> int:
+    """Return how many rows of an entity a Dataset with the given number of tasks holds."""
+    return max(1, int(tasks * ENTITY_RATIOS.get(entity, DEFAULT_RATIO)))
+
+
+def _timestamp(minutes: int) -> str:
+    return (_EPOCH + timedelta(minutes=minutes)).isoformat(" ")
+
+
+def _entities() -> Dict[str, set]:
+    """Map every entity in the spec to the supported actions it has."""
+    entities: Dict[str, set] = {}
+    for method in METHODS:
+        entity, _, action = method.partition(".")
+        if action in ACTIONS:
+            entities.setdefault(entity, set()).add(action)
+    return entities
+
+
+class Dataset:
+    """Deterministic synthetic rows for every entity, indexed by code and parent."""
+
+    def __init__(self, tasks: int = 10000, seed: int = 0):
+        """
+        Generate rows.
+
+        Args:
+            tasks: Number of tasks; other entities scale with ENTITY_RATIOS
+            seed: Random seed, so runs with equal arguments serve equal data
+        """
+        self.tasks = tasks
+        self.rng = random.Random(seed)
+        self.actions = _entities()
+        self.rows: Dict[str, List[Dict[str, Any]]] = {}
+        self.by_code: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.by_parent: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        self._next: Dict[str, int] = {}
+        self._clock = 0
+
+        # Referenced entities first, so tasks and comments can point at them
+        order = ["CmfProject", "CmfPerson", "CmfList", "CmfTask"]
+        order += sorted(entity for entity in self.actions if entity not in order)
+        for entity in order:
+            if entity not in self.actions:
+                continue
+            self.rows[entity] = []
+            self.by_code[entity] = {}
+            self.by_parent[entity] = {}
+            self._next[entity] = 1
+            for _ in range(row_count(entity, tasks)):
+                self.insert(entity, self._generate(entity))
+
+    def codes(self, entity: str) -> List[str]:
+        """Return the codes of all rows of an entity."""
+        return [row["code"] for row in self.rows[entity]]
+
+    def _pick(self, entity: str) -> Optional[str]:
+        rows = self.rows.get(entity)
+        return self.rng.choice(rows)["code"] if rows else None
+
+    def _text(self, words: int) -> str:
+        return " ".join(self.rng.choices(WORDS, k=words))
+
+    def _generate(self, entity: str) -> Dict[str, Any]:
+        """Build the fields of one row; code and timestamps are added by insert()."""
+        rng = self.rng
+        row = {"name": self._text(4).capitalize(), "cmf_owner": self._pick("CmfPerson")}
+        if entity == "CmfTask":
+            row.update(
+                parent=self._pick("CmfProject"),
+                responsible=self._pick("CmfPerson"),
+                status=rng.choice(STATUSES),
+                priority=rng.randint(1, 4),
+                lists=[self._pick("CmfList")],
+                executors=[self._pick("CmfPerson") for _ in range(rng.randint(0, 3))],
+                spectators=[self._pick("CmfPerson") for _ in range(rng.randint(0, 3))],
+                deadline=_timestamp(rng.randint(0, 525600)),
+                tags=[rng.choice(WORDS) for _ in range(rng.randint(0, 3))],
+                mark=None,
+                waiting_for=None,
+                text="".join(f"<p>{self._text(20)}</p>" for _ in range(rng.randint(1, 6))),
+            )
+        elif entity == "CmfDocument":
+            row.update(
+                parent=self._pick("CmfProject"),
+                responsible=self._pick("CmfPerson"),
+                tags=[rng.choice(WORDS)],
+                text="".join(f"<p>{self._text(30)}</p>" for _ in range(rng.randint(2, 10))),
+            )
+        elif entity == "CmfProject":
+            row.update(task_code_prefix=f"P{len(self.rows[entity]) + 1}", activity="active")
+        elif entity == "CmfPerson":
+            number = len(self.rows[entity]) + 1
+            row.update(login=f"user{number}", email=f"user{number}@example.com")
+        elif entity in ("CmfComment", "CmfAttachment", "CmfStatusHistory", "CmfTimeTrackerHistory"):
+            row.update(parent=self._pick("CmfTask"), text=f"<p>{self._text(12)}</p>")
+        elif entity == "CmfAudit":
+            row.update(object_code=self._pick("CmfTask"), action=rng.choice(("create", "update")))
+        else:
+            row.update(parent=self._pick("CmfProject"))
+        return row
+
+    def insert(self, entity: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Add a row with the next code and a fresh modification time."""
+        number = self._next[entity]
+        self._next[entity] = number + 1
+        self._clock += 1
+        row = {
+            "class_name": entity,
+            "code": code_for(entity, number),
+            **fields,
+            "cmf_created_at": _timestamp(self._clock),
+            "cmf_modified_at": _timestamp(self._clock),
+        }
+        self.rows[entity].append(row)
+        self.by_code[entity][row["code"]] = row
+        self._index_parent(entity, row)
+        return row
+
+    def _index_parent(self, entity: str, row: Dict[str, Any]) -> None:
+        parent = row.get("parent")
+        if isinstance(parent, str):
+            self.by_parent[entity].setdefault(parent, []).append(row)
+
+    def update(self, entity: str, code: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Change fields of an existing row; returns None if the code is unknown."""
+        row = self.by_code[entity].get(code)
+        if row is None:
+            return None
+        if "parent" in fields and fields["parent"] != row.get("parent"):
+            siblings = self.by_parent[entity].get(row.get("parent"), [])
+            if row in siblings:
+                siblings.remove(row)
+            row.update(fields)
+            self._index_parent(entity, row)
+        else:
+            row.update(fields)
+        self._clock += 1
+        row["cmf_modified_at"] = _timestamp(self._clock)
+        return row
+
+    def candidates(self, entity: str, filters: List[List[Any]]) -> List[Dict[str, Any]]:
+        """Narrow rows with the code or parent index before filters are applied."""
+        for field, op, value in filters:
+            if field == "code" and op == "=":
+                row = self.by_code[entity].get(value)
+                return [row] if row else []
+            if field == "code" and op == "in":
+                index = self.by_code[entity]
+                return [index[code] for code in value if code in index]
+            if field == "parent" and op == "=":
+                return self.by_parent[entity].get(value, [])
+        return self.rows[entity]
+
+
+def _like(pattern: str, flags: int = 0) -> Callable[[Any], bool]:
+    regex = re.compile(
+        "".join(".*" if c == "%" else "." if c == "_" else re.escape(c) for c in pattern) + r"\Z",
+        flags | re.DOTALL,
+    )
+    return lambda value: isinstance(value, str) and regex.match(value) is not None
+
+
+def _predicate(field: str, op: str, value: Any) -> Callable[[Dict[str, Any]], bool]:
+    """Compile one [field, operator, value] filter."""
+    if op == "ilike" and re.fullmatch(r"%[^%_]*%", str(value)):
+        # Substring search, the form search tools send; avoids a regex per row
+        needle = str(value)[1:-1].lower()
+        return lambda row: isinstance(row.get(field), str) and needle in row[field].lower()
+    if op == "ilike":
+        match = _like(str(value), re.IGNORECASE)
+        return lambda row: match(row.get(field))
+    if op == "like":
+        match = _like(str(value))
+        return lambda row: match(row.get(field))
+    if op == "=":
+        return lambda row: row.get(field) == value
+    if op == "!=":
+        return lambda row: row.get(field) != value
+    if op in ("in", "not in"):
+        values = set(value)
+        if op == "in":
+            return lambda row: row.get(field) in values
+        return lambda row: row.get(field) not in values
+    compare = {
+        ">": lambda a: a > value,
+        ">=": lambda a: a >= value,
+        "<": lambda a: a < value,
+        "<=": lambda a: a <= value,
+    }.get(op)
+    if compare is None:
+        raise ValueError(f"Unsupported filter operator '{op}'")
+    return lambda row: row.get(field) is not None and compare(row.get(field))
+
+
+class RPCError(Exception):
+    """JSON-RPC error returned to the client."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class EvaBackend:
+    """JSON-RPC method handlers over a Dataset, independent of the HTTP transport."""
+
+    def __init__(self, data: Dataset):
+        self.data = data
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer one JSON-RPC request object."""
+        response = {"jsonrpc": request.get("jsonrpc", "2.2"), "callid": request.get("callid")}
+        try:
+            response["result"] = self.call(request.get("method", ""), request.get("kwargs") or {})
+        except RPCError as e:
+            response["error"] = {"code": e.code, "message": e.message}
+        return response
+
+    def call(self, method: str, kwargs: Dict[str, Any]) -> Any:
+        entity, _, action = method.partition(".")
+        if action not in self.data.actions.get(entity, ()):
+            raise RPCError(METHOD_NOT_FOUND, f"Method not found: {method}")
+        allowed = METHODS[method]
+        # get/update address a row by code, which the spec leaves out of kwargs
+        unknown = [key for key in kwargs if key not in allowed and key != "code"]
+        if unknown and allowed:
+            raise RPCError(
+                INVALID_PARAMS, f"Unexpected arguments for {method}: {', '.join(unknown)}"
+            )
+
+        if action == "create":
+            return self.data.insert(entity, kwargs)
+        if action == "update":
+            fields = dict(kwargs)
+            code = fields.pop("code", None)
+            row = self.data.update(entity, code, fields)
+            if row is None:
+                raise RPCError(INVALID_PARAMS, f"{entity} {code} not found")
+            return row
+
+        filters = list(kwargs.get("filter") or [])
+        if "code" in kwargs:
+            filters.insert(0, ["code", "=", kwargs["code"]])
+        rows = self._select(entity, filters)
+        if action == "count":
+            return sum(1 for _ in rows)
+        start, stop = (0, 1) if action == "get" else kwargs.get("slice") or (0, 50)
+        if kwargs.get("order_by"):
+            rows = self._order(list(rows), kwargs["order_by"])[start:stop]
+        else:
+            # Stop scanning once the page is full
+            rows = list(itertools.islice(rows, start, stop))
+        fields = kwargs.get("fields")
+        if fields:
+            rows = [{"code": row["code"], **{f: row.get(f) for f in fields}} for row in rows]
+        if action == "get":
+            return rows[0] if rows else None
+        return rows
+
+    def _select(self, entity: str, filters: List[List[Any]]) -> Iterator[Dict[str, Any]]:
+        """Return a lazy iterator over the rows matching all filters."""
+        try:
+            predicates = [_predicate(*item) for item in filters]
+        except (TypeError, ValueError) as e:
+            raise RPCError(INVALID_PARAMS, f"Invalid filter: {e}")
+        rows = self.data.candidates(entity, filters)
+        if not predicates:
+            return iter(rows)
+        if len(predicates) == 1:
+            return filter(predicates[0], rows)
+        return (row for row in rows if all(predicate(row) for predicate in predicates))
+
+    @staticmethod
+    def _order(rows: List[Dict[str, Any]], order_by: Optional[List[str]]) -> List[Dict[str, Any]]:
+        for key in reversed(order_by or []):
+            field = key.lstrip("-")
+            rows.sort(
+                key=lambda row: (row.get(field) is not None, row.get(field) or ""),
+                reverse=key.startswith("-"),
+            )
+        return rows
+
+
+class MockEvaServer:
+    """
+    Asyncio HTTP/1.1 server speaking the Eva JSON-RPC contract.
+
+    Faults are drawn per request from a seeded RNG: HTTP 503 responses with
+    probability http_error_rate, and JSON-RPC errors with probability error_rate.
+    """
+
+    def __init__(
+        self,
+        data: Optional[Dataset] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        http_error_rate: float = 0.0,
+        token: Optional[str] = None,
+        seed: int = 0,
+    ):
+        """
+        Initialize server.
+
+        Args:
+            data: Dataset to serve (default: Dataset() with 10000 tasks)
+            host: Interface to bind
+            port: Port to bind, 0 for a free one
+            latency: Added delay per request in seconds
+            jitter: Maximum extra random delay per request in seconds
+            error_rate: Fraction of calls answered with a JSON-RPC error
+            http_error_rate: Fraction of requests answered with HTTP 503
+            token: Required bearer token (default: any)
+            seed: Seed of the fault and jitter RNG
+        """
+        self.backend = EvaBackend(data or Dataset())
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.http_error_rate = http_error_rate
+        self.token = token
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: set = set()
+
+    @property
+    def url(self) -> str:
+        """API base URL to use as EVA_API_URL."""
+        return f"http://{self.host}:{self.port}/api"
+
+    def stats(self) -> Dict[str, Any]:
+        return {"requests": self.requests, "bytes_in": self.bytes_in, "bytes_out": self.bytes_out}
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            # Kept-alive connections outlive the listener; end them too
+            for task in list(self._connections):
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    def _rpc(self, payload: Any) -> Any:
+        """Answer a request object or a batch array, injecting JSON-RPC errors."""
+        requests = payload if isinstance(payload, list) else [payload]
+        responses = []
+        for request in requests:
+            if self.error_rate and self.rng.random() < self.error_rate:
+                responses.append(
+                    {
+                        "jsonrpc": "2.2",
+                        "callid": request.get("callid"),
+                        "error": {"code": INJECTED_ERROR, "message": "Injected error"},
+                    }
+                )
+            else:
+                responses.append(self.backend.handle(request))
+        return responses if isinstance(payload, list) else responses[0]
+
+    async def _respond(self, headers: Dict[str, str], body: bytes) -> Tuple[int, bytes]:
+        delay = self.latency + (self.rng.random() * self.jitter if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.token is not None and headers.get("authorization") != f"Bearer {self.token}":
+            return 401, b'{"error":"Unauthorized"}'
+        if self.http_error_rate and self.rng.random() < self.http_error_rate:
+            return 503, b'{"error":"Service Unavailable"}'
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return 400, b'{"error":"Invalid JSON"}'
+        result = self._rpc(payload)
+        return 200, json.dumps(result, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests on one kept-alive connection until the client closes it."""
+        reasons = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 503: "Service Unavailable"}
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+                self.requests += 1
+                self.bytes_in += len(body)
+
+                if request_line.split()[0] == b"HEAD":
+                    status, content = 200, b""
+                else:
+                    status, content = await self._respond(headers, body)
+                self.bytes_out += len(content)
+                head = (
+                    f"HTTP/1.1 {status} {reasons.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(content)}\r\n\r\n"
+                )
+                writer.write(head.encode("ascii") + content)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+
+@contextmanager
+def serve_in_thread(server: MockEvaServer) -> Iterator[MockEvaServer]:
+    """Run a mock server on its own event loop in a background thread for the block's duration."""
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def run() -> None:
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start())
+        started.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, name="mock-eva", daemon=True)
+    thread.start()
+    started.wait()
+    try:
+        yield server
+    finally:
+        asyncio.run_coroutine_threadsafe(server.stop(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+@contextmanager
+def serve_in_process(argv: List[str]) -> Iterator[str]:
+    """
+    Run this script in a subprocess for the duration of the block.
+
+    A separate process keeps the mock from competing with the measured client
+    for the GIL.
+
+    Args:
+        argv: Extra command line options, see add_server_arguments()
+
+    Yields:
+        API base URL of the running server
+    """
+    process = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--port", "0", *argv],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        line = process.stdout.readline()
+        if not line:
+            raise RuntimeError(f"Mock Eva API exited with code {process.wait()}")
+        yield line.split()[-1]
+    finally:
+        process.terminate()
+        process.wait()
+        process.stdout.close()
+
+
+def server_argv(args: argparse.Namespace) -> List[str]:
+    """Turn parsed add_server_arguments() options back into command line options."""
+    return [
+        "--tasks",
+        str(args.tasks),
+        "--latency-ms",
+        str(args.latency_ms),
+        "--jitter-ms",
+        str(args.jitter_ms),
+        "--error-rate",
+        str(args.error_rate),
+        "--http-error-rate",
+        str(args.http_error_rate),
+        "--seed",
+        str(args.seed),
+    ]
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add dataset and fault injection options shared by benchmark scripts."""
+    parser.add_argument("--tasks", type=int, default=10000, help="Number of synthetic tasks")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Maximum random extra latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of JSON-RPC errors")
+    parser.add_argument("--http-error-rate", type=float, default=0.0, help="Fraction of HTTP 503s")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def server_from_arguments(args: argparse.Namespace, port: int = 0) -> MockEvaServer:
+    """Create a mock server from add_server_arguments() options."""
+    return MockEvaServer(
+        Dataset(tasks=args.tasks, seed=args.seed),
+        port=port,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        http_error_rate=args.http_error_rate,
+        seed=args.seed,
+    )
+
+
+async def _serve_forever(server: MockEvaServer) -> None:
+    await server.start()
+    print(f"Mock Eva API listening on {server.url}", flush=True)
+    await asyncio.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve_forever(server_from_arguments(args, port=args.port)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
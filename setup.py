@@ -8,4 +8,3 @@ from setuptools import setup
 
 if __name__ == "__main__":
     setup()
-
@@ -1,4 +1,3 @@
 """Eva MCP Server - MCP server for Eva-project API integration."""
 
 __version__ = "0.1.0"
-
@@ -0,0 +1,105 @@
+"""Eva API methods and their keyword arguments, generated from oas_evateam_v1_9_22.json.
+
+Regenerate with: python src/registry.py oas_evateam_v1_9_22.json > src/api_methods.py
+"""
+
+API_VERSION = "1.9.22"
+
+METHODS = {
+    "CmfTask.create": (
+        "name", "text", "parent", "lists", "cmf_owner", "responsible", "waiting_for", "executors",
+        "spectators", "priority", "mark", "alarm_date", "deadline", "epic", "parent_task", "tags",
+    ),
+    "CmfTask.update": (
+        "name", "text", "parent", "lists", "cmf_owner", "responsible", "waiting_for", "executors",
+        "spectators", "priority", "mark", "alarm_date", "deadline", "epic", "parent_task", "tags",
+    ),
+    "CmfTask.get": ("filter", "fields", "slice", "order_by", "include_archived"),
+    "CmfTask.list": ("filter", "fields", "slice", "order_by", "include_archived"),
+    "CmfTask.count": ("filter", "fields", "slice", "include_archived"),
+    "CmfTask.create_task_from_template": ("params",),
+    "CmfTask.fix_versions.append": (),
+    "CmfDocument.create": (
+        "name", "text_draft", "tree_parent", "parent", "cmf_owner", "responsible", "executors",
+        "spectators", "tags", "full_screen", "categories",
+    ),
+    "CmfDocument.update": (
+        "name", "text_draft", "tree_parent", "parent", "cmf_owner", "responsible", "executors",
+        "spectators", "tags", "full_screen", "categories",
+    ),
+    "CmfDocument.get": ("filter", "fields", "slice", "order_by", "include_archived"),
+    "CmfDocument.list": ("filter", "fields", "slice", "order_by", "include_archived"),
+    "CmfDocument.count": ("filter", "fields", "slice", "include_archived"),
+    "CmfDocument.do_publish": (),
+    "CmfDocument.download_all_attachment": (),
+    "CmfProject.create": ("name", "logic_type", "task_code_prefix", "activity", "scheme_wf"),
+    "CmfProject.update": (
+        "name", "perm_policy", "logic_type", "task_code_prefix", "activity",
+        "sl_task_only_owner_close", "cmf_owner", "add_object_type", "category",
+        "cmf_owner_assistants", "workflow", "show_tasks", "show_docs", "show_archive", "show_epic",
+        "show_sprint", "show_release", "show_roadmap", "show_components", "show_reports",
+        "show_tests", "show_active_sprints", "show_queue", "show_knowlage_base",
+        "show_servicedesk_channels", "show_servicedesk_clients", "show_filters", "show_all_tasks",
+        "show_trashcan", "show_app_learn", "sl_only_owner_approve", "sl_deny_no_approve",
+        "sl_task_need_approve", "sl_readonly_closed_task", "default_list", "default_list_if_empty",
+        "ui_form_scheme", "project_perm_scheme", "security_level_scheme", "notify_scheme",
+        "scheme_wf", "cust_field_conf_scheme", "calendar", "cmf_project_admins", "executors",
+        "spectators", "protected_cmf_project_admins", "protected_ui_form_scheme",
+        "protected_project_perm_scheme", "protected_security_level_scheme",
+        "protected_notify_scheme", "protected_scheme_wf", "task_allow_multiple_sprints",
+        "filter_responsible", "tree_text_overflow",
+    ),
+    "CmfProject.get": ("filter", "fields", "slice", "order_by", "include_archived"),
+    "CmfProject.list": ("filter", "fields", "slice", "order_by", "include_archived"),
+    "CmfProject.count": ("filter", "fields", "slice", "include_archived"),
+    "CmfList.create": ("name", "parent"),
+    "CmfList.update": ("name", "parent"),
+    "CmfList.get": ("filter", "fields", "slice", "order_by", "include_archived"),
+    "CmfList.list": ("filter", "fields", "slice", "order_by", "include_archived"),
+    "CmfList.count": ("filter", "fields", "slice", "include_archived"),
+    "CmfPerson.create": ("name", "login", "email"),
+    "CmfPerson.update": ("name", "login", "email", "cmf_owner"),
+    "CmfPerson.get": ("filter", "fields", "slice", "order_by", "include_archived"),
+    "CmfPerson.list": ("filter", "fields", "slice", "order_by", "include_archived"),
+    "CmfPerson.count": ("filter", "fields", "slice", "include_archived"),
+    "CmfPerson.set_avatar": ("image",),
+    "CmfAttachment.create": ("name", "parent"),
+    "CmfAttachment.update": ("name", "parent"),
+    "CmfAttachment.get": ("filter", "fields", "slice", "order_by", "include_archived"),
+    "CmfAttachment.list": ("filter", "fields", "slice", "order_by", "include_archived"),
+    "CmfAttachment.count": ("filter", "fields", "slice", "include_archived"),
+    "CmfAudit.get": ("filter", "fields", "slice", "order_by", "include_archived"),
+    "CmfAudit.list": ("filter", "fields", "slice", "order_by", "include_archived"),
+    "CmfAudit.count": ("filter", "fields", "slice", "include_archived"),
+    "CmfComment.create": ("parent", "text"),
+    "CmfComment.update": ("text", "parent"),
+    "CmfComment.get": ("filter", "fields", "slice", "include_archived", "order_by"),
+    "CmfComment.list": ("filter", "fields", "slice", "include_archived", "order_by"),
+    "CmfComment.count": ("filter", "fields", "slice", "include_archived"),
+    "CmfCompany.create": ("name", "inn", "ogrn", "kpp"),
+    "CmfCompany.update": ("name", "inn", "kpp", "ogrn", "cmf_owner"),
+    "CmfCompany.get": ("filter", "fields", "slice", "include_archived", "order_by"),
+    "CmfCompany.list": ("filter", "fields", "slice", "include_archived", "order_by"),
+    "CmfCompany.count": ("filter", "fields", "slice", "include_archived"),
+    "CmfGanttTask.update": ("start_plan", "end_plan"),
+    "CmfLogicType.create": ("name",),
+    "CmfLogicType.update": ("name",),
+    "CmfLogicType.get": ("filter", "fields", "slice", "order_by", "include_archived"),
+    "CmfLogicType.list": ("filter", "fields", "slice", "order_by", "include_archived"),
+    "CmfLogicType.count": ("filter", "fields", "slice", "include_archived"),
+    "CmfNotepad.create": ("text", "parent"),
+    "CmfNotepad.update": ("text",),
+    "CmfNotepad.get": ("filter", "fields", "slice", "order_by", "include_archived"),
+    "CmfNotepad.list": ("filter", "fields", "slice", "order_by", "include_archived"),
+    "CmfNotepad.count": ("filter", "fields", "slice", "include_archived"),
+    "CmfRelationOption.create": ("out_link", "in_link", "relation_type"),
+    "CmfRelationOption.update": ("out_link", "in_link", "relation_type"),
+    "CmfRelationOption.get": ("filter", "fields", "slice", "include_archived", "order_by"),
+    "CmfRelationOption.list": ("filter", "fields", "slice", "include_archived", "order_by"),
+    "CmfRelationOption.count": ("filter", "fields", "slice", "include_archived"),
+    "CmfStatusHistory.get": ("filter", "fields", "slice", "order_by", "include_archived"),
+    "CmfStatusHistory.list": ("filter", "fields", "slice", "order_by", "include_archived"),
+    "CmfStatusHistory.count": ("filter", "fields", "slice", "include_archived"),
+    "CmfTimeTrackerHistory.list": ("filter", "fields", "slice", "order_by", "include_archived"),
+    "CmfTimeTrackerHistory.count": ("filter", "fields", "slice", "include_archived"),
+}
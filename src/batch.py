@@ -0,0 +1,120 @@
+"""JSON-RPC batch requests - several heterogeneous calls in one HTTP round trip."""
+
+import types
+from typing import Any, Dict, List, Optional
+
+# Entity methods of the client that can be queued on a batch
+BATCHABLE_PREFIXES = ("get_", "list_", "count_", "create_", "update_")
+
+
+class BatchCall:
+    """Pending result of one call queued on a :class:`Batch`."""
+
+    def __init__(self, method: str, kwargs: Dict[str, Any], callid: str):
+        self.method = method
+        self.kwargs = kwargs
+        self.callid = callid
+        self.cache_key: Optional[str] = None
+        self.cache_generation: Optional[int] = None
+        self.done = False
+        self._result: Any = None
+        self._error: Optional[Exception] = None
+
+    def set_result(self, result: Any) -> None:
+        """Resolve the call with a result."""
+        self._result = result
+        self.done = True
+
+    def set_error(self, error: Exception) -> None:
+        """Resolve the call with an error."""
+        self._error = error
+        self.done = True
+
+    def result(self) -> Any:
+        """
+        Return the call result.
+
+        Raises:
+            EvaAPIError: If the call failed
+            RuntimeError: If the batch has not been executed yet
+        """
+        if not self.done:
+            raise RuntimeError(f"Batch has not been executed yet ({self.method})")
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+class Batch:
+    """
+    Collects calls and sends them together as one JSON-RPC array.
+
+    Entity methods of the client (get_task, list_comments, count_tasks, ...) can be
+    called on the batch; they return :class:`BatchCall` placeholders resolved when
+    the batch is executed - on leaving the ``with`` / ``async with`` block or by
+    calling :meth:`execute` (awaitable on AsyncEvaClient)::
+
+        with client.batch() as batch:
+            task = batch.get_task("TASK-1")
+            comments = batch.list_comments(filters=[["parent", "=", "TASK-1"]])
+        task.result(), comments.result()
+    """
+
+    def __init__(self, client):
+        """
+        Initialize batch.
+
+        Args:
+            client: EvaClient or AsyncEvaClient executing the batch
+        """
+        self.client = client
+        self.calls: List[BatchCall] = []
+
+    def call(self, method: str, **kwargs) -> BatchCall:
+        """
+        Queue a raw API call.
+
+        Args:
+            method: API method name (e.g., "CmfTask.get")
+            **kwargs: Method parameters
+
+        Raises:
+            EvaAPIError: If a write operation is queued in read-only mode
+        """
+        self.client._check_write_operation(method)
+        call = BatchCall(method, kwargs, self.client._generate_callid())
+        self.calls.append(call)
+        return call
+
+    def __getattr__(self, name: str):
+        func = getattr(type(self.client), name, None)
+        if (
+            not name.startswith(BATCHABLE_PREFIXES)
+            or name.startswith("get_many_")
+            or not isinstance(func, types.FunctionType)
+        ):
+            raise AttributeError(f"'{name}' cannot be called on a batch")
+        # Entity methods only build parameters and delegate to self.call
+        return types.MethodType(func, self)
+
+    def execute(self):
+        """Send queued calls and resolve their results; awaitable on AsyncEvaClient."""
+        calls, self.calls = self.calls, []
+        return self.client._run_batch(calls)
+
+    def __len__(self) -> int:
+        return len(self.calls)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.execute()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            await self.execute()
@@ -0,0 +1,319 @@
+"""Response cache for Eva API read calls."""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+from config import parse_mapping
+
+logger = logging.getLogger(__name__)
+
+# Sentinel returned by cache lookups that miss
+MISSING = object()
+
+# Read methods whose results are cached by default
+CACHEABLE_METHODS = frozenset(
+    {
+        "CmfTask.get",
+        "CmfProject.get",
+        "CmfPerson.get",
+        "CmfDocument.get",
+        "CmfList.get",
+    }
+)
+
+# Default time-to-live per entity, in seconds
+DEFAULT_TTLS = {
+    "CmfTask": 30.0,
+    "CmfDocument": 60.0,
+    "CmfProject": 300.0,
+    "CmfList": 300.0,
+    "CmfPerson": 600.0,
+}
+
+
+def make_key(method: str, kwargs: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Build a cache key from method name and normalized kwargs.
+
+    Keys are stable regardless of kwargs ordering.
+    """
+    return (
+        method
+        + ":"
+        + json.dumps(
+            kwargs or {}, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+        )
+    )
+
+
+def entity_of(method: str) -> str:
+    """Return entity name of an API method (e.g., "CmfTask" for "CmfTask.get")."""
+    return method.split(".", 1)[0]
+
+
+def codes_of(kwargs: Dict[str, Any], result: Any = None) -> Set[str]:
+    """Collect entity identifiers referenced by a call and its result."""
+    codes = set()
+    code = kwargs.get("code")
+    if isinstance(code, str):
+        codes.add(code)
+    rows = result if isinstance(result, list) else [result]
+    for row in rows:
+        if isinstance(row, dict):
+            for field in ("code", "id"):
+                value = row.get(field)
+                if isinstance(value, str):
+                    codes.add(value)
+    return codes
+
+
+class _Entry:
+    """Cached value with expiry and bookkeeping."""
+
+    __slots__ = ("value", "expires_at", "size", "codes")
+
+    def __init__(self, value: Any, expires_at: float, size: int, codes: Set[str]):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+        self.codes = codes
+
+
+class MemoryCache:
+    """
+    Thread-safe in-memory LRU cache with per-entity TTLs.
+
+    Entries are bounded both by count and by approximate JSON size in bytes.
+    Any object exposing the same ``get``/``set``/``invalidate_code``/``clear``/
+    ``stats`` methods can be plugged into :class:`EvaClient` instead.
+    Cached values are shared between callers and must be treated as read-only.
+
+    Every invalidation advances a generation counter and records it for the
+    invalidated key or code. A reader takes ``generation()`` before sending its
+    request and passes it to ``set``; the store is dropped if the key or one of
+    its codes was invalidated meanwhile, so a write racing the read cannot be
+    overwritten by the stale value.
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = 60.0,
+        max_entries: int = 1024,
+        max_bytes: int = 16 * 1024 * 1024,
+        cacheable_methods: Iterable[str] = CACHEABLE_METHODS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            ttls: Time-to-live per entity in seconds (default: DEFAULT_TTLS)
+            default_ttl: TTL for entities not listed in ttls
+            max_entries: Maximum number of cached entries
+            max_bytes: Maximum total size of cached values in bytes
+            cacheable_methods: API methods whose results are cached
+            clock: Monotonic time source
+        """
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.cacheable_methods = frozenset(cacheable_methods)
+        self._clock = clock
+
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._by_code: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        # Generation at which each key or code was last invalidated; the oldest
+        # records are forgotten past max_entries, raising _floor instead
+        self._generation = 0
+        self._floor = 0
+        self._invalidated: "OrderedDict[str, int]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @classmethod
+    def from_env(cls) -> "MemoryCache":
+        """
+        Create cache configured from environment variables.
+
+        EVA_CACHE_TTLS overrides per-entity TTLs (e.g. "CmfTask=10,CmfPerson=3600"),
+        EVA_CACHE_MAX_ENTRIES and EVA_CACHE_MAX_BYTES bound the cache size.
+        """
+        ttls = dict(DEFAULT_TTLS)
+        ttls.update(parse_mapping(os.getenv("EVA_CACHE_TTLS", ""), cast=float))
+        return cls(
+            ttls=ttls,
+            max_entries=int(os.getenv("EVA_CACHE_MAX_ENTRIES", "1024")),
+            max_bytes=int(os.getenv("EVA_CACHE_MAX_BYTES", str(16 * 1024 * 1024))),
+        )
+
+    def is_cacheable(self, method: str) -> bool:
+        """Check whether results of a method are cached."""
+        return method in self.cacheable_methods and self.ttl_for(method) > 0
+
+    def ttl_for(self, method: str) -> float:
+        """Return TTL in seconds for results of a method."""
+        return self.ttls.get(entity_of(method), self.default_ttl)
+
+    def get(self, key: str) -> Any:
+        """
+        Look up a cached value.
+
+        Returns:
+            Cached value, or MISSING if absent or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            if entry.expires_at <= self._clock():
+                self._remove(key)
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def generation(self) -> int:
+        """Return the current invalidation generation, taken before a read is sent."""
+        with self._lock:
+            return self._generation
+
+    def changed_since(self, generation: int, key: str, codes: Iterable[str] = ()) -> bool:
+        """Check whether a key or one of its codes was invalidated after a generation."""
+        with self._lock:
+            return self._changed_since(generation, key, codes)
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: float,
+        codes: Iterable[str] = (),
+        generation: Optional[int] = None,
+    ) -> None:
+        """
+        Store a value.
+
+        Args:
+            key: Cache key (see make_key)
+            value: JSON-serializable value
+            ttl: Time-to-live in seconds
+            codes: Entity codes the value depends on, used for invalidation
+            generation: Generation taken before the value was read; the value
+                is dropped if the key or a code was invalidated since
+        """
+        size = len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        codes = set(codes)
+        with self._lock:
+            if generation is not None and self._changed_since(generation, key, codes):
+                logger.debug(f"Dropping cache store invalidated during the read: {key}")
+                return
+            if key in self._entries:
+                self._remove(key)
+            entry = _Entry(value, self._clock() + ttl, size, codes)
+            self._entries[key] = entry
+            self._bytes += size
+            for code in entry.codes:
+                self._by_code.setdefault(code, set()).add(key)
+
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, key: str) -> bool:
+        """Remove a single entry by key."""
+        with self._lock:
+            self._advance(key)
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            self.invalidations += 1
+            return True
+
+    def invalidate_code(self, code: str) -> int:
+        """
+        Remove every entry that depends on an entity code.
+
+        Returns:
+            Number of removed entries
+        """
+        with self._lock:
+            self._advance(code)
+            keys = self._by_code.pop(code, set())
+            removed = 0
+            for key in list(keys):
+                if key in self._entries:
+                    self._remove(key)
+                    removed += 1
+            self.invalidations += removed
+            return removed
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._by_code.clear()
+            self._bytes = 0
+            self._generation += 1
+            self._floor = self._generation
+            self._invalidated.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def _advance(self, name: str) -> None:
+        """Record an invalidation of a key or code; caller holds the lock."""
+        self._generation += 1
+        self._invalidated[name] = self._generation
+        self._invalidated.move_to_end(name)
+        while len(self._invalidated) > self.max_entries:
+            _, forgotten = self._invalidated.popitem(last=False)
+            self._floor = max(self._floor, forgotten)
+
+    def _changed_since(self, generation: int, key: str, codes: Iterable[str]) -> bool:
+        """Check for invalidations after a generation; caller holds the lock."""
+        if generation < self._floor:
+            return True
+        return any(self._invalidated.get(name, 0) > generation for name in (key, *codes))
+
+    def _remove(self, key: str) -> None:
+        """Remove entry and its code index; caller holds the lock."""
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        for code in entry.codes:
+            keys = self._by_code.get(code)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_code[code]
@@ -0,0 +1,221 @@
+"""Audit log change feed - tails CmfAudit and invalidates cached entities."""
+
+import asyncio
+import inspect
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from eva_client import EvaAPIError
+from ratelimit import bulk
+
+logger = logging.getLogger(__name__)
+
+# Audit entry fields that reference the changed entity
+ENTITY_FIELDS = ("object_code", "object_id")
+
+DEFAULT_DIR = Path.home() / ".cache" / "eva-mcp-server"
+
+# High-water mark of an audit log that was empty at startup: every entry written
+# afterwards is new, so the next poll reads the log from the start
+EMPTY_LOG_MARK = ""
+
+
+class AuditChangeFeed:
+    """
+    Poll the Eva audit log from a persisted high-water mark.
+
+    Each new audit entry invalidates the cached entities it references and is
+    published to subscribers, so other caches can react to the same changes.
+    Works with both EvaClient and AsyncEvaClient.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        cache: Optional[Any] = None,
+        state_file: Optional[str] = None,
+        interval: Optional[float] = None,
+        page_size: int = 100,
+        namespace: Optional[str] = None,
+    ):
+        """
+        Initialize change feed.
+
+        Args:
+            client: EvaClient or AsyncEvaClient instance
+            cache: Cache to invalidate (default: client.cache)
+            state_file: File persisting the high-water mark (default: from EVA_AUDIT_STATE_FILE
+                env var or audit_state-<namespace>.json in ~/.cache/eva-mcp-server)
+            interval: Seconds between polls (default: from EVA_AUDIT_POLL_INTERVAL env var or 30)
+            page_size: Audit entries fetched per request
+            namespace: Identifies the Eva instance and user (see diskcache.cache_namespace), so
+                feeds of different instances or tokens never share a high-water mark
+        """
+        self.client = client
+        self.cache = cache if cache is not None else getattr(client, "cache", None)
+        default_name = f"audit_state-{namespace}.json" if namespace else "audit_state.json"
+        self.state_file = Path(
+            state_file or os.getenv("EVA_AUDIT_STATE_FILE", str(DEFAULT_DIR / default_name))
+        ).expanduser()
+        self.interval = (
+            interval if interval is not None else float(os.getenv("EVA_AUDIT_POLL_INTERVAL", "30"))
+        )
+        self.page_size = page_size
+
+        self.high_water_mark: Optional[str] = None
+        # Entries already processed at exactly high_water_mark
+        self._seen_at_mark: Set[str] = set()
+        self._subscribers: List[Callable[[Dict[str, Any]], Any]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._load_state()
+
+    def subscribe(self, callback: Callable[[Dict[str, Any]], Any]) -> Callable[[], None]:
+        """
+        Register a callback receiving each new audit entry.
+
+        Callbacks may be plain functions or coroutine functions.
+
+        Returns:
+            Function that removes the subscription
+        """
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    async def poll_once(self) -> int:
+        """
+        Fetch audit entries newer than the high-water mark and process them.
+
+        Returns:
+            Number of new entries processed
+        """
+        if self.high_water_mark is None:
+            await self._init_high_water_mark()
+            return 0
+
+        processed = 0
+        offset = 0
+        mark = self.high_water_mark
+        while True:
+            entries = await self._call(
+                self.client.list_audit,
+                # The whole log is new when it was empty at startup
+                filters=[["cmf_created_at", ">=", mark]] if mark else None,
+                limit=self.page_size,
+                offset=offset,
+                order_by=["cmf_created_at"],
+            )
+            for entry in entries:
+                if await self._process(entry):
+                    processed += 1
+            if len(entries) < self.page_size:
+                break
+            offset += self.page_size
+
+        if processed:
+            self._save_state()
+            logger.info(f"Audit feed processed {processed} change(s) up to {self.high_water_mark}")
+        return processed
+
+    async def run(self) -> None:
+        """Poll until cancelled; API errors are logged and retried on the next tick."""
+        while True:
+            try:
+                await self.poll_once()
+            except EvaAPIError as e:
+                logger.warning(f"Audit feed poll failed: {e.message}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> asyncio.Task:
+        """Start polling in a background task on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        """Stop the background polling task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _call(self, func: Callable[..., Any], **kwargs) -> Any:
+        # Audit polling runs in the bulk pool so it never starves interactive calls
+        with bulk():
+            result = func(**kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+        return result
+
+    async def _init_high_water_mark(self) -> None:
+        """Start tailing from the newest audit entry; older changes predate the cache."""
+        latest = await self._call(self.client.list_audit, limit=1, order_by=["-cmf_created_at"])
+        if latest:
+            self.high_water_mark = latest[0].get("cmf_created_at")
+            self._seen_at_mark = {latest[0].get("code")}
+        else:
+            self.high_water_mark = EMPTY_LOG_MARK
+            self._seen_at_mark = set()
+        self._save_state()
+
+    async def _process(self, entry: Dict[str, Any]) -> bool:
+        """Invalidate and publish a single entry; returns False for already seen entries."""
+        created_at = entry.get("cmf_created_at")
+        entry_code = entry.get("code")
+        if created_at == self.high_water_mark and entry_code in self._seen_at_mark:
+            return False
+
+        if self.cache is not None:
+            for field in ENTITY_FIELDS:
+                code = entry.get(field)
+                if not isinstance(code, str):
+                    continue
+                # A persistent tier is updated in a worker thread (TieredCache.ainvalidate_code)
+                if hasattr(self.cache, "ainvalidate_code"):
+                    await self.cache.ainvalidate_code(code)
+                else:
+                    self.cache.invalidate_code(code)
+
+        for callback in list(self._subscribers):
+            try:
+                result = callback(entry)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Audit feed subscriber failed: {e}")
+
+        if created_at is not None:
+            if created_at != self.high_water_mark:
+                self.high_water_mark = created_at
+                self._seen_at_mark = set()
+            self._seen_at_mark.add(entry_code)
+        return True
+
+    def _load_state(self) -> None:
+        try:
+            state = json.loads(self.state_file.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable audit feed state {self.state_file}: {e}")
+            return
+        self.high_water_mark = state.get("high_water_mark")
+        self._seen_at_mark = set(state.get("seen", []))
+
+    def _save_state(self) -> None:
+        state = {
+            "high_water_mark": self.high_water_mark,
+            "seen": sorted(c for c in self._seen_at_mark if c),
+        }
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.state_file.with_suffix(".tmp")
+            tmp_file.write_text(json.dumps(state), encoding="utf-8")
+            os.replace(tmp_file, self.state_file)
+        except OSError as e:
+            logger.warning(f"Failed to persist audit feed state to {self.state_file}: {e}")
@@ -0,0 +1,38 @@
+"""Configuration helpers shared by Eva MCP Server modules."""
+
+from typing import Any, Callable, Dict
+
+_env_loaded = False
+
+
+def load_env() -> None:
+    """Load environment variables from a .env file, once; dotenv is imported on first use."""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        _env_loaded = True
+
+
+def parse_mapping(value: str, cast: Callable[[str], Any] = int) -> Dict[str, Any]:
+    """
+    Parse per-key settings from a "name=N,other=M" string.
+
+    Args:
+        value: Comma-separated list of name=value pairs
+        cast: Callable converting each value (default: int)
+
+    Returns:
+        Mapping of name to converted value
+    """
+    mapping = {}
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, sep, raw = item.partition("=")
+        if not sep:
+            raise ValueError(f"Invalid setting '{item}', expected name=N")
+        mapping[name.strip()] = cast(raw.strip())
+    return mapping
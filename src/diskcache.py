@@ -0,0 +1,443 @@
+"""Persistent SQLite cache tier for warm restarts."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from cache import CACHEABLE_METHODS, MISSING, MemoryCache
+
+logger = logging.getLogger(__name__)
+
+# Reference data lists cached by the tiered cache in addition to *.get results
+REFERENCE_LIST_METHODS = frozenset({"CmfProject.list", "CmfList.list", "CmfPerson.list"})
+
+DEFAULT_PATH = "~/.cache/eva-mcp-server/cache.sqlite3"
+
+# Run size pruning every N writes
+PRUNE_INTERVAL = 64
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    stored_at REAL NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE TABLE IF NOT EXISTS entry_codes (
+    namespace TEXT NOT NULL,
+    code TEXT NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (namespace, code, key)
+);
+CREATE INDEX IF NOT EXISTS entry_codes_key ON entry_codes (namespace, key);
+"""
+
+
+def cache_namespace(api_url: str, api_token: str) -> str:
+    """Derive a namespace so that different Eva instances and users never share entries."""
+    return hashlib.sha256(f"{api_url}\n{api_token}".encode("utf-8")).hexdigest()[:16]
+
+
+class SQLiteCache:
+    """
+    Cache stored in a SQLite database shared by server processes on one machine.
+
+    The database runs in WAL mode so readers never block the writer, and every
+    write is a short IMMEDIATE transaction. Expiry uses wall-clock time so TTLs
+    survive restarts. The total size is capped by deleting the oldest entries.
+    Errors are logged and treated as misses: the cache is best-effort.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_PATH,
+        namespace: str = "default",
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entries: int = 50000,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize cache and create the database if needed.
+
+        Args:
+            path: Database file path
+            namespace: Partition of the database used by this client (see cache_namespace)
+            max_bytes: Maximum total size of stored values in bytes
+            max_entries: Maximum number of stored entries
+            clock: Wall-clock time source
+        """
+        self.path = Path(path).expanduser()
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.evictions = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    @classmethod
+    def from_env(cls, namespace: str = "default") -> "SQLiteCache":
+        """
+        Create cache from EVA_DISK_CACHE_PATH, EVA_DISK_CACHE_MAX_BYTES and
+        EVA_DISK_CACHE_MAX_ENTRIES env vars.
+        """
+        return cls(
+            path=os.getenv("EVA_DISK_CACHE_PATH", DEFAULT_PATH),
+            namespace=namespace,
+            max_bytes=int(os.getenv("EVA_DISK_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+            max_entries=int(os.getenv("EVA_DISK_CACHE_MAX_ENTRIES", "50000")),
+        )
+
+    def lookup(self, key: str) -> Optional[Tuple[Any, float, set]]:
+        """
+        Look up an entry with its metadata.
+
+        Returns:
+            Tuple of value, remaining TTL in seconds and dependent codes, or None on a miss
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM entries WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                ).fetchone()
+                codes = set()
+                if row is not None:
+                    codes = {
+                        code
+                        for (code,) in self._conn.execute(
+                            "SELECT code FROM entry_codes WHERE namespace = ? AND key = ?",
+                            (self.namespace, key),
+                        )
+                    }
+        except sqlite3.Error as e:
+            self._error("read", e)
+            return None
+
+        remaining = row[1] - self._clock() if row is not None else 0
+        if row is None or remaining <= 0:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0]), remaining, codes
+
+    def get(self, key: str) -> Any:
+        """
+        Look up a cached value.
+
+        Returns:
+            Cached value, or MISSING if absent or expired
+        """
+        entry = self.lookup(key)
+        return MISSING if entry is None else entry[0]
+
+    def set(self, key: str, value: Any, ttl: float, codes: Iterable[str] = ()) -> None:
+        """
+        Store a value.
+
+        Args:
+            key: Cache key (see cache.make_key)
+            value: JSON-serializable value
+            ttl: Time-to-live in seconds
+            codes: Entity codes the value depends on, used for invalidation
+        """
+        data = json.dumps(value, ensure_ascii=False, default=str)
+        size = len(data.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = self._clock()
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                        (self.namespace, key, data, now + ttl, now, size),
+                    )
+                    self._conn.execute(
+                        "DELETE FROM entry_codes WHERE namespace = ? AND key = ?",
+                        (self.namespace, key),
+                    )
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO entry_codes VALUES (?, ?, ?)",
+                        [(self.namespace, code, key) for code in set(codes)],
+                    )
+                    self._writes += 1
+                    if self._writes % PRUNE_INTERVAL == 0:
+                        self._prune(now)
+                    self._conn.execute("COMMIT")
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+        except sqlite3.Error as e:
+            self._error("write", e)
+
+    def invalidate(self, key: str) -> bool:
+        """Remove a single entry by key."""
+        return self._delete("key = ?", (key,)) > 0
+
+    def invalidate_code(self, code: str) -> int:
+        """
+        Remove every entry that depends on an entity code.
+
+        Returns:
+            Number of removed entries
+        """
+        return self._delete(
+            "key IN (SELECT key FROM entry_codes WHERE namespace = ? AND code = ?)",
+            (self.namespace, code),
+        )
+
+    def clear(self) -> None:
+        """Remove all entries of this namespace."""
+        self._delete("1 = 1", ())
+
+    def prune(self) -> int:
+        """Delete expired entries and the oldest ones beyond the size caps; returns the count."""
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    removed = self._prune(self._clock())
+                    self._conn.execute("COMMIT")
+                    return removed
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+        except sqlite3.Error as e:
+            self._error("write", e)
+            return 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        try:
+            with self._lock:
+                entries, size = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries WHERE namespace = ?",
+                    (self.namespace,),
+                ).fetchone()
+        except sqlite3.Error as e:
+            self._error("read", e)
+            entries, size = None, None
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "evictions": self.evictions,
+            "errors": self.errors,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _delete(self, condition: str, params: Tuple) -> int:
+        """Delete matching entries of this namespace with their code index."""
+        keys_query = f"SELECT key FROM entries WHERE namespace = ? AND {condition}"
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    keys = [
+                        key for (key,) in self._conn.execute(keys_query, (self.namespace,) + params)
+                    ]
+                    self._delete_keys(keys)
+                    self._conn.execute("COMMIT")
+                    return len(keys)
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+        except sqlite3.Error as e:
+            self._error("write", e)
+            return 0
+
+    def _delete_keys(self, keys) -> None:
+        """Delete entries by key inside an open transaction."""
+        rows = [(self.namespace, key) for key in keys]
+        self._conn.executemany("DELETE FROM entries WHERE namespace = ? AND key = ?", rows)
+        self._conn.executemany("DELETE FROM entry_codes WHERE namespace = ? AND key = ?", rows)
+
+    def _prune(self, now: float) -> int:
+        """Delete expired and oldest entries inside an open transaction."""
+        expired = [
+            key
+            for (key,) in self._conn.execute(
+                "SELECT key FROM entries WHERE namespace = ? AND expires_at <= ?",
+                (self.namespace, now),
+            )
+        ]
+        self._delete_keys(expired)
+
+        entries, size = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries WHERE namespace = ?",
+            (self.namespace,),
+        ).fetchone()
+        oldest = []
+        if entries > self.max_entries or size > self.max_bytes:
+            for key, entry_size in self._conn.execute(
+                "SELECT key, size FROM entries WHERE namespace = ? ORDER BY stored_at",
+                (self.namespace,),
+            ):
+                if entries <= self.max_entries and size <= self.max_bytes:
+                    break
+                oldest.append(key)
+                entries -= 1
+                size -= entry_size
+            self._delete_keys(oldest)
+            self.evictions += len(oldest)
+        return len(expired) + len(oldest)
+
+    def _error(self, operation: str, error: Exception) -> None:
+        self.errors += 1
+        logger.warning(f"Disk cache {operation} failed: {error}")
+
+
+class TieredCache:
+    """
+    In-memory cache backed by a persistent tier.
+
+    Lookups try memory first, then the persistent tier, promoting hits to
+    memory with their remaining TTL. Writes and invalidations go to both tiers.
+    Besides *.get results, reference lists (projects, lists, persons) are cached.
+
+    aget, aset and ainvalidate_code are the variants for the event loop: the
+    memory tier is used inline and the SQLite tier, which may wait on another
+    process's write lock, runs in a worker thread.
+    """
+
+    def __init__(
+        self,
+        memory: MemoryCache,
+        disk: SQLiteCache,
+        cacheable_methods: Iterable[str] = CACHEABLE_METHODS | REFERENCE_LIST_METHODS,
+    ):
+        """
+        Initialize tiered cache.
+
+        Args:
+            memory: In-process cache tier
+            disk: Persistent cache tier
+            cacheable_methods: API methods whose results are cached
+        """
+        self.memory = memory
+        self.disk = disk
+        self.cacheable_methods = frozenset(cacheable_methods)
+
+    def is_cacheable(self, method: str) -> bool:
+        """Check whether results of a method are cached."""
+        return method in self.cacheable_methods and self.ttl_for(method) > 0
+
+    def ttl_for(self, method: str) -> float:
+        """Return TTL in seconds for results of a method."""
+        return self.memory.ttl_for(method)
+
+    def get(self, key: str) -> Any:
+        """Look up a value in memory, then on disk."""
+        value = self.memory.get(key)
+        if value is not MISSING:
+            return value
+        entry = self.disk.lookup(key)
+        if entry is None:
+            return MISSING
+        value, remaining, codes = entry
+        self.memory.set(key, value, remaining, codes)
+        return value
+
+    def generation(self) -> int:
+        """Return the invalidation generation of the memory tier, which sees every invalidation."""
+        return self.memory.generation()
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: float,
+        codes: Iterable[str] = (),
+        generation: Optional[int] = None,
+    ) -> None:
+        """Store a value in both tiers, unless invalidated since generation (see MemoryCache)."""
+        codes = set(codes)
+        if generation is not None and self.memory.changed_since(generation, key, codes):
+            return
+        self.memory.set(key, value, ttl, codes)
+        self.disk.set(key, value, ttl, codes)
+
+    async def aget(self, key: str) -> Any:
+        """Look up a value like get, reading the disk tier in a worker thread."""
+        value = self.memory.get(key)
+        if value is not MISSING:
+            return value
+        entry = await asyncio.to_thread(self.disk.lookup, key)
+        if entry is None:
+            return MISSING
+        value, remaining, codes = entry
+        self.memory.set(key, value, remaining, codes)
+        return value
+
+    async def aset(
+        self,
+        key: str,
+        value: Any,
+        ttl: float,
+        codes: Iterable[str] = (),
+        generation: Optional[int] = None,
+    ) -> None:
+        """Store a value like set, writing the disk tier in a worker thread."""
+        codes = set(codes)
+        if generation is not None and self.memory.changed_since(generation, key, codes):
+            return
+        self.memory.set(key, value, ttl, codes)
+        await asyncio.to_thread(self.disk.set, key, value, ttl, codes)
+
+    async def ainvalidate_code(self, code: str) -> int:
+        """Remove entries of an entity code like invalidate_code, on disk in a worker thread."""
+        in_memory = self.memory.invalidate_code(code)
+        return max(in_memory, await asyncio.to_thread(self.disk.invalidate_code, code))
+
+    def invalidate(self, key: str) -> bool:
+        """Remove a single entry from both tiers."""
+        in_memory = self.memory.invalidate(key)
+        return self.disk.invalidate(key) or in_memory
+
+    def invalidate_code(self, code: str) -> int:
+        """Remove every entry depending on an entity code from both tiers."""
+        return max(self.memory.invalidate_code(code), self.disk.invalidate_code(code))
+
+    def clear(self) -> None:
+        """Remove all entries from both tiers."""
+        self.memory.clear()
+        self.disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return statistics of both tiers."""
+        return {"memory": self.memory.stats(), "disk": self.disk.stats()}
+
+    def close(self) -> None:
+        """Close the persistent tier."""
+        self.disk.close()
@@ -0,0 +1,162 @@
+"""Tool dispatcher - bounded-concurrency execution of MCP tool calls."""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from config import parse_mapping
+
+logger = logging.getLogger(__name__)
+
+
+class _ToolStats:
+    """Running counters for a single tool."""
+
+    def __init__(self):
+        self.calls = 0
+        self.waiting = 0
+        self.in_flight = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "waiting": self.waiting,
+            "in_flight": self.in_flight,
+            "wait_avg_ms": round(self.wait_total / self.calls * 1000, 3) if self.calls else 0.0,
+            "wait_max_ms": round(self.wait_max * 1000, 3),
+        }
+
+
+class ToolDispatcher:
+    """
+    Run tool invocations concurrently under a global and per-tool limit.
+
+    Coroutine functions are awaited on the event loop; plain functions are
+    executed on a thread pool so they never block it.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        tool_limits: Optional[Dict[str, int]] = None,
+        max_workers: Optional[int] = None,
+    ):
+        """
+        Initialize dispatcher.
+
+        Args:
+            max_concurrency: Global limit of tool calls in flight
+                (default: from EVA_MAX_CONCURRENCY env var or 16)
+            tool_limits: Per-tool limits
+                (default: from EVA_TOOL_CONCURRENCY env var, e.g. "eva_search_tasks=4")
+            max_workers: Thread pool size for synchronous tools
+                (default: from EVA_WORKER_THREADS env var or max_concurrency)
+        """
+        self.max_concurrency = max_concurrency or int(os.getenv("EVA_MAX_CONCURRENCY", "16"))
+        self.tool_limits = (
+            tool_limits
+            if tool_limits is not None
+            else parse_mapping(os.getenv("EVA_TOOL_CONCURRENCY", ""))
+        )
+        self.max_workers = max_workers or int(
+            os.getenv("EVA_WORKER_THREADS", str(self.max_concurrency))
+        )
+
+        self._global = asyncio.Semaphore(self.max_concurrency)
+        self._tool_semaphores = {
+            name: asyncio.Semaphore(limit) for name, limit in self.tool_limits.items()
+        }
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stats: Dict[str, _ToolStats] = {}
+        self.waiting = 0
+        self.in_flight = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="eva-tool"
+            )
+        return self._executor
+
+    async def dispatch(self, name: str, func: Callable[..., Any], arguments: Dict[str, Any]) -> Any:
+        """
+        Execute a tool once a concurrency slot is available.
+
+        Args:
+            name: Tool name (used for per-tool limits and stats)
+            func: Tool callable, sync or async
+            arguments: Keyword arguments for the tool
+
+        Returns:
+            Tool result
+        """
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = _ToolStats()
+        tool_semaphore = self._tool_semaphores.get(name)
+
+        queued_at = time.perf_counter()
+        stats.waiting += 1
+        self.waiting += 1
+        try:
+            if tool_semaphore is not None:
+                await tool_semaphore.acquire()
+            try:
+                await self._global.acquire()
+            except BaseException:
+                if tool_semaphore is not None:
+                    tool_semaphore.release()
+                raise
+        finally:
+            stats.waiting -= 1
+            self.waiting -= 1
+
+        waited = time.perf_counter() - queued_at
+        stats.calls += 1
+        stats.wait_total += waited
+        stats.wait_max = max(stats.wait_max, waited)
+        stats.in_flight += 1
+        self.in_flight += 1
+        logger.debug(
+            f"Dispatching {name} (waited={waited * 1000:.1f}ms, "
+            f"in_flight={self.in_flight}, queued={self.waiting})"
+        )
+
+        try:
+            if inspect.iscoroutinefunction(func):
+                return await func(**arguments)
+            loop = asyncio.get_running_loop()
+            # Copy the context so the worker thread sees the caller's pool and trace span
+            return await loop.run_in_executor(
+                self._get_executor(),
+                functools.partial(contextvars.copy_context().run, func, **arguments),
+            )
+        finally:
+            stats.in_flight -= 1
+            self.in_flight -= 1
+            self._global.release()
+            if tool_semaphore is not None:
+                tool_semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, in-flight count and wait times per tool."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "waiting": self.waiting,
+            "in_flight": self.in_flight,
+            "tools": {name: stats.snapshot() for name, stats in self._stats.items()},
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker thread pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
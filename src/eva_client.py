@@ -1,23 +1,45 @@
 """Eva API Client - HTTP client for Eva-project API."""
 
+import asyncio
+import contextvars
 import os
+import time
 import uuid
 import logging
-from typing import Any, Dict, Optional, List
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterator, Optional, List, Tuple
 
-import httpx
-from dotenv import load_dotenv
+from batch import Batch, BatchCall
+from cache import MISSING, MemoryCache, codes_of, entity_of, make_key
+from config import load_env
+from hedging import HedgePolicy
+from metrics import Metrics
+from ratelimit import AsyncBulkheads, Bulkheads, RateLimiter, bulk, current_pool
+from registry import is_read_method, is_write_method
+from resilience import CircuitBreaker, RetryPolicy, parse_retry_after
+from singleflight import AsyncSingleFlight, SingleFlight
+from tracing import KIND_CLIENT, span
 
-# Load environment variables
-load_dotenv()
+# httpx and dotenv are imported when a client is created, not when the module is imported
+if TYPE_CHECKING:
+    import httpx
 
 logger = logging.getLogger(__name__)
 
+# Sort order used by bulk fetches; ascending creation time appends new rows at the end
+DEFAULT_FETCH_ORDER = ["cmf_created_at"]
+
+# Maximum number of codes resolved by one `in` filter in get_many_*
+DEFAULT_CHUNK_SIZE = 100
+
+# EVA_BATCH values: auto-detect array support, always batch, never batch
+BATCH_MODES = {"auto": None, "true": True, "false": False}
+
 
 class EvaAPIError(Exception):
     """Base exception for Eva API errors."""
-    
+
     def __init__(self, message: str, code: Optional[int] = None, details: Optional[Dict] = None):
         self.message = message
         self.code = code
@@ -25,57 +47,120 @@ class EvaAPIError(Exception):
         super().__init__(self.message)
 
 
-class EvaClient:
-    """Client for interacting with Eva-project API using JSON-RPC 2.0."""
-    
+class EvaTransientError(EvaAPIError):
+    """Connection failure, timeout or retryable HTTP status that may succeed on retry."""
+
+    def __init__(
+        self,
+        message: str,
+        status: Optional[int] = None,
+        retry_after: Optional[float] = None,
+        details: Optional[Dict] = None,
+    ):
+        super().__init__(message, details=details)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class EvaCircuitOpenError(EvaAPIError):
+    """Raised without sending a request while the circuit breaker is open."""
+
+
+class _BaseEvaClient:
+    """
+    Shared configuration, request building and API methods for Eva clients.
+
+    Entity methods delegate to ``self.call``; in :class:`AsyncEvaClient` that is a
+    coroutine function, so the same methods return awaitables there.
+    """
+
     def __init__(
         self,
         api_url: Optional[str] = None,
         api_token: Optional[str] = None,
         read_only: Optional[bool] = None,
         timeout: int = 30,
+        cache: Optional[MemoryCache] = None,
+        coalesce: bool = True,
+        batch_mode: Optional[str] = None,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        limiter: Optional[RateLimiter] = None,
+        metrics: Optional[Metrics] = None,
     ):
         """
         Initialize Eva API client.
-        
+
         Args:
             api_url: Eva API base URL (default: from EVA_API_URL env var)
             api_token: API authentication token (default: from EVA_API_TOKEN env var)
-            read_only: Enable read-only mode to prevent write operations (default: from EVA_READ_ONLY env var or True if not set)
+            read_only: Enable read-only mode to prevent write operations
+                (default: from EVA_READ_ONLY env var or True if not set)
             timeout: Request timeout in seconds (default: 30)
+            cache: Cache for read calls (default: no caching)
+            coalesce: Share one in-flight request between identical concurrent read calls
+            batch_mode: JSON-RPC batch support - auto, true or false
+                (default: from EVA_BATCH env var or auto)
+            retry: Retry policy for transient failures of read calls
+                (default: RetryPolicy.from_env())
+            breaker: Circuit breaker shared by all calls (default: CircuitBreaker.from_env())
+            limiter: Client-side request rate limiter (default: RateLimiter.from_env())
+            metrics: Registry recording per-method latency, errors, retries, cache hits and bytes
+                (default: none)
         """
+        load_env()
         self.api_url = api_url or os.getenv("EVA_API_URL", "https://your-eva-instance.com/api")
         self.api_token = api_token or os.getenv("EVA_API_TOKEN", "")
-        # По умолчанию read-only режим включен (true), если не указано явно или через EVA_READ_ONLY
-        self.read_only = read_only if read_only is not None else os.getenv("EVA_READ_ONLY", "true").lower() == "true"
+        # По умолчанию read-only режим включен (true),
+        # если не указано явно или через EVA_READ_ONLY
+        if read_only is None:
+            read_only = os.getenv("EVA_READ_ONLY", "true").lower() == "true"
+        self.read_only = read_only
         self.timeout = timeout or int(os.getenv("EVA_TIMEOUT", "30"))
-        
+
+        self.cache = cache
+        self.coalesce = coalesce
+        self.retry = retry or RetryPolicy.from_env()
+        self.breaker = breaker or CircuitBreaker.from_env()
+        self.limiter = limiter or RateLimiter.from_env()
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.track_breaker(self.breaker)
+
+        batch_mode = (batch_mode or os.getenv("EVA_BATCH", "auto")).lower()
+        if batch_mode not in BATCH_MODES:
+            raise ValueError(f"Unknown batch mode '{batch_mode}', expected auto, true or false")
+        # None until the first batch tells whether the endpoint accepts arrays
+        self._batch_supported = BATCH_MODES[batch_mode]
+
         if not self.api_token:
             raise ValueError("API token is required. Set EVA_API_TOKEN environment variable.")
-        
-        self.client = httpx.Client(
-            timeout=self.timeout,
-            headers={
+
+    def _client_options(self) -> Dict[str, Any]:
+        """Keyword arguments shared by the sync and async httpx clients."""
+        return {
+            "timeout": self.timeout,
+            "headers": {
                 "Authorization": f"Bearer {self.api_token}",
                 "Content-Type": "application/json",
             },
-            follow_redirects=False,
-        )
-        
-        logger.info(f"Eva client initialized (read_only={self.read_only}, url={self.api_url})")
-    
+            "follow_redirects": False,
+        }
+
     def _generate_callid(self) -> str:
         """Generate a unique call ID for JSON-RPC request."""
         return str(uuid.uuid4())
-    
-    def _build_request(self, method: str, kwargs: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+
+    def _build_request(
+        self, method: str, kwargs: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         Build JSON-RPC 2.0 request.
-        
+
         Args:
             method: API method name (e.g., "CmfTask.get")
             kwargs: Method parameters
-            
+
         Returns:
             JSON-RPC request dictionary
         """
@@ -85,81 +170,391 @@ class EvaClient:
             "callid": self._generate_callid(),
             "kwargs": kwargs or {},
         }
-    
+
+    def _is_read_operation(self, method: str) -> bool:
+        """Check if API method is an idempotent read (get, list or count)."""
+        return is_read_method(method)
+
+    def _is_write_operation(self, method: str) -> bool:
+        """Check if API method modifies data (precomputed from the API spec, see registry)."""
+        return is_write_method(method)
+
     def _check_write_operation(self, method: str) -> None:
         """
         Check if write operation is allowed.
-        
+
         Args:
             method: API method name
-            
+
         Raises:
             EvaAPIError: If write operation is attempted in read-only mode
         """
-        write_operations = ["create", "update", "delete", "append", "set_", "do_"]
-        
-        if self.read_only and any(op in method.lower() for op in write_operations):
+        if self.read_only and self._is_write_operation(method):
             raise EvaAPIError(
                 f"Write operation '{method}' is not allowed in read-only mode. "
                 "Set read_only=False to enable write operations.",
-                code=-32001
+                code=-32001,
             )
-    
-    def call(self, method: str, **kwargs) -> Any:
+
+    def _cache_key(self, method: str, kwargs: Dict[str, Any]) -> Optional[str]:
+        """Return the cache key of a read call, or None if the call is not cacheable."""
+        if self.cache is None or not self.cache.is_cacheable(method):
+            return None
+        return make_key(method, kwargs)
+
+    def _cache_hit(self, method: str, cached: Any) -> Any:
+        """Record a cache hit in metrics and pass the looked-up value through."""
+        if cached is not MISSING and self.metrics is not None:
+            self.metrics.record_cache_hit(method)
+        return cached
+
+    def _cache_lookup(self, method: str, kwargs: Dict[str, Any]):
         """
-        Make a JSON-RPC API call.
-        
-        Args:
-            method: API method name (e.g., "CmfTask.get")
-            **kwargs: Method parameters
-            
+        Look up a read call in the cache.
+
         Returns:
-            API response result
-            
+            Tuple of cache key (None if the call is not cacheable) and cached value or MISSING
+        """
+        key = self._cache_key(method, kwargs)
+        if key is None:
+            return None, MISSING
+        return key, self._cache_hit(method, self.cache.get(key))
+
+    @staticmethod
+    def _cached_codes(method: str, kwargs: Dict[str, Any], result: Any) -> set:
+        """Return entity codes a cached read result depends on."""
+        codes = codes_of(kwargs, result)
+        if method.endswith(".list"):
+            # Cached lists also depend on their entity, so creating a new row invalidates them
+            codes.add(entity_of(method))
+        return codes
+
+    @staticmethod
+    def _touched_codes(method: str, kwargs: Dict[str, Any], result: Any) -> set:
+        """Return entity codes whose cache entries a write invalidates."""
+        touched = codes_of(kwargs, result)
+        touched.add(entity_of(method))
+        parent = kwargs.get("parent")
+        if isinstance(parent, str):
+            touched.add(parent)
+        return touched
+
+    def _cache_generation(self) -> Optional[int]:
+        """Return the cache invalidation generation before a read, if the cache tracks one."""
+        if self.cache is None or not hasattr(self.cache, "generation"):
+            return None
+        return self.cache.generation()
+
+    @staticmethod
+    def _store_args(generation: Optional[int]) -> Dict[str, Any]:
+        """Keyword arguments passing a read's generation to cache.set, when there is one."""
+        return {} if generation is None else {"generation": generation}
+
+    def _cache_update(
+        self,
+        method: str,
+        kwargs: Dict[str, Any],
+        key: Optional[str],
+        result: Any,
+        generation: Optional[int] = None,
+    ) -> None:
+        """
+        Store a read result, or invalidate entities touched by a write.
+
+        A read result is dropped when its entities were invalidated after
+        generation (see MemoryCache), i.e. by a write while the read ran.
+        """
+        if self.cache is None:
+            return
+        if key is not None:
+            codes = self._cached_codes(method, kwargs, result)
+            self.cache.set(
+                key, result, self.cache.ttl_for(method), codes, **self._store_args(generation)
+            )
+        elif self._is_write_operation(method):
+            for code in self._touched_codes(method, kwargs, result):
+                self.cache.invalidate_code(code)
+
+    def _method_url(self, method: str) -> str:
+        """Build endpoint URL; the method is passed as a query parameter."""
+        return f"{self.api_url}/?m={method}"
+
+    def _parse_response(self, method: str, response: "httpx.Response") -> Any:
+        """
+        Validate HTTP response and extract JSON-RPC result.
+
         Raises:
-            EvaAPIError: If API returns an error or request fails
+            EvaAPIError: If API returns a JSON-RPC error
+            httpx.HTTPStatusError: If HTTP status is not successful
         """
-        self._check_write_operation(method)
-        
-        request_data = self._build_request(method, kwargs)
-        
-        logger.debug(f"API call: {method} with params: {kwargs}")
-        
-        try:
-            # Method is added as query parameter in URL
-            url_with_method = f"{self.api_url}/?m={method}"
-            response = self.client.post(url_with_method, json=request_data)
-            response.raise_for_status()
-            
+        if self.metrics is not None:
+            self._record_bytes(method, response)
+        response.raise_for_status()
+
+        with span("json.decode"):
             result = response.json()
-            
-            # Check for JSON-RPC error
-            if "error" in result:
-                error = result["error"]
-                raise EvaAPIError(
-                    message=error.get("message", "Unknown error"),
-                    code=error.get("code"),
-                    details=error
+
+        # Check for JSON-RPC error
+        if "error" in result:
+            raise self._rpc_error(result["error"])
+
+        logger.debug(f"API call successful: {method}")
+        return result.get("result")
+
+    def _record_bytes(self, method: str, response: "httpx.Response") -> None:
+        """Count one HTTP round trip with its request and response body sizes."""
+        self.metrics.record_request(method, len(response.request.content), len(response.content))
+
+    @staticmethod
+    def _http_attributes(request_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Span attributes of one HTTP request, including the JSON-RPC callid."""
+        return {"rpc.method": request_data["method"], "eva.callid": request_data["callid"]}
+
+    @staticmethod
+    def _batch_attributes(request_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Span attributes of one batch request: its size and the callid of every call."""
+        return {
+            "rpc.method": "batch",
+            "eva.batch_size": len(request_data),
+            "eva.callid": ",".join(item["callid"] for item in request_data),
+        }
+
+    def _http_error(self, error: "httpx.HTTPStatusError") -> EvaAPIError:
+        """Convert an HTTP status error, marking retryable statuses as transient."""
+        response = error.response
+        message = f"HTTP error: {response.status_code}"
+        details = {"response": str(error), "status": response.status_code}
+        if self.retry.is_retryable_status(response.status_code):
+            return EvaTransientError(
+                message,
+                status=response.status_code,
+                retry_after=parse_retry_after(response.headers.get("Retry-After")),
+                details=details,
+            )
+        return EvaAPIError(message, details=details)
+
+    def _check_circuit(self, method: str) -> None:
+        """
+        Fail fast while the circuit breaker is open.
+
+        Raises:
+            EvaCircuitOpenError: If the call must not be sent
+        """
+        if not self.breaker.allow():
+            raise EvaCircuitOpenError(
+                f"Eva API is unavailable (circuit open); '{method}' was not sent", code=-32002
+            )
+
+    def _record_outcome(self, error: Optional[Exception]) -> None:
+        """Feed the result of a request to the circuit breaker."""
+        if isinstance(error, EvaTransientError) or (
+            isinstance(error, EvaAPIError) and error.details.get("status", 0) >= 500
+        ):
+            self.breaker.record_failure()
+        else:
+            # Successful results and JSON-RPC errors both mean Eva is answering
+            self.breaker.record_success()
+
+    def _retry_delay(self, method: str, attempt: int, error: EvaAPIError) -> Optional[float]:
+        """Return seconds to wait before retrying a failed read call, or None to give up."""
+        if not isinstance(error, EvaTransientError) or not self._is_read_operation(method):
+            return None
+        delay = self.retry.next_delay(attempt, error.retry_after)
+        if delay is not None:
+            if self.metrics is not None:
+                self.metrics.record_retry(method)
+            logger.warning(f"Retrying {method} in {delay:.2f}s (attempt {attempt + 2}): {error}")
+        return delay
+
+    def stats(self) -> Dict[str, Any]:
+        """Return retry, circuit breaker, coalescing and cache counters."""
+        stats = {
+            "retry": self.retry.stats(),
+            "breaker": self.breaker.stats(),
+            "coalescing": self._inflight.stats(),
+            "rate_limit": self.limiter.stats(),
+            "bulkheads": self.bulkheads.stats(),
+        }
+        if self.cache is not None:
+            stats["cache"] = self.cache.stats()
+        return stats
+
+    @staticmethod
+    def _rpc_error(error: Dict[str, Any]) -> "EvaAPIError":
+        """Convert a JSON-RPC error object to EvaAPIError."""
+        return EvaAPIError(
+            message=error.get("message", "Unknown error"), code=error.get("code"), details=error
+        )
+
+    # JSON-RPC batch
+    def batch(self) -> Batch:
+        """
+        Start a batch of calls sent in one HTTP request.
+
+        If the endpoint does not accept JSON-RPC arrays (detected on the first
+        batch unless EVA_BATCH is set), the calls are sent as concurrent
+        individual requests instead.
+
+        Returns:
+            Batch usable as a context manager (async context manager on AsyncEvaClient)
+        """
+        return Batch(self)
+
+    def _run_batch(self, calls: List[BatchCall]):
+        """Execute batch calls; implemented by sync and async clients."""
+        raise NotImplementedError
+
+    def _prepare_batch(self, calls: List[BatchCall]) -> List[BatchCall]:
+        """Resolve cached calls and return those that still need a request."""
+        pending = []
+        for call in calls:
+            call.cache_generation = self._cache_generation()
+            call.cache_key, cached = self._cache_lookup(call.method, call.kwargs)
+            if cached is not MISSING:
+                call.set_result(cached)
+            else:
+                pending.append(call)
+        return pending
+
+    def _batch_request(self, calls: List[BatchCall]) -> List[Dict[str, Any]]:
+        """Build the JSON-RPC array for pending calls, keeping their callids."""
+        return [
+            dict(self._build_request(call.method, call.kwargs), callid=call.callid)
+            for call in calls
+        ]
+
+    def _fail_batch(
+        self, calls: List[BatchCall], error: Exception
+    ) -> Tuple[List[BatchCall], float]:
+        """
+        Handle a batch that could not be sent.
+
+        Returns:
+            Calls to send individually and seconds to wait first (see _batch_failed)
+        """
+        import httpx
+
+        if isinstance(error, httpx.RequestError):
+            logger.error(f"Request error: {error}")
+            error = EvaTransientError(f"Request error: {str(error)}")
+            self._record_outcome(error)
+            return self._batch_failed(calls, error)
+        for call in calls:
+            call.set_error(error)
+        return [], 0.0
+
+    def _batch_failed(
+        self, calls: List[BatchCall], error: EvaTransientError
+    ) -> Tuple[List[BatchCall], float]:
+        """
+        Decide what happens to the calls of a batch that failed transiently.
+
+        While batch support is still unknown every call is sent individually:
+        the failure says nothing about arrays. Otherwise writes fail with the
+        error, as they would when sent alone, and reads are sent again
+        individually after the retry policy's backoff, or fail too if the
+        policy allows no retry.
+
+        Returns:
+            Calls to send individually and seconds to wait first
+        """
+        if self._batch_supported is None:
+            return calls, 0.0
+        reads = [call for call in calls if self._is_read_operation(call.method)]
+        delay = self.retry.next_delay(0, error.retry_after) if reads else None
+        retried = reads if delay is not None else []
+        for call in calls:
+            if call not in retried:
+                call.set_error(error)
+        if retried:
+            logger.warning(f"Batch failed ({error}); retrying {len(retried)} read(s) individually")
+        return retried, delay or 0.0
+
+    def _resolve_batch(
+        self, calls: List[BatchCall], response: "httpx.Response"
+    ) -> Tuple[List[BatchCall], float]:
+        """
+        Match batch response items to calls by callid.
+
+        A 4xx or a well-formed reply that is not an array means the endpoint
+        does not accept batches. 5xx, retryable statuses and unreadable bodies
+        are transient and handled by _batch_failed.
+
+        Returns:
+            Calls still to be sent individually (empty once every call is
+            resolved) and seconds to wait before sending them
+        """
+        if self.metrics is not None:
+            self._record_bytes("batch", response)
+        status = response.status_code
+        if status >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        if status >= 500 or self.retry.is_retryable_status(status):
+            error = EvaTransientError(
+                f"Batch request failed: HTTP {status}",
+                status=status,
+                retry_after=parse_retry_after(response.headers.get("Retry-After")),
+                details={"response": response.text, "status": status},
+            )
+            return self._batch_failed(calls, error)
+        try:
+            items = response.json() if response.is_success else None
+        except ValueError:
+            error = EvaTransientError(
+                "Batch response is not valid JSON", details={"response": response.text}
+            )
+            return self._batch_failed(calls, error)
+
+        if not isinstance(items, list):
+            if self._batch_supported is None:
+                logger.info(
+                    "Eva endpoint does not accept JSON-RPC batches; using individual requests"
                 )
-            
-            logger.debug(f"API call successful: {method}")
-            return result.get("result")
-            
-        except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error: {e}")
-            raise EvaAPIError(f"HTTP error: {e.response.status_code}", details={"response": str(e)})
-        except httpx.RequestError as e:
-            logger.error(f"Request error: {e}")
-            raise EvaAPIError(f"Request error: {str(e)}")
-        except Exception as e:
-            logger.error(f"Unexpected error: {e}")
-            raise EvaAPIError(f"Unexpected error: {str(e)}")
-    
+                self._batch_supported = False
+                return calls, 0.0
+            error = EvaAPIError(
+                f"Batch request failed: HTTP {status}",
+                details={"response": response.text},
+            )
+            for call in calls:
+                call.set_error(error)
+            return [], 0.0
+
+        self._batch_supported = True
+        by_callid = {
+            item.get("callid", item.get("id")): item for item in items if isinstance(item, dict)
+        }
+        for call in calls:
+            item = by_callid.get(call.callid)
+            if item is None:
+                call.set_error(
+                    EvaAPIError(
+                        f"No response for {call.method} in batch", details={"callid": call.callid}
+                    )
+                )
+            elif "error" in item:
+                call.set_error(self._rpc_error(item["error"]))
+            else:
+                self._cache_update(
+                    call.method,
+                    call.kwargs,
+                    call.cache_key,
+                    item.get("result"),
+                    call.cache_generation,
+                )
+                call.set_result(item.get("result"))
+        logger.debug(f"Batch of {len(calls)} calls successful")
+        return [], 0.0
+
     # Task operations
-    def get_task(self, code: str) -> Dict[str, Any]:
-        """Get task by code."""
+    def get_task(self, code: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get task by code, optionally limited to the given fields."""
+        if fields:
+            return self.call("CmfTask.get", code=code, fields=fields)
         return self.call("CmfTask.get", code=code)
-    
+
     def list_tasks(
         self,
         filters: Optional[List[List[Any]]] = None,
@@ -170,10 +565,7 @@ class EvaClient:
         include_archived: bool = False,
     ) -> List[Dict[str, Any]]:
         """List tasks with optional filters."""
-        params = {
-            "slice": [offset, offset + limit],
-            "include_archived": include_archived
-        }
+        params = {"slice": [offset, offset + limit], "include_archived": include_archived}
         if filters:
             params["filter"] = filters
         if fields:
@@ -181,14 +573,20 @@ class EvaClient:
         if order_by:
             params["order_by"] = order_by
         return self.call("CmfTask.list", **params)
-    
-    def count_tasks(self, filters: Optional[List[List[Any]]] = None) -> int:
+
+    def count_tasks(
+        self,
+        filters: Optional[List[List[Any]]] = None,
+        include_archived: Optional[bool] = None,
+    ) -> int:
         """Count tasks with optional filters."""
         params = {}
         if filters:
             params["filter"] = filters
+        if include_archived is not None:
+            params["include_archived"] = include_archived
         return self.call("CmfTask.count", **params)
-    
+
     def create_task(
         self,
         name: str,
@@ -196,11 +594,11 @@ class EvaClient:
         lists: Optional[List[str]] = None,
         text: Optional[str] = None,
         responsible: Optional[str] = None,
-        **kwargs
+        **kwargs,
     ) -> Dict[str, Any]:
         """Create a new task."""
         params = {"name": name}
-        
+
         if parent:
             params["parent"] = parent
         if lists:
@@ -211,22 +609,25 @@ class EvaClient:
             params["responsible"] = responsible
         params.update(kwargs)
         return self.call("CmfTask.create", **params)
-    
+
     def update_task(self, code: str, **kwargs) -> Dict[str, Any]:
         """Update an existing task."""
         return self.call("CmfTask.update", code=code, **kwargs)
-    
+
     # Project operations
-    def get_project(self, code: str) -> Dict[str, Any]:
-        """Get project by code."""
+    def get_project(self, code: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get project by code, optionally limited to the given fields."""
+        if fields:
+            return self.call("CmfProject.get", code=code, fields=fields)
         return self.call("CmfProject.get", code=code)
-    
+
     def list_projects(
         self,
         filters: Optional[List[List[Any]]] = None,
         limit: int = 50,
         offset: int = 0,
         fields: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None,
     ) -> List[Dict[str, Any]]:
         """List projects with optional filters."""
         params = {"slice": [offset, offset + limit]}
@@ -234,26 +635,31 @@ class EvaClient:
             params["filter"] = filters
         if fields:
             params["fields"] = fields
+        if order_by:
+            params["order_by"] = order_by
         return self.call("CmfProject.list", **params)
-    
+
     def count_projects(self, filters: Optional[List[List[Any]]] = None) -> int:
         """Count projects with optional filters."""
         params = {}
         if filters:
             params["filter"] = filters
         return self.call("CmfProject.count", **params)
-    
+
     # User operations
-    def get_user(self, code: str) -> Dict[str, Any]:
-        """Get user by code."""
+    def get_user(self, code: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get user by code, optionally limited to the given fields."""
+        if fields:
+            return self.call("CmfPerson.get", code=code, fields=fields)
         return self.call("CmfPerson.get", code=code)
-    
+
     def list_users(
         self,
         filters: Optional[List[List[Any]]] = None,
         limit: int = 50,
         offset: int = 0,
         fields: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None,
     ) -> List[Dict[str, Any]]:
         """List users with optional filters."""
         params = {"slice": [offset, offset + limit]}
@@ -261,19 +667,31 @@ class EvaClient:
             params["filter"] = filters
         if fields:
             params["fields"] = fields
+        if order_by:
+            params["order_by"] = order_by
         return self.call("CmfPerson.list", **params)
-    
+
+    def count_users(self, filters: Optional[List[List[Any]]] = None) -> int:
+        """Count users with optional filters."""
+        params = {}
+        if filters:
+            params["filter"] = filters
+        return self.call("CmfPerson.count", **params)
+
     # Document operations
-    def get_document(self, code: str) -> Dict[str, Any]:
-        """Get document by code."""
+    def get_document(self, code: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get document by code, optionally limited to the given fields."""
+        if fields:
+            return self.call("CmfDocument.get", code=code, fields=fields)
         return self.call("CmfDocument.get", code=code)
-    
+
     def list_documents(
         self,
         filters: Optional[List[List[Any]]] = None,
         limit: int = 50,
         offset: int = 0,
         fields: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None,
     ) -> List[Dict[str, Any]]:
         """List documents with optional filters."""
         params = {"slice": [offset, offset + limit]}
@@ -281,8 +699,17 @@ class EvaClient:
             params["filter"] = filters
         if fields:
             params["fields"] = fields
+        if order_by:
+            params["order_by"] = order_by
         return self.call("CmfDocument.list", **params)
-    
+
+    def count_documents(self, filters: Optional[List[List[Any]]] = None) -> int:
+        """Count documents with optional filters."""
+        params = {}
+        if filters:
+            params["filter"] = filters
+        return self.call("CmfDocument.count", **params)
+
     # Comment operations
     def list_comments(
         self,
@@ -290,6 +717,7 @@ class EvaClient:
         limit: int = 50,
         offset: int = 0,
         fields: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None,
     ) -> List[Dict[str, Any]]:
         """List comments with optional filters."""
         params = {"slice": [offset, offset + limit]}
@@ -297,14 +725,18 @@ class EvaClient:
             params["filter"] = filters
         if fields:
             params["fields"] = fields
+        if order_by:
+            params["order_by"] = order_by
         return self.call("CmfComment.list", **params)
-    
-    def create_comment(
-        self,
-        parent: str,
-        text: str,
-        **kwargs
-    ) -> Dict[str, Any]:
+
+    def count_comments(self, filters: Optional[List[List[Any]]] = None) -> int:
+        """Count comments with optional filters."""
+        params = {}
+        if filters:
+            params["filter"] = filters
+        return self.call("CmfComment.count", **params)
+
+    def create_comment(self, parent: str, text: str, **kwargs) -> Dict[str, Any]:
         """Create a new comment."""
         params = {
             "parent": parent,
@@ -312,12 +744,14 @@ class EvaClient:
         }
         params.update(kwargs)
         return self.call("CmfComment.create", **params)
-    
+
     # List/Sprint operations
-    def get_list(self, code: str) -> Dict[str, Any]:
-        """Get list/sprint by code."""
+    def get_list(self, code: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get list/sprint by code, optionally limited to the given fields."""
+        if fields:
+            return self.call("CmfList.get", code=code, fields=fields)
         return self.call("CmfList.get", code=code)
-    
+
     def create_list(self, name: str, parent: str, **kwargs) -> Dict[str, Any]:
         """Create a new list/sprint under a project.
 
@@ -326,13 +760,14 @@ class EvaClient:
         params = {"name": name, "parent": parent}
         params.update(kwargs)
         return self.call("CmfList.create", **params)
-    
+
     def list_lists(
         self,
         filters: Optional[List[List[Any]]] = None,
         limit: int = 50,
         offset: int = 0,
         fields: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None,
     ) -> List[Dict[str, Any]]:
         """List all lists/sprints with optional filters."""
         params = {"slice": [offset, offset + limit]}
@@ -340,8 +775,17 @@ class EvaClient:
             params["filter"] = filters
         if fields:
             params["fields"] = fields
+        if order_by:
+            params["order_by"] = order_by
         return self.call("CmfList.list", **params)
-    
+
+    def count_lists(self, filters: Optional[List[List[Any]]] = None) -> int:
+        """Count lists/sprints with optional filters."""
+        params = {}
+        if filters:
+            params["filter"] = filters
+        return self.call("CmfList.count", **params)
+
     # Audit operations
     def list_audit(
         self,
@@ -349,6 +793,7 @@ class EvaClient:
         limit: int = 50,
         offset: int = 0,
         fields: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None,
     ) -> List[Dict[str, Any]]:
         """List audit log entries with optional filters."""
         params = {"slice": [offset, offset + limit]}
@@ -356,17 +801,1118 @@ class EvaClient:
             params["filter"] = filters
         if fields:
             params["fields"] = fields
+        if order_by:
+            params["order_by"] = order_by
         return self.call("CmfAudit.list", **params)
-    
-    def close(self):
-        """Close the HTTP client."""
-        self.client.close()
-    
-    def __enter__(self):
-        """Context manager entry."""
-        return self
-    
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit."""
-        self.close()
 
+    def count_audit(self, filters: Optional[List[List[Any]]] = None) -> int:
+        """Count audit log entries with optional filters."""
+        params = {}
+        if filters:
+            params["filter"] = filters
+        return self.call("CmfAudit.count", **params)
+
+    # Generic operations for entities without dedicated methods
+    def get_object(
+        self, entity: str, code: str, fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Get an object of any entity (e.g., "CmfAttachment") by code."""
+        if fields:
+            return self.call(f"{entity}.get", code=code, fields=fields)
+        return self.call(f"{entity}.get", code=code)
+
+    def list_objects(
+        self,
+        entity: str,
+        filters: Optional[List[List[Any]]] = None,
+        limit: int = 50,
+        offset: int = 0,
+        fields: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """List objects of any entity with optional filters."""
+        params = {"slice": [offset, offset + limit]}
+        if filters:
+            params["filter"] = filters
+        if fields:
+            params["fields"] = fields
+        if order_by:
+            params["order_by"] = order_by
+        return self.call(f"{entity}.list", **params)
+
+    def count_objects(self, entity: str, filters: Optional[List[List[Any]]] = None) -> int:
+        """Count objects of any entity with optional filters."""
+        params = {}
+        if filters:
+            params["filter"] = filters
+        return self.call(f"{entity}.count", **params)
+
+    # Auto-pagination
+    def _iterate(self, list_method, page_size: int, max_items: Optional[int], **kwargs):
+        """Walk slice windows of a list method; implemented by sync and async clients."""
+        raise NotImplementedError
+
+    def iter_tasks(
+        self,
+        filters: Optional[List[List[Any]]] = None,
+        page_size: int = 100,
+        max_items: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None,
+        include_archived: bool = False,
+    ):
+        """
+        Iterate over all tasks matching filters, fetching one page at a time.
+
+        Args:
+            filters: Task filters
+            page_size: Number of rows requested per API call
+            max_items: Stop after this many rows (default: no limit)
+            fields: Fields to return
+            order_by: Sort order; a stable order avoids rows shifting between pages
+            include_archived: Include archived tasks
+
+        Returns:
+            Generator (EvaClient) or async generator (AsyncEvaClient) of tasks
+        """
+        return self._iterate(
+            self.list_tasks,
+            page_size,
+            max_items,
+            filters=filters,
+            fields=fields,
+            order_by=order_by,
+            include_archived=include_archived,
+        )
+
+    def iter_projects(
+        self,
+        filters: Optional[List[List[Any]]] = None,
+        page_size: int = 100,
+        max_items: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None,
+    ):
+        """Iterate over all projects matching filters (see iter_tasks)."""
+        return self._iterate(
+            self.list_projects,
+            page_size,
+            max_items,
+            filters=filters,
+            fields=fields,
+            order_by=order_by,
+        )
+
+    def iter_users(
+        self,
+        filters: Optional[List[List[Any]]] = None,
+        page_size: int = 100,
+        max_items: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None,
+    ):
+        """Iterate over all users matching filters (see iter_tasks)."""
+        return self._iterate(
+            self.list_users, page_size, max_items, filters=filters, fields=fields, order_by=order_by
+        )
+
+    def iter_documents(
+        self,
+        filters: Optional[List[List[Any]]] = None,
+        page_size: int = 100,
+        max_items: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None,
+    ):
+        """Iterate over all documents matching filters (see iter_tasks)."""
+        return self._iterate(
+            self.list_documents,
+            page_size,
+            max_items,
+            filters=filters,
+            fields=fields,
+            order_by=order_by,
+        )
+
+    def iter_comments(
+        self,
+        filters: Optional[List[List[Any]]] = None,
+        page_size: int = 100,
+        max_items: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None,
+    ):
+        """Iterate over all comments matching filters (see iter_tasks)."""
+        return self._iterate(
+            self.list_comments,
+            page_size,
+            max_items,
+            filters=filters,
+            fields=fields,
+            order_by=order_by,
+        )
+
+    def iter_lists(
+        self,
+        filters: Optional[List[List[Any]]] = None,
+        page_size: int = 100,
+        max_items: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None,
+    ):
+        """Iterate over all lists/sprints matching filters (see iter_tasks)."""
+        return self._iterate(
+            self.list_lists, page_size, max_items, filters=filters, fields=fields, order_by=order_by
+        )
+
+    def iter_audit(
+        self,
+        filters: Optional[List[List[Any]]] = None,
+        page_size: int = 100,
+        max_items: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None,
+    ):
+        """Iterate over all audit log entries matching filters (see iter_tasks)."""
+        return self._iterate(
+            self.list_audit, page_size, max_items, filters=filters, fields=fields, order_by=order_by
+        )
+
+    # Parallel bulk fetch
+    def _fetch_all(
+        self,
+        list_method,
+        count_method,
+        filters,
+        page_size: int,
+        max_concurrency: int,
+        count_kwargs: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ):
+        """Count, fetch slices concurrently and merge; implemented by sync and async clients."""
+        raise NotImplementedError
+
+    @staticmethod
+    def _plan_slices(count: int, page_size: int) -> List[int]:
+        """Return offsets of slice windows covering count rows."""
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+        return list(range(0, count, page_size))
+
+    @staticmethod
+    def _merge_pages(pages: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Concatenate pages in order, dropping rows repeated after shifting between slices."""
+        rows = []
+        seen = set()
+        for page in pages:
+            for row in page:
+                key = row.get("code") or row.get("id") if isinstance(row, dict) else None
+                if key is not None:
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                rows.append(row)
+        return rows
+
+    def fetch_all_tasks(
+        self,
+        filters: Optional[List[List[Any]]] = None,
+        page_size: int = 200,
+        max_concurrency: int = 8,
+        fields: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None,
+        include_archived: bool = False,
+    ):
+        """
+        Fetch every task matching filters using concurrent slice requests.
+
+        The total is counted first, then all slice windows are requested in
+        parallel (at most max_concurrency at a time) and reassembled in order.
+        If the row count changes while fetching, missing rows are recovered with
+        a sequential pass and duplicates are dropped by code.
+
+        Args:
+            filters: Task filters
+            page_size: Number of rows per slice request
+            max_concurrency: Maximum number of slice requests in flight
+            fields: Fields to return
+            order_by: Sort order (default: by creation time, so new rows land at the end)
+            include_archived: Include archived tasks
+
+        Returns:
+            List of tasks (awaitable on AsyncEvaClient)
+        """
+        return self._fetch_all(
+            self.list_tasks,
+            self.count_tasks,
+            filters,
+            page_size,
+            max_concurrency,
+            count_kwargs={"include_archived": include_archived},
+            fields=fields,
+            order_by=order_by or DEFAULT_FETCH_ORDER,
+            include_archived=include_archived,
+        )
+
+    def fetch_all_projects(
+        self,
+        filters: Optional[List[List[Any]]] = None,
+        page_size: int = 200,
+        max_concurrency: int = 8,
+        fields: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None,
+    ):
+        """Fetch every project matching filters with concurrent slices (see fetch_all_tasks)."""
+        return self._fetch_all(
+            self.list_projects,
+            self.count_projects,
+            filters,
+            page_size,
+            max_concurrency,
+            fields=fields,
+            order_by=order_by or DEFAULT_FETCH_ORDER,
+        )
+
+    def fetch_all_users(
+        self,
+        filters: Optional[List[List[Any]]] = None,
+        page_size: int = 200,
+        max_concurrency: int = 8,
+        fields: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None,
+    ):
+        """Fetch every user matching filters with concurrent slices (see fetch_all_tasks)."""
+        return self._fetch_all(
+            self.list_users,
+            self.count_users,
+            filters,
+            page_size,
+            max_concurrency,
+            fields=fields,
+            order_by=order_by or DEFAULT_FETCH_ORDER,
+        )
+
+    def fetch_all_documents(
+        self,
+        filters: Optional[List[List[Any]]] = None,
+        page_size: int = 200,
+        max_concurrency: int = 8,
+        fields: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None,
+    ):
+        """Fetch every document matching filters with concurrent slices (see fetch_all_tasks)."""
+        return self._fetch_all(
+            self.list_documents,
+            self.count_documents,
+            filters,
+            page_size,
+            max_concurrency,
+            fields=fields,
+            order_by=order_by or DEFAULT_FETCH_ORDER,
+        )
+
+    def fetch_all_comments(
+        self,
+        filters: Optional[List[List[Any]]] = None,
+        page_size: int = 200,
+        max_concurrency: int = 8,
+        fields: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None,
+    ):
+        """Fetch every comment matching filters with concurrent slices (see fetch_all_tasks)."""
+        return self._fetch_all(
+            self.list_comments,
+            self.count_comments,
+            filters,
+            page_size,
+            max_concurrency,
+            fields=fields,
+            order_by=order_by or DEFAULT_FETCH_ORDER,
+        )
+
+    def fetch_all_lists(
+        self,
+        filters: Optional[List[List[Any]]] = None,
+        page_size: int = 200,
+        max_concurrency: int = 8,
+        fields: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None,
+    ):
+        """Fetch every list/sprint matching filters with concurrent slices (see fetch_all_tasks)."""
+        return self._fetch_all(
+            self.list_lists,
+            self.count_lists,
+            filters,
+            page_size,
+            max_concurrency,
+            fields=fields,
+            order_by=order_by or DEFAULT_FETCH_ORDER,
+        )
+
+    def fetch_all_audit(
+        self,
+        filters: Optional[List[List[Any]]] = None,
+        page_size: int = 200,
+        max_concurrency: int = 8,
+        fields: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None,
+    ):
+        """Fetch every audit entry matching filters with concurrent slices (see fetch_all_tasks)."""
+        return self._fetch_all(
+            self.list_audit,
+            self.count_audit,
+            filters,
+            page_size,
+            max_concurrency,
+            fields=fields,
+            order_by=order_by or DEFAULT_FETCH_ORDER,
+        )
+
+    # Batch get
+    def _get_many(self, list_method, codes: List[str], chunk_size: int, **kwargs):
+        """Resolve codes with chunked `in` list calls; implemented by sync and async clients."""
+        raise NotImplementedError
+
+    @staticmethod
+    def _plan_chunks(codes: List[str], chunk_size: int) -> List[List[str]]:
+        """Split unique codes, in first-seen order, into chunks of at most chunk_size."""
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        unique = list(dict.fromkeys(codes))
+        return [unique[i : i + chunk_size] for i in range(0, len(unique), chunk_size)]
+
+    @staticmethod
+    def _batch_fields(fields: Optional[List[str]]) -> Optional[List[str]]:
+        """Make sure projected rows still carry the code used to match them."""
+        if fields and "code" not in fields:
+            return ["code"] + list(fields)
+        return fields
+
+    @staticmethod
+    def _match_codes(
+        codes: List[str], pages: List[List[Dict[str, Any]]]
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Map every requested code to its row, or None when it was not returned."""
+        rows = {}
+        for page in pages:
+            for row in page:
+                if isinstance(row, dict) and row.get("code") is not None:
+                    rows.setdefault(row["code"], row)
+        return {code: rows.get(code) for code in dict.fromkeys(codes)}
+
+    def get_many_tasks(
+        self,
+        codes: List[str],
+        fields: Optional[List[str]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        """
+        Get several tasks by code with as few requests as possible.
+
+        Codes are deduplicated and resolved with one CmfTask.list call per
+        chunk_size codes using a ["code", "in", [...]] filter, instead of one
+        CmfTask.get call per code. Archived tasks are included, as with get_task.
+
+        Args:
+            codes: Task codes
+            fields: Fields to return ("code" is always added)
+            chunk_size: Maximum number of codes per list request
+
+        Returns:
+            Dict mapping each requested code, in request order, to its task or
+            None if not found (awaitable on AsyncEvaClient)
+        """
+        return self._get_many(
+            self.list_tasks,
+            codes,
+            chunk_size,
+            fields=self._batch_fields(fields),
+            include_archived=True,
+        )
+
+    def get_many_projects(
+        self,
+        codes: List[str],
+        fields: Optional[List[str]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        """Get several projects by code with chunked `in` list calls (see get_many_tasks)."""
+        return self._get_many(
+            self.list_projects, codes, chunk_size, fields=self._batch_fields(fields)
+        )
+
+    def get_many_users(
+        self,
+        codes: List[str],
+        fields: Optional[List[str]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        """Get several users by code with chunked `in` list calls (see get_many_tasks)."""
+        return self._get_many(self.list_users, codes, chunk_size, fields=self._batch_fields(fields))
+
+
+class EvaClient(_BaseEvaClient):
+    """Client for interacting with Eva-project API using JSON-RPC 2.0."""
+
+    def __init__(
+        self,
+        api_url: Optional[str] = None,
+        api_token: Optional[str] = None,
+        read_only: Optional[bool] = None,
+        timeout: int = 30,
+        cache: Optional[MemoryCache] = None,
+        coalesce: bool = True,
+        batch_mode: Optional[str] = None,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        limiter: Optional[RateLimiter] = None,
+        metrics: Optional[Metrics] = None,
+    ):
+        super().__init__(
+            api_url=api_url,
+            api_token=api_token,
+            read_only=read_only,
+            timeout=timeout,
+            cache=cache,
+            coalesce=coalesce,
+            batch_mode=batch_mode,
+            retry=retry,
+            breaker=breaker,
+            limiter=limiter,
+            metrics=metrics,
+        )
+
+        import httpx
+
+        self.client = httpx.Client(**self._client_options())
+        self._inflight = SingleFlight()
+        self.bulkheads = Bulkheads()
+
+        logger.info(f"Eva client initialized (read_only={self.read_only}, url={self.api_url})")
+
+    def call(self, method: str, **kwargs) -> Any:
+        """
+        Make a JSON-RPC API call.
+
+        Args:
+            method: API method name (e.g., "CmfTask.get")
+            **kwargs: Method parameters
+
+        Returns:
+            API response result
+
+        Raises:
+            EvaAPIError: If API returns an error or request fails
+        """
+        with span("EvaClient.call", {"rpc.method": method}):
+            if self.metrics is None:
+                return self._call(method, kwargs)
+            started = time.perf_counter()
+            try:
+                result = self._call(method, kwargs)
+            except EvaAPIError as e:
+                self.metrics.observe_call(method, time.perf_counter() - started, e)
+                raise
+            self.metrics.observe_call(method, time.perf_counter() - started)
+            return result
+
+    def _call(self, method: str, kwargs: Dict[str, Any]) -> Any:
+        """Serve a call from the cache, a coalesced in-flight request or a new request."""
+        self._check_write_operation(method)
+
+        cache_key, cached = self._cache_lookup(method, kwargs)
+        if cached is not MISSING:
+            logger.debug(f"API call served from cache: {method}")
+            return cached
+
+        if self.coalesce and self._is_read_operation(method):
+            generation, result = self._inflight.do(
+                cache_key or make_key(method, kwargs), lambda: self._fetch(method, kwargs)
+            )
+        else:
+            generation, result = self._fetch(method, kwargs)
+        self._cache_update(method, kwargs, cache_key, result, generation)
+        return result
+
+    def _fetch(self, method: str, kwargs: Dict[str, Any]) -> Tuple[Optional[int], Any]:
+        """Send a call, returning the cache generation taken before it with the result."""
+        generation = self._cache_generation()
+        return generation, self._send(method, kwargs)
+
+    def _send(self, method: str, kwargs: Dict[str, Any]) -> Any:
+        """Send a request through the circuit breaker, retrying transient read failures."""
+        attempt = 0
+        while True:
+            self._check_circuit(method)
+            try:
+                with self._admit(method):
+                    result = self._post(method, kwargs)
+            except EvaAPIError as e:
+                self._record_outcome(e)
+                delay = self._retry_delay(method, attempt, e)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                # Interrupted or failed before Eva answered: free a half-open probe slot
+                self.breaker.release()
+                raise
+            self._record_outcome(None)
+            return result
+
+    @contextmanager
+    def _admit(self, *methods: str):
+        """
+        Hold a bulkhead slot and wait for rate limiter capacity before a request.
+
+        A batch passes the method of every call it carries, taking one token each.
+        """
+        with self.bulkheads.slot(current_pool()):
+            delay = max(self.limiter.reserve(method) for method in methods)
+            if delay > 0:
+                time.sleep(delay)
+            yield
+
+    def _post(self, method: str, kwargs: Dict[str, Any]) -> Any:
+        """Send a JSON-RPC request over HTTP and return its result."""
+        import httpx
+
+        request_data = self._build_request(method, kwargs)
+
+        logger.debug(f"API call: {method} with params: {kwargs}")
+
+        try:
+            with span("http.post", self._http_attributes(request_data), KIND_CLIENT) as http:
+                response = self.client.post(self._method_url(method), json=request_data)
+                http.set_attribute("http.status_code", response.status_code)
+            return self._parse_response(method, response)
+
+        except EvaAPIError:
+            raise
+        except httpx.HTTPStatusError as e:
+            logger.error(f"HTTP error: {e}")
+            raise self._http_error(e)
+        except httpx.RequestError as e:
+            logger.error(f"Request error: {e}")
+            raise EvaTransientError(f"Request error: {str(e)}")
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+            raise EvaAPIError(f"Unexpected error: {str(e)}")
+
+    def _iterate(
+        self, list_method, page_size: int, max_items: Optional[int], **kwargs
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield rows page by page until a short page or max_items is reached."""
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+        offset = 0
+        while max_items is None or offset < max_items:
+            limit = page_size if max_items is None else min(page_size, max_items - offset)
+            with bulk():
+                page = list_method(limit=limit, offset=offset, **kwargs)
+            yield from page
+            if len(page) < limit:
+                return
+            offset += limit
+
+    def _fetch_all(
+        self,
+        list_method,
+        count_method,
+        filters,
+        page_size: int,
+        max_concurrency: int,
+        count_kwargs: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """Count, fetch slices on a thread pool and merge them in order."""
+        with bulk():
+            count = count_method(filters=filters, **(count_kwargs or {}))
+            offsets = self._plan_slices(count, page_size)
+
+            def fetch(offset: int) -> List[Dict[str, Any]]:
+                return list_method(filters=filters, limit=page_size, offset=offset, **kwargs)
+
+            workers = max(1, min(max_concurrency, len(offsets) or 1))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                # Worker threads do not inherit context variables, so pass the bulk flag along
+                futures = [
+                    pool.submit(contextvars.copy_context().run, fetch, offset) for offset in offsets
+                ]
+                pages = [future.result() for future in futures]
+            rows = self._merge_pages(pages)
+
+            recount = count_method(filters=filters, **(count_kwargs or {}))
+        if len(rows) != recount:
+            logger.warning(
+                f"Result set changed during bulk fetch ({count} -> {recount} rows, "
+                f"got {len(rows)}); re-reading sequentially"
+            )
+            rows = self._merge_pages(
+                [list(self._iterate(list_method, page_size, None, filters=filters, **kwargs))]
+            )
+        return rows
+
+    def _run_batch(self, calls: List[BatchCall]) -> List[BatchCall]:
+        """Send pending calls as one JSON-RPC array, or individually if unsupported."""
+        import httpx
+
+        pending = self._prepare_batch(calls)
+        if len(pending) > 1 and self._batch_supported is not False:
+            logger.debug(f"API batch: {[call.method for call in pending]}")
+            try:
+                self._check_circuit("batch")
+                request_data = self._batch_request(pending)
+                # Every call in the array takes its own rate limiter token
+                with self._admit(*(call.method for call in pending)):
+                    with span("http.post", self._batch_attributes(request_data), KIND_CLIENT):
+                        response = self.client.post(self._method_url("batch"), json=request_data)
+            except (EvaAPIError, httpx.RequestError) as e:
+                pending, delay = self._fail_batch(pending, e)
+            except BaseException:
+                self.breaker.release()
+                raise
+            else:
+                pending, delay = self._resolve_batch(pending, response)
+            if delay > 0:
+                time.sleep(delay)
+
+        def send(call: BatchCall) -> None:
+            try:
+                call.set_result(self.call(call.method, **call.kwargs))
+            except EvaAPIError as e:
+                call.set_error(e)
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(len(pending), 8)) as pool:
+                list(pool.map(send, pending))
+        return calls
+
+    def _get_many(
+        self, list_method, codes: List[str], chunk_size: int, **kwargs
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Resolve codes with one `in` list call per chunk."""
+        pages = [
+            list_method(filters=[["code", "in", chunk]], limit=len(chunk), **kwargs)
+            for chunk in self._plan_chunks(codes, chunk_size)
+        ]
+        return self._match_codes(codes, pages)
+
+    def warm_up(self) -> None:
+        """Open a pooled connection (DNS, TCP, TLS) before the first call; errors are ignored."""
+        import httpx
+
+        try:
+            self.client.head(self.api_url)
+        except httpx.HTTPError as e:
+            logger.debug(f"Connection warm-up failed: {e}")
+
+    def close(self):
+        """Close the HTTP client."""
+        self.client.close()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+
+class AsyncEvaClient(_BaseEvaClient):
+    """
+    Asyncio client for Eva-project API built on httpx.AsyncClient.
+
+    Exposes the same methods as :class:`EvaClient`; each of them must be awaited.
+    Optionally hedges slow read requests (see :class:`hedging.HedgePolicy`): the
+    ``hedging`` argument, or EVA_HEDGE=true, enables it.
+    """
+
+    def __init__(
+        self,
+        api_url: Optional[str] = None,
+        api_token: Optional[str] = None,
+        read_only: Optional[bool] = None,
+        timeout: int = 30,
+        cache: Optional[MemoryCache] = None,
+        coalesce: bool = True,
+        batch_mode: Optional[str] = None,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        limiter: Optional[RateLimiter] = None,
+        hedging: Optional[HedgePolicy] = None,
+        metrics: Optional[Metrics] = None,
+    ):
+        super().__init__(
+            api_url=api_url,
+            api_token=api_token,
+            read_only=read_only,
+            timeout=timeout,
+            cache=cache,
+            coalesce=coalesce,
+            batch_mode=batch_mode,
+            retry=retry,
+            breaker=breaker,
+            limiter=limiter,
+            metrics=metrics,
+        )
+
+        import httpx
+
+        self.client = httpx.AsyncClient(**self._client_options())
+        self._inflight = AsyncSingleFlight()
+        self.bulkheads = AsyncBulkheads()
+        self.hedging = hedging if hedging is not None else HedgePolicy.from_env()
+
+        logger.info(
+            f"Async Eva client initialized (read_only={self.read_only}, url={self.api_url})"
+        )
+
+    async def call(self, method: str, **kwargs) -> Any:
+        """
+        Make a JSON-RPC API call without blocking the event loop.
+
+        Args:
+            method: API method name (e.g., "CmfTask.get")
+            **kwargs: Method parameters
+
+        Returns:
+            API response result
+
+        Raises:
+            EvaAPIError: If API returns an error or request fails
+        """
+        with span("AsyncEvaClient.call", {"rpc.method": method}):
+            if self.metrics is None:
+                return await self._call(method, kwargs)
+            started = time.perf_counter()
+            try:
+                result = await self._call(method, kwargs)
+            except EvaAPIError as e:
+                self.metrics.observe_call(method, time.perf_counter() - started, e)
+                raise
+            self.metrics.observe_call(method, time.perf_counter() - started)
+            return result
+
+    async def _call(self, method: str, kwargs: Dict[str, Any]) -> Any:
+        """Serve a call from the cache, a coalesced in-flight request or a new request."""
+        self._check_write_operation(method)
+
+        cache_key, cached = await self._async_cache_lookup(method, kwargs)
+        if cached is not MISSING:
+            logger.debug(f"API call served from cache: {method}")
+            return cached
+
+        if self.coalesce and self._is_read_operation(method):
+            generation, result = await self._inflight.do(
+                cache_key or make_key(method, kwargs), lambda: self._fetch(method, kwargs)
+            )
+        else:
+            generation, result = await self._fetch(method, kwargs)
+        await self._async_cache_update(method, kwargs, cache_key, result, generation)
+        return result
+
+    async def _fetch(self, method: str, kwargs: Dict[str, Any]) -> Tuple[Optional[int], Any]:
+        """Send a call, returning the cache generation taken before it with the result."""
+        generation = self._cache_generation()
+        return generation, await self._send(method, kwargs)
+
+    def _disk_cache(self) -> bool:
+        """Check whether the cache has a persistent tier that must be used off the event loop."""
+        return hasattr(self.cache, "aget")
+
+    async def _async_cache_lookup(self, method: str, kwargs: Dict[str, Any]):
+        """Look up a read call like _cache_lookup without blocking the event loop on disk."""
+        if not self._disk_cache():
+            return self._cache_lookup(method, kwargs)
+        key = self._cache_key(method, kwargs)
+        if key is None:
+            return None, MISSING
+        return key, self._cache_hit(method, await self.cache.aget(key))
+
+    async def _async_cache_update(
+        self,
+        method: str,
+        kwargs: Dict[str, Any],
+        key: Optional[str],
+        result: Any,
+        generation: Optional[int] = None,
+    ) -> None:
+        """Store or invalidate like _cache_update without blocking the event loop on disk."""
+        if not self._disk_cache():
+            return self._cache_update(method, kwargs, key, result, generation)
+        if key is not None:
+            await self.cache.aset(
+                key,
+                result,
+                self.cache.ttl_for(method),
+                self._cached_codes(method, kwargs, result),
+                **self._store_args(generation),
+            )
+        elif self._is_write_operation(method):
+            for code in self._touched_codes(method, kwargs, result):
+                await self.cache.ainvalidate_code(code)
+
+    async def _off_loop(self, func, *args: Any) -> Any:
+        """Run batch bookkeeping touching the cache, in a worker thread if it has a disk tier."""
+        if self._disk_cache():
+            return await asyncio.to_thread(func, *args)
+        return func(*args)
+
+    async def _send(self, method: str, kwargs: Dict[str, Any]) -> Any:
+        """Send a request through the circuit breaker, retrying transient read failures."""
+        attempt = 0
+        while True:
+            self._check_circuit(method)
+            try:
+                if self.hedging is not None and self.hedging.applies(method):
+                    result = await self._hedged_post(method, kwargs)
+                else:
+                    async with self._admit(method):
+                        result = await self._post(method, kwargs)
+            except EvaAPIError as e:
+                self._record_outcome(e)
+                delay = self._retry_delay(method, attempt, e)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                # Cancelled or failed before Eva answered: free a half-open probe slot
+                self.breaker.release()
+                raise
+            self._record_outcome(None)
+            return result
+
+    async def _hedged_post(self, method: str, kwargs: Dict[str, Any]) -> Any:
+        """
+        Send a read request and, if it is slower than the hedge delay, a duplicate.
+
+        The first successful response wins and the other request is cancelled;
+        an error is raised only if both requests fail. A cancelled original
+        request records its elapsed time, a lower bound of its latency, so the
+        slow requests that got hedged still count toward the hedge delay.
+        """
+        policy = self.hedging
+
+        async def attempt(original: bool) -> Any:
+            started = time.monotonic()
+            try:
+                async with self._admit(method):
+                    result = await self._post(method, kwargs)
+            except asyncio.CancelledError:
+                if original:
+                    policy.observe(method, time.monotonic() - started)
+                raise
+            policy.observe(method, time.monotonic() - started)
+            return result
+
+        delay = policy.delay(method)
+        primary = asyncio.ensure_future(attempt(True))
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait({primary}, timeout=delay)
+                if not done and policy.try_hedge():
+                    logger.debug(f"Hedging {method} after {delay * 1000:.1f}ms")
+                    hedge = asyncio.ensure_future(attempt(False))
+                    return await self._first_success(primary, hedge)
+            return await primary
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+
+    async def _first_success(self, primary: "asyncio.Future", hedge: "asyncio.Future") -> Any:
+        """Return the first successful result of two requests and cancel the other one."""
+        pending = {primary, hedge}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedging.record_win()
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return client counters, including hedging when enabled."""
+        stats = super().stats()
+        if self.hedging is not None:
+            stats["hedging"] = self.hedging.stats()
+        return stats
+
+    @asynccontextmanager
+    async def _admit(self, *methods: str):
+        """
+        Hold a bulkhead slot and wait for rate limiter capacity before a request.
+
+        A batch passes the method of every call it carries, taking one token each.
+        """
+        async with self.bulkheads.slot(current_pool()):
+            delay = max(self.limiter.reserve(method) for method in methods)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield
+
+    async def _post(self, method: str, kwargs: Dict[str, Any]) -> Any:
+        """Send a JSON-RPC request over HTTP and return its result."""
+        import httpx
+
+        request_data = self._build_request(method, kwargs)
+
+        logger.debug(f"API call: {method} with params: {kwargs}")
+
+        try:
+            with span("http.post", self._http_attributes(request_data), KIND_CLIENT) as http:
+                response = await self.client.post(self._method_url(method), json=request_data)
+                http.set_attribute("http.status_code", response.status_code)
+            return self._parse_response(method, response)
+
+        except EvaAPIError:
+            raise
+        except httpx.HTTPStatusError as e:
+            logger.error(f"HTTP error: {e}")
+            raise self._http_error(e)
+        except httpx.RequestError as e:
+            logger.error(f"Request error: {e}")
+            raise EvaTransientError(f"Request error: {str(e)}")
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+            raise EvaAPIError(f"Unexpected error: {str(e)}")
+
+    async def _iterate(
+        self, list_method, page_size: int, max_items: Optional[int], **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield rows page by page until a short page or max_items is reached."""
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+        offset = 0
+        while max_items is None or offset < max_items:
+            limit = page_size if max_items is None else min(page_size, max_items - offset)
+            with bulk():
+                page = await list_method(limit=limit, offset=offset, **kwargs)
+            for row in page:
+                yield row
+            if len(page) < limit:
+                return
+            offset += limit
+
+    async def _fetch_all(
+        self,
+        list_method,
+        count_method,
+        filters,
+        page_size: int,
+        max_concurrency: int,
+        count_kwargs: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """Count, fetch slices concurrently and merge them in order."""
+        with bulk():
+            count = await count_method(filters=filters, **(count_kwargs or {}))
+            offsets = self._plan_slices(count, page_size)
+            semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+            async def fetch(offset: int) -> List[Dict[str, Any]]:
+                async with semaphore:
+                    return await list_method(
+                        filters=filters, limit=page_size, offset=offset, **kwargs
+                    )
+
+            pages = await asyncio.gather(*(fetch(offset) for offset in offsets))
+            rows = self._merge_pages(pages)
+
+            recount = await count_method(filters=filters, **(count_kwargs or {}))
+        if len(rows) != recount:
+            logger.warning(
+                f"Result set changed during bulk fetch ({count} -> {recount} rows, "
+                f"got {len(rows)}); re-reading sequentially"
+            )
+            rows = self._merge_pages(
+                [
+                    [
+                        row
+                        async for row in self._iterate(
+                            list_method, page_size, None, filters=filters, **kwargs
+                        )
+                    ]
+                ]
+            )
+        return rows
+
+    async def _run_batch(self, calls: List[BatchCall]) -> List[BatchCall]:
+        """Send pending calls as one JSON-RPC array, or concurrently if unsupported."""
+        import httpx
+
+        pending = await self._off_loop(self._prepare_batch, calls)
+        if len(pending) > 1 and self._batch_supported is not False:
+            logger.debug(f"API batch: {[call.method for call in pending]}")
+            try:
+                self._check_circuit("batch")
+                request_data = self._batch_request(pending)
+                # Every call in the array takes its own rate limiter token
+                async with self._admit(*(call.method for call in pending)):
+                    with span("http.post", self._batch_attributes(request_data), KIND_CLIENT):
+                        response = await self.client.post(
+                            self._method_url("batch"), json=request_data
+                        )
+            except (EvaAPIError, httpx.RequestError) as e:
+                pending, delay = self._fail_batch(pending, e)
+            except BaseException:
+                self.breaker.release()
+                raise
+            else:
+                pending, delay = await self._off_loop(self._resolve_batch, pending, response)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        async def send(call: BatchCall) -> None:
+            try:
+                call.set_result(await self.call(call.method, **call.kwargs))
+            except EvaAPIError as e:
+                call.set_error(e)
+
+        await asyncio.gather(*(send(call) for call in pending))
+        return calls
+
+    async def _get_many(
+        self, list_method, codes: List[str], chunk_size: int, **kwargs
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Resolve codes with one `in` list call per chunk, chunks in parallel."""
+        pages = await asyncio.gather(
+            *(
+                list_method(filters=[["code", "in", chunk]], limit=len(chunk), **kwargs)
+                for chunk in self._plan_chunks(codes, chunk_size)
+            )
+        )
+        return self._match_codes(codes, pages)
+
+    async def warm_up(self) -> None:
+        """Open a pooled connection (DNS, TCP, TLS) before the first call; errors are ignored."""
+        import httpx
+
+        try:
+            await self.client.head(self.api_url)
+        except httpx.HTTPError as e:
+            logger.debug(f"Connection warm-up failed: {e}")
+
+    async def close(self):
+        """Close the HTTP client."""
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.close()
@@ -0,0 +1,142 @@
+"""Hedged reads - duplicate slow idempotent requests to cut tail latency."""
+
+import math
+import os
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Optional
+
+DEFAULT_HEDGE_METHODS = (
+    "CmfTask.get",
+    "CmfPerson.get",
+    "CmfProject.get",
+    "CmfDocument.get",
+    "CmfList.get",
+)
+
+
+class HedgePolicy:
+    """
+    When to send a duplicate (hedge) of a slow read request.
+
+    The hedge delay is the configured percentile of recent latencies of the
+    method, so only the slowest few percent of requests are hedged. A token
+    budget caps the extra load: every request earns budget_ratio tokens (up to
+    budget_burst) and every hedge spends one.
+    """
+
+    def __init__(
+        self,
+        methods: Iterable[str] = DEFAULT_HEDGE_METHODS,
+        percentile: float = 95.0,
+        budget_ratio: float = 0.05,
+        budget_burst: float = 10.0,
+        min_delay: float = 0.005,
+        max_delay: float = 2.0,
+        window: int = 256,
+        min_samples: int = 20,
+    ):
+        """
+        Initialize hedge policy.
+
+        Args:
+            methods: API methods eligible for hedging (idempotent reads only)
+            percentile: Latency percentile after which a hedge is sent
+            budget_ratio: Maximum hedges per request in the long run (0.05 = 5% extra load)
+            budget_burst: Maximum hedges that can be sent back to back
+            min_delay: Lower bound of the hedge delay in seconds
+            max_delay: Upper bound of the hedge delay in seconds
+            window: Number of recent latencies kept per method
+            min_samples: Latencies needed before a method is hedged
+        """
+        self.methods = frozenset(methods)
+        self.percentile = percentile
+        self.budget_ratio = budget_ratio
+        self.budget_burst = budget_burst
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.window = window
+        self.min_samples = min_samples
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._tokens = budget_burst
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.budget_denied = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["HedgePolicy"]:
+        """
+        Create policy from EVA_HEDGE, EVA_HEDGE_METHODS, EVA_HEDGE_PERCENTILE,
+        EVA_HEDGE_BUDGET and EVA_HEDGE_MAX_DELAY env vars.
+
+        Returns:
+            Policy, or None if hedging is not enabled with EVA_HEDGE=true
+        """
+        if os.getenv("EVA_HEDGE", "false").lower() != "true":
+            return None
+        methods = os.getenv("EVA_HEDGE_METHODS", "")
+        return cls(
+            methods=(
+                [m.strip() for m in methods.split(",") if m.strip()]
+                if methods
+                else DEFAULT_HEDGE_METHODS
+            ),
+            percentile=float(os.getenv("EVA_HEDGE_PERCENTILE", "95")),
+            budget_ratio=float(os.getenv("EVA_HEDGE_BUDGET", "0.05")),
+            max_delay=float(os.getenv("EVA_HEDGE_MAX_DELAY", "2")),
+        )
+
+    def applies(self, method: str) -> bool:
+        """Check if a method is eligible for hedging."""
+        return method in self.methods
+
+    def observe(self, method: str, latency: float) -> None:
+        """Record the latency of a completed request, or a lower bound for a cancelled one."""
+        with self._lock:
+            samples = self._latencies.get(method)
+            if samples is None:
+                samples = self._latencies[method] = deque(maxlen=self.window)
+            samples.append(latency)
+
+    def delay(self, method: str) -> Optional[float]:
+        """
+        Return the hedge delay for a new request and credit the hedge budget.
+
+        Returns:
+            Seconds to wait before hedging, or None while too few latencies are known
+        """
+        with self._lock:
+            self.requests += 1
+            self._tokens = min(self.budget_burst, self._tokens + self.budget_ratio)
+            samples = self._latencies.get(method)
+            if samples is None or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+        index = min(len(ordered) - 1, math.ceil(self.percentile / 100 * len(ordered)) - 1)
+        return min(self.max_delay, max(self.min_delay, ordered[max(0, index)]))
+
+    def try_hedge(self) -> bool:
+        """Spend one budget token on a hedge; False if the budget is exhausted."""
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self.hedged += 1
+                return True
+            self.budget_denied += 1
+            return False
+
+    def record_win(self) -> None:
+        """Count a hedge that answered before the original request."""
+        with self._lock:
+            self.hedge_wins += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return request, hedge, hedge win and denied hedge counters."""
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "budget_denied": self.budget_denied,
+        }
@@ -0,0 +1,429 @@
+"""Latency histograms and counters per MCP tool and per Eva API method."""
+
+import asyncio
+import logging
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+# Prometheus counters: metric name, series attribute, help text
+_TOOL_COUNTERS = (
+    ("eva_tool_calls_total", "calls", "MCP tool calls."),
+    ("eva_tool_errors_total", "errors", "MCP tool calls that returned an error."),
+    ("eva_tool_response_bytes_total", "response_bytes", "Bytes of MCP tool responses."),
+)
+_METHOD_COUNTERS = (
+    ("eva_api_calls_total", "calls", "Eva API calls, including cache hits."),
+    ("eva_api_retries_total", "retries", "Retried Eva API requests."),
+    ("eva_api_cache_hits_total", "cache_hits", "Eva API calls answered from cache."),
+    ("eva_api_requests_total", "requests", "HTTP requests sent to Eva."),
+    ("eva_api_request_bytes_total", "request_bytes", "Bytes of HTTP request bodies sent to Eva."),
+    ("eva_api_response_bytes_total", "response_bytes", "Bytes of HTTP response bodies from Eva."),
+)
+
+# Prometheus metrics of the circuit breaker: metric name, breaker attribute, help text
+_BREAKER_COUNTERS = (
+    ("eva_api_circuit_trips_total", "trips", "Times the Eva API circuit breaker opened."),
+    ("eva_api_circuit_rejected_total", "rejected", "Calls rejected while the circuit was open."),
+)
+BREAKER_STATES = ("closed", "open", "half_open")
+
+# Quantiles reported in snapshots
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Tool responses built by EvaTools._error_response, compact or indented
+_ERROR_RESPONSE = re.compile(r'\{\s*"success":\s*false')
+
+
+def error_code(error: Exception) -> str:
+    """
+    Return the label an error is counted under.
+
+    JSON-RPC errors use their EvaAPIError.code, HTTP errors their status
+    ("http_503") and anything else its class name.
+    """
+    code = getattr(error, "code", None)
+    if code is not None:
+        return str(code)
+    details = getattr(error, "details", None) or {}
+    status = getattr(error, "status", None) or details.get("status")
+    if status is not None:
+        return f"http_{status}"
+    return type(error).__name__
+
+
+def is_error_response(text: str) -> bool:
+    """Return True if a tool response reports a failure ({"success": false, ...})."""
+    return _ERROR_RESPONSE.match(text) is not None
+
+
+class Histogram:
+    """Fixed-bucket latency histogram with Prometheus-style quantile estimates."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        # One extra slot counts observations above the last bound (+Inf)
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one observation."""
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile by linear interpolation inside its bucket.
+
+        Observations above the last bucket bound are reported as the maximum seen.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                if i == len(self.buckets):
+                    return self.max
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = min(self.buckets[i], self.max)
+                return lower + (upper - lower) * max(rank - cumulative, 0) / count
+            cumulative += count
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        stats = {"count": self.count}
+        if self.count:
+            stats["avg_ms"] = round(self.sum / self.count * 1000, 3)
+            stats["max_ms"] = round(self.max * 1000, 3)
+            for q in QUANTILES:
+                stats[f"p{round(q * 100)}_ms"] = round(self.quantile(q) * 1000, 3)
+        return stats
+
+
+class _ToolSeries:
+    """Counters for one MCP tool."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.response_bytes = 0
+        self.latency = Histogram()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "response_bytes": self.response_bytes,
+            "latency": self.latency.snapshot(),
+        }
+
+
+class _MethodSeries:
+    """Counters for one Eva API method."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors: Dict[str, int] = {}
+        self.retries = 0
+        self.cache_hits = 0
+        self.requests = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.latency = Histogram()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": dict(self.errors),
+            "retries": self.retries,
+            "cache_hits": self.cache_hits,
+            "requests": self.requests,
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "latency": self.latency.snapshot(),
+        }
+
+
+class Metrics:
+    """
+    Thread-safe registry of per-tool and per-API-method metrics.
+
+    Tool latency runs from the call_tool request to its response, including
+    client creation on the first call and dispatcher queueing. Method latency
+    covers EvaClient.call, including cache hits, coalesced waits and retries;
+    requests and bytes count HTTP round trips only. The circuit breaker of
+    the client, registered with track_breaker, is read when rendering.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.started_at = clock()
+        self._lock = threading.Lock()
+        self._tools: Dict[str, _ToolSeries] = {}
+        self._methods: Dict[str, _MethodSeries] = {}
+        self._breaker = None
+
+    def _tool(self, name: str) -> _ToolSeries:
+        series = self._tools.get(name)
+        if series is None:
+            series = self._tools[name] = _ToolSeries()
+        return series
+
+    def _method(self, method: str) -> _MethodSeries:
+        series = self._methods.get(method)
+        if series is None:
+            series = self._methods[method] = _MethodSeries()
+        return series
+
+    def observe_tool(
+        self, name: str, seconds: float, error: bool = False, response_bytes: int = 0
+    ) -> None:
+        """Record one tool call."""
+        with self._lock:
+            series = self._tool(name)
+            series.calls += 1
+            series.errors += error
+            series.response_bytes += response_bytes
+            series.latency.observe(seconds)
+
+    def observe_call(self, method: str, seconds: float, error: Optional[Exception] = None) -> None:
+        """Record one EvaClient.call, failed with error if given."""
+        with self._lock:
+            series = self._method(method)
+            series.calls += 1
+            series.latency.observe(seconds)
+            if error is not None:
+                code = error_code(error)
+                series.errors[code] = series.errors.get(code, 0) + 1
+
+    def record_cache_hit(self, method: str) -> None:
+        """Count a call answered from the response cache."""
+        with self._lock:
+            self._method(method).cache_hits += 1
+
+    def record_retry(self, method: str) -> None:
+        """Count a retry of a failed request."""
+        with self._lock:
+            self._method(method).retries += 1
+
+    def record_request(self, method: str, request_bytes: int, response_bytes: int) -> None:
+        """Count one HTTP round trip and its body sizes."""
+        with self._lock:
+            series = self._method(method)
+            series.requests += 1
+            series.request_bytes += request_bytes
+            series.response_bytes += response_bytes
+
+    def track_breaker(self, breaker) -> None:
+        """Report trips, rejections and state of a CircuitBreaker in the Prometheus output."""
+        self._breaker = breaker
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return all metrics as a JSON-serializable dict."""
+        with self._lock:
+            return {
+                "uptime_s": round(self.clock() - self.started_at, 3),
+                "tools": {name: series.snapshot() for name, series in sorted(self._tools.items())},
+                "methods": {
+                    name: series.snapshot() for name, series in sorted(self._methods.items())
+                },
+            }
+
+    def prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+
+        def header(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def counters(label: str, series: List[Tuple[str, Any]], specs: Tuple[Tuple[str, ...], ...]):
+            for name, attr, help_text in specs:
+                header(name, "counter", help_text)
+                lines.extend(f'{name}{{{label}="{key}"}} {getattr(s, attr)}' for key, s in series)
+
+        def histogram(name: str, label: str, series: List[Tuple[str, Any]], help_text: str) -> None:
+            header(name, "histogram", help_text)
+            for key, s in series:
+                hist, labels = s.latency, f'{label}="{key}"'
+                cumulative = 0
+                for bound, count in zip(hist.buckets, hist.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {hist.count}')
+                lines.append(f"{name}_sum{{{labels}}} {hist.sum:.6f}")
+                lines.append(f"{name}_count{{{labels}}} {hist.count}")
+
+        with self._lock:
+            tools = sorted(self._tools.items())
+            methods = sorted(self._methods.items())
+
+            counters("tool", tools, _TOOL_COUNTERS)
+            histogram("eva_tool_duration_seconds", "tool", tools, "MCP tool call latency.")
+
+            counters("method", methods, _METHOD_COUNTERS)
+            header("eva_api_errors_total", "counter", "Failed Eva API calls by error code.")
+            for key, s in methods:
+                for code, count in sorted(s.errors.items()):
+                    lines.append(f'eva_api_errors_total{{method="{key}",code="{code}"}} {count}')
+            histogram("eva_api_call_duration_seconds", "method", methods, "Eva API call latency.")
+
+        breaker = self._breaker
+        if breaker is not None:
+            for name, attr, help_text in _BREAKER_COUNTERS:
+                header(name, "counter", help_text)
+                lines.append(f"{name} {getattr(breaker, attr)}")
+            header(
+                "eva_api_circuit_state", "gauge", "Circuit breaker state, 1 for the current one."
+            )
+            state = breaker.state
+            lines.extend(
+                f'eva_api_circuit_state{{state="{name}"}} {int(name == state)}'
+                for name in BREAKER_STATES
+            )
+
+        return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    """
+    Publish metrics in Prometheus text format outside MCP.
+
+    Writes a text file (for node_exporter's textfile collector) every interval
+    seconds and/or serves GET /metrics on a local port.
+    """
+
+    def __init__(
+        self,
+        metrics: Metrics,
+        path: Optional[str] = None,
+        port: Optional[int] = None,
+        host: str = "127.0.0.1",
+        interval: float = 15.0,
+    ):
+        """
+        Initialize exporter.
+
+        Args:
+            metrics: Metrics registry to publish
+            path: Prometheus text file to write (default: none)
+            port: Local HTTP port serving /metrics (default: none)
+            host: Interface the HTTP endpoint binds to
+            interval: Seconds between text file writes
+        """
+        self.metrics = metrics
+        self.path = Path(path) if path else None
+        self.port = port
+        self.host = host
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @classmethod
+    def from_env(cls, metrics: Metrics) -> Optional["MetricsExporter"]:
+        """
+        Create an exporter from EVA_METRICS_FILE, EVA_METRICS_PORT and EVA_METRICS_INTERVAL.
+
+        Returns:
+            Exporter, or None if neither a file nor a port is configured
+        """
+        path = os.getenv("EVA_METRICS_FILE") or None
+        port = os.getenv("EVA_METRICS_PORT") or None
+        if path is None and port is None:
+            return None
+        return cls(
+            metrics,
+            path=path,
+            port=int(port) if port is not None else None,
+            interval=float(os.getenv("EVA_METRICS_INTERVAL", "15")),
+        )
+
+    def write(self) -> None:
+        """Write the text file atomically, so scrapers never read a partial file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(self.metrics.prometheus(), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    async def run(self) -> None:
+        """Write the text file until cancelled."""
+        while True:
+            try:
+                self.write()
+            except OSError as e:
+                logger.warning(f"Writing metrics file failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request_line.split()
+            if len(parts) >= 2 and parts[0] == b"GET" and parts[1] in (b"/metrics", b"/"):
+                status, body = "200 OK", self.metrics.prometheus().encode("utf-8")
+            else:
+                status, body = "404 Not Found", b"Not found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("ascii") + body
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def start(self) -> None:
+        """Start the file writer and HTTP endpoint on the running event loop."""
+        if self.path is not None and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self.run())
+        if self.port is not None and self._server is None:
+            self._server = await asyncio.start_server(self._handle, self.host, self.port)
+            logger.info(f"Metrics endpoint: http://{self.host}:{self.port}/metrics")
+
+    async def stop(self) -> None:
+        """Stop the file writer and HTTP endpoint, writing the file one last time."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            try:
+                self.write()
+            except OSError as e:
+                logger.warning(f"Writing metrics file failed: {e}")
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
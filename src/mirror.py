@@ -0,0 +1,702 @@
+"""Local SQLite mirror of Eva reference and task data with a full-text index."""
+
+import asyncio
+import html
+import inspect
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from eva_client import EvaAPIError
+from ratelimit import bulk
+
+logger = logging.getLogger(__name__)
+
+# Mirrored entities with the client methods used to backfill and refresh them
+ENTITY_METHODS = {
+    "CmfTask": ("fetch_all_tasks", "list_tasks"),
+    "CmfProject": ("fetch_all_projects", "list_projects"),
+    "CmfList": ("fetch_all_lists", "list_lists"),
+    "CmfPerson": ("fetch_all_users", "list_users"),
+    "CmfDocument": ("fetch_all_documents", "list_documents"),
+}
+
+# Entities indexed for full-text search with the field holding their HTML body
+TEXT_FIELDS = {
+    "CmfTask": "text",
+    "CmfDocument": "text",
+}
+
+DEFAULT_DIR = "~/.cache/eva-mcp-server"
+
+MODIFIED_FIELD = "cmf_modified_at"
+
+# Fields requested for mirrored rows: Eva's default payload ("*") plus the fields the
+# mirror filters, orders and indexes on, which the default payload may leave out
+MIRROR_FIELDS = ("*", "code", "name", "parent", "responsible", "status", MODIFIED_FIELD)
+
+# Relation fields, returned by Eva either as a code or as an object with a code
+RELATION_FIELDS = ("parent", "responsible")
+
+# Audit entry fields that reference the changed object (see changefeed.ENTITY_FIELDS)
+AUDIT_FIELDS = ("object_code", "object_id")
+
+_FIELD_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_TAG_RE = re.compile(r"<(script|style)\b.*?</\1\s*>|<[^>]*>", re.IGNORECASE | re.DOTALL)
+_WORD_RE = re.compile(r"\w+")
+
+
+def _fields(entity: str) -> List[str]:
+    """Fields to request for rows of an entity, with its full-text body if indexed."""
+    body_field = TEXT_FIELDS.get(entity)
+    return list(MIRROR_FIELDS) + ([body_field] if body_field else [])
+
+
+def _timestamp(seconds: float) -> str:
+    """Format a wall-clock time like Eva's cmf_modified_at values (UTC)."""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(seconds))
+
+
+def _column(field: str) -> str:
+    """SQL expression for a field of the JSON row data, relation fields normalised to codes."""
+    if field in RELATION_FIELDS:
+        return f"coalesce(json_extract(data, '$.{field}.code'), json_extract(data, '$.{field}'))"
+    return f"json_extract(data, '$.{field}')"
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rows (
+    entity TEXT NOT NULL,
+    code TEXT NOT NULL,
+    data TEXT NOT NULL,
+    modified_at TEXT,
+    PRIMARY KEY (entity, code)
+);
+DROP INDEX IF EXISTS rows_parent;
+DROP INDEX IF EXISTS rows_responsible;
+CREATE INDEX IF NOT EXISTS rows_parent_code ON rows (entity, {parent});
+CREATE INDEX IF NOT EXISTS rows_responsible_code ON rows (entity, {responsible});
+CREATE INDEX IF NOT EXISTS rows_status ON rows (entity, json_extract(data, '$.status'));
+CREATE TABLE IF NOT EXISTS sync_state (
+    entity TEXT PRIMARY KEY,
+    high_water_mark TEXT,
+    synced_at REAL NOT NULL,
+    backfilled_at REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS rows_fts USING fts5 (
+    name, body, tokenize = 'unicode61 remove_diacritics 2'
+);
+""".format(**{field: _column(field) for field in RELATION_FIELDS})
+
+# bm25 column weights: matches in the name rank above matches in the body
+NAME_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+
+
+class UnsupportedQuery(Exception):
+    """Raised for filters the mirror cannot evaluate locally."""
+
+
+def _casefold(value: Any) -> Optional[str]:
+    return value.casefold() if isinstance(value, str) else value
+
+
+def html_to_text(value: Any) -> str:
+    """Strip tags, scripts and entities from an HTML body."""
+    if not isinstance(value, str):
+        return ""
+    return " ".join(html.unescape(_TAG_RE.sub(" ", value)).split())
+
+
+def match_expression(text: str) -> Optional[str]:
+    """
+    Build an FTS5 query matching all words of free text, each as a prefix.
+
+    Returns:
+        Query, or None if the text has no words
+    """
+    words = _WORD_RE.findall(text or "")
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def _where(filters: Optional[List[List[Any]]]) -> Tuple[str, List[Any]]:
+    """
+    Translate Eva filters to an SQL condition over the JSON row data.
+
+    Supports "=", "!=", "in", "ilike" and "like" on top-level fields. Relation
+    fields match by code whether a row holds the code or an object.
+
+    Raises:
+        UnsupportedQuery: For other operators or malformed filters
+    """
+    clauses, params = [], []
+    for condition in filters or []:
+        if not isinstance(condition, (list, tuple)) or len(condition) != 3:
+            raise UnsupportedQuery(f"Unsupported filter {condition!r}")
+        field, op, value = condition
+        if not isinstance(field, str) or not _FIELD_RE.match(field):
+            raise UnsupportedQuery(f"Unsupported filter field {field!r}")
+        column = _column(field)
+        if op == "=":
+            clauses.append(f"{column} = ?")
+            params.append(value)
+        elif op == "!=":
+            clauses.append(f"({column} IS NULL OR {column} != ?)")
+            params.append(value)
+        elif op == "in" and isinstance(value, list):
+            clauses.append(f"{column} IN ({', '.join('?' * len(value))})" if value else "0")
+            params.extend(value)
+        elif op in ("ilike", "like") and isinstance(value, str):
+            # Eva's ilike is case-insensitive for any script, SQLite's LIKE only for ASCII
+            clauses.append(
+                f"casefold({column}) LIKE casefold(?)" if op == "ilike" else f"{column} LIKE ?"
+            )
+            params.append(value)
+        else:
+            raise UnsupportedQuery(f"Unsupported filter operator {op!r}")
+    return (" AND ".join(clauses) or "1"), params
+
+
+def _order(order_by: Optional[List[str]]) -> str:
+    """Translate Eva order_by (["-cmf_created_at"]) to an SQL ORDER BY clause."""
+    terms = []
+    for field in order_by or []:
+        direction = "DESC" if field.startswith("-") else "ASC"
+        field = field.lstrip("-")
+        if not _FIELD_RE.match(field):
+            raise UnsupportedQuery(f"Unsupported order field {field!r}")
+        terms.append(f"json_extract(data, '$.{field}') {direction}")
+    terms.append("code ASC")
+    return ", ".join(terms)
+
+
+class Mirror:
+    """
+    Local replica of tasks, projects, lists, persons and documents in SQLite.
+
+    Each entity is backfilled with a parallel bulk fetch and then kept up to date
+    by pulling rows whose cmf_modified_at is at or after the last seen value.
+    Deleted or archived rows never show up in that pull: subscribe
+    on_audit_entry to the audit change feed so the codes it reports are fetched
+    again and dropped when the API no longer lists them. Without the feed they
+    stay until the next full backfill (every resync_interval). Reads are
+    answered only while the entity was synced within max_staleness and no
+    reported change is still being checked; otherwise callers fall back to the API.
+    Names and HTML-stripped bodies of tasks and documents are kept in an FTS5
+    index updated with every pulled row, for ranked full-text search.
+    Works with both EvaClient and AsyncEvaClient. SQLite work started from the
+    event loop runs in worker threads, and reads use their own connection, so a
+    long backfill transaction neither blocks the loop nor queries (WAL mode).
+    """
+
+    def __init__(
+        self,
+        client,
+        path: str,
+        entities: Iterable[str] = tuple(ENTITY_METHODS),
+        interval: float = 30.0,
+        max_staleness: float = 120.0,
+        resync_interval: float = 3600.0,
+        page_size: int = 200,
+        max_concurrency: int = 8,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize mirror and create the database if needed.
+
+        Args:
+            client: EvaClient or AsyncEvaClient
+            path: Database file path
+            entities: Entities to mirror (subset of ENTITY_METHODS)
+            interval: Seconds between incremental pulls
+            max_staleness: Maximum age in seconds of data served from the mirror
+            resync_interval: Seconds between full backfills
+            page_size: Rows per list request
+            max_concurrency: Parallel slice requests during backfill
+            clock: Wall-clock time source
+        """
+        self.client = client
+        self.path = Path(path).expanduser()
+        self.entities = [entity for entity in entities if entity in ENTITY_METHODS]
+        self.interval = interval
+        self.max_staleness = max_staleness
+        self.resync_interval = resync_interval
+        self.page_size = page_size
+        self.max_concurrency = max_concurrency
+        self._clock = clock
+        # Writer and reader connections, each used by one thread at a time
+        self._lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        # Codes reported by the audit feed and not checked yet
+        self._changed: Set[str] = set()
+        self._check_task: Optional[asyncio.Task] = None
+
+        self.hits = 0
+        self.misses = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = self._connect()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        indexed = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'rows_fts'"
+        ).fetchone()
+        self._conn.executescript(SCHEMA)
+        if not indexed:
+            # Mirrors created before the index existed are backfilled again to fill it
+            self._conn.execute("DELETE FROM sync_state")
+        self._reader = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            str(self.path), timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        conn.create_function("casefold", 1, _casefold, deterministic=True)
+        return conn
+
+    @classmethod
+    def from_env(cls, client, namespace: str) -> "Mirror":
+        """
+        Create mirror from EVA_MIRROR_PATH, EVA_MIRROR_INTERVAL, EVA_MIRROR_MAX_STALENESS,
+        EVA_MIRROR_RESYNC_INTERVAL and EVA_MIRROR_ENTITIES env vars.
+
+        Args:
+            client: EvaClient or AsyncEvaClient
+            namespace: Identifies the Eva instance and user (see diskcache.cache_namespace)
+        """
+        entities = os.getenv("EVA_MIRROR_ENTITIES", "")
+        return cls(
+            client,
+            path=os.getenv(
+                "EVA_MIRROR_PATH", os.path.join(DEFAULT_DIR, f"mirror-{namespace}.sqlite3")
+            ),
+            entities=(
+                [e.strip() for e in entities.split(",") if e.strip()]
+                if entities
+                else tuple(ENTITY_METHODS)
+            ),
+            interval=float(os.getenv("EVA_MIRROR_INTERVAL", "30")),
+            max_staleness=float(os.getenv("EVA_MIRROR_MAX_STALENESS", "120")),
+            resync_interval=float(os.getenv("EVA_MIRROR_RESYNC_INTERVAL", "3600")),
+        )
+
+    # Synchronization
+
+    async def backfill(self, entity: str) -> int:
+        """
+        Replace the replica of an entity with a full parallel fetch.
+
+        Returns:
+            Number of mirrored rows
+        """
+        fetch_all = getattr(self.client, ENTITY_METHODS[entity][0])
+        started = self._clock()
+        rows = await self._call(
+            fetch_all,
+            page_size=self.page_size,
+            max_concurrency=self.max_concurrency,
+            fields=_fields(entity),
+        )
+        await asyncio.to_thread(self._replace, entity, rows, started)
+        logger.info(f"Mirror backfilled {len(rows)} {entity} row(s)")
+        return len(rows)
+
+    async def refresh(self, entity: str) -> int:
+        """
+        Pull rows modified since the last sync.
+
+        Returns:
+            Number of upserted rows
+        """
+        state = await asyncio.to_thread(self._state, entity)
+        if state is None:
+            return await self.backfill(entity)
+        mark = state[0]
+        list_method = getattr(self.client, ENTITY_METHODS[entity][1])
+        started = self._clock()
+        filters = [[MODIFIED_FIELD, ">=", mark]] if mark else None
+
+        rows, offset = [], 0
+        while True:
+            page = await self._call(
+                list_method,
+                filters=filters,
+                limit=self.page_size,
+                offset=offset,
+                order_by=[MODIFIED_FIELD],
+                fields=_fields(entity),
+            )
+            rows.extend(page)
+            if len(page) < self.page_size:
+                break
+            offset += self.page_size
+
+        await asyncio.to_thread(self._apply, entity, rows, mark, started)
+        if rows:
+            logger.debug(f"Mirror refreshed {len(rows)} {entity} row(s)")
+        return len(rows)
+
+    async def sync_once(self) -> Dict[str, int]:
+        """
+        Backfill entities that are new or due for a full resync, refresh the others.
+
+        Returns:
+            Number of synced rows per entity
+        """
+        now = self._clock()
+
+        async def sync(entity: str) -> int:
+            state = await asyncio.to_thread(self._state, entity)
+            if state is None or now - state[2] >= self.resync_interval:
+                return await self.backfill(entity)
+            return await self.refresh(entity)
+
+        counts = await asyncio.gather(*(sync(entity) for entity in self.entities))
+        # Retry checks of audited changes that failed earlier
+        if self._changed:
+            await self.check_changes()
+        return dict(zip(self.entities, counts))
+
+    def on_audit_entry(self, entry: Dict[str, Any]) -> None:
+        """
+        Audit change feed subscriber: queue the codes an entry references for checking.
+
+        Until they are checked, queries fall back to the API.
+        """
+        codes = {entry.get(field) for field in AUDIT_FIELDS}
+        self._changed.update(code for code in codes if isinstance(code, str))
+        if self._changed and (self._check_task is None or self._check_task.done()):
+            self._check_task = asyncio.get_running_loop().create_task(self.check_changes())
+
+    async def check_changes(self) -> int:
+        """
+        Fetch mirrored rows reported changed by the audit feed again.
+
+        Rows the API no longer lists (deleted or archived) are dropped, the
+        others are updated. Codes not in the mirror are ignored.
+
+        Returns:
+            Number of dropped rows
+        """
+        dropped = 0
+        while self._changed:
+            codes = sorted(self._changed)
+            mirrored = await asyncio.to_thread(self._entities_of, codes)
+            try:
+                for entity, entity_codes in mirrored.items():
+                    dropped += await self._check(entity, entity_codes)
+            except EvaAPIError as e:
+                logger.warning(f"Mirror change check failed: {e.message}")
+                return dropped
+            self._changed.difference_update(codes)
+        return dropped
+
+    async def _check(self, entity: str, codes: List[str]) -> int:
+        list_method = getattr(self.client, ENTITY_METHODS[entity][1])
+        rows = []
+        for start in range(0, len(codes), self.page_size):
+            chunk = codes[start : start + self.page_size]
+            rows += await self._call(
+                list_method,
+                filters=[["code", "in", chunk]],
+                limit=len(chunk),
+                fields=_fields(entity),
+            )
+        gone = set(codes) - {row.get("code") for row in rows if isinstance(row, dict)}
+        await asyncio.to_thread(self._apply, entity, rows, None, None, gone)
+        if gone:
+            logger.debug(f"Mirror dropped {len(gone)} deleted or archived {entity} row(s)")
+        return len(gone)
+
+    async def run(self) -> None:
+        """Sync until cancelled; API errors are logged and retried on the next tick."""
+        while True:
+            try:
+                await self.sync_once()
+            except EvaAPIError as e:
+                logger.warning(f"Mirror sync failed: {e.message}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> asyncio.Task:
+        """Start syncing in a background task on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        """Stop the background sync and change check tasks."""
+        for task in (self._task, self._check_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._check_task = None
+
+    # Queries
+
+    def is_fresh(self, entity: str) -> bool:
+        """Check if an entity was synced within max_staleness and no audited change is pending."""
+        if self._changed:
+            return False
+        state = self._state(entity)
+        return state is not None and self._clock() - state[1] <= self.max_staleness
+
+    def query(
+        self,
+        entity: str,
+        filters: Optional[List[List[Any]]] = None,
+        limit: int = 50,
+        offset: int = 0,
+        order_by: Optional[List[str]] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        List mirrored rows like the corresponding *.list call.
+
+        Returns:
+            Rows, or None if the data is stale or the filters are not supported locally
+        """
+        try:
+            where, params = _where(filters)
+            order = _order(order_by)
+        except UnsupportedQuery as e:
+            return self._miss(entity, e)
+        if not self.is_fresh(entity):
+            return self._miss(entity, "stale")
+        with self._read_lock:
+            cursor = self._reader.execute(
+                f"SELECT data FROM rows WHERE entity = ? AND {where} "
+                f"ORDER BY {order} LIMIT ? OFFSET ?",
+                [entity, *params, limit, offset],
+            )
+            rows = [json.loads(data) for (data,) in cursor]
+        self.hits += 1
+        if fields:
+            rows = [{field: row[field] for field in fields if field in row} for row in rows]
+        return rows
+
+    def search(
+        self,
+        entity: str,
+        text: str,
+        filters: Optional[List[List[Any]]] = None,
+        limit: int = 50,
+        offset: int = 0,
+        fields: Optional[List[str]] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Full-text search over names and bodies, best matches first.
+
+        Every word of text must occur in the name or body, as a word or word prefix.
+
+        Returns:
+            Rows, or None if the entity is not indexed, the data is stale or the
+            filters are not supported locally
+        """
+        if entity not in TEXT_FIELDS:
+            return self._miss(entity, "not indexed")
+        expression = match_expression(text)
+        if expression is None:
+            return self.query(entity, filters, limit, offset, fields=fields)
+        try:
+            where, params = _where(filters)
+        except UnsupportedQuery as e:
+            return self._miss(entity, e)
+        if not self.is_fresh(entity):
+            return self._miss(entity, "stale")
+        with self._read_lock:
+            cursor = self._reader.execute(
+                f"SELECT rows.data FROM rows_fts JOIN rows ON rows.rowid = rows_fts.rowid "
+                f"WHERE rows_fts MATCH ? AND rows.entity = ? AND {where} "
+                f"ORDER BY bm25(rows_fts, {NAME_WEIGHT}, {BODY_WEIGHT}), rows.code "
+                f"LIMIT ? OFFSET ?",
+                [expression, entity, *params, limit, offset],
+            )
+            rows = [json.loads(data) for (data,) in cursor]
+        self.hits += 1
+        if fields:
+            rows = [{field: row[field] for field in fields if field in row} for row in rows]
+        return rows
+
+    def count(self, entity: str, filters: Optional[List[List[Any]]] = None) -> Optional[int]:
+        """
+        Count mirrored rows like the corresponding *.count call.
+
+        Returns:
+            Row count, or None if the data is stale or the filters are not supported locally
+        """
+        try:
+            where, params = _where(filters)
+        except UnsupportedQuery as e:
+            return self._miss(entity, e)
+        if not self.is_fresh(entity):
+            return self._miss(entity, "stale")
+        with self._read_lock:
+            (count,) = self._reader.execute(
+                f"SELECT COUNT(*) FROM rows WHERE entity = ? AND {where}", [entity, *params]
+            ).fetchone()
+        self.hits += 1
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and per-entity row counts and sync age."""
+        now = self._clock()
+        with self._read_lock:
+            counts = dict(self._reader.execute("SELECT entity, COUNT(*) FROM rows GROUP BY entity"))
+            states = dict(self._reader.execute("SELECT entity, synced_at FROM sync_state"))
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "pending_changes": len(self._changed),
+            "entities": {
+                entity: {
+                    "rows": counts.get(entity, 0),
+                    "age_s": round(now - states[entity], 3) if entity in states else None,
+                }
+                for entity in self.entities
+            },
+        }
+
+    def close(self) -> None:
+        """Close the database connections."""
+        with self._read_lock:
+            self._reader.close()
+        with self._lock:
+            self._conn.close()
+
+    # Helpers
+
+    async def _call(self, func: Callable[..., Any], **kwargs) -> Any:
+        with bulk():
+            result = func(**kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+        return result
+
+    def _state(self, entity: str) -> Optional[Tuple[Optional[str], float, float]]:
+        """Return high-water mark, last sync and last backfill time of an entity."""
+        with self._read_lock:
+            return self._reader.execute(
+                "SELECT high_water_mark, synced_at, backfilled_at FROM sync_state WHERE entity = ?",
+                (entity,),
+            ).fetchone()
+
+    def _entities_of(self, codes: List[str]) -> Dict[str, List[str]]:
+        """Group the mirrored codes among codes by entity."""
+        mirrored: Dict[str, List[str]] = {}
+        with self._read_lock:
+            for start in range(0, len(codes), 500):
+                chunk = codes[start : start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                for entity, code in self._reader.execute(
+                    f"SELECT entity, code FROM rows WHERE code IN ({placeholders})", chunk
+                ):
+                    if entity in self.entities:
+                        mirrored.setdefault(entity, []).append(code)
+        return mirrored
+
+    def _replace(self, entity: str, rows: List[Dict[str, Any]], started: float) -> None:
+        """Replace all rows of an entity in one transaction (backfill)."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "DELETE FROM rows_fts WHERE rowid IN (SELECT rowid FROM rows WHERE entity = ?)",
+                    (entity,),
+                )
+                self._conn.execute("DELETE FROM rows WHERE entity = ?", (entity,))
+                # Without modified rows the backfill start is the mark, so refreshes
+                # never pull the whole table again
+                mark = self._upsert(entity, rows, None) or _timestamp(started)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?)",
+                    (entity, mark, started, started),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _apply(
+        self,
+        entity: str,
+        rows: List[Dict[str, Any]],
+        mark: Optional[str],
+        started: Optional[float],
+        gone: Iterable[str] = (),
+    ) -> None:
+        """
+        Upsert rows and drop the gone codes in one transaction.
+
+        The high-water mark and sync time are recorded only for a refresh
+        (started is set); checks of single codes keep them unchanged.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for code in gone:
+                    self._conn.execute(
+                        "DELETE FROM rows_fts WHERE rowid IN "
+                        "(SELECT rowid FROM rows WHERE entity = ? AND code = ?)",
+                        (entity, code),
+                    )
+                    self._conn.execute(
+                        "DELETE FROM rows WHERE entity = ? AND code = ?", (entity, code)
+                    )
+                new_mark = self._upsert(entity, rows, mark)
+                if started is not None:
+                    new_mark = new_mark or _timestamp(started)
+                    self._conn.execute(
+                        "UPDATE sync_state SET high_water_mark = ?, synced_at = ? WHERE entity = ?",
+                        (new_mark, started, entity),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _upsert(
+        self, entity: str, rows: List[Dict[str, Any]], mark: Optional[str]
+    ) -> Optional[str]:
+        """Store rows inside an open transaction and return the new high-water mark."""
+        body_field = TEXT_FIELDS.get(entity)
+        for row in rows:
+            code = row.get("code") if isinstance(row, dict) else None
+            if not code:
+                continue
+            modified = row.get(MODIFIED_FIELD)
+            if isinstance(modified, str) and (mark is None or modified > mark):
+                mark = modified
+            # Upsert keeps the rowid stable, so it can key the full-text index
+            self._conn.execute(
+                "INSERT INTO rows VALUES (?, ?, ?, ?) ON CONFLICT (entity, code) "
+                "DO UPDATE SET data = excluded.data, modified_at = excluded.modified_at",
+                (entity, code, json.dumps(row, ensure_ascii=False, default=str), modified),
+            )
+            if body_field is None:
+                continue
+            (rowid,) = self._conn.execute(
+                "SELECT rowid FROM rows WHERE entity = ? AND code = ?", (entity, code)
+            ).fetchone()
+            self._conn.execute("DELETE FROM rows_fts WHERE rowid = ?", (rowid,))
+            self._conn.execute(
+                "INSERT INTO rows_fts (rowid, name, body) VALUES (?, ?, ?)",
+                (rowid, row.get("name") or "", html_to_text(row.get(body_field))),
+            )
+        return mark
+
+    def _miss(self, entity: str, reason: Any) -> None:
+        self.misses += 1
+        logger.debug(f"Mirror cannot answer {entity} query ({reason}); using the API")
+        return None
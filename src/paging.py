@@ -0,0 +1,210 @@
+"""Response budgets and continuation cursors for list tools."""
+
+import base64
+import binascii
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import parse_mapping
+
+# Bytes reserved for the response envelope (success flag, count, cursor)
+ENVELOPE_RESERVE = 512
+
+# Keys of the decoded cursor state: tool, arguments, offset, remaining rows,
+# and optionally the source that answered the first page
+CURSOR_KEYS = {"t", "a", "o", "r"}
+OPTIONAL_CURSOR_KEYS = {"s"}
+
+
+def encode_cursor(
+    tool: str, args: Dict[str, Any], offset: int, remaining: int, source: Optional[str] = None
+) -> str:
+    """
+    Encode an opaque continuation cursor.
+
+    Args:
+        tool: Tool name the cursor belongs to
+        args: Tool arguments defining the query (filters, view, ...)
+        offset: Slice offset of the next page
+        remaining: Rows still wanted out of the original limit
+        source: Source later pages must be read from ("mirror" or "api")
+
+    Returns:
+        URL-safe cursor string
+    """
+    state = {"t": tool, "a": args, "o": offset, "r": remaining}
+    if source is not None:
+        state["s"] = source
+    raw = json.dumps(state, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, tool: str) -> Tuple[Dict[str, Any], int, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Returns:
+        Tuple of tool arguments, offset and remaining rows
+
+    Raises:
+        ValueError: If the cursor is malformed or belongs to another tool
+    """
+    args, offset, remaining, _ = _decode_state(cursor, tool)
+    return args, offset, remaining
+
+
+def _decode_state(cursor: str, tool: str) -> Tuple[Dict[str, Any], int, int, Optional[str]]:
+    """Decode and check a cursor, also returning its source."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        keys = set(state) if isinstance(state, dict) else set()
+        if not CURSOR_KEYS <= keys <= CURSOR_KEYS | OPTIONAL_CURSOR_KEYS:
+            raise ValueError("Invalid cursor")
+        args, offset, remaining = state["a"], int(state["o"]), int(state["r"])
+        cursor_tool, source = state["t"], state.get("s")
+    except (binascii.Error, UnicodeError, ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if cursor_tool != tool:
+        raise ValueError(f"Cursor belongs to tool '{cursor_tool}', not '{tool}'")
+    if not isinstance(args, dict) or offset < 0 or remaining < 0:
+        raise ValueError("Invalid cursor")
+    if source is not None and not isinstance(source, str):
+        raise ValueError("Invalid cursor")
+    return args, offset, remaining, source
+
+
+class Page:
+    """One bounded page of a list tool call."""
+
+    def __init__(
+        self,
+        tool: str,
+        args: Dict[str, Any],
+        offset: int,
+        remaining: int,
+        size: int,
+        max_bytes: int,
+        source: Optional[str] = None,
+    ):
+        self.tool = tool
+        self.args = args
+        self.offset = offset
+        self.remaining = remaining
+        self.size = size
+        self.max_bytes = max_bytes
+        # Set by tools that can answer from more than one source; kept in the cursor
+        self.source = source
+
+
+class ResponseBudget:
+    """
+    Row and byte budgets for list tool responses.
+
+    Results larger than the budget are returned in pages with a cursor that
+    resumes the same query at the next slice offset.
+    """
+
+    def __init__(
+        self,
+        max_rows: int = 200,
+        max_bytes: int = 256 * 1024,
+        tool_rows: Optional[Dict[str, int]] = None,
+        tool_bytes: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Initialize budget.
+
+        Args:
+            max_rows: Default maximum rows per response
+            max_bytes: Default maximum serialized response size
+            tool_rows: Per-tool row budgets
+            tool_bytes: Per-tool byte budgets
+        """
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.tool_rows = tool_rows or {}
+        self.tool_bytes = tool_bytes or {}
+
+    @classmethod
+    def from_env(cls) -> "ResponseBudget":
+        """
+        Create budget from EVA_RESPONSE_MAX_ROWS, EVA_RESPONSE_MAX_BYTES and the
+        per-tool EVA_TOOL_MAX_ROWS / EVA_TOOL_MAX_BYTES ("eva_search_tasks=50") env vars.
+        """
+        return cls(
+            max_rows=int(os.getenv("EVA_RESPONSE_MAX_ROWS", "200")),
+            max_bytes=int(os.getenv("EVA_RESPONSE_MAX_BYTES", str(256 * 1024))),
+            tool_rows=parse_mapping(os.getenv("EVA_TOOL_MAX_ROWS", "")),
+            tool_bytes=parse_mapping(os.getenv("EVA_TOOL_MAX_BYTES", "")),
+        )
+
+    def page(self, tool: str, cursor: Optional[str], limit: int, **args: Any) -> Page:
+        """
+        Plan the next page of a list tool call.
+
+        Args:
+            tool: Tool name
+            cursor: Cursor from a previous response; its arguments replace args
+            limit: Total number of rows wanted
+            **args: Tool arguments defining the query
+
+        Returns:
+            Page with the effective arguments, slice offset and size
+
+        Raises:
+            ValueError: If the cursor is invalid, was made for a call with other
+                arguments, or args passed along with it differ from the cursor's
+        """
+        source = None
+        if cursor:
+            cursor_args, offset, remaining, source = _decode_state(cursor, tool)
+            if set(cursor_args) != set(args):
+                raise ValueError("Invalid cursor")
+            conflicting = sorted(
+                name
+                for name, value in args.items()
+                if value is not None and value != cursor_args[name]
+            )
+            if conflicting:
+                raise ValueError(f"Cursor does not match arguments: {', '.join(conflicting)}")
+            args = cursor_args
+        else:
+            offset, remaining = 0, max(0, limit)
+        size = min(remaining, self.tool_rows.get(tool, self.max_rows))
+        return Page(
+            tool, args, offset, remaining, size, self.tool_bytes.get(tool, self.max_bytes), source
+        )
+
+    def next_cursor(self, page: Page, returned: int, fetched: int) -> Optional[str]:
+        """
+        Build the continuation cursor after returning part of a page.
+
+        Args:
+            page: Page the rows were fetched for
+            returned: Number of rows included in the response
+            fetched: Number of rows the API returned for the page
+
+        Returns:
+            Cursor string, or None when the result is complete
+        """
+        remaining = page.remaining - returned
+        exhausted = fetched < page.size and returned == fetched
+        if remaining <= 0 or exhausted:
+            return None
+        return encode_cursor(page.tool, page.args, page.offset + returned, remaining, page.source)
+
+    def trim(self, page: Page, rows: List[Any], serializer) -> List[Any]:
+        """
+        Return the leading rows whose serialized size fits the page byte budget.
+
+        At least one row is always kept so that paging makes progress.
+        """
+        limit = page.max_bytes - ENVELOPE_RESERVE
+        total = 0
+        for index, row in enumerate(rows):
+            total += len(serializer.dumps(row).encode("utf-8")) + 1
+            if total > limit and index > 0:
+                return rows[:index]
+        return rows
@@ -0,0 +1,75 @@
+"""Field projection profiles - named field sets sent as `fields` to *.get and *.list."""
+
+from typing import Dict, List, Optional
+
+VIEWS = ("minimal", "summary", "full")
+
+# None means no `fields` argument, so Eva returns its default payload
+PROJECTIONS: Dict[str, Dict[str, Optional[List[str]]]] = {
+    "CmfTask": {
+        "minimal": ["code", "name"],
+        "summary": [
+            "code",
+            "name",
+            "status",
+            "responsible",
+            "priority",
+            "deadline",
+            "parent",
+            "lists",
+            "cmf_modified_at",
+        ],
+        "full": None,
+    },
+    "CmfProject": {
+        "minimal": ["code", "name"],
+        "summary": ["code", "name", "cmf_owner", "task_code_prefix", "activity", "cmf_modified_at"],
+        "full": None,
+    },
+    "CmfPerson": {
+        "minimal": ["code", "name"],
+        "summary": ["code", "name", "login", "email"],
+        "full": None,
+    },
+    "CmfDocument": {
+        "minimal": ["code", "name"],
+        "summary": ["code", "name", "parent", "responsible", "tags", "cmf_modified_at"],
+        "full": None,
+    },
+    "CmfComment": {
+        "minimal": ["code", "text"],
+        "summary": ["code", "text", "parent", "cmf_owner", "cmf_created_at"],
+        "full": None,
+    },
+    "CmfList": {
+        "minimal": ["code", "name"],
+        "summary": ["code", "name", "parent", "cmf_modified_at"],
+        "full": None,
+    },
+    "CmfAudit": {
+        "minimal": ["code", "object_code", "cmf_created_at"],
+        "summary": ["code", "object_code", "action", "cmf_owner", "cmf_created_at"],
+        "full": None,
+    },
+}
+
+
+def fields_for(entity: str, view: Optional[str]) -> Optional[List[str]]:
+    """
+    Resolve a view name to the field list for an entity.
+
+    Args:
+        entity: Entity name (e.g., "CmfTask")
+        view: One of VIEWS, or None for the full payload
+
+    Returns:
+        Field list, or None to request Eva's default payload
+
+    Raises:
+        ValueError: If view is unknown
+    """
+    if view is None:
+        return None
+    if view not in VIEWS:
+        raise ValueError(f"Unknown view '{view}', expected one of: {', '.join(VIEWS)}")
+    return PROJECTIONS.get(entity, {}).get(view)
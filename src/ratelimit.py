@@ -0,0 +1,241 @@
+"""Client-side rate limiting (token buckets) and bulkheads for Eva API calls."""
+
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Callable, Dict, Optional
+
+from config import parse_mapping
+
+BULK = "bulk"
+INTERACTIVE = "interactive"
+
+_bulk = contextvars.ContextVar("eva_bulk", default=False)
+
+
+@contextmanager
+def bulk():
+    """
+    Mark API calls made inside the block as bulk traffic.
+
+    Bulk calls (bulk fetches, pagination, audit polling) run in their own
+    bulkhead so they cannot starve interactive calls. The flag is kept in a
+    context variable, so it follows asyncio tasks created inside the block.
+    """
+    token = _bulk.set(True)
+    try:
+        yield
+    finally:
+        _bulk.reset(token)
+
+
+def current_pool() -> str:
+    """Return the bulkhead pool of the current context: bulk or interactive."""
+    return BULK if _bulk.get() else INTERACTIVE
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Callers reserve a token and receive the time to wait for it, so the same
+    bucket serves threads (time.sleep) and coroutines (asyncio.sleep).
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize bucket.
+
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity (default: max(1, rate))
+            clock: Monotonic time source (for tests)
+        """
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take one token, possibly from the future.
+
+        Returns:
+            Seconds to wait before the reserved token becomes available
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class RateLimiter:
+    """
+    Global and per-method-family request rates.
+
+    A family is either a full method name ("CmfTask.get") or an entity
+    ("CmfAudit"); the most specific configured family applies in addition to
+    the global rate.
+    """
+
+    def __init__(
+        self,
+        rate: float = 0,
+        burst: Optional[float] = None,
+        family_rates: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize limiter.
+
+        Args:
+            rate: Global requests per second (0 disables the global limit)
+            burst: Global burst size (default: max(1, rate))
+            family_rates: Requests per second per method or entity
+            clock: Monotonic time source (for tests)
+        """
+        self._global = TokenBucket(rate, burst, clock) if rate > 0 else None
+        self._families = {
+            family: TokenBucket(family_rate, clock=clock)
+            for family, family_rate in (family_rates or {}).items()
+            if family_rate > 0
+        }
+        self._lock = threading.Lock()
+        self.throttled = 0
+        self.wait_total = 0.0
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        """
+        Create limiter from EVA_RATE_LIMIT, EVA_RATE_BURST and EVA_RATE_LIMITS
+        ("CmfAudit=2,CmfTask.get=20") env vars; rates are requests per second.
+        """
+        burst = os.getenv("EVA_RATE_BURST")
+        return cls(
+            rate=float(os.getenv("EVA_RATE_LIMIT", "0")),
+            burst=float(burst) if burst else None,
+            family_rates=parse_mapping(os.getenv("EVA_RATE_LIMITS", ""), cast=float),
+        )
+
+    def _family(self, method: str) -> Optional[TokenBucket]:
+        return self._families.get(method) or self._families.get(method.split(".", 1)[0])
+
+    def reserve(self, method: str) -> float:
+        """
+        Reserve capacity for one request.
+
+        Returns:
+            Seconds to wait before sending the request
+        """
+        delay = 0.0
+        for bucket in (self._global, self._family(method)):
+            if bucket is not None:
+                delay = max(delay, bucket.reserve())
+        if delay > 0:
+            with self._lock:
+                self.throttled += 1
+                self.wait_total += delay
+        return delay
+
+    def stats(self) -> Dict[str, Any]:
+        """Return number of delayed requests and total delay."""
+        return {"throttled": self.throttled, "wait_total_s": round(self.wait_total, 3)}
+
+
+def _pool_limits(bulk_limit: Optional[int], interactive_limit: Optional[int]) -> Dict[str, int]:
+    return {
+        BULK: bulk_limit if bulk_limit is not None else int(os.getenv("EVA_BULK_CONCURRENCY", "4")),
+        INTERACTIVE: (
+            interactive_limit
+            if interactive_limit is not None
+            else int(os.getenv("EVA_INTERACTIVE_CONCURRENCY", "16"))
+        ),
+    }
+
+
+class Bulkheads:
+    """
+    Separate concurrency pools for bulk and interactive calls (threads).
+
+    A limit of 0 leaves the pool unbounded.
+    """
+
+    def __init__(self, bulk_limit: Optional[int] = None, interactive_limit: Optional[int] = None):
+        """
+        Initialize pools.
+
+        Args:
+            bulk_limit: Concurrent bulk requests (default: from EVA_BULK_CONCURRENCY env var or 4)
+            interactive_limit: Concurrent interactive requests
+                (default: from EVA_INTERACTIVE_CONCURRENCY env var or 16)
+        """
+        self.limits = _pool_limits(bulk_limit, interactive_limit)
+        self._semaphores = {
+            pool: threading.BoundedSemaphore(limit)
+            for pool, limit in self.limits.items()
+            if limit > 0
+        }
+        self._lock = threading.Lock()
+        self.in_flight = {pool: 0 for pool in self.limits}
+
+    @contextmanager
+    def slot(self, pool: str):
+        """Hold a slot of the given pool for the duration of the block."""
+        semaphore = self._semaphores.get(pool)
+        if semaphore is not None:
+            semaphore.acquire()
+        with self._lock:
+            self.in_flight[pool] += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight[pool] -= 1
+            if semaphore is not None:
+                semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return limit and requests in flight per pool."""
+        return {
+            pool: {"limit": self.limits[pool], "in_flight": self.in_flight[pool]}
+            for pool in self.limits
+        }
+
+
+class AsyncBulkheads(Bulkheads):
+    """Separate concurrency pools for bulk and interactive calls (asyncio)."""
+
+    def __init__(self, bulk_limit: Optional[int] = None, interactive_limit: Optional[int] = None):
+        self.limits = _pool_limits(bulk_limit, interactive_limit)
+        self._semaphores = {
+            pool: asyncio.Semaphore(limit) for pool, limit in self.limits.items() if limit > 0
+        }
+        self.in_flight = {pool: 0 for pool in self.limits}
+
+    @asynccontextmanager
+    async def slot(self, pool: str):
+        """Hold a slot of the given pool for the duration of the block."""
+        semaphore = self._semaphores.get(pool)
+        if semaphore is not None:
+            await semaphore.acquire()
+        self.in_flight[pool] += 1
+        try:
+            yield
+        finally:
+            self.in_flight[pool] -= 1
+            if semaphore is not None:
+                semaphore.release()
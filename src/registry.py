@@ -0,0 +1,675 @@
+"""Tool and API method registry - built once at import from the Eva OpenAPI spec."""
+
+import functools
+import json
+import sys
+import textwrap
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from api_methods import METHODS
+from projections import VIEWS
+from tracing import enabled as tracing_enabled, traced
+from validation import compile_validator
+
+# Actions of idempotent reads; every other Eva API action modifies data
+READ_ACTIONS = ("get", "list", "count")
+
+# Spec methods that only read data although their action is not a read action.
+# The spec marks every method as a POST, so these are listed explicitly.
+READ_ONLY_METHODS = frozenset({"CmfDocument.download_all_attachment"})
+
+# Markers of writes among methods missing from the spec
+_WRITE_MARKERS = ("create", "update", "delete", "append", "set_", "do_")
+
+READ_METHODS = frozenset(
+    method
+    for method in METHODS
+    if method.rsplit(".", 1)[-1] in READ_ACTIONS or method in READ_ONLY_METHODS
+)
+WRITE_METHODS = frozenset(METHODS) - READ_METHODS
+
+
+def is_read_method(method: str) -> bool:
+    """Check if an API method is an idempotent read (get, list, count or a listed download)."""
+    if method in READ_METHODS:
+        return True
+    if method in WRITE_METHODS:
+        return False
+    return method.rsplit(".", 1)[-1] in READ_ACTIONS
+
+
+def is_write_method(method: str) -> bool:
+    """
+    Check if an API method modifies data.
+
+    Methods in the spec are classified by action and READ_ONLY_METHODS; others
+    by name markers ("create", "update", "set_", ...). Those are checked on
+    every call rather than memoized, so arbitrary names cannot grow memory.
+    """
+    if method in WRITE_METHODS:
+        return True
+    if method in READ_METHODS:
+        return False
+    lowered = method.lower()
+    return any(marker in lowered for marker in _WRITE_MARKERS)
+
+
+# Shared schema of the optional field profile argument
+VIEW_SCHEMA = {
+    "type": "string",
+    "enum": list(VIEWS),
+    "description": (
+        "Field profile: minimal (code and name), summary (key fields) or full (all fields)"
+    ),
+}
+
+# Shared schema of the continuation cursor argument of list tools
+CURSOR_SCHEMA = {
+    "type": "string",
+    "description": "next_cursor from a previous truncated response to fetch the following page",
+}
+
+# Shared schema of the consistency argument of tools answered from the local mirror
+CONSISTENCY_SCHEMA = {
+    "type": "string",
+    "enum": ["eventual", "strong"],
+    "description": (
+        "eventual (default) may answer from the local mirror within its freshness bound, "
+        "strong always queries the API"
+    ),
+}
+
+# Shared schema of the mode argument of search tools
+SEARCH_MODE_SCHEMA = {
+    "type": "string",
+    "enum": ["filter", "ranked"],
+    "description": (
+        "filter (default) matches the query in names; ranked uses the local full-text index "
+        "over names and bodies, best matches first"
+    ),
+}
+
+# Shared schema of the explicit field list of generic entity tools
+FIELDS_SCHEMA = {
+    "type": "array",
+    "items": {"type": "string"},
+    "description": "Fields to return (default: Eva's default payload)",
+}
+
+
+class ToolSpec:
+    """
+    Static description of one MCP tool, its compiled argument validator and the
+    EvaTools method serving it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: str,
+        api_method: str,
+        description: str,
+        input_schema: Dict[str, Any],
+        bound: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Initialize tool spec.
+
+        Args:
+            name: MCP tool name
+            handler: Name of the EvaTools / AsyncEvaTools method
+            api_method: Main Eva API method called by the tool, used to classify it as read or write
+            description: Tool description shown to the model
+            input_schema: JSON schema of the tool arguments
+            bound: Keyword arguments bound to the handler (generic entity tools)
+        """
+        self.name = name
+        self.handler = handler
+        self.api_method = api_method
+        self.description = description
+        self.input_schema = input_schema
+        self.bound = bound or {}
+        self.read_only = not is_write_method(api_method)
+        self.validate = compile_validator(name, input_schema)
+
+
+TOOL_SPECS: List[ToolSpec] = [
+    # Task tools
+    ToolSpec(
+        name="eva_search_tasks",
+        handler="search_tasks",
+        api_method="CmfTask.list",
+        description=(
+            "Search and list tasks with optional filters (query, project, responsible, status)"
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "Search query text"},
+                "project": {"type": "string", "description": "Filter by project code"},
+                "responsible": {"type": "string", "description": "Filter by responsible user"},
+                "status": {"type": "string", "description": "Filter by task status"},
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of results",
+                    "default": 20,
+                },
+                "view": VIEW_SCHEMA,
+                "cursor": CURSOR_SCHEMA,
+                "consistency": CONSISTENCY_SCHEMA,
+                "mode": SEARCH_MODE_SCHEMA,
+            },
+        },
+    ),
+    ToolSpec(
+        name="eva_get_task",
+        handler="get_task_details",
+        api_method="CmfTask.get",
+        description="Get detailed information about a specific task by code",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "task_code": {"type": "string", "description": "Task code/ID"},
+                "view": VIEW_SCHEMA,
+            },
+            "required": ["task_code"],
+        },
+    ),
+    ToolSpec(
+        name="eva_get_tasks",
+        handler="get_tasks",
+        api_method="CmfTask.list",
+        description="Get several tasks by code in one request; reports codes that were not found",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "task_codes": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Task codes",
+                },
+                "view": VIEW_SCHEMA,
+            },
+            "required": ["task_codes"],
+        },
+    ),
+    ToolSpec(
+        name="eva_count_tasks",
+        handler="count_tasks_by_filter",
+        api_method="CmfTask.count",
+        description="Count tasks matching filters",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "project": {"type": "string", "description": "Filter by project code"},
+                "responsible": {"type": "string", "description": "Filter by responsible user"},
+                "status": {"type": "string", "description": "Filter by task status"},
+                "consistency": CONSISTENCY_SCHEMA,
+            },
+        },
+    ),
+    ToolSpec(
+        name="eva_create_task",
+        handler="create_task",
+        api_method="CmfTask.create",
+        description=(
+            "Create a new task (WARNING: write operation, requires read_only=False). "
+            "For tasks in sprints, provide BOTH project_code and lists for proper linking."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "name": {"type": "string", "description": "Task name/title"},
+                "project_code": {
+                    "type": "string",
+                    "description": (
+                        "Parent project code. "
+                        "Required for sprint tasks to properly link to project."
+                    ),
+                },
+                "lists": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": (
+                        "List of sprint/list codes to add task to (e.g., ['SPR-000929']). "
+                        "Use with project_code for proper linking."
+                    ),
+                },
+                "description": {"type": "string", "description": "Task description (HTML)"},
+                "responsible": {"type": "string", "description": "Responsible user email/login"},
+                "priority": {"type": "integer", "description": "Task priority (0-5)"},
+            },
+            "required": ["name"],
+        },
+    ),
+    ToolSpec(
+        name="eva_update_task",
+        handler="update_task",
+        api_method="CmfTask.update",
+        description="Update an existing task (WARNING: write operation, requires read_only=False)",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "task_code": {"type": "string", "description": "Task code to update"},
+                "name": {"type": "string", "description": "New task name"},
+                "description": {"type": "string", "description": "New task description (HTML)"},
+                "responsible": {"type": "string", "description": "New responsible user"},
+                "status": {"type": "string", "description": "New task status"},
+                "priority": {"type": "integer", "description": "New task priority (0-5)"},
+            },
+            "required": ["task_code"],
+        },
+    ),
+    # Project tools
+    ToolSpec(
+        name="eva_list_projects",
+        handler="list_projects",
+        api_method="CmfProject.list",
+        description="List all projects",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of results",
+                    "default": 20,
+                },
+                "view": VIEW_SCHEMA,
+                "cursor": CURSOR_SCHEMA,
+            },
+        },
+    ),
+    ToolSpec(
+        name="eva_get_project",
+        handler="get_project_details",
+        api_method="CmfProject.get",
+        description="Get detailed information about a specific project by code",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "project_code": {"type": "string", "description": "Project code/ID"},
+                "view": VIEW_SCHEMA,
+            },
+            "required": ["project_code"],
+        },
+    ),
+    ToolSpec(
+        name="eva_get_projects",
+        handler="get_projects",
+        api_method="CmfProject.list",
+        description=(
+            "Get several projects by code in one request; reports codes that were not found"
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "project_codes": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Project codes",
+                },
+                "view": VIEW_SCHEMA,
+            },
+            "required": ["project_codes"],
+        },
+    ),
+    # User tools
+    ToolSpec(
+        name="eva_list_users",
+        handler="list_users",
+        api_method="CmfPerson.list",
+        description="List all users",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of results",
+                    "default": 50,
+                },
+                "view": VIEW_SCHEMA,
+                "cursor": CURSOR_SCHEMA,
+            },
+        },
+    ),
+    ToolSpec(
+        name="eva_get_user",
+        handler="get_user_details",
+        api_method="CmfPerson.get",
+        description="Get detailed information about a specific user",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "user_code": {"type": "string", "description": "User code/email/login"},
+                "view": VIEW_SCHEMA,
+            },
+            "required": ["user_code"],
+        },
+    ),
+    ToolSpec(
+        name="eva_get_users",
+        handler="get_users",
+        api_method="CmfPerson.list",
+        description="Get several users by code in one request; reports codes that were not found",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "user_codes": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "User codes",
+                },
+                "view": VIEW_SCHEMA,
+            },
+            "required": ["user_codes"],
+        },
+    ),
+    # Document tools
+    ToolSpec(
+        name="eva_search_documents",
+        handler="search_documents",
+        api_method="CmfDocument.list",
+        description="Search and list documents with optional filters",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "Search query text"},
+                "project": {"type": "string", "description": "Filter by project code"},
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of results",
+                    "default": 20,
+                },
+                "view": VIEW_SCHEMA,
+                "cursor": CURSOR_SCHEMA,
+                "mode": SEARCH_MODE_SCHEMA,
+            },
+        },
+    ),
+    ToolSpec(
+        name="eva_get_document",
+        handler="get_document_details",
+        api_method="CmfDocument.get",
+        description="Get detailed information about a specific document",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "document_code": {"type": "string", "description": "Document code/ID"},
+                "view": VIEW_SCHEMA,
+            },
+            "required": ["document_code"],
+        },
+    ),
+    # Comment tools
+    ToolSpec(
+        name="eva_get_comments",
+        handler="get_comments",
+        api_method="CmfComment.list",
+        description="Get comments for a task or document",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "parent_code": {"type": "string", "description": "Parent task or document code"},
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of results",
+                    "default": 50,
+                },
+                "view": VIEW_SCHEMA,
+                "cursor": CURSOR_SCHEMA,
+            },
+            "required": ["parent_code"],
+        },
+    ),
+    ToolSpec(
+        name="eva_add_comment",
+        handler="add_comment",
+        api_method="CmfComment.create",
+        description=(
+            "Add a comment to a task or document "
+            "(WARNING: write operation, requires read_only=False)"
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "parent_code": {"type": "string", "description": "Parent task or document code"},
+                "text": {"type": "string", "description": "Comment text (HTML)"},
+            },
+            "required": ["parent_code", "text"],
+        },
+    ),
+    # Sprint/List tools
+    ToolSpec(
+        name="eva_list_sprints",
+        handler="list_sprints",
+        api_method="CmfList.list",
+        description="List all sprints/lists",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of results",
+                    "default": 50,
+                },
+                "view": VIEW_SCHEMA,
+                "cursor": CURSOR_SCHEMA,
+            },
+        },
+    ),
+    ToolSpec(
+        name="eva_get_sprint",
+        handler="get_sprint_details",
+        api_method="CmfList.get",
+        description="Get detailed information about a specific sprint/list",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "list_code": {"type": "string", "description": "Sprint/list code"},
+                "view": VIEW_SCHEMA,
+            },
+            "required": ["list_code"],
+        },
+    ),
+    ToolSpec(
+        name="eva_create_list",
+        handler="create_list",
+        api_method="CmfList.create",
+        description=(
+            "Create a new list/sprint/release (WARNING: write operation, requires read_only=False)"
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "name": {"type": "string", "description": "List name/title"},
+                "project_code": {
+                    "type": "string",
+                    "description": "Parent project code (e.g., CmfProject:...)",
+                },
+            },
+            "required": ["name", "project_code"],
+        },
+    ),
+    # Audit tools
+    ToolSpec(
+        name="eva_get_audit_log",
+        handler="get_audit_log",
+        api_method="CmfAudit.list",
+        description="Get audit log entries with optional filters",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "entity_code": {"type": "string", "description": "Filter by specific entity code"},
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of results",
+                    "default": 50,
+                },
+                "view": VIEW_SCHEMA,
+                "cursor": CURSOR_SCHEMA,
+            },
+        },
+    ),
+]
+
+# Entities without dedicated tools, exposed as generic list/get tools:
+# entity -> (singular name, plural name, description)
+GENERIC_ENTITIES = {
+    "CmfAttachment": ("attachment", "attachments", "file attachments"),
+    "CmfStatusHistory": ("status_change", "status_history", "status change history entries"),
+    "CmfTimeTrackerHistory": ("time_entry", "time_entries", "time tracking entries"),
+}
+
+
+def generic_tool_specs(entities: Dict[str, tuple] = GENERIC_ENTITIES) -> List[ToolSpec]:
+    """Build list and get tools for entities whose methods are in the spec."""
+    specs = []
+    for entity, (singular, plural, title) in entities.items():
+        if f"{entity}.list" in METHODS:
+            name = f"eva_list_{plural}"
+            specs.append(
+                ToolSpec(
+                    name=name,
+                    handler="list_entities",
+                    api_method=f"{entity}.list",
+                    description=f"List {title} ({entity}) with optional filters",
+                    input_schema={
+                        "type": "object",
+                        "properties": {
+                            "parent": {
+                                "type": "string",
+                                "description": "Filter by parent object code",
+                            },
+                            "filters": {
+                                "type": "array",
+                                "items": {"type": "array", "minItems": 3, "maxItems": 3},
+                                "description": "Eva filters as [field, operator, value] triples",
+                            },
+                            "order_by": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Sort fields, prefixed with - for descending order",
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "description": "Maximum number of results",
+                                "default": 50,
+                            },
+                            "fields": FIELDS_SCHEMA,
+                            "cursor": CURSOR_SCHEMA,
+                        },
+                    },
+                    bound={"entity": entity, "tool": name, "key": plural},
+                )
+            )
+        if f"{entity}.get" in METHODS:
+            specs.append(
+                ToolSpec(
+                    name=f"eva_get_{singular}",
+                    handler="get_entity",
+                    api_method=f"{entity}.get",
+                    description=f"Get one of the {title} ({entity}) by code",
+                    input_schema={
+                        "type": "object",
+                        "properties": {
+                            "code": {"type": "string", "description": f"{entity} code"},
+                            "fields": FIELDS_SCHEMA,
+                        },
+                        "required": ["code"],
+                    },
+                    bound={"entity": entity, "key": singular},
+                )
+            )
+    return specs
+
+
+class ToolRegistry:
+    """Tool specs by name with handlers resolved once per tools instance."""
+
+    def __init__(self, specs: Iterable[ToolSpec]):
+        self.specs: Dict[str, ToolSpec] = {}
+        for spec in specs:
+            if spec.name in self.specs:
+                raise ValueError(f"Duplicate tool name '{spec.name}'")
+            self.specs[spec.name] = spec
+
+    def __iter__(self) -> Iterator[ToolSpec]:
+        return iter(self.specs.values())
+
+    def __len__(self) -> int:
+        return len(self.specs)
+
+    def get(self, name: str) -> Optional[ToolSpec]:
+        """Return the spec of a tool, or None if unknown."""
+        return self.specs.get(name)
+
+    def bind(self, tools) -> Dict[str, Callable[..., Any]]:
+        """
+        Resolve every tool to a callable on an EvaTools or AsyncEvaTools instance.
+
+        Returns:
+            Mapping of tool name to handler, built once and reused for every call
+
+        While tracing is enabled, each handler runs in a span named after its method.
+        """
+        handlers = {}
+        for spec in self:
+            handler = getattr(tools, spec.handler)
+            if tracing_enabled():
+                handler = traced(f"{type(tools).__name__}.{spec.handler}", handler)
+            handlers[spec.name] = (
+                functools.partial(handler, **spec.bound) if spec.bound else handler
+            )
+        return handlers
+
+
+REGISTRY = ToolRegistry(TOOL_SPECS + generic_tool_specs())
+
+
+def generate_methods(spec_path: str) -> str:
+    """
+    Render api_methods.py from an Eva OpenAPI spec.
+
+    Args:
+        spec_path: Path to the OpenAPI JSON file (e.g., oas_evateam_v1_9_22.json)
+
+    Returns:
+        Python source of the compact method table
+    """
+    with open(spec_path, encoding="utf-8") as f:
+        spec = json.load(f)
+
+    spec_name = spec_path.rsplit("/", 1)[-1]
+    lines = [
+        f'"""Eva API methods and their keyword arguments, generated from {spec_name}.',
+        "",
+        "Regenerate with: python src/registry.py oas_evateam_v1_9_22.json > src/api_methods.py",
+        '"""',
+        "",
+        f'API_VERSION = "{spec["info"]["version"]}"',
+        "",
+        "METHODS = {",
+    ]
+    for path, operations in spec["paths"].items():
+        method = path.split("?m=", 1)[1]
+        schema = operations["post"]["requestBody"]["content"]["application/json"]["schema"]
+        kwargs = schema["properties"].get("kwargs", {}).get("properties", {})
+        names = ", ".join(f'"{name}"' for name in kwargs) + ("," if len(kwargs) == 1 else "")
+        line = f'    "{method}": ({names}),'
+        if len(line) <= 100:
+            lines.append(line)
+        else:
+            lines.append(f'    "{method}": (')
+            lines.extend(
+                f"        {chunk}"
+                for chunk in textwrap.wrap(names + ",", 92, break_on_hyphens=False)
+            )
+            lines.append("    ),")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+if __name__ == "__main__":
+    sys.stdout.write(
+        generate_methods(sys.argv[1] if len(sys.argv) > 1 else "oas_evateam_v1_9_22.json")
+    )
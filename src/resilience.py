@@ -0,0 +1,255 @@
+"""Retries with exponential backoff and a circuit breaker for Eva API calls."""
+
+import logging
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETRY_STATUSES = (429, 502, 503, 504)
+
+
+def parse_retry_after(
+    value: Optional[str], clock: Callable[[], float] = time.time
+) -> Optional[float]:
+    """
+    Parse a Retry-After header given in seconds or as an HTTP date.
+
+    Returns:
+        Delay in seconds, or None if the header is missing or malformed
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - clock())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Retry policy for idempotent read calls.
+
+    Delays grow exponentially with full jitter: attempt n waits a random time
+    between 0 and min(max_delay, base_delay * 2**n). A Retry-After hint from
+    the server replaces the computed delay; hints longer than max_delay are
+    not waited for and the error is returned instead.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 0.2,
+        max_delay: float = 10.0,
+        retry_statuses: Iterable[int] = DEFAULT_RETRY_STATUSES,
+        rng: Callable[[], float] = random.random,
+    ):
+        """
+        Initialize retry policy.
+
+        Args:
+            max_retries: Retries after the first attempt (0 disables retries)
+            base_delay: Initial backoff in seconds
+            max_delay: Maximum backoff and maximum honored Retry-After in seconds
+            retry_statuses: HTTP statuses treated as transient
+            rng: Random source returning floats in [0, 1) (for tests)
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = frozenset(retry_statuses)
+        self._rng = rng
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.exhausted = 0
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        """
+        Create policy from EVA_RETRY_MAX, EVA_RETRY_BASE_DELAY, EVA_RETRY_MAX_DELAY
+        and EVA_RETRY_STATUSES ("429,502,503,504") env vars.
+        """
+        statuses = os.getenv("EVA_RETRY_STATUSES", "")
+        return cls(
+            max_retries=int(os.getenv("EVA_RETRY_MAX", "3")),
+            base_delay=float(os.getenv("EVA_RETRY_BASE_DELAY", "0.2")),
+            max_delay=float(os.getenv("EVA_RETRY_MAX_DELAY", "10")),
+            retry_statuses=(
+                [int(status) for status in statuses.split(",") if status.strip()]
+                if statuses
+                else DEFAULT_RETRY_STATUSES
+            ),
+        )
+
+    def is_retryable_status(self, status: int) -> bool:
+        """Check if an HTTP status is transient."""
+        return status in self.retry_statuses
+
+    def next_delay(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Decide whether to retry after a failed attempt.
+
+        Args:
+            attempt: Number of the failed attempt, starting at 0
+            retry_after: Server-provided Retry-After delay in seconds
+
+        Returns:
+            Seconds to wait before the next attempt, or None to give up
+        """
+        if attempt >= self.max_retries or (
+            retry_after is not None and retry_after > self.max_delay
+        ):
+            with self._lock:
+                self.exhausted += 1
+            return None
+        with self._lock:
+            self.retries += 1
+        if retry_after is not None:
+            return retry_after
+        return self._rng() * min(self.max_delay, self.base_delay * (2**attempt))
+
+    def stats(self) -> Dict[str, int]:
+        """Return number of retries and of calls that failed after giving up."""
+        return {"retries": self.retries, "exhausted": self.exhausted}
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker.
+
+    After failure_threshold consecutive transient failures the circuit opens and
+    calls fail fast. Once reset_timeout has passed, up to half_open_max probe
+    calls are let through: a success closes the circuit, a failure opens it
+    again for another reset_timeout.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_max: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit (0 disables the breaker)
+            reset_timeout: Seconds the circuit stays open before probing
+            half_open_max: Concurrent probe calls allowed while half-open
+            clock: Monotonic time source (for tests)
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max = half_open_max
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self.trips = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_env(cls) -> "CircuitBreaker":
+        """
+        Create breaker from EVA_BREAKER_THRESHOLD, EVA_BREAKER_RESET and
+        EVA_BREAKER_HALF_OPEN env vars.
+        """
+        return cls(
+            failure_threshold=int(os.getenv("EVA_BREAKER_THRESHOLD", "5")),
+            reset_timeout=float(os.getenv("EVA_BREAKER_RESET", "30")),
+            half_open_max=int(os.getenv("EVA_BREAKER_HALF_OPEN", "1")),
+        )
+
+    @property
+    def state(self) -> str:
+        """Current state: closed, open or half_open."""
+        with self._lock:
+            self._advance()
+            return self._state
+
+    def _advance(self) -> None:
+        """Move an open circuit to half-open once the reset timeout has passed (lock held)."""
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probes = 0
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may proceed; while half-open this reserves a probe slot.
+
+        Returns:
+            False if the call must fail fast
+        """
+        if self.failure_threshold <= 0:
+            return True
+        with self._lock:
+            self._advance()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and self._probes < self.half_open_max:
+                self._probes += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def release(self) -> None:
+        """
+        Return the probe slot of an allowed call that ended without an outcome.
+
+        Calls cancelled or failed locally neither close nor reopen the circuit;
+        without this a half-open circuit would keep rejecting every call.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def record_success(self) -> None:
+        """Record a successful call, closing a half-open circuit."""
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info("Eva API circuit closed")
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        """Record a transient failure; opens the circuit at the threshold or on a failed probe."""
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or (
+                self._state == self.CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self.trips += 1
+                logger.warning(
+                    f"Eva API circuit opened after {self._failures} consecutive failures; "
+                    f"failing fast for {self.reset_timeout}s"
+                )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return state, consecutive failures, number of trips and rejected calls."""
+        with self._lock:
+            self._advance()
+            return {
+                "state": self._state,
+                "failures": self._failures,
+                "trips": self.trips,
+                "rejected": self.rejected,
+            }
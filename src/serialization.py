@@ -0,0 +1,90 @@
+"""JSON serialization of tool responses - compact by default, orjson when available."""
+
+import json
+import logging
+import os
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+class JSONSerializer:
+    """Serializer based on the standard library json module."""
+
+    name = "json"
+
+    def __init__(self, indent: Optional[int] = None):
+        """
+        Initialize serializer.
+
+        Args:
+            indent: Indentation for pretty output (default: compact)
+        """
+        self.indent = indent or None
+        self._separators = None if self.indent else (",", ":")
+
+    def dumps(self, obj: Any) -> str:
+        """Serialize object to a JSON string, keeping non-ASCII characters."""
+        return json.dumps(
+            obj, ensure_ascii=False, indent=self.indent, separators=self._separators, default=str
+        )
+
+
+class OrjsonSerializer:
+    """Serializer based on orjson (optional dependency)."""
+
+    name = "orjson"
+
+    def __init__(self, indent: Optional[int] = None):
+        """
+        Initialize serializer.
+
+        Args:
+            indent: Any truthy value enables 2-space indentation (orjson supports only 2)
+        """
+        if orjson is None:
+            raise ImportError("orjson is not installed. Install with: pip install orjson")
+        self.indent = 2 if indent else None
+        self._option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+
+    def dumps(self, obj: Any) -> str:
+        """Serialize object to a JSON string."""
+        return orjson.dumps(obj, default=str, option=self._option).decode("utf-8")
+
+
+def get_serializer(backend: Optional[str] = None, indent: Optional[int] = None):
+    """
+    Create a serializer.
+
+    Args:
+        backend: "orjson", "json" or "auto" (default: from EVA_JSON_BACKEND env var or auto)
+        indent: Indentation, 0 for compact output (default: from EVA_JSON_INDENT env var or 0)
+
+    Returns:
+        Serializer with a dumps(obj) -> str method
+    """
+    backend = (backend or os.getenv("EVA_JSON_BACKEND", "auto")).lower()
+    if indent is None:
+        indent = int(os.getenv("EVA_JSON_INDENT", "0"))
+
+    if backend == "orjson" or (backend == "auto" and orjson is not None):
+        return OrjsonSerializer(indent=indent)
+    if backend not in ("json", "auto"):
+        raise ValueError(f"Unknown JSON backend '{backend}', expected auto, orjson or json")
+    return JSONSerializer(indent=indent)
+
+
+_default_serializer = None
+
+
+def dumps(obj: Any) -> str:
+    """Serialize object with the process-wide default serializer."""
+    global _default_serializer
+    if _default_serializer is None:
+        _default_serializer = get_serializer()
+    return _default_serializer.dumps(obj)
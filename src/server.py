@@ -4,7 +4,8 @@ import asyncio
 import logging
 import os
 import sys
-from typing import Any
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Optional
 from pathlib import Path
 
 # Add src directory to path if running as script
@@ -15,350 +16,359 @@ if __name__ == "__main__":
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
-from mcp.types import Tool, TextContent
+from mcp.types import Resource, Tool, TextContent
 
-from eva_client import EvaClient
-from tools import EvaTools
+from config import load_env
+import tracing
+from metrics import Metrics, MetricsExporter, is_error_response
+from registry import REGISTRY
+from serialization import dumps
+
+try:
+    from mcp.server.lowlevel.helper_types import ReadResourceContents
+except ImportError:  # mcp < 1.3 reads resources as plain strings
+    ReadResourceContents = None
+
+try:
+    from mcp.types import ToolAnnotations
+except ImportError:  # mcp < 1.6
+    ToolAnnotations = None
+
+# The client stack is imported on first use (see initialize_client), so the
+# server can answer initialize and list_tools without loading it
+if TYPE_CHECKING:
+    from changefeed import AuditChangeFeed
+    from dispatcher import ToolDispatcher
+    from eva_client import AsyncEvaClient
+    from mirror import Mirror
+    from tools import AsyncEvaTools
 
 # Configure logging
 logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
 # Initialize MCP server
 app = Server("eva-mcp-server")
 
-# Global client and tools instances
-eva_client: EvaClient = None
-eva_tools: EvaTools = None
+# Global client and tools instances, created lazily by ensure_client()
+eva_client: "AsyncEvaClient" = None
+eva_tools: "AsyncEvaTools" = None
+dispatcher: "ToolDispatcher" = None
+change_feed: "AuditChangeFeed" = None
+mirror: "Mirror" = None
+tool_handlers: Dict[str, Callable[..., Any]] = None
+_client_lock: Optional[asyncio.Lock] = None
+
+# Per-tool and per-API-method metrics, created in main() unless EVA_METRICS=false
+metrics: Optional[Metrics] = None
+
+METRICS_URI = "eva://metrics"
+PROMETHEUS_URI = "eva://metrics/prometheus"
+
+
+def build_cache(api_url: str, api_token: str):
+    """Create the response cache: memory only, or backed by SQLite when EVA_DISK_CACHE=true."""
+    from cache import MemoryCache
+    from diskcache import SQLiteCache, TieredCache, cache_namespace
+
+    memory = MemoryCache.from_env()
+    if os.getenv("EVA_DISK_CACHE", "false").lower() != "true":
+        return memory
+    disk = SQLiteCache.from_env(namespace=cache_namespace(api_url, api_token))
+    logger.info(f"Disk cache enabled: {disk.path}")
+    return TieredCache(memory, disk)
 
 
 def initialize_client():
-    """Initialize Eva API client and tools."""
-    global eva_client, eva_tools
-    
-    try:
-        # Get configuration from environment
-        api_url = os.getenv("EVA_API_URL", "https://your-eva-instance.com/api")
-        api_token = os.getenv("EVA_API_TOKEN")
-        # По умолчанию запись разрешена (false), явно укажите "true" для read-only режима
-        read_only = os.getenv("EVA_READ_ONLY", "false").lower() == "true"
-        
-        logger.info(f"Initializing Eva MCP Server...")
-        logger.info(f"API URL: {api_url}")
-        logger.info(f"Read-only mode: {read_only}")
-        logger.info(f"Token present: {bool(api_token)}")
-        
-        if not api_token:
-            logger.error("EVA_API_TOKEN environment variable is required")
-            sys.exit(1)
-        
-        # Initialize client
-        eva_client = EvaClient(
-            api_url=api_url,
-            api_token=api_token,
-            read_only=read_only
+    """
+    Initialize Eva API client and tools.
+
+    Raises:
+        ValueError: If EVA_API_TOKEN is not set
+    """
+    global eva_client, eva_tools, dispatcher, change_feed, mirror, tool_handlers
+
+    from changefeed import AuditChangeFeed
+    from diskcache import cache_namespace
+    from dispatcher import ToolDispatcher
+    from eva_client import AsyncEvaClient
+    from mirror import Mirror
+    from tools import AsyncEvaTools
+
+    # Get configuration from environment
+    api_url = os.getenv("EVA_API_URL", "https://your-eva-instance.com/api")
+    api_token = os.getenv("EVA_API_TOKEN")
+    # По умолчанию запись разрешена (false),
+    # явно укажите "true" для read-only режима
+    read_only = os.getenv("EVA_READ_ONLY", "false").lower() == "true"
+    cache_enabled = os.getenv("EVA_CACHE_ENABLED", "true").lower() == "true"
+    audit_poll_interval = float(os.getenv("EVA_AUDIT_POLL_INTERVAL", "0"))
+    mirror_enabled = os.getenv("EVA_MIRROR", "false").lower() == "true"
+
+    logger.info("Initializing Eva client...")
+    logger.info(f"API URL: {api_url}")
+    logger.info(f"Read-only mode: {read_only}")
+    logger.info(f"Token present: {bool(api_token)}")
+    logger.info(f"Cache enabled: {cache_enabled}")
+
+    if not api_token:
+        raise ValueError("EVA_API_TOKEN environment variable is required")
+
+    # Initialize client
+    eva_client = AsyncEvaClient(
+        api_url=api_url,
+        api_token=api_token,
+        read_only=read_only,
+        cache=build_cache(api_url, api_token) if cache_enabled else None,
+        metrics=metrics,
+    )
+    logger.info("Eva client initialized")
+
+    # Local replica answering task searches and counts
+    if mirror_enabled:
+        mirror = Mirror.from_env(eva_client, namespace=cache_namespace(api_url, api_token))
+        logger.info(f"Mirror enabled: {mirror.path} (max_staleness={mirror.max_staleness}s)")
+
+    # Initialize dispatcher
+    dispatcher = ToolDispatcher()
+    logger.info(f"Tool dispatcher initialized (max_concurrency={dispatcher.max_concurrency})")
+
+    # The mirror needs the feed to notice deleted and archived rows
+    if mirror is not None and audit_poll_interval <= 0:
+        audit_poll_interval = mirror.interval
+
+    # Audit log change feed keeps cached entities and mirrored rows fresh
+    if (eva_client.cache is not None or mirror is not None) and audit_poll_interval > 0:
+        change_feed = AuditChangeFeed(
+            eva_client, interval=audit_poll_interval, namespace=cache_namespace(api_url, api_token)
         )
-        logger.info("Eva client initialized")
-        
-        # Initialize tools
-        eva_tools = EvaTools(eva_client)
-        logger.info("Eva tools initialized")
-        
-        logger.info(f"✓ Eva MCP Server ready (read_only={read_only})")
-        
+        if mirror is not None:
+            change_feed.subscribe(mirror.on_audit_entry)
+        logger.info(f"Audit change feed enabled (interval={audit_poll_interval}s)")
+
+    # Initialize tools and resolve tool handlers last:
+    # ensure_client() treats them as the ready marker
+    eva_tools = AsyncEvaTools(eva_client, mirror=mirror)
+    tool_handlers = REGISTRY.bind(eva_tools)
+    logger.info(f"Eva tools initialized ({len(tool_handlers)} tools)")
+
+    logger.info(f"✓ Eva client ready (read_only={read_only})")
+
+
+async def ensure_client() -> Dict[str, Callable[..., Any]]:
+    """
+    Create the client and tools on first use and start background services.
+
+    Returns:
+        Mapping of tool name to bound tool method
+
+    Concurrent callers wait for the same initialization; a failed one is
+    retried by the next caller.
+    """
+    global _client_lock
+    if tool_handlers is not None:
+        return tool_handlers
+    if _client_lock is None:
+        _client_lock = asyncio.Lock()
+    async with _client_lock:
+        if tool_handlers is None:
+            # Imports and SQLite setup run in a thread so MCP messages keep flowing
+            await asyncio.to_thread(initialize_client)
+            if change_feed is not None:
+                change_feed.start()
+            if mirror is not None:
+                mirror.start()
+    return tool_handlers
+
+
+async def warm_up() -> None:
+    """Create the client and connect to the API in the background after startup."""
+    try:
+        await ensure_client()
+        await eva_client.warm_up()
+        logger.info("Eva client warm-up finished")
     except Exception as e:
-        logger.error(f"Failed to initialize Eva client: {e}", exc_info=True)
-        sys.exit(1)
+        logger.warning(f"Background warm-up failed: {e}")
+
+
+def _build_tools() -> list[Tool]:
+    """Convert registry specs to MCP tools, marking tools that only read data."""
+    tools = []
+    for spec in REGISTRY:
+        extra = {}
+        if ToolAnnotations is not None:
+            extra["annotations"] = ToolAnnotations(readOnlyHint=spec.read_only)
+        tools.append(
+            Tool(
+                name=spec.name, description=spec.description, inputSchema=spec.input_schema, **extra
+            )
+        )
+    return tools
+
+
+# Built once; list_tools returns the same objects on every request
+TOOLS = _build_tools()
 
 
 @app.list_tools()
 async def list_tools() -> list[Tool]:
     """List all available MCP tools."""
+    return TOOLS
+
+
+def _call_tool_handler():
+    """
+    Register call_tool without the SDK's per-call jsonschema check.
+
+    Arguments are validated by the registry instead.
+    """
+    try:
+        return app.call_tool(validate_input=False)
+    except TypeError:  # mcp < 1.10 does not validate tool input
+        return app.call_tool()
+
+
+def _utf8_length(text: str) -> int:
+    """Return the UTF-8 size of a response without encoding ASCII-only text."""
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+@_call_tool_handler()
+async def call_tool(name: str, arguments: Any) -> list[TextContent]:
+    """Handle tool calls."""
+    started = time.perf_counter()
+    spec = REGISTRY.get(name)
+    with tracing.span("call_tool", {"mcp.tool": name}) as span:
+        try:
+            logger.info(f"Tool called: {name}")
+            logger.debug(f"Tool arguments: {arguments}")
+
+            if spec is None:
+                raise ValueError(f"Unknown tool: {name}")
+            # Reject bad input before the client is created or any request is sent
+            arguments = spec.validate(arguments)
+
+            handler = (await ensure_client())[name]
+
+            # Call the tool method under the dispatcher's concurrency limits
+            result = await dispatcher.dispatch(name, handler, arguments)
+
+        except Exception as e:
+            logger.error(f"Error calling tool {name}: {e}")
+            result = dumps({"success": False, "error": str(e)})
+        failed = is_error_response(result)
+        span.set_attribute("mcp.error", failed)
+
+    # Unknown names are not recorded, so callers cannot add series at will
+    if metrics is not None and spec is not None:
+        metrics.observe_tool(name, time.perf_counter() - started, failed, _utf8_length(result))
+    return [TextContent(type="text", text=result)]
+
+
+def metrics_report() -> Dict[str, Any]:
+    """Return tool and API method metrics with dispatcher and client counters once they exist."""
+    report = metrics.snapshot()
+    if dispatcher is not None:
+        report["dispatcher"] = dispatcher.stats()
+    if eva_client is not None:
+        report["client"] = eva_client.stats()
+    return report
+
+
+@app.list_resources()
+async def list_resources() -> list[Resource]:
+    """List server resources: metrics in JSON and Prometheus text format."""
+    if metrics is None:
+        return []
     return [
-        # Task tools
-        Tool(
-            name="eva_search_tasks",
-            description="Search and list tasks with optional filters (query, project, responsible, status)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {"type": "string", "description": "Search query text"},
-                    "project": {"type": "string", "description": "Filter by project code"},
-                    "responsible": {"type": "string", "description": "Filter by responsible user"},
-                    "status": {"type": "string", "description": "Filter by task status"},
-                    "limit": {"type": "integer", "description": "Maximum number of results", "default": 20},
-                },
-            },
-        ),
-        Tool(
-            name="eva_get_task",
-            description="Get detailed information about a specific task by code",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "task_code": {"type": "string", "description": "Task code/ID"},
-                },
-                "required": ["task_code"],
-            },
-        ),
-        Tool(
-            name="eva_count_tasks",
-            description="Count tasks matching filters",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project": {"type": "string", "description": "Filter by project code"},
-                    "responsible": {"type": "string", "description": "Filter by responsible user"},
-                    "status": {"type": "string", "description": "Filter by task status"},
-                },
-            },
-        ),
-        Tool(
-            name="eva_create_task",
-            description="Create a new task (WARNING: write operation, requires read_only=False). For tasks in sprints, provide BOTH project_code and lists for proper linking.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {"type": "string", "description": "Task name/title"},
-                    "project_code": {"type": "string", "description": "Parent project code. Required for sprint tasks to properly link to project."},
-                    "lists": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "List of sprint/list codes to add task to (e.g., ['SPR-000929']). Use with project_code for proper linking."
-                    },
-                    "description": {"type": "string", "description": "Task description (HTML)"},
-                    "responsible": {"type": "string", "description": "Responsible user email/login"},
-                    "priority": {"type": "integer", "description": "Task priority (0-5)"},
-                },
-                "required": ["name"],
-            },
-        ),
-        Tool(
-            name="eva_update_task",
-            description="Update an existing task (WARNING: write operation, requires read_only=False)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "task_code": {"type": "string", "description": "Task code to update"},
-                    "name": {"type": "string", "description": "New task name"},
-                    "description": {"type": "string", "description": "New task description (HTML)"},
-                    "responsible": {"type": "string", "description": "New responsible user"},
-                    "status": {"type": "string", "description": "New task status"},
-                    "priority": {"type": "integer", "description": "New task priority (0-5)"},
-                },
-                "required": ["task_code"],
-            },
-        ),
-        
-        # Project tools
-        Tool(
-            name="eva_list_projects",
-            description="List all projects",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "limit": {"type": "integer", "description": "Maximum number of results", "default": 20},
-                },
-            },
-        ),
-        Tool(
-            name="eva_get_project",
-            description="Get detailed information about a specific project by code",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project_code": {"type": "string", "description": "Project code/ID"},
-                },
-                "required": ["project_code"],
-            },
-        ),
-        
-        # User tools
-        Tool(
-            name="eva_list_users",
-            description="List all users",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "limit": {"type": "integer", "description": "Maximum number of results", "default": 50},
-                },
-            },
-        ),
-        Tool(
-            name="eva_get_user",
-            description="Get detailed information about a specific user",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "user_code": {"type": "string", "description": "User code/email/login"},
-                },
-                "required": ["user_code"],
-            },
-        ),
-        
-        # Document tools
-        Tool(
-            name="eva_search_documents",
-            description="Search and list documents with optional filters",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {"type": "string", "description": "Search query text"},
-                    "project": {"type": "string", "description": "Filter by project code"},
-                    "limit": {"type": "integer", "description": "Maximum number of results", "default": 20},
-                },
-            },
+        Resource(
+            uri=METRICS_URI,
+            name="metrics",
+            description=(
+                "Latency, calls, errors, retries, cache hits and bytes per tool and API method"
+            ),
+            mimeType="application/json",
         ),
-        Tool(
-            name="eva_get_document",
-            description="Get detailed information about a specific document",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "document_code": {"type": "string", "description": "Document code/ID"},
-                },
-                "required": ["document_code"],
-            },
-        ),
-        
-        # Comment tools
-        Tool(
-            name="eva_get_comments",
-            description="Get comments for a task or document",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "parent_code": {"type": "string", "description": "Parent task or document code"},
-                    "limit": {"type": "integer", "description": "Maximum number of results", "default": 50},
-                },
-                "required": ["parent_code"],
-            },
-        ),
-        Tool(
-            name="eva_add_comment",
-            description="Add a comment to a task or document (WARNING: write operation, requires read_only=False)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "parent_code": {"type": "string", "description": "Parent task or document code"},
-                    "text": {"type": "string", "description": "Comment text (HTML)"},
-                },
-                "required": ["parent_code", "text"],
-            },
-        ),
-        
-        # Sprint/List tools
-        Tool(
-            name="eva_list_sprints",
-            description="List all sprints/lists",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "limit": {"type": "integer", "description": "Maximum number of results", "default": 50},
-                },
-            },
-        ),
-        Tool(
-            name="eva_get_sprint",
-            description="Get detailed information about a specific sprint/list",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "list_code": {"type": "string", "description": "Sprint/list code"},
-                },
-                "required": ["list_code"],
-            },
-        ),
-        Tool(
-            name="eva_create_list",
-            description="Create a new list/sprint/release (WARNING: write operation, requires read_only=False)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {"type": "string", "description": "List name/title"},
-                    "project_code": {"type": "string", "description": "Parent project code (e.g., CmfProject:...)"},
-                },
-                "required": ["name", "project_code"],
-            },
-        ),
-        
-        # Audit tools
-        Tool(
-            name="eva_get_audit_log",
-            description="Get audit log entries with optional filters",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "entity_code": {"type": "string", "description": "Filter by specific entity code"},
-                    "limit": {"type": "integer", "description": "Maximum number of results", "default": 50},
-                },
-            },
+        Resource(
+            uri=PROMETHEUS_URI,
+            name="metrics-prometheus",
+            description="The same metrics in Prometheus text exposition format",
+            mimeType="text/plain",
         ),
     ]
 
 
-@app.call_tool()
-async def call_tool(name: str, arguments: Any) -> list[TextContent]:
-    """Handle tool calls."""
-    try:
-        logger.info(f"Tool called: {name} with arguments: {arguments}")
-        
-        # Map tool names to methods
-        tool_map = {
-            "eva_search_tasks": eva_tools.search_tasks,
-            "eva_get_task": eva_tools.get_task_details,
-            "eva_count_tasks": eva_tools.count_tasks_by_filter,
-            "eva_create_task": eva_tools.create_task,
-            "eva_update_task": eva_tools.update_task,
-            "eva_list_projects": eva_tools.list_projects,
-            "eva_get_project": eva_tools.get_project_details,
-            "eva_list_users": eva_tools.list_users,
-            "eva_get_user": eva_tools.get_user_details,
-            "eva_search_documents": eva_tools.search_documents,
-            "eva_get_document": eva_tools.get_document_details,
-            "eva_get_comments": eva_tools.get_comments,
-            "eva_add_comment": eva_tools.add_comment,
-            "eva_list_sprints": eva_tools.list_sprints,
-            "eva_get_sprint": eva_tools.get_sprint_details,
-            "eva_create_list": eva_tools.create_list,
-            "eva_get_audit_log": eva_tools.get_audit_log,
-        }
-        
-        if name not in tool_map:
-            raise ValueError(f"Unknown tool: {name}")
-        
-        # Call the tool method
-        result = tool_map[name](**arguments)
-        
-        return [TextContent(type="text", text=result)]
-        
-    except Exception as e:
-        logger.error(f"Error calling tool {name}: {e}")
-        error_result = f'{{"success": false, "error": "{str(e)}"}}'
-        return [TextContent(type="text", text=error_result)]
+@app.read_resource()
+async def read_resource(uri: Any) -> Iterable[Any]:
+    """Read a server resource."""
+    uri = str(uri)
+    if metrics is not None and uri == METRICS_URI:
+        content, mime_type = dumps(metrics_report()), "application/json"
+    elif metrics is not None and uri == PROMETHEUS_URI:
+        content, mime_type = metrics.prometheus(), "text/plain"
+    else:
+        raise ValueError(f"Unknown resource: {uri}")
+    if ReadResourceContents is None:
+        return content
+    return [ReadResourceContents(content=content, mime_type=mime_type)]
 
 
 async def main():
     """Main entry point for the MCP server."""
+    global metrics
+
     logger.info("=" * 60)
     logger.info("Starting Eva MCP Server...")
     logger.info("=" * 60)
-    
-    # Initialize client before starting server
-    initialize_client()
-    
+
+    # Fail fast on missing configuration; the client itself is created lazily
+    load_env()
+    if not os.getenv("EVA_API_TOKEN"):
+        logger.error("EVA_API_TOKEN environment variable is required")
+        sys.exit(1)
+
+    # Before the client and tools are created: they install trace hooks only when enabled
+    if tracing.configure_from_env() is not None:
+        logger.info("Tracing enabled")
+
+    exporter = None
+    if os.getenv("EVA_METRICS", "true").lower() == "true":
+        metrics = Metrics()
+        exporter = MetricsExporter.from_env(metrics)
+
     # Run the server
-    async with stdio_server() as (read_stream, write_stream):
-        logger.info("Eva MCP Server started and listening for requests")
-        logger.info("=" * 60)
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
-        )
+    warm_up_task = None
+    try:
+        if exporter is not None:
+            await exporter.start()
+        async with stdio_server() as (read_stream, write_stream):
+            logger.info("Eva MCP Server started and listening for requests")
+            logger.info("=" * 60)
+            # Build the client and connect while the host runs the MCP handshake
+            if os.getenv("EVA_WARM_UP", "true").lower() == "true":
+                warm_up_task = asyncio.create_task(warm_up())
+            await app.run(read_stream, write_stream, app.create_initialization_options())
+    finally:
+        if warm_up_task is not None:
+            warm_up_task.cancel()
+        if exporter is not None:
+            await exporter.stop()
+        if change_feed is not None:
+            await change_feed.stop()
+        if mirror is not None:
+            await mirror.stop()
+            mirror.close()
+        if dispatcher is not None:
+            dispatcher.shutdown()
+        if eva_client is not None:
+            from diskcache import TieredCache
+
+            await eva_client.close()
+            if isinstance(eva_client.cache, TieredCache):
+                eva_client.cache.close()
+        tracing.shutdown()
 
 
 def run():
@@ -374,4 +384,3 @@ def run():
 
 if __name__ == "__main__":
     run()
-
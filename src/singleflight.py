@@ -0,0 +1,120 @@
+"""Request coalescing - share one in-flight call between identical requests."""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class _Call:
+    """In-flight call shared by concurrent callers."""
+
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Thread-safe request coalescing for synchronous callers.
+
+    While a call for a key is in flight, later callers with the same key wait
+    for it and receive its result or exception instead of issuing their own.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key: str, func: Callable[[], Any]) -> Any:
+        """
+        Run func once per key across concurrent callers.
+
+        Args:
+            key: Request identity (see cache.make_key)
+            func: Callable performing the request
+
+        Returns:
+            Result of the shared call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+                self.executed += 1
+            else:
+                leader = False
+                self.shared += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def stats(self) -> Dict[str, int]:
+        """Return number of executed and coalesced calls."""
+        return {"executed": self.executed, "shared": self.shared, "in_flight": len(self._calls)}
+
+
+class AsyncSingleFlight:
+    """
+    Request coalescing for asyncio callers.
+
+    The shared request runs in its own task, so cancelling one waiter does not
+    cancel the request for the others.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+        self.executed = 0
+        self.shared = 0
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await func once per key across concurrent callers.
+
+        Args:
+            key: Request identity (see cache.make_key)
+            func: Coroutine function performing the request
+
+        Returns:
+            Result of the shared call
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            self.executed += 1
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _done(self, key: str, task: asyncio.Future) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark exception as retrieved when every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        """Return number of executed and coalesced calls."""
+        return {"executed": self.executed, "shared": self.shared, "in_flight": len(self._calls)}
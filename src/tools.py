@@ -1,28 +1,301 @@
 """MCP Tools for Eva API - Tool definitions for Model Context Protocol."""
 
-import json
+import asyncio
+import functools
 import logging
-from typing import Any, Dict, Optional, List
+import os
+from typing import Any, Callable, Dict, Generator, Optional, List
 
-from eva_client import EvaClient, EvaAPIError
+from eva_client import EvaClient, AsyncEvaClient, EvaAPIError
+from paging import Page, ResponseBudget
+from projections import fields_for
+from serialization import get_serializer
+from tracing import TracedSerializer, enabled as tracing_enabled
 
 logger = logging.getLogger(__name__)
 
+CONSISTENCY_LEVELS = ("eventual", "strong")
+SEARCH_MODES = ("filter", "ranked")
+
+
+def _task_filters(
+    project: Optional[str] = None,
+    responsible: Optional[str] = None,
+    status: Optional[str] = None,
+    query: Optional[str] = None,
+) -> List[List[Any]]:
+    """Build CmfTask filter list from tool arguments."""
+    filters = []
+
+    if project:
+        filters.append(["parent", "=", project])
+    if responsible:
+        filters.append(["responsible", "=", responsible])
+    if status:
+        filters.append(["status", "=", status])
+    # Note: text search might require different field name
+    if query:
+        filters.append(["name", "ilike", f"%{query}%"])
+    return filters
+
+
+def _document_filters(
+    project: Optional[str] = None, query: Optional[str] = None
+) -> List[List[Any]]:
+    """Build CmfDocument filter list from tool arguments."""
+    filters = []
+
+    if project:
+        filters.append(["parent", "=", project])
+    if query:
+        filters.append(["name", "ilike", f"%{query}%"])
+    return filters
+
+
+def _audit_filters(entity_code: Optional[str] = None) -> List[List[Any]]:
+    """Build CmfAudit filter list from tool arguments."""
+    filters = []
+    if entity_code:
+        filters.append(["object_code", "=", entity_code])
+    return filters
+
+
+def _task_update_kwargs(
+    name: Optional[str] = None,
+    description: Optional[str] = None,
+    responsible: Optional[str] = None,
+    status: Optional[str] = None,
+    priority: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Map update_task tool arguments to CmfTask fields."""
+    kwargs = {}
+    if name:
+        kwargs["name"] = name
+    if description:
+        kwargs["text"] = description
+    if responsible:
+        kwargs["responsible"] = responsible
+    if status:
+        kwargs["status"] = status
+    if priority is not None:
+        kwargs["priority"] = priority
+    return kwargs
+
+
+def _validate_create_list(name: str, project_code: str) -> None:
+    """Validate create_list tool arguments."""
+    if not name or not name.strip():
+        raise ValueError("name is required")
+    if not project_code or not project_code.strip():
+        raise ValueError("project_code is required")
+
+
+def _check_consistency(consistency: Optional[str]) -> str:
+    """Validate consistency argument of tools that can be answered from the local mirror."""
+    consistency = consistency or "eventual"
+    if consistency not in CONSISTENCY_LEVELS:
+        raise ValueError(f"consistency must be one of {', '.join(CONSISTENCY_LEVELS)}")
+    return consistency
+
+
+def _check_search_mode(mode: Optional[str]) -> str:
+    """Validate mode argument of search tools."""
+    mode = mode or "filter"
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"mode must be one of {', '.join(SEARCH_MODES)}")
+    return mode
+
+
+def _entity_filters(
+    parent: Optional[str] = None, filters: Optional[List[List[Any]]] = None
+) -> List[List[Any]]:
+    """Build filter list of generic entity tools from a parent code and raw Eva filters."""
+    if filters is not None and (
+        not isinstance(filters, list)
+        or not all(isinstance(f, list) and len(f) == 3 and isinstance(f[0], str) for f in filters)
+    ):
+        raise ValueError("filters must be a list of [field, operator, value] triples")
+    result = [["parent", "=", parent]] if parent else []
+    return result + list(filters or [])
+
+
+def _validate_codes(codes: List[str], argument: str) -> List[str]:
+    """Validate list of entity codes passed to batch get tools."""
+    if not isinstance(codes, list) or not codes:
+        raise ValueError(f"{argument} must be a non-empty list of codes")
+    if not all(isinstance(code, str) and code.strip() for code in codes):
+        raise ValueError(f"{argument} must contain only non-empty strings")
+    return codes
+
+
+def _run(steps: Generator) -> Any:
+    """Run tool steps synchronously: each yielded client result is already the value."""
+    value = None
+    try:
+        while True:
+            value = steps.send(value)
+    except StopIteration as stop:
+        return stop.value
+
+
+async def _arun(steps: Generator) -> Any:
+    """Run tool steps on the event loop, awaiting each yielded client call."""
+    value, error = None, None
+    try:
+        while True:
+            pending = steps.send(value) if error is None else steps.throw(error)
+            value, error = None, None
+            try:
+                value = await pending
+            except Exception as e:
+                error = e
+    except StopIteration as stop:
+        return stop.value
+
+
+def _tool(steps: Callable[..., Generator]) -> Callable[..., str]:
+    """
+    Make a tool method from a generator of steps shared by EvaTools and AsyncEvaTools.
+
+    The body yields each client call and receives its result back. EvaTools
+    runs it directly; AsyncEvaTools awaits the yielded calls (see _async_tool).
+    """
+
+    @functools.wraps(steps)
+    def method(self, *args, **kwargs):
+        return _run(steps(self, *args, **kwargs))
+
+    method.steps = steps
+    return method
+
+
+def _async_tool(method: Callable[..., str]) -> Callable[..., Any]:
+    """Make the coroutine counterpart of a _tool method."""
+    steps = method.steps
+
+    @functools.wraps(method)
+    async def coroutine(self, *args, **kwargs):
+        return await _arun(steps(self, *args, **kwargs))
+
+    return coroutine
+
 
 class EvaTools:
-    """MCP tools for interacting with Eva API."""
-    
-    def __init__(self, client: EvaClient):
+    """
+    MCP tools for interacting with Eva API.
+
+    Tool bodies are generators that yield client calls (see _tool), so
+    AsyncEvaTools reuses them unchanged.
+    """
+
+    def __init__(
+        self,
+        client: EvaClient,
+        default_view: Optional[str] = None,
+        serializer=None,
+        budget: Optional[ResponseBudget] = None,
+        mirror=None,
+    ):
         """
         Initialize Eva tools with API client.
-        
+
         Args:
             client: EvaClient instance
+            default_view: Field profile used when a tool call has no view
+                (default: from EVA_DEFAULT_VIEW env var or full)
+            serializer: Object with dumps(obj) -> str for responses
+                (default: serialization.get_serializer())
+            budget: Row/byte budget for list responses (default: ResponseBudget.from_env())
+            mirror: Local replica (mirror.Mirror) answering task searches and counts
         """
         self.client = client
-    
+        self.default_view = default_view or os.getenv("EVA_DEFAULT_VIEW", "full")
+        self.serializer = serializer or get_serializer()
+        if tracing_enabled():
+            self.serializer = TracedSerializer(self.serializer)
+        self.budget = budget or ResponseBudget.from_env()
+        self.mirror = mirror
+
+    def _success_response(self, **payload: Any) -> str:
+        """Build successful tool response."""
+        return self.serializer.dumps({"success": True, **payload})
+
+    def _error_response(self, error: Exception) -> str:
+        """Build failed tool response from an API or validation error."""
+        if isinstance(error, EvaAPIError):
+            return self.serializer.dumps(
+                {"success": False, "error": error.message, "code": error.code}
+            )
+        return self.serializer.dumps({"success": False, "error": str(error)})
+
+    def _page_response(self, page: Page, key: str, rows: List[Any], **extra: Any) -> str:
+        """
+        Build list response within the page budget.
+
+        Rows exceeding the byte budget are dropped from the end and a
+        next_cursor is added whenever more rows are available.
+        """
+        next_cursor = self.budget.next_cursor(page, len(rows), len(rows))
+        response = self._list_response(key, rows, next_cursor, extra)
+        if len(response.encode("utf-8")) <= page.max_bytes:
+            return response
+
+        kept = self.budget.trim(page, rows, self.serializer)
+        next_cursor = self.budget.next_cursor(page, len(kept), len(rows))
+        return self._list_response(key, kept, next_cursor, extra)
+
+    def _list_response(
+        self, key: str, rows: List[Any], next_cursor: Optional[str], extra: Dict[str, Any]
+    ) -> str:
+        payload = {"count": len(rows), key: rows, **extra}
+        if next_cursor:
+            payload["next_cursor"] = next_cursor
+            payload["truncated"] = True
+        return self._success_response(**payload)
+
+    def _batch_response(self, key: str, found: Dict[str, Optional[Dict[str, Any]]]) -> str:
+        """Build batch get response listing found rows in request order and missing codes."""
+        rows = [row for row in found.values() if row is not None]
+        not_found = [code for code, row in found.items() if row is None]
+        return self._success_response(count=len(rows), **{key: rows}, not_found=not_found)
+
+    def _mirror_for(self, consistency: Optional[str]):
+        """Return the mirror if a read may be answered locally, None for strong consistency."""
+        if _check_consistency(consistency) == "strong":
+            return None
+        return self.mirror
+
+    def _mirror_source(self, page: Page, mirror):
+        """
+        Return the mirror if this page may be read from it.
+
+        Pages after the first stay on the source of the first page (kept in the
+        cursor): the mirror and the API order rows differently, so switching
+        would skip or repeat rows.
+        """
+        return None if page.source == "api" else mirror
+
+    def _api_source(self, page: Page) -> None:
+        """Mark a page as read from the API, or fail if its cursor was made from the mirror."""
+        if page.source == "mirror":
+            raise ValueError(
+                "The local mirror can no longer continue this cursor; "
+                "repeat the search without a cursor"
+            )
+        if self.mirror is not None:
+            page.source = "api"
+
+    def _offload(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run blocking local work such as mirror queries; AsyncEvaTools runs it in a thread."""
+        return func(*args, **kwargs)
+
+    def _fields(self, entity: str, view: Optional[str]) -> Optional[List[str]]:
+        """Resolve view name to the `fields` argument for an entity."""
+        return fields_for(entity, view or self.default_view)
+
     # Task Tools
-    
+
+    @_tool
     def search_tasks(
         self,
         query: Optional[str] = None,
@@ -30,118 +303,171 @@ class EvaTools:
         responsible: Optional[str] = None,
         status: Optional[str] = None,
         limit: int = 20,
+        view: Optional[str] = None,
+        cursor: Optional[str] = None,
+        consistency: Optional[str] = None,
+        mode: Optional[str] = None,
     ) -> str:
         """
         Search and list tasks with filters.
-        
+
         Args:
             query: Search query text
             project: Filter by project code
             responsible: Filter by responsible user
             status: Filter by task status
             limit: Maximum number of results (default: 20)
-            
+            view: Field profile - minimal, summary or full (default: EVA_DEFAULT_VIEW or full)
+            cursor: Continuation cursor from a previous truncated response
+            consistency: eventual (default) may answer from the local mirror,
+                strong always queries the API
+            mode: filter (default) matches query in names, ranked searches names and descriptions
+                in the local full-text index, best matches first
+
         Returns:
             JSON string with task list
         """
         try:
-            filters = []
-            
-            if project:
-                filters.append(["parent", "=", project])
-            if responsible:
-                filters.append(["responsible", "=", responsible])
-            if status:
-                filters.append(["status", "=", status])
-            # Note: text search might require different field name
-            if query:
-                filters.append(["name", "ilike", f"%{query}%"])
-            
-            tasks = self.client.list_tasks(
+            page = self.budget.page(
+                "eva_search_tasks",
+                cursor,
+                limit,
+                query=query,
+                project=project,
+                responsible=responsible,
+                status=status,
+                view=view,
+                consistency=consistency,
+                mode=mode,
+            )
+            args = page.args
+            filters = _task_filters(
+                args["project"], args["responsible"], args["status"], args["query"]
+            )
+            fields = self._fields("CmfTask", args["view"])
+            ranked = _check_search_mode(args.get("mode")) == "ranked"
+
+            mirror = self._mirror_source(page, self._mirror_for(args.get("consistency")))
+            if mirror is not None:
+                if ranked:
+                    tasks = yield self._offload(
+                        mirror.search,
+                        "CmfTask",
+                        args["query"],
+                        _task_filters(args["project"], args["responsible"], args["status"]),
+                        limit=page.size,
+                        offset=page.offset,
+                        fields=fields,
+                    )
+                else:
+                    tasks = yield self._offload(
+                        mirror.query,
+                        "CmfTask",
+                        filters,
+                        limit=page.size,
+                        offset=page.offset,
+                        fields=fields,
+                    )
+                if tasks is not None:
+                    page.source = "mirror"
+                    return self._page_response(page, "tasks", tasks, source="mirror")
+            self._api_source(page)
+
+            tasks = yield self.client.list_tasks(
                 filters=filters if filters else None,
-                limit=limit
+                limit=page.size,
+                offset=page.offset,
+                fields=fields,
             )
-            
-            return json.dumps({
-                "success": True,
-                "count": len(tasks),
-                "tasks": tasks
-            }, ensure_ascii=False, indent=2)
-            
-        except EvaAPIError as e:
-            return json.dumps({
-                "success": False,
-                "error": e.message,
-                "code": e.code
-            }, ensure_ascii=False, indent=2)
-    
-    def get_task_details(self, task_code: str) -> str:
+
+            return self._page_response(page, "tasks", tasks)
+
+        except (EvaAPIError, ValueError) as e:
+            return self._error_response(e)
+
+    @_tool
+    def get_task_details(self, task_code: str, view: Optional[str] = None) -> str:
         """
         Get detailed information about a specific task.
-        
+
         Args:
             task_code: Task code/ID
-            
+            view: Field profile - minimal, summary or full (default: EVA_DEFAULT_VIEW or full)
+
         Returns:
             JSON string with task details
         """
         try:
-            task = self.client.get_task(task_code)
-            
-            return json.dumps({
-                "success": True,
-                "task": task
-            }, ensure_ascii=False, indent=2)
-            
-        except EvaAPIError as e:
-            return json.dumps({
-                "success": False,
-                "error": e.message,
-                "code": e.code
-            }, ensure_ascii=False, indent=2)
-    
+            task = yield self.client.get_task(task_code, fields=self._fields("CmfTask", view))
+
+            return self._success_response(task=task)
+
+        except (EvaAPIError, ValueError) as e:
+            return self._error_response(e)
+
+    @_tool
+    def get_tasks(self, task_codes: List[str], view: Optional[str] = None) -> str:
+        """
+        Get several tasks by code in one request.
+
+        Args:
+            task_codes: Task codes
+            view: Field profile - minimal, summary or full (default: EVA_DEFAULT_VIEW or full)
+
+        Returns:
+            JSON string with found tasks and codes that were not found
+        """
+        try:
+            found = yield self.client.get_many_tasks(
+                _validate_codes(task_codes, "task_codes"), fields=self._fields("CmfTask", view)
+            )
+
+            return self._batch_response("tasks", found)
+
+        except (EvaAPIError, ValueError) as e:
+            return self._error_response(e)
+
+    @_tool
     def count_tasks_by_filter(
         self,
         project: Optional[str] = None,
         responsible: Optional[str] = None,
         status: Optional[str] = None,
+        consistency: Optional[str] = None,
     ) -> str:
         """
         Count tasks matching filters.
-        
+
         Args:
             project: Filter by project code
             responsible: Filter by responsible user
             status: Filter by task status
-            
+            consistency: eventual (default) may answer from the local mirror,
+                strong always queries the API
+
         Returns:
             JSON string with task count
         """
         try:
-            filters = []
-            
-            if project:
-                filters.append(["parent", "=", project])
-            if responsible:
-                filters.append(["responsible", "=", responsible])
-            if status:
-                filters.append(["status", "=", status])
-            
-            count = self.client.count_tasks(filters=filters if filters else None)
-            
-            return json.dumps({
-                "success": True,
-                "count": count,
-                "filters": filters
-            }, ensure_ascii=False, indent=2)
-            
-        except EvaAPIError as e:
-            return json.dumps({
-                "success": False,
-                "error": e.message,
-                "code": e.code
-            }, ensure_ascii=False, indent=2)
-    
+            filters = _task_filters(project, responsible, status)
+
+            mirror = self._mirror_for(consistency)
+            if mirror is not None:
+                count = yield self._offload(mirror.count, "CmfTask", filters)
+                if count is not None:
+                    return self._success_response(count=count, filters=filters, source="mirror")
+
+            # Archived tasks are excluded like in list_tasks and the mirror
+            count = yield self.client.count_tasks(
+                filters=filters if filters else None, include_archived=False
+            )
+
+            return self._success_response(count=count, filters=filters)
+
+        except (EvaAPIError, ValueError) as e:
+            return self._error_response(e)
+
+    @_tool
     def create_task(
         self,
         name: str,
@@ -153,9 +479,9 @@ class EvaTools:
     ) -> str:
         """
         Create a new task in Eva.
-        
+
         WARNING: This is a write operation. Requires read_only=False.
-        
+
         Args:
             name: Task name/title
             project_code: Parent project code (optional)
@@ -163,43 +489,28 @@ class EvaTools:
             description: Task description (HTML)
             responsible: Responsible user email/login
             priority: Task priority (0-5)
-            
+
         Note:
             - For tasks in projects: specify only project_code
             - For tasks in sprints: specify BOTH project_code and lists
             - If only lists is provided, task will be created but not linked to project
-            
+
         Returns:
             JSON string with created task details
         """
         try:
-            kwargs = {}
-            if description:
-                kwargs["text"] = description
-            if priority is not None:
-                kwargs["priority"] = priority
-            
-            task = self.client.create_task(
-                name=name,
-                parent=project_code,
-                lists=lists,
-                responsible=responsible,
-                **kwargs
+            kwargs = _task_update_kwargs(description=description, priority=priority)
+
+            task = yield self.client.create_task(
+                name=name, parent=project_code, lists=lists, responsible=responsible, **kwargs
             )
-            
-            return json.dumps({
-                "success": True,
-                "task": task,
-                "message": "Task created successfully"
-            }, ensure_ascii=False, indent=2)
-            
+
+            return self._success_response(task=task, message="Task created successfully")
+
         except EvaAPIError as e:
-            return json.dumps({
-                "success": False,
-                "error": e.message,
-                "code": e.code
-            }, ensure_ascii=False, indent=2)
-    
+            return self._error_response(e)
+
+    @_tool
     def update_task(
         self,
         task_code: str,
@@ -211,9 +522,9 @@ class EvaTools:
     ) -> str:
         """
         Update an existing task.
-        
+
         WARNING: This is a write operation. Requires read_only=False.
-        
+
         Args:
             task_code: Task code to update
             name: New task name
@@ -221,250 +532,300 @@ class EvaTools:
             responsible: New responsible user
             status: New task status
             priority: New task priority (0-5)
-            
+
         Returns:
             JSON string with updated task details
         """
         try:
-            kwargs = {}
-            if name:
-                kwargs["name"] = name
-            if description:
-                kwargs["text"] = description
-            if responsible:
-                kwargs["responsible"] = responsible
-            if status:
-                kwargs["status"] = status
-            if priority is not None:
-                kwargs["priority"] = priority
-            
-            task = self.client.update_task(task_code, **kwargs)
-            
-            return json.dumps({
-                "success": True,
-                "task": task,
-                "message": "Task updated successfully"
-            }, ensure_ascii=False, indent=2)
-            
+            kwargs = _task_update_kwargs(name, description, responsible, status, priority)
+
+            task = yield self.client.update_task(task_code, **kwargs)
+
+            return self._success_response(task=task, message="Task updated successfully")
+
         except EvaAPIError as e:
-            return json.dumps({
-                "success": False,
-                "error": e.message,
-                "code": e.code
-            }, ensure_ascii=False, indent=2)
-    
+            return self._error_response(e)
+
     # Project Tools
-    
-    def list_projects(self, limit: int = 20) -> str:
+
+    @_tool
+    def list_projects(
+        self, limit: int = 20, view: Optional[str] = None, cursor: Optional[str] = None
+    ) -> str:
         """
         List all projects.
-        
+
         Args:
             limit: Maximum number of results (default: 20)
-            
+            view: Field profile - minimal, summary or full (default: EVA_DEFAULT_VIEW or full)
+            cursor: Continuation cursor from a previous truncated response
+
         Returns:
             JSON string with project list
         """
         try:
-            projects = self.client.list_projects(limit=limit)
-            
-            return json.dumps({
-                "success": True,
-                "count": len(projects),
-                "projects": projects
-            }, ensure_ascii=False, indent=2)
-            
-        except EvaAPIError as e:
-            return json.dumps({
-                "success": False,
-                "error": e.message,
-                "code": e.code
-            }, ensure_ascii=False, indent=2)
-    
-    def get_project_details(self, project_code: str) -> str:
+            page = self.budget.page("eva_list_projects", cursor, limit, view=view)
+
+            projects = yield self.client.list_projects(
+                limit=page.size,
+                offset=page.offset,
+                fields=self._fields("CmfProject", page.args["view"]),
+            )
+
+            return self._page_response(page, "projects", projects)
+
+        except (EvaAPIError, ValueError) as e:
+            return self._error_response(e)
+
+    @_tool
+    def get_project_details(self, project_code: str, view: Optional[str] = None) -> str:
         """
         Get detailed information about a specific project.
-        
+
         Args:
             project_code: Project code/ID
-            
+            view: Field profile - minimal, summary or full (default: EVA_DEFAULT_VIEW or full)
+
         Returns:
             JSON string with project details
         """
         try:
-            project = self.client.get_project(project_code)
-            
-            return json.dumps({
-                "success": True,
-                "project": project
-            }, ensure_ascii=False, indent=2)
-            
-        except EvaAPIError as e:
-            return json.dumps({
-                "success": False,
-                "error": e.message,
-                "code": e.code
-            }, ensure_ascii=False, indent=2)
-    
+            project = yield self.client.get_project(
+                project_code, fields=self._fields("CmfProject", view)
+            )
+
+            return self._success_response(project=project)
+
+        except (EvaAPIError, ValueError) as e:
+            return self._error_response(e)
+
+    @_tool
+    def get_projects(self, project_codes: List[str], view: Optional[str] = None) -> str:
+        """
+        Get several projects by code in one request.
+
+        Args:
+            project_codes: Project codes
+            view: Field profile - minimal, summary or full (default: EVA_DEFAULT_VIEW or full)
+
+        Returns:
+            JSON string with found projects and codes that were not found
+        """
+        try:
+            found = yield self.client.get_many_projects(
+                _validate_codes(project_codes, "project_codes"),
+                fields=self._fields("CmfProject", view),
+            )
+
+            return self._batch_response("projects", found)
+
+        except (EvaAPIError, ValueError) as e:
+            return self._error_response(e)
+
     # User Tools
-    
-    def list_users(self, limit: int = 50) -> str:
+
+    @_tool
+    def list_users(
+        self, limit: int = 50, view: Optional[str] = None, cursor: Optional[str] = None
+    ) -> str:
         """
         List all users.
-        
+
         Args:
             limit: Maximum number of results (default: 50)
-            
+            view: Field profile - minimal, summary or full (default: EVA_DEFAULT_VIEW or full)
+            cursor: Continuation cursor from a previous truncated response
+
         Returns:
             JSON string with user list
         """
         try:
-            users = self.client.list_users(limit=limit)
-            
-            return json.dumps({
-                "success": True,
-                "count": len(users),
-                "users": users
-            }, ensure_ascii=False, indent=2)
-            
-        except EvaAPIError as e:
-            return json.dumps({
-                "success": False,
-                "error": e.message,
-                "code": e.code
-            }, ensure_ascii=False, indent=2)
-    
-    def get_user_details(self, user_code: str) -> str:
+            page = self.budget.page("eva_list_users", cursor, limit, view=view)
+
+            users = yield self.client.list_users(
+                limit=page.size,
+                offset=page.offset,
+                fields=self._fields("CmfPerson", page.args["view"]),
+            )
+
+            return self._page_response(page, "users", users)
+
+        except (EvaAPIError, ValueError) as e:
+            return self._error_response(e)
+
+    @_tool
+    def get_user_details(self, user_code: str, view: Optional[str] = None) -> str:
         """
         Get detailed information about a specific user.
-        
+
         Args:
             user_code: User code/email/login
-            
+            view: Field profile - minimal, summary or full (default: EVA_DEFAULT_VIEW or full)
+
         Returns:
             JSON string with user details
         """
         try:
-            user = self.client.get_user(user_code)
-            
-            return json.dumps({
-                "success": True,
-                "user": user
-            }, ensure_ascii=False, indent=2)
-            
-        except EvaAPIError as e:
-            return json.dumps({
-                "success": False,
-                "error": e.message,
-                "code": e.code
-            }, ensure_ascii=False, indent=2)
-    
+            user = yield self.client.get_user(user_code, fields=self._fields("CmfPerson", view))
+
+            return self._success_response(user=user)
+
+        except (EvaAPIError, ValueError) as e:
+            return self._error_response(e)
+
+    @_tool
+    def get_users(self, user_codes: List[str], view: Optional[str] = None) -> str:
+        """
+        Get several users by code in one request.
+
+        Args:
+            user_codes: User codes
+            view: Field profile - minimal, summary or full (default: EVA_DEFAULT_VIEW or full)
+
+        Returns:
+            JSON string with found users and codes that were not found
+        """
+        try:
+            found = yield self.client.get_many_users(
+                _validate_codes(user_codes, "user_codes"), fields=self._fields("CmfPerson", view)
+            )
+
+            return self._batch_response("users", found)
+
+        except (EvaAPIError, ValueError) as e:
+            return self._error_response(e)
+
     # Document Tools
-    
+
+    @_tool
     def search_documents(
         self,
         query: Optional[str] = None,
         project: Optional[str] = None,
         limit: int = 20,
+        view: Optional[str] = None,
+        cursor: Optional[str] = None,
+        mode: Optional[str] = None,
     ) -> str:
         """
         Search and list documents with filters.
-        
+
         Args:
             query: Search query text
             project: Filter by project code
             limit: Maximum number of results (default: 20)
-            
+            view: Field profile - minimal, summary or full (default: EVA_DEFAULT_VIEW or full)
+            cursor: Continuation cursor from a previous truncated response
+            mode: filter (default) matches query in names, ranked searches names and bodies
+                in the local full-text index, best matches first
+
         Returns:
             JSON string with document list
         """
         try:
-            filters = []
-            
-            if project:
-                filters.append(["parent", "=", project])
-            if query:
-                filters.append(["name", "ilike", f"%{query}%"])
-            
-            documents = self.client.list_documents(
+            page = self.budget.page(
+                "eva_search_documents",
+                cursor,
+                limit,
+                query=query,
+                project=project,
+                view=view,
+                mode=mode,
+            )
+            args = page.args
+            filters = _document_filters(args["project"], args["query"])
+            fields = self._fields("CmfDocument", args["view"])
+
+            mirror = self._mirror_source(page, self.mirror)
+            if _check_search_mode(args.get("mode")) == "ranked" and mirror is not None:
+                documents = yield self._offload(
+                    mirror.search,
+                    "CmfDocument",
+                    args["query"],
+                    _document_filters(args["project"]),
+                    limit=page.size,
+                    offset=page.offset,
+                    fields=fields,
+                )
+                if documents is not None:
+                    page.source = "mirror"
+                    return self._page_response(page, "documents", documents, source="mirror")
+            self._api_source(page)
+
+            documents = yield self.client.list_documents(
                 filters=filters if filters else None,
-                limit=limit
+                limit=page.size,
+                offset=page.offset,
+                fields=fields,
             )
-            
-            return json.dumps({
-                "success": True,
-                "count": len(documents),
-                "documents": documents
-            }, ensure_ascii=False, indent=2)
-            
-        except EvaAPIError as e:
-            return json.dumps({
-                "success": False,
-                "error": e.message,
-                "code": e.code
-            }, ensure_ascii=False, indent=2)
-    
-    def get_document_details(self, document_code: str) -> str:
+
+            return self._page_response(page, "documents", documents)
+
+        except (EvaAPIError, ValueError) as e:
+            return self._error_response(e)
+
+    @_tool
+    def get_document_details(self, document_code: str, view: Optional[str] = None) -> str:
         """
         Get detailed information about a specific document.
-        
+
         Args:
             document_code: Document code/ID
-            
+            view: Field profile - minimal, summary or full (default: EVA_DEFAULT_VIEW or full)
+
         Returns:
             JSON string with document details
         """
         try:
-            document = self.client.get_document(document_code)
-            
-            return json.dumps({
-                "success": True,
-                "document": document
-            }, ensure_ascii=False, indent=2)
-            
-        except EvaAPIError as e:
-            return json.dumps({
-                "success": False,
-                "error": e.message,
-                "code": e.code
-            }, ensure_ascii=False, indent=2)
-    
+            document = yield self.client.get_document(
+                document_code, fields=self._fields("CmfDocument", view)
+            )
+
+            return self._success_response(document=document)
+
+        except (EvaAPIError, ValueError) as e:
+            return self._error_response(e)
+
     # Comment Tools
-    
+
+    @_tool
     def get_comments(
         self,
         parent_code: str,
         limit: int = 50,
+        view: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> str:
         """
         Get comments for a task or document.
-        
+
         Args:
             parent_code: Parent task or document code
             limit: Maximum number of results (default: 50)
-            
+            view: Field profile - minimal, summary or full (default: EVA_DEFAULT_VIEW or full)
+            cursor: Continuation cursor from a previous truncated response
+
         Returns:
             JSON string with comment list
         """
         try:
-            comments = self.client.list_comments(
-                filters=[["parent", "=", parent_code]],
-                limit=limit
+            page = self.budget.page(
+                "eva_get_comments", cursor, limit, parent_code=parent_code, view=view
             )
-            
-            return json.dumps({
-                "success": True,
-                "count": len(comments),
-                "comments": comments
-            }, ensure_ascii=False, indent=2)
-            
-        except EvaAPIError as e:
-            return json.dumps({
-                "success": False,
-                "error": e.message,
-                "code": e.code
-            }, ensure_ascii=False, indent=2)
-    
+
+            comments = yield self.client.list_comments(
+                filters=[["parent", "=", page.args["parent_code"]]],
+                limit=page.size,
+                offset=page.offset,
+                fields=self._fields("CmfComment", page.args["view"]),
+            )
+
+            return self._page_response(page, "comments", comments)
+
+        except (EvaAPIError, ValueError) as e:
+            return self._error_response(e)
+
+    @_tool
     def add_comment(
         self,
         parent_code: str,
@@ -472,162 +833,258 @@ class EvaTools:
     ) -> str:
         """
         Add a comment to a task or document.
-        
+
         WARNING: This is a write operation. Requires read_only=False.
-        
+
         Args:
             parent_code: Parent task or document code
             text: Comment text (HTML)
-            
+
         Returns:
             JSON string with created comment details
         """
         try:
-            comment = self.client.create_comment(parent=parent_code, text=text)
-            
-            return json.dumps({
-                "success": True,
-                "comment": comment,
-                "message": "Comment added successfully"
-            }, ensure_ascii=False, indent=2)
-            
+            comment = yield self.client.create_comment(parent=parent_code, text=text)
+
+            return self._success_response(comment=comment, message="Comment added successfully")
+
         except EvaAPIError as e:
-            return json.dumps({
-                "success": False,
-                "error": e.message,
-                "code": e.code
-            }, ensure_ascii=False, indent=2)
-    
+            return self._error_response(e)
+
     # List/Sprint Tools
-    
-    def list_sprints(self, limit: int = 50) -> str:
+
+    @_tool
+    def list_sprints(
+        self, limit: int = 50, view: Optional[str] = None, cursor: Optional[str] = None
+    ) -> str:
         """
         List all sprints/lists.
-        
+
         Args:
             limit: Maximum number of results (default: 50)
-            
+            view: Field profile - minimal, summary or full (default: EVA_DEFAULT_VIEW or full)
+            cursor: Continuation cursor from a previous truncated response
+
         Returns:
             JSON string with sprint/list list
         """
         try:
-            lists = self.client.list_lists(limit=limit)
-            
-            return json.dumps({
-                "success": True,
-                "count": len(lists),
-                "lists": lists
-            }, ensure_ascii=False, indent=2)
-            
-        except EvaAPIError as e:
-            return json.dumps({
-                "success": False,
-                "error": e.message,
-                "code": e.code
-            }, ensure_ascii=False, indent=2)
-    
+            page = self.budget.page("eva_list_sprints", cursor, limit, view=view)
+
+            lists = yield self.client.list_lists(
+                limit=page.size,
+                offset=page.offset,
+                fields=self._fields("CmfList", page.args["view"]),
+            )
+
+            return self._page_response(page, "lists", lists)
+
+        except (EvaAPIError, ValueError) as e:
+            return self._error_response(e)
+
+    @_tool
     def create_list(self, name: str, project_code: str) -> str:
         """
         Create a new list (sprint/release/list) in Eva under a project.
-        
+
         WARNING: This is a write operation. Requires read_only=False.
-        NOTE: API schema (oas) exposes only 'name' and 'parent', so list type is determined by Eva side.
-        
+        NOTE: API schema (oas) exposes only 'name' and 'parent', so list type is determined
+        by Eva side.
+
         Args:
             name: List name/title
             project_code: Parent project code (e.g., CmfProject:...)
-            
+
         Returns:
             JSON string with created list details
         """
         try:
-            if not name or not name.strip():
-                raise ValueError("name is required")
-            if not project_code or not project_code.strip():
-                raise ValueError("project_code is required")
-            
-            created = self.client.create_list(name=name, parent=project_code)
-            
-            return json.dumps({
-                "success": True,
-                "list": created,
-                "message": "List created successfully"
-            }, ensure_ascii=False, indent=2)
-            
+            _validate_create_list(name, project_code)
+
+            created = yield self.client.create_list(name=name, parent=project_code)
+
+            return self._success_response(list=created, message="List created successfully")
+
         except (EvaAPIError, ValueError) as e:
-            if isinstance(e, EvaAPIError):
-                return json.dumps({
-                    "success": False,
-                    "error": e.message,
-                    "code": e.code
-                }, ensure_ascii=False, indent=2)
-            return json.dumps({
-                "success": False,
-                "error": str(e)
-            }, ensure_ascii=False, indent=2)
-    
-    def get_sprint_details(self, list_code: str) -> str:
+            return self._error_response(e)
+
+    @_tool
+    def get_sprint_details(self, list_code: str, view: Optional[str] = None) -> str:
         """
         Get detailed information about a specific sprint/list.
-        
+
         Args:
             list_code: Sprint/list code
-            
+            view: Field profile - minimal, summary or full (default: EVA_DEFAULT_VIEW or full)
+
         Returns:
             JSON string with sprint/list details
         """
         try:
-            sprint = self.client.get_list(list_code)
-            
-            return json.dumps({
-                "success": True,
-                "list": sprint
-            }, ensure_ascii=False, indent=2)
-            
-        except EvaAPIError as e:
-            return json.dumps({
-                "success": False,
-                "error": e.message,
-                "code": e.code
-            }, ensure_ascii=False, indent=2)
-    
+            sprint = yield self.client.get_list(list_code, fields=self._fields("CmfList", view))
+
+            return self._success_response(list=sprint)
+
+        except (EvaAPIError, ValueError) as e:
+            return self._error_response(e)
+
     # Audit Tools
-    
+
+    @_tool
     def get_audit_log(
         self,
         entity_code: Optional[str] = None,
         limit: int = 50,
+        view: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> str:
         """
         Get audit log entries.
-        
+
         Args:
             entity_code: Filter by specific entity code
             limit: Maximum number of results (default: 50)
-            
+            view: Field profile - minimal, summary or full (default: EVA_DEFAULT_VIEW or full)
+            cursor: Continuation cursor from a previous truncated response
+
         Returns:
             JSON string with audit log entries
         """
         try:
-            filters = []
-            if entity_code:
-                filters.append(["object_code", "=", entity_code])
-            
-            audit_entries = self.client.list_audit(
+            page = self.budget.page(
+                "eva_get_audit_log", cursor, limit, entity_code=entity_code, view=view
+            )
+            filters = _audit_filters(page.args["entity_code"])
+
+            audit_entries = yield self.client.list_audit(
                 filters=filters if filters else None,
-                limit=limit
+                limit=page.size,
+                offset=page.offset,
+                fields=self._fields("CmfAudit", page.args["view"]),
             )
-            
-            return json.dumps({
-                "success": True,
-                "count": len(audit_entries),
-                "audit_log": audit_entries
-            }, ensure_ascii=False, indent=2)
-            
+
+            return self._page_response(page, "audit_log", audit_entries)
+
+        except (EvaAPIError, ValueError) as e:
+            return self._error_response(e)
+
+    # Generic Entity Tools
+
+    @_tool
+    def list_entities(
+        self,
+        entity: str,
+        tool: str,
+        key: str,
+        parent: Optional[str] = None,
+        filters: Optional[List[List[Any]]] = None,
+        order_by: Optional[List[str]] = None,
+        limit: int = 50,
+        fields: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
+    ) -> str:
+        """
+        List objects of an entity without dedicated tools (see registry.GENERIC_ENTITIES).
+
+        Args:
+            entity: Entity name (e.g., "CmfAttachment"), bound by the registry
+            tool: Tool name the continuation cursor belongs to, bound by the registry
+            key: Response key of the rows, bound by the registry
+            parent: Filter by parent object code
+            filters: Eva filters as [field, operator, value] triples
+            order_by: Sort fields, prefixed with - for descending order
+            limit: Maximum number of results (default: 50)
+            fields: Fields to return
+            cursor: Continuation cursor from a previous truncated response
+
+        Returns:
+            JSON string with object list
+        """
+        try:
+            page = self.budget.page(
+                tool,
+                cursor,
+                limit,
+                parent=parent,
+                filters=filters,
+                order_by=order_by,
+                fields=fields,
+            )
+            args = page.args
+            rows = yield self.client.list_objects(
+                entity,
+                filters=_entity_filters(args["parent"], args["filters"]) or None,
+                limit=page.size,
+                offset=page.offset,
+                fields=args["fields"],
+                order_by=args["order_by"],
+            )
+
+            return self._page_response(page, key, rows)
+
+        except (EvaAPIError, ValueError) as e:
+            return self._error_response(e)
+
+    @_tool
+    def get_entity(
+        self, entity: str, key: str, code: str, fields: Optional[List[str]] = None
+    ) -> str:
+        """
+        Get an object of an entity without dedicated tools by code.
+
+        Args:
+            entity: Entity name, bound by the registry
+            key: Response key of the object, bound by the registry
+            code: Object code
+            fields: Fields to return
+
+        Returns:
+            JSON string with object details
+        """
+        try:
+            row = yield self.client.get_object(entity, code, fields=fields)
+
+            return self._success_response(**{key: row})
+
         except EvaAPIError as e:
-            return json.dumps({
-                "success": False,
-                "error": e.message,
-                "code": e.code
-            }, ensure_ascii=False, indent=2)
+            return self._error_response(e)
+
+
+class AsyncEvaTools(EvaTools):
+    """
+    Asyncio variant of :class:`EvaTools` backed by :class:`AsyncEvaClient`.
+
+    Every tool method is a coroutine with the same arguments and JSON output
+    as its synchronous counterpart, running the same body and awaiting the
+    client calls it yields.
+    """
+
+    def __init__(
+        self,
+        client: AsyncEvaClient,
+        default_view: Optional[str] = None,
+        serializer=None,
+        budget: Optional[ResponseBudget] = None,
+        mirror=None,
+    ):
+        """
+        Initialize Eva tools with async API client.
+
+        Args:
+            client: AsyncEvaClient instance
+            default_view: Field profile used when a tool call has no view
+            serializer: Object with dumps(obj) -> str for responses
+            budget: Row/byte budget for list responses
+            mirror: Local replica answering task searches and counts
+        """
+        super().__init__(client, default_view, serializer, budget, mirror)
+
+    def _offload(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run blocking local work in a worker thread so the event loop keeps serving calls."""
+        return asyncio.to_thread(func, *args, **kwargs)
+
 
+for _name, _method in list(vars(EvaTools).items()):
+    if hasattr(_method, "steps"):
+        setattr(AsyncEvaTools, _name, _async_tool(_method))
+del _name, _method
@@ -0,0 +1,365 @@
+"""Span tracing hooks with OTLP-compatible JSON export; a shared no-op span when disabled."""
+
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import urllib.request
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "eva-mcp-server"
+
+# OTLP span kinds and status codes
+KIND_INTERNAL = 1
+KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_current: ContextVar[Optional["Span"]] = ContextVar("eva_span", default=None)
+
+# Active tracer; None means tracing is disabled and span() returns the no-op span
+_tracer: Optional["Tracer"] = None
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    """Encode an attribute value as an OTLP AnyValue."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class Span:
+    """One timed operation; use as a context manager to make it the current span."""
+
+    __slots__ = (
+        "tracer",
+        "name",
+        "kind",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "attributes",
+        "start_ns",
+        "end_ns",
+        "status",
+        "message",
+        "_token",
+    )
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        kind: int = KIND_INTERNAL,
+    ):
+        parent = _current.get()
+        self.tracer = tracer
+        self.name = name
+        self.kind = kind
+        self.trace_id = parent.trace_id if parent is not None else f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attributes = dict(attributes) if attributes else {}
+        self.start_ns = 0
+        self.end_ns = 0
+        self.status = STATUS_OK
+        self.message = None
+        self._token = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set an attribute, e.g. http.status_code once the response arrives."""
+        self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        self.start_ns = time.time_ns()
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.end_ns = time.time_ns()
+        _current.reset(self._token)
+        if exc is not None:
+            self.status = STATUS_ERROR
+            self.message = f"{exc_type.__name__}: {exc}"
+        self.tracer.finish(self)
+        return False
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Return the span in OTLP/JSON form."""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in self.attributes.items()],
+            "status": {"code": self.status},
+        }
+        if self.parent_id is not None:
+            span["parentSpanId"] = self.parent_id
+        if self.message is not None:
+            span["status"]["message"] = self.message
+        return span
+
+
+class _NoopSpan:
+    """Span returned while tracing is disabled; every operation does nothing."""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+# Exporter worker queue markers
+_FLUSH = object()
+_STOP = object()
+
+
+class JsonLinesExporter:
+    """Append each finished span as one OTLP/JSON object per line to a file."""
+
+    def __init__(self, path: str):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_otlp(), ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+            # Flush once per finished trace rather than per span
+            if span.parent_id is None:
+                self._file.flush()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class OTLPHttpExporter:
+    """
+    Send spans to an OTLP/HTTP collector (JSON encoding) from a background thread.
+
+    Spans are queued without blocking the caller and posted in batches; when
+    the queue is full, new spans are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        max_queue: int = 10000,
+        timeout: float = 5.0,
+    ):
+        self.endpoint = endpoint
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.timeout = timeout
+        self.dropped = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(max_queue)
+        self._thread = threading.Thread(target=self._worker, name="eva-trace-export", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _payload(self, spans: List[Span]) -> bytes:
+        return json.dumps(
+            {
+                "resourceSpans": [
+                    {
+                        "resource": {
+                            "attributes": [
+                                {"key": "service.name", "value": {"stringValue": SERVICE_NAME}},
+                            ]
+                        },
+                        "scopeSpans": [
+                            {
+                                "scope": {"name": SERVICE_NAME},
+                                "spans": [span.to_otlp() for span in spans],
+                            }
+                        ],
+                    }
+                ],
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+    def _post(self, spans: List[Span]) -> None:
+        request = urllib.request.Request(
+            self.endpoint, data=self._payload(spans), headers={"Content-Type": "application/json"}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+        except OSError as e:
+            logger.warning(f"Exporting {len(spans)} spans to {self.endpoint} failed: {e}")
+
+    def _worker(self) -> None:
+        batch: List[Span] = []
+        flushed = time.monotonic()
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = _FLUSH
+            if isinstance(item, Span):
+                batch.append(item)
+                due = time.monotonic() - flushed >= self.flush_interval
+                if len(batch) < self.batch_size and not due:
+                    continue
+            if batch:
+                self._post(batch)
+                batch = []
+            flushed = time.monotonic()
+            if item is _STOP:
+                return
+
+    def shutdown(self) -> None:
+        """Send queued spans and stop the worker thread."""
+        self._queue.put(_STOP)
+        self._thread.join(self.timeout + self.flush_interval)
+
+
+class Tracer:
+    """Creates spans and hands finished ones to exporters."""
+
+    def __init__(self, exporters: List[Any]):
+        self.exporters = exporters
+
+    def span(
+        self, name: str, attributes: Optional[Dict[str, Any]] = None, kind: int = KIND_INTERNAL
+    ) -> Span:
+        return Span(self, name, attributes, kind)
+
+    def finish(self, span: Span) -> None:
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                logger.warning(f"Span export failed: {e}")
+
+    def shutdown(self) -> None:
+        for exporter in self.exporters:
+            exporter.shutdown()
+
+
+def span(name: str, attributes: Optional[Dict[str, Any]] = None, kind: int = KIND_INTERNAL):
+    """
+    Start a span as a child of the current one.
+
+    Args:
+        name: Span name (e.g., "EvaClient.call")
+        attributes: Initial span attributes
+        kind: OTLP span kind (KIND_INTERNAL or KIND_CLIENT)
+
+    Returns:
+        Context manager yielding the span; the shared no-op span while tracing is disabled
+    """
+    if _tracer is None:
+        return NOOP_SPAN
+    return _tracer.span(name, attributes, kind)
+
+
+def enabled() -> bool:
+    """Return True if a tracer is configured."""
+    return _tracer is not None
+
+
+def traced(name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a function or coroutine function so each call runs in a span called name."""
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with span(name):
+                return await func(*args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with span(name):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+class TracedSerializer:
+    """Serializer proxy recording each dumps call as a json.dumps span."""
+
+    def __init__(self, serializer: Any):
+        self.serializer = serializer
+        self.name = serializer.name
+        self.indent = serializer.indent
+
+    def dumps(self, obj: Any) -> str:
+        with span("json.dumps") as s:
+            text = self.serializer.dumps(obj)
+            s.set_attribute("json.chars", len(text))
+        return text
+
+
+def configure(exporters: List[Any]) -> Optional[Tracer]:
+    """
+    Install a tracer exporting to the given exporters, or disable tracing if the list is empty.
+
+    Components wrap their methods when they are created, so configure tracing
+    before creating clients and tools.
+    """
+    global _tracer
+    if _tracer is not None:
+        _tracer.shutdown()
+    _tracer = Tracer(exporters) if exporters else None
+    return _tracer
+
+
+def configure_from_env() -> Optional[Tracer]:
+    """
+    Configure tracing from EVA_TRACE_FILE (JSON lines) and EVA_TRACE_OTLP_ENDPOINT (OTLP/HTTP).
+
+    Returns:
+        Installed tracer, or None if neither is set
+    """
+    exporters = []
+    path = os.getenv("EVA_TRACE_FILE")
+    if path:
+        exporters.append(JsonLinesExporter(path))
+    endpoint = os.getenv("EVA_TRACE_OTLP_ENDPOINT")
+    if endpoint:
+        exporters.append(OTLPHttpExporter(endpoint))
+    return configure(exporters)
+
+
+def shutdown() -> None:
+    """Flush exporters and disable tracing."""
+    configure([])
@@ -0,0 +1,183 @@
+"""Tool argument validation compiled once from each tool's JSON input schema."""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Validator = Callable[[Optional[Dict[str, Any]]], Dict[str, Any]]
+
+_TRUE = ("true", "1", "yes")
+_FALSE = ("false", "0", "no")
+
+
+class ValidationError(ValueError):
+    """Raised when tool arguments do not match the tool's input schema."""
+
+    def __init__(self, tool: str, problems: List[str]):
+        self.tool = tool
+        self.problems = problems
+        super().__init__(f"Invalid arguments for {tool}: {'; '.join(problems)}")
+
+
+class _Invalid(Exception):
+    """Internal: a value cannot be converted to its schema type."""
+
+
+def _string(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    raise _Invalid("must be a string")
+
+
+def _integer(value: Any) -> int:
+    if isinstance(value, bool):
+        raise _Invalid("must be an integer")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            pass
+    raise _Invalid("must be an integer")
+
+
+def _number(value: Any) -> float:
+    if isinstance(value, bool):
+        raise _Invalid("must be a number")
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        try:
+            return float(value.strip())
+        except ValueError:
+            pass
+    raise _Invalid("must be a number")
+
+
+def _boolean(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in _TRUE:
+            return True
+        if lowered in _FALSE:
+            return False
+    raise _Invalid("must be a boolean")
+
+
+def _any(value: Any) -> Any:
+    return value
+
+
+_SCALARS = {"string": _string, "integer": _integer, "number": _number, "boolean": _boolean}
+
+
+def _compile_value(schema: Dict[str, Any]) -> Callable[[Any], Any]:
+    """Compile the schema of one value to a function that converts or raises _Invalid."""
+    kind = schema.get("type")
+    if kind == "array":
+        convert_item = _compile_value(schema.get("items", {}))
+        min_items = schema.get("minItems")
+        max_items = schema.get("maxItems")
+
+        def convert(value: Any) -> List[Any]:
+            if not isinstance(value, list):
+                raise _Invalid("must be an array")
+            if min_items is not None and len(value) < min_items:
+                raise _Invalid(f"must have at least {min_items} items")
+            if max_items is not None and len(value) > max_items:
+                raise _Invalid(f"must have at most {max_items} items")
+            if convert_item is _any:
+                return value
+            return [convert_item(item) for item in value]
+
+    elif kind == "object":
+
+        def convert(value: Any) -> Dict[str, Any]:
+            if not isinstance(value, dict):
+                raise _Invalid("must be an object")
+            return value
+
+    else:
+        convert = _SCALARS.get(kind, _any)
+
+    enum = schema.get("enum")
+    if enum is None:
+        return convert
+    allowed = frozenset(enum)
+    listed = ", ".join(map(str, enum))
+
+    def convert_enum(value: Any) -> Any:
+        value = convert(value)
+        if value not in allowed:
+            raise _Invalid(f"must be one of {listed}")
+        return value
+
+    return convert_enum
+
+
+def compile_validator(tool: str, schema: Dict[str, Any]) -> Validator:
+    """
+    Compile a tool input schema to a validator function.
+
+    The validator converts loosely typed values ("20" for an integer, "true"
+    for a boolean), fills in schema defaults, drops null optional arguments and
+    rejects missing required or unknown arguments.
+
+    Args:
+        tool: Tool name used in error messages
+        schema: JSON schema of the tool arguments (object with properties)
+
+    Returns:
+        Function taking the raw arguments and returning validated keyword arguments
+
+    Raises:
+        ValidationError: From the returned function, listing every problem found
+    """
+    properties = schema.get("properties", {})
+    converters = {name: _compile_value(prop) for name, prop in properties.items()}
+    required = tuple(schema.get("required", ()))
+    defaults: Tuple[Tuple[str, Any], ...] = tuple(
+        (name, prop["default"]) for name, prop in properties.items() if "default" in prop
+    )
+
+    def validate(arguments: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        if arguments is None:
+            arguments = {}
+        elif not isinstance(arguments, dict):
+            raise ValidationError(tool, ["arguments must be an object"])
+        result = {}
+        problems = None
+        # Arguments already reported as invalid are not reported as missing too
+        invalid = None
+        for name, value in arguments.items():
+            convert = converters.get(name)
+            if convert is None:
+                problems = problems or []
+                problems.append(f"unknown argument '{name}'")
+                continue
+            if value is None:
+                continue
+            try:
+                result[name] = convert(value)
+            except _Invalid as e:
+                problems = problems or []
+                problems.append(f"'{name}' {e}")
+                invalid = invalid or set()
+                invalid.add(name)
+        for name in required:
+            if name not in result and (invalid is None or name not in invalid):
+                problems = problems or []
+                problems.append(f"'{name}' is required")
+        if problems:
+            raise ValidationError(tool, problems)
+        for name, default in defaults:
+            if name not in result:
+                result[name] = default
+        return result
+
+    return validate
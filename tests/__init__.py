@@ -1,2 +1 @@
 """Tests for Eva MCP Server."""
-
@@ -0,0 +1,41 @@
+"""Shared test fixtures."""
+
+import os
+import sys
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from eva_client import AsyncEvaClient, EvaClient
+
+
+@pytest.fixture
+async def make_client():
+    """
+    Factory for clients whose HTTP requests are answered by a handler.
+
+    make_client(handler, cls=EvaClient, **kwargs) builds cls with kwargs and
+    swaps its HTTP client for one on httpx.MockTransport(handler); the handler
+    may be async for AsyncEvaClient. The replaced and the mock HTTP clients are
+    both closed at teardown.
+    """
+    http_clients = []
+
+    def make(handler, cls=EvaClient, **kwargs):
+        kwargs.setdefault("api_url", "https://test.eva.com/api")
+        kwargs.setdefault("api_token", "test_token")
+        client = cls(**kwargs)
+        client_cls = httpx.AsyncClient if issubclass(cls, AsyncEvaClient) else httpx.Client
+        http_clients.append(client.client)
+        client.client = client_cls(transport=httpx.MockTransport(handler))
+        http_clients.append(client.client)
+        return client
+
+    yield make
+    for http_client in http_clients:
+        if isinstance(http_client, httpx.AsyncClient):
+            await http_client.aclose()
+        else:
+            http_client.close()
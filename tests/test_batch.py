@@ -0,0 +1,233 @@
+"""Tests for JSON-RPC batch requests."""
+
+import json
+import os
+import sys
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from eva_client import AsyncEvaClient, EvaAPIError, EvaClient
+from resilience import RetryPolicy
+
+ROWS = {
+    "CmfTask.get": {"code": "TASK-1", "name": "Task"},
+    "CmfComment.list": [{"code": "COM-1"}],
+    "CmfAudit.list": [{"code": "AUD-1"}],
+}
+
+
+def _answer(request):
+    """Answer a single JSON-RPC request object."""
+    if request["method"] == "CmfTask.count":
+        return {"callid": request["callid"], "error": {"code": -32600, "message": "Bad filter"}}
+    return {"callid": request["callid"], "result": ROWS[request["method"]]}
+
+
+def _batch_server(posts):
+    """Endpoint accepting arrays; responses are returned in reverse order."""
+
+    def handler(request):
+        body = json.loads(request.content)
+        posts.append(body)
+        if isinstance(body, list):
+            return httpx.Response(200, json=[_answer(item) for item in reversed(body)])
+        return httpx.Response(200, json=_answer(body))
+
+    return handler
+
+
+def _single_server(posts):
+    """Endpoint rejecting arrays like a plain JSON-RPC server."""
+
+    def handler(request):
+        body = json.loads(request.content)
+        posts.append(body)
+        if isinstance(body, list):
+            return httpx.Response(
+                200, json={"error": {"code": -32600, "message": "Invalid Request"}}
+            )
+        return httpx.Response(200, json=_answer(body))
+
+    return handler
+
+
+def _flaky_server(posts, statuses):
+    """Batch endpoint answering arrays with the queued statuses before succeeding."""
+    batch = _batch_server(posts)
+
+    def handler(request):
+        if isinstance(json.loads(request.content), list) and statuses:
+            posts.append("array")
+            return httpx.Response(statuses.pop(0), text="upstream unavailable")
+        return batch(request)
+
+    return handler
+
+
+def test_batch_sends_one_request_and_matches_callids(make_client):
+    """Calls go out as one array and results are matched by callid."""
+    posts = []
+    client = make_client(_batch_server(posts))
+
+    with client.batch() as batch:
+        task = batch.get_task("TASK-1")
+        comments = batch.list_comments(filters=[["parent", "=", "TASK-1"]])
+        audit = batch.call("CmfAudit.list", filter=[["object_code", "=", "TASK-1"]])
+        count = batch.count_tasks()
+
+    assert len(posts) == 1 and len(posts[0]) == 4
+    assert task.result() == ROWS["CmfTask.get"]
+    assert comments.result() == ROWS["CmfComment.list"]
+    assert audit.result() == ROWS["CmfAudit.list"]
+    with pytest.raises(EvaAPIError, match="Bad filter"):
+        count.result()
+    assert client._batch_supported is True
+
+
+def test_batch_falls_back_when_arrays_rejected(make_client):
+    """Unsupported batches are detected once and sent as individual requests."""
+    posts = []
+    client = make_client(_single_server(posts))
+
+    with client.batch() as batch:
+        task = batch.get_task("TASK-1")
+        comments = batch.list_comments()
+
+    assert task.result() == ROWS["CmfTask.get"]
+    assert comments.result() == ROWS["CmfComment.list"]
+    assert client._batch_supported is False
+
+    posts.clear()
+    with client.batch() as batch:
+        batch.get_task("TASK-1")
+        batch.list_comments()
+    assert all(isinstance(body, dict) for body in posts)
+    assert len(posts) == 2
+
+
+def test_batch_5xx_before_detection_keeps_support_unknown(make_client):
+    """A 5xx on the first batch is not taken as 'arrays unsupported'."""
+    posts = []
+    client = make_client(_flaky_server(posts, [503]), retry=RetryPolicy(max_retries=0))
+
+    with client.batch() as batch:
+        task = batch.get_task("TASK-1")
+        comments = batch.list_comments()
+
+    assert task.result() == ROWS["CmfTask.get"]
+    assert comments.result() == ROWS["CmfComment.list"]
+    assert client._batch_supported is None
+    assert posts[0] == "array" and len(posts) == 3
+
+    with client.batch() as batch:
+        batch.get_task("TASK-1")
+        batch.list_comments()
+    assert client._batch_supported is True
+
+
+def test_batch_5xx_retries_reads_and_fails_writes(make_client):
+    """Once batching is confirmed, a 5xx retries reads individually and fails writes."""
+    posts = []
+    client = make_client(
+        _flaky_server(posts, [502]),
+        read_only=False,
+        retry=RetryPolicy(max_retries=2, base_delay=0),
+    )
+    client._batch_supported = True
+
+    with client.batch() as batch:
+        task = batch.get_task("TASK-1")
+        update = batch.update_task("TASK-1", name="Renamed")
+
+    assert task.result() == ROWS["CmfTask.get"]
+    with pytest.raises(EvaAPIError, match="HTTP 502"):
+        update.result()
+    assert posts[0] == "array" and len(posts) == 2
+    assert client._batch_supported is True
+
+
+def test_batch_takes_one_rate_limit_token_per_call(make_client):
+    """Each call carried by a batch is charged to the rate limiter."""
+    posts = []
+    client = make_client(_batch_server(posts))
+    reserved = []
+    reserve = client.limiter.reserve
+    client.limiter.reserve = lambda method: reserved.append(method) or reserve(method)
+
+    with client.batch() as batch:
+        batch.get_task("TASK-1")
+        batch.list_comments()
+        batch.call("CmfAudit.list")
+
+    assert len(posts) == 1
+    assert reserved == ["CmfTask.get", "CmfComment.list", "CmfAudit.list"]
+
+
+def test_batch_mode_false_never_sends_arrays(make_client):
+    """EVA_BATCH=false skips detection."""
+    posts = []
+    client = make_client(_batch_server(posts), batch_mode="false")
+
+    with client.batch() as batch:
+        batch.get_task("TASK-1")
+        batch.list_comments()
+
+    assert all(isinstance(body, dict) for body in posts)
+
+
+def test_batch_result_before_execute_and_write_in_read_only(make_client):
+    """Results are unavailable until execution; writes are checked when queued."""
+    client = make_client(_batch_server([]), read_only=True)
+    batch = client.batch()
+    task = batch.get_task("TASK-1")
+
+    with pytest.raises(RuntimeError, match="not been executed"):
+        task.result()
+    with pytest.raises(EvaAPIError, match="read-only"):
+        batch.create_comment(parent="TASK-1", text="hi")
+    with pytest.raises(AttributeError):
+        batch.fetch_all_tasks()
+
+
+def test_invalid_batch_mode():
+    """Unknown EVA_BATCH values are rejected."""
+    with pytest.raises(ValueError, match="batch mode"):
+        EvaClient(
+            api_url="https://test.eva.com/api", api_token="test_token", batch_mode="sometimes"
+        )
+
+
+@pytest.mark.asyncio
+async def test_async_batch(make_client):
+    """Async batches are executed on leaving async with."""
+    posts = []
+    client = make_client(_batch_server(posts), cls=AsyncEvaClient)
+
+    async with client.batch() as batch:
+        task = batch.get_task("TASK-1")
+        audit = batch.list_audit(filters=[["object_code", "=", "TASK-1"]])
+
+    assert len(posts) == 1
+    assert task.result() == ROWS["CmfTask.get"]
+    assert audit.result() == ROWS["CmfAudit.list"]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_async_batch_fallback(make_client):
+    """Async fallback sends the calls concurrently as individual requests."""
+    posts = []
+    client = make_client(_single_server(posts), cls=AsyncEvaClient)
+
+    batch = client.batch()
+    task = batch.get_task("TASK-1")
+    comments = batch.list_comments()
+    await batch.execute()
+
+    assert task.result() == ROWS["CmfTask.get"]
+    assert comments.result() == ROWS["CmfComment.list"]
+    assert len(posts) == 3
+    await client.close()
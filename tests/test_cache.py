@@ -0,0 +1,136 @@
+"""Tests for Eva API response cache."""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from cache import MISSING, MemoryCache, codes_of, make_key
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Create a fake clock."""
+    return FakeClock()
+
+
+def test_make_key_normalizes_kwargs():
+    """Test that kwargs ordering does not change the key."""
+    assert make_key("CmfTask.get", {"code": "T-1", "fields": ["a"]}) == make_key(
+        "CmfTask.get", {"fields": ["a"], "code": "T-1"}
+    )
+    assert make_key("CmfTask.get", {"code": "T-1"}) != make_key("CmfProject.get", {"code": "T-1"})
+
+
+def test_codes_of_collects_kwargs_and_result_codes():
+    """Test entity code extraction."""
+    codes = codes_of({"code": "T-1"}, {"code": "T-1", "id": "CmfTask:uuid"})
+    assert codes == {"T-1", "CmfTask:uuid"}
+
+
+def test_get_set_and_ttl_expiry(clock):
+    """Test cached values expire after their TTL."""
+    cache = MemoryCache(clock=clock)
+    cache.set("k", {"code": "T-1"}, ttl=10)
+
+    assert cache.get("k") == {"code": "T-1"}
+    clock.now = 11
+    assert cache.get("k") is MISSING
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 0
+
+
+def test_per_entity_ttl():
+    """Test TTL lookup and cacheability per entity."""
+    cache = MemoryCache(ttls={"CmfTask": 5, "CmfPerson": 0}, default_ttl=60)
+
+    assert cache.ttl_for("CmfTask.get") == 5
+    assert cache.ttl_for("CmfProject.get") == 60
+    assert cache.is_cacheable("CmfTask.get") is True
+    assert cache.is_cacheable("CmfPerson.get") is False
+    assert cache.is_cacheable("CmfTask.list") is False
+
+
+def test_lru_eviction_by_entries(clock):
+    """Test least recently used entry is evicted first."""
+    cache = MemoryCache(max_entries=2, clock=clock)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")
+    cache.set("c", 3, ttl=60)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_eviction_by_bytes(clock):
+    """Test entries are evicted to stay within the byte budget."""
+    cache = MemoryCache(max_bytes=30, clock=clock)
+    cache.set("a", "x" * 10, ttl=60)
+    cache.set("b", "y" * 10, ttl=60)
+    cache.set("c", "z" * 10, ttl=60)
+
+    assert cache.get("a") is MISSING
+    assert cache.stats()["bytes"] <= 30
+
+    # Values larger than the whole budget are never stored
+    cache.set("big", "w" * 100, ttl=60)
+    assert cache.get("big") is MISSING
+
+
+def test_invalidate_code(clock):
+    """Test invalidation removes every entry depending on a code."""
+    cache = MemoryCache(clock=clock)
+    cache.set("k1", {"code": "T-1"}, ttl=60, codes={"T-1"})
+    cache.set("k2", {"code": "T-1"}, ttl=60, codes={"T-1", "CmfTask:uuid"})
+    cache.set("k3", {"code": "T-2"}, ttl=60, codes={"T-2"})
+
+    assert cache.invalidate_code("T-1") == 2
+    assert cache.get("k1") is MISSING
+    assert cache.get("k2") is MISSING
+    assert cache.get("k3") == {"code": "T-2"}
+    assert cache.invalidate_code("CmfTask:uuid") == 0
+
+
+def test_store_dropped_when_invalidated_during_read(clock):
+    """Test a read started before an invalidation does not store its stale value."""
+    cache = MemoryCache(clock=clock)
+    before = cache.generation()
+    cache.invalidate_code("T-1")
+
+    cache.set("k1", {"code": "T-1", "name": "old"}, ttl=60, codes={"T-1"}, generation=before)
+    assert cache.get("k1") is MISSING
+
+    cache.set("k2", {"code": "T-2"}, ttl=60, codes={"T-2"}, generation=before)
+    assert cache.get("k2") == {"code": "T-2"}
+
+    after = cache.generation()
+    cache.set("k1", {"code": "T-1", "name": "new"}, ttl=60, codes={"T-1"}, generation=after)
+    assert cache.get("k1") == {"code": "T-1", "name": "new"}
+
+
+def test_forgotten_invalidations_drop_older_reads(clock):
+    """Test reads older than the forgotten invalidation records are never stored."""
+    cache = MemoryCache(max_entries=2, clock=clock)
+    before = cache.generation()
+    for code in ("T-1", "T-2", "T-3"):
+        cache.invalidate_code(code)
+
+    cache.set("k1", {"code": "T-9"}, ttl=60, codes={"T-9"}, generation=before)
+    assert cache.get("k1") is MISSING
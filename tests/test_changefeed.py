@@ -0,0 +1,126 @@
+"""Tests for audit log change feed."""
+
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from cache import MISSING, MemoryCache
+from changefeed import AuditChangeFeed
+
+
+def _entry(code, created_at, object_code):
+    return {"code": code, "cmf_created_at": created_at, "object_code": object_code}
+
+
+@pytest.fixture
+def cache():
+    """Create cache holding two tasks."""
+    cache = MemoryCache()
+    cache.set("task-1", {"code": "T-1"}, ttl=600, codes={"T-1"})
+    cache.set("task-2", {"code": "T-2"}, ttl=600, codes={"T-2"})
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_first_poll_sets_high_water_mark(tmp_path, cache):
+    """Test first poll starts from the newest audit entry without invalidating."""
+    client = AsyncMock()
+    client.list_audit.return_value = [_entry("A-9", "2025-01-01T10:00:00", "T-1")]
+    feed = AuditChangeFeed(client, cache=cache, state_file=str(tmp_path / "state.json"))
+
+    assert await feed.poll_once() == 0
+    assert feed.high_water_mark == "2025-01-01T10:00:00"
+    assert cache.get("task-1") == {"code": "T-1"}
+    state = json.loads((tmp_path / "state.json").read_text())
+    assert state == {"high_water_mark": "2025-01-01T10:00:00", "seen": ["A-9"]}
+
+
+@pytest.mark.asyncio
+async def test_empty_audit_log_delivers_the_first_change(tmp_path, cache):
+    """Test a feed started on an empty audit log processes the first entry written later."""
+    client = AsyncMock()
+    client.list_audit.return_value = []
+    feed = AuditChangeFeed(client, cache=cache, state_file=str(tmp_path / "state.json"))
+
+    assert await feed.poll_once() == 0
+    assert feed.high_water_mark == ""
+    restarted = AuditChangeFeed(client, cache=cache, state_file=str(tmp_path / "state.json"))
+    assert restarted.high_water_mark == ""
+
+    client.list_audit.return_value = [_entry("A-1", "2025-01-01T10:00:00", "T-1")]
+    assert await restarted.poll_once() == 1
+    assert client.list_audit.call_args.kwargs["filters"] is None
+    assert cache.get("task-1") is MISSING
+    assert restarted.high_water_mark == "2025-01-01T10:00:00"
+
+
+@pytest.mark.asyncio
+async def test_poll_invalidates_changed_entities_and_publishes(tmp_path, cache):
+    """Test new entries invalidate exactly the changed entities."""
+    state_file = tmp_path / "state.json"
+    state_file.write_text(json.dumps({"high_water_mark": "2025-01-01T10:00:00", "seen": ["A-9"]}))
+    client = AsyncMock()
+    client.list_audit.return_value = [
+        _entry("A-9", "2025-01-01T10:00:00", "T-2"),
+        _entry("A-10", "2025-01-01T10:05:00", "T-1"),
+    ]
+    feed = AuditChangeFeed(client, cache=cache, state_file=str(state_file), page_size=10)
+    received = []
+    feed.subscribe(received.append)
+
+    assert await feed.poll_once() == 1
+    assert cache.get("task-1") is MISSING
+    assert cache.get("task-2") == {"code": "T-2"}
+    assert [entry["code"] for entry in received] == ["A-10"]
+    assert client.list_audit.call_args.kwargs["filters"] == [
+        ["cmf_created_at", ">=", "2025-01-01T10:00:00"]
+    ]
+
+    restarted = AuditChangeFeed(client, cache=cache, state_file=str(state_file))
+    assert restarted.high_water_mark == "2025-01-01T10:05:00"
+
+
+@pytest.mark.asyncio
+async def test_poll_with_sync_client_and_failing_subscriber(tmp_path, cache):
+    """Test feed works with sync client and isolates subscriber errors."""
+    client = Mock()
+    client.list_audit.return_value = [_entry("A-11", "2025-01-02", "T-2")]
+    feed = AuditChangeFeed(client, cache=cache, state_file=str(tmp_path / "state.json"))
+    feed.high_water_mark = "2025-01-01"
+
+    def failing(entry):
+        raise RuntimeError("boom")
+
+    async_received = []
+
+    async def async_subscriber(entry):
+        async_received.append(entry["code"])
+
+    feed.subscribe(failing)
+    unsubscribe = feed.subscribe(async_subscriber)
+
+    assert await feed.poll_once() == 1
+    assert async_received == ["A-11"]
+    assert cache.get("task-2") is MISSING
+
+    unsubscribe()
+    client.list_audit.return_value = [_entry("A-12", "2025-01-03", "T-1")]
+    await feed.poll_once()
+    assert async_received == ["A-11"]
+
+
+def test_default_state_file_is_namespaced(monkeypatch):
+    """Feeds of different Eva instances or tokens keep separate high-water marks."""
+    monkeypatch.delenv("EVA_AUDIT_STATE_FILE", raising=False)
+    monkeypatch.setattr("changefeed.AuditChangeFeed._load_state", lambda self: None)
+
+    first = AuditChangeFeed(Mock(), namespace="aaaa")
+    second = AuditChangeFeed(Mock(), namespace="bbbb")
+
+    assert first.state_file.name == "audit_state-aaaa.json"
+    assert first.state_file.parent == second.state_file.parent
+    assert first.state_file != second.state_file
@@ -0,0 +1,187 @@
+"""Tests for the persistent SQLite cache tier."""
+
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from cache import MISSING, MemoryCache, make_key
+from diskcache import SQLiteCache, TieredCache, cache_namespace
+from eva_client import AsyncEvaClient, EvaClient
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "cache.sqlite3")
+
+
+def test_values_survive_reopen(db_path):
+    """Entries written by one process are served after a restart."""
+    first = SQLiteCache(db_path)
+    first.set("k", {"code": "T-1", "name": "Задача"}, ttl=60, codes={"T-1"})
+    first.close()
+
+    second = SQLiteCache(db_path)
+    assert second.get("k") == {"code": "T-1", "name": "Задача"}
+    value, remaining, codes = second.lookup("k")
+    assert 0 < remaining <= 60
+    assert codes == {"T-1"}
+
+
+def test_expiry_uses_stored_ttl(db_path):
+    """Entries expire after their TTL."""
+    clock = FakeClock()
+    cache = SQLiteCache(db_path, clock=clock)
+    cache.set("k", 1, ttl=10)
+
+    clock.now += 11
+    assert cache.get("k") is MISSING
+
+
+def test_invalidate_code_and_namespaces(db_path):
+    """Invalidation removes dependent entries of the own namespace only."""
+    ours = SQLiteCache(db_path, namespace="a")
+    theirs = SQLiteCache(db_path, namespace="b")
+    ours.set("k1", 1, ttl=60, codes={"T-1"})
+    ours.set("k2", 2, ttl=60, codes={"T-2"})
+    theirs.set("k1", 3, ttl=60, codes={"T-1"})
+
+    assert ours.invalidate_code("T-1") == 1
+    assert ours.get("k1") is MISSING
+    assert ours.get("k2") == 2
+    assert theirs.get("k1") == 3
+
+
+def test_size_cap_evicts_oldest(db_path):
+    """Pruning removes expired entries first, then the oldest ones."""
+    clock = FakeClock()
+    cache = SQLiteCache(db_path, max_entries=3, clock=clock)
+    for i in range(5):
+        clock.now += 1
+        cache.set(f"k{i}", i, ttl=60 if i else 0.5)
+
+    assert cache.prune() == 2
+    assert [cache.get(f"k{i}") for i in range(5)] == [MISSING, MISSING, 2, 3, 4]
+    assert cache.stats()["entries"] == 3
+
+
+def test_concurrent_writers(db_path):
+    """Several connections can write concurrently without errors."""
+    caches = [SQLiteCache(db_path) for _ in range(4)]
+
+    def write(cache, n):
+        for i in range(50):
+            cache.set(f"{n}-{i}", i, ttl=60, codes={f"C-{i}"})
+
+    threads = [threading.Thread(target=write, args=(c, n)) for n, c in enumerate(caches)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(c.errors for c in caches) == 0
+    assert caches[0].stats()["entries"] == 200
+
+
+def test_tiered_cache_promotes_disk_hits(db_path):
+    """A cold memory tier is filled from disk with the remaining TTL."""
+    SQLiteCache(db_path).set("k", {"code": "P-1"}, ttl=300, codes={"P-1"})
+    tiered = TieredCache(MemoryCache(), SQLiteCache(db_path))
+
+    assert tiered.get("k") == {"code": "P-1"}
+    assert tiered.memory.get("k") == {"code": "P-1"}
+
+    tiered.invalidate_code("P-1")
+    assert tiered.get("k") is MISSING
+    assert tiered.disk.get("k") is MISSING
+
+
+def test_client_warm_restart_serves_reference_lists(db_path, monkeypatch):
+    """After a restart, gets and reference lists are served without requests."""
+
+    def client():
+        cache = TieredCache(
+            MemoryCache(), SQLiteCache(db_path, namespace=cache_namespace("u", "t"))
+        )
+        return EvaClient(api_url="https://test.eva.com/api", api_token="test_token", cache=cache)
+
+    first = client()
+    monkeypatch.setattr(
+        first,
+        "_send",
+        lambda method, kwargs: [{"code": "P-1"}] if method.endswith("list") else {"code": "P-1"},
+    )
+    first.list_projects()
+    first.get_project("P-1")
+    first.close()
+
+    second = client()
+    monkeypatch.setattr(
+        second, "_send", lambda method, kwargs: pytest.fail(f"request sent: {method}")
+    )
+    assert second.list_projects() == [{"code": "P-1"}]
+    assert second.get_project("P-1") == {"code": "P-1"}
+    second.close()
+
+
+def test_write_invalidates_cached_reference_list(db_path):
+    """Creating a list invalidates cached CmfList.list results."""
+    cache = TieredCache(MemoryCache(), SQLiteCache(db_path))
+    key = make_key("CmfList.list", {"slice": [0, 50]})
+    cache.set(key, [{"code": "L-1"}], ttl=300, codes={"L-1", "CmfList"})
+    client = EvaClient(
+        api_url="https://test.eva.com/api", api_token="test_token", read_only=False, cache=cache
+    )
+
+    client._cache_update(
+        "CmfList.create", {"name": "Sprint", "parent": "P-1"}, None, {"code": "L-2"}
+    )
+
+    assert cache.get(key) is MISSING
+    client.close()
+
+
+@pytest.mark.asyncio
+async def test_async_client_uses_disk_tier_off_the_event_loop(db_path, monkeypatch):
+    """SQLite reads, writes and invalidations of AsyncEvaClient run in worker threads."""
+    disk = SQLiteCache(db_path)
+    threads = []
+    for name in ("lookup", "set", "invalidate_code"):
+        method = getattr(disk, name)
+
+        def record(*args, _method=method):
+            threads.append(threading.get_ident())
+            return _method(*args)
+
+        monkeypatch.setattr(disk, name, record)
+
+    async def send(method, kwargs):
+        return {"code": "P-1"}
+
+    client = AsyncEvaClient(
+        api_url="https://test.eva.com/api",
+        api_token="test_token",
+        read_only=False,
+        cache=TieredCache(MemoryCache(), disk),
+    )
+    monkeypatch.setattr(client, "_send", send)
+
+    assert await client.get_project("P-1") == {"code": "P-1"}
+    assert await client.get_project("P-1") == {"code": "P-1"}  # memory hit, no disk access
+    await client.update_task("T-1", parent="P-1")
+
+    assert len(threads) == 2 + 3  # lookup, set, then the task, CmfTask and P-1 codes
+    assert threading.get_ident() not in threads
+    assert disk.get(make_key("CmfProject.get", {"code": "P-1"})) is MISSING
+    await client.close()
@@ -0,0 +1,104 @@
+"""Tests for tool dispatcher."""
+
+import asyncio
+import threading
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from config import parse_mapping
+from dispatcher import ToolDispatcher
+
+
+def test_parse_limits():
+    """Test parsing per-tool limits."""
+    assert parse_mapping("eva_get_task=8, eva_search_tasks=2") == {
+        "eva_get_task": 8,
+        "eva_search_tasks": 2,
+    }
+    assert parse_mapping("") == {}
+
+
+def test_parse_limits_invalid():
+    """Test invalid limit specification."""
+    with pytest.raises(ValueError, match="expected name=N"):
+        parse_mapping("eva_get_task")
+
+
+@pytest.mark.asyncio
+async def test_dispatch_runs_async_tools_concurrently():
+    """Test that async tools run in parallel up to the global limit."""
+    dispatcher = ToolDispatcher(max_concurrency=3, tool_limits={})
+    peak = 0
+
+    async def tool(value):
+        nonlocal peak
+        peak = max(peak, dispatcher.in_flight)
+        await asyncio.sleep(0.01)
+        return value
+
+    results = await asyncio.gather(
+        *(dispatcher.dispatch("eva_get_task", tool, {"value": i}) for i in range(10))
+    )
+
+    assert results == list(range(10))
+    assert peak == 3
+    stats = dispatcher.stats()
+    assert stats["tools"]["eva_get_task"]["calls"] == 10
+    assert stats["waiting"] == 0
+    assert stats["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_dispatch_per_tool_limit():
+    """Test that a per-tool limit is applied below the global limit."""
+    dispatcher = ToolDispatcher(max_concurrency=10, tool_limits={"eva_search_tasks": 1})
+    active = 0
+    peak = 0
+
+    async def tool():
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.005)
+        active -= 1
+
+    await asyncio.gather(*(dispatcher.dispatch("eva_search_tasks", tool, {}) for _ in range(4)))
+
+    assert peak == 1
+    assert dispatcher.stats()["tools"]["eva_search_tasks"]["wait_max_ms"] > 0
+
+
+@pytest.mark.asyncio
+async def test_dispatch_sync_tool_runs_in_worker_thread():
+    """Test that synchronous tools are moved off the event loop thread."""
+    dispatcher = ToolDispatcher(max_concurrency=2, tool_limits={})
+    loop_thread = threading.get_ident()
+
+    def tool(task_code):
+        return task_code, threading.get_ident()
+
+    try:
+        code, thread_id = await dispatcher.dispatch("eva_get_task", tool, {"task_code": "T-1"})
+    finally:
+        dispatcher.shutdown()
+
+    assert code == "T-1"
+    assert thread_id != loop_thread
+
+
+@pytest.mark.asyncio
+async def test_dispatch_releases_slot_on_error():
+    """Test that failing tools release their concurrency slot."""
+    dispatcher = ToolDispatcher(max_concurrency=1, tool_limits={"eva_get_task": 1})
+
+    async def tool():
+        raise RuntimeError("boom")
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            await dispatcher.dispatch("eva_get_task", tool, {})
+
+    assert dispatcher.in_flight == 0
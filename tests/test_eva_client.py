@@ -1,14 +1,15 @@
 """Tests for Eva API client."""
 
 import pytest
-from unittest.mock import Mock, patch
-import httpx
+from unittest.mock import AsyncMock, Mock, patch
 
 import sys
 import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from eva_client import EvaClient, EvaAPIError
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from cache import MemoryCache
+from eva_client import EvaClient, AsyncEvaClient, EvaAPIError
 
 
 @pytest.fixture
@@ -16,9 +17,7 @@ def mock_client():
     """Create a mock Eva client."""
     with patch.dict(os.environ, {"EVA_API_TOKEN": "test_token"}):
         client = EvaClient(
-            api_url="https://test.eva.com/api",
-            api_token="test_token",
-            read_only=True
+            api_url="https://test.eva.com/api", api_token="test_token", read_only=True
         )
         yield client
         client.close()
@@ -28,15 +27,13 @@ def test_client_initialization():
     """Test client initialization."""
     with patch.dict(os.environ, {"EVA_API_TOKEN": "test_token"}):
         client = EvaClient(
-            api_url="https://test.eva.com/api",
-            api_token="test_token",
-            read_only=True
+            api_url="https://test.eva.com/api", api_token="test_token", read_only=True
         )
-        
+
         assert client.api_url == "https://test.eva.com/api"
         assert client.api_token == "test_token"
         assert client.read_only is True
-        
+
         client.close()
 
 
@@ -69,7 +66,7 @@ def test_generate_callid(mock_client):
 def test_build_request(mock_client):
     """Test request building."""
     request = mock_client._build_request("CmfTask.get", {"code": "TASK-123"})
-    
+
     assert request["jsonrpc"] == "2.2"
     assert request["method"] == "CmfTask.get"
     assert "callid" in request
@@ -80,14 +77,12 @@ def test_build_request(mock_client):
 async def test_successful_api_call(mock_client):
     """Test successful API call."""
     mock_response = Mock()
-    mock_response.json.return_value = {
-        "result": {"code": "TASK-123", "name": "Test Task"}
-    }
+    mock_response.json.return_value = {"result": {"code": "TASK-123", "name": "Test Task"}}
     mock_response.raise_for_status = Mock()
-    
-    with patch.object(mock_client.client, 'post', return_value=mock_response):
+
+    with patch.object(mock_client.client, "post", return_value=mock_response):
         result = mock_client.call("CmfTask.get", code="TASK-123")
-        
+
         assert result == {"code": "TASK-123", "name": "Test Task"}
 
 
@@ -95,15 +90,10 @@ async def test_successful_api_call(mock_client):
 async def test_api_error_response(mock_client):
     """Test API error response handling."""
     mock_response = Mock()
-    mock_response.json.return_value = {
-        "error": {
-            "code": -32600,
-            "message": "Invalid Request"
-        }
-    }
+    mock_response.json.return_value = {"error": {"code": -32600, "message": "Invalid Request"}}
     mock_response.raise_for_status = Mock()
-    
-    with patch.object(mock_client.client, 'post', return_value=mock_response):
+
+    with patch.object(mock_client.client, "post", return_value=mock_response):
         with pytest.raises(EvaAPIError, match="Invalid Request"):
             mock_client.call("CmfTask.get", code="TASK-123")
 
@@ -114,3 +104,291 @@ def test_context_manager(mock_client):
         with EvaClient(api_url="https://test.eva.com/api", api_token="test_token") as client:
             assert client.api_url == "https://test.eva.com/api"
 
+
+@pytest.fixture
+async def async_client():
+    """Create an async Eva client."""
+    client = AsyncEvaClient(
+        api_url="https://test.eva.com/api", api_token="test_token", read_only=True
+    )
+    yield client
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_async_successful_api_call(async_client):
+    """Test successful async API call."""
+    mock_response = Mock()
+    mock_response.json.return_value = {"result": {"code": "TASK-123", "name": "Test Task"}}
+    mock_response.raise_for_status = Mock()
+
+    with patch.object(
+        async_client.client, "post", new=AsyncMock(return_value=mock_response)
+    ) as post:
+        result = await async_client.get_task("TASK-123")
+
+        assert result == {"code": "TASK-123", "name": "Test Task"}
+        assert post.call_args.args[0] == "https://test.eva.com/api/?m=CmfTask.get"
+
+
+@pytest.mark.asyncio
+async def test_async_api_error_response(async_client):
+    """Test async API error response keeps JSON-RPC error code."""
+    mock_response = Mock()
+    mock_response.json.return_value = {"error": {"code": -32600, "message": "Invalid Request"}}
+    mock_response.raise_for_status = Mock()
+
+    with patch.object(async_client.client, "post", new=AsyncMock(return_value=mock_response)):
+        with pytest.raises(EvaAPIError, match="Invalid Request") as exc_info:
+            await async_client.list_tasks(limit=5)
+
+        assert exc_info.value.code == -32600
+
+
+@pytest.mark.asyncio
+async def test_async_read_only_protection(async_client):
+    """Test that async write operations are blocked in read-only mode."""
+    with pytest.raises(EvaAPIError, match="read-only mode"):
+        await async_client.create_comment(parent="TASK-1", text="Hi")
+
+
+def _result_response(result):
+    """Build a mock HTTP response carrying a JSON-RPC result."""
+    response = Mock()
+    response.json.return_value = {"result": result}
+    response.raise_for_status = Mock()
+    return response
+
+
+def test_cached_get_skips_network():
+    """Test repeated get calls are served from cache."""
+    client = EvaClient(
+        api_url="https://test.eva.com/api",
+        api_token="test_token",
+        read_only=False,
+        cache=MemoryCache(),
+    )
+    with patch.object(
+        client.client, "post", return_value=_result_response({"code": "T-1"})
+    ) as post:
+        assert client.get_task("T-1") == {"code": "T-1"}
+        assert client.get_task("T-1") == {"code": "T-1"}
+
+        assert post.call_count == 1
+        assert client.cache.stats()["hits"] == 1
+    client.close()
+
+
+def test_write_invalidates_cached_entity():
+    """Test update and comment creation invalidate the touched task."""
+    client = EvaClient(
+        api_url="https://test.eva.com/api",
+        api_token="test_token",
+        read_only=False,
+        cache=MemoryCache(),
+    )
+    with patch.object(
+        client.client, "post", return_value=_result_response({"code": "T-1"})
+    ) as post:
+        client.get_task("T-1")
+        client.update_task("T-1", name="New name")
+        client.get_task("T-1")
+        assert post.call_count == 3
+
+        client.create_comment(parent="T-1", text="Hi")
+        client.get_task("T-1")
+        assert post.call_count == 5
+    client.close()
+
+
+def test_write_during_read_keeps_stale_result_out_of_cache():
+    """Test a get racing an update of the same task does not cache the old row."""
+    client = EvaClient(
+        api_url="https://test.eva.com/api",
+        api_token="test_token",
+        read_only=False,
+        cache=MemoryCache(),
+    )
+
+    def post(url, json=None):
+        if json["method"] == "CmfTask.get" and post.calls == 0:
+            post.calls += 1
+            # The update lands while the first read is in flight
+            client.update_task("T-1", name="New name")
+            return _result_response({"code": "T-1", "name": "Old name"})
+        return _result_response({"code": "T-1", "name": "New name"})
+
+    post.calls = 0
+
+    with patch.object(client.client, "post", side_effect=post):
+        assert client.get_task("T-1")["name"] == "Old name"
+        assert client.get_task("T-1")["name"] == "New name"
+    client.close()
+
+
+def test_iter_tasks_walks_slices_until_short_page(mock_client):
+    """Test sync iterator requests consecutive slices and stops on a short page."""
+    pages = [[{"code": f"T-{i}"} for i in range(3)], [{"code": "T-3"}]]
+
+    with patch.object(mock_client, "call", side_effect=pages) as call:
+        codes = [task["code"] for task in mock_client.iter_tasks(page_size=3, order_by=["code"])]
+
+    assert codes == ["T-0", "T-1", "T-2", "T-3"]
+    assert [c.kwargs["slice"] for c in call.call_args_list] == [[0, 3], [3, 6]]
+    assert call.call_args.kwargs["order_by"] == ["code"]
+
+
+def test_iter_projects_early_termination(mock_client):
+    """Test iteration fetches no more pages than consumed."""
+    with patch.object(mock_client, "call", return_value=[{"code": "P"}] * 2) as call:
+        iterator = mock_client.iter_projects(page_size=2)
+        assert next(iterator) == {"code": "P"}
+        iterator.close()
+
+    assert call.call_count == 1
+
+
+def test_iter_audit_max_items(mock_client):
+    """Test max_items trims the last slice."""
+    with patch.object(
+        mock_client,
+        "call",
+        side_effect=lambda method, **kw: [{}] * (kw["slice"][1] - kw["slice"][0]),
+    ) as call:
+        rows = list(mock_client.iter_audit(page_size=4, max_items=6))
+
+    assert len(rows) == 6
+    assert [c.kwargs["slice"] for c in call.call_args_list] == [[0, 4], [4, 6]]
+
+
+@pytest.mark.asyncio
+async def test_async_iter_comments(async_client):
+    """Test async iterator walks pages lazily."""
+    pages = [[{"code": "C-1"}, {"code": "C-2"}], []]
+
+    with patch.object(async_client, "call", new=AsyncMock(side_effect=pages)) as call:
+        codes = [
+            c["code"]
+            async for c in async_client.iter_comments([["parent", "=", "T-1"]], page_size=2)
+        ]
+
+    assert codes == ["C-1", "C-2"]
+    assert call.await_count == 2
+    assert call.call_args.kwargs["filter"] == [["parent", "=", "T-1"]]
+
+
+def _fake_table(rows):
+    """Build a call() side effect serving count and list requests from rows."""
+
+    def call(method, **kwargs):
+        if method.endswith(".count"):
+            return len(rows)
+        start, end = kwargs["slice"]
+        return rows[start:end]
+
+    return call
+
+
+def test_fetch_all_tasks_fans_out_and_keeps_order(mock_client):
+    """Test bulk fetch counts first and requests every slice."""
+    rows = [{"code": f"T-{i}"} for i in range(25)]
+
+    with patch.object(mock_client, "call", side_effect=_fake_table(rows)) as call:
+        result = mock_client.fetch_all_tasks(page_size=10, max_concurrency=3)
+
+    assert result == rows
+    slices = sorted(c.kwargs["slice"] for c in call.call_args_list if "slice" in c.kwargs)
+    assert slices == [[0, 10], [10, 20], [20, 30]]
+    assert call.call_args_list[0].args[0] == "CmfTask.count"
+    assert call.call_args_list[0].kwargs == {"include_archived": False}
+
+
+def test_fetch_all_recovers_from_shifted_rows(mock_client):
+    """Test rows inserted during the fetch are recovered by the consistency guard."""
+    rows = [{"code": f"T-{i}"} for i in range(6)]
+    counts = iter([6, 7, 7])
+
+    def call(method, **kwargs):
+        if method.endswith(".count"):
+            return next(counts)
+        start, end = kwargs["slice"]
+        if start == 3:
+            # A new row was inserted at the front before the second slice was read
+            rows.insert(0, {"code": "T-new"})
+        return rows[start:end]
+
+    with patch.object(mock_client, "call", side_effect=call):
+        result = mock_client.fetch_all_projects(page_size=3, max_concurrency=1)
+
+    assert sorted(r["code"] for r in result) == sorted(["T-new"] + [f"T-{i}" for i in range(6)])
+
+
+@pytest.mark.asyncio
+async def test_async_fetch_all_users(async_client):
+    """Test async bulk fetch with limited concurrency."""
+    rows = [{"code": f"U-{i}"} for i in range(7)]
+    table = _fake_table(rows)
+
+    async def call(method, **kwargs):
+        return table(method, **kwargs)
+
+    with patch.object(async_client, "call", new=AsyncMock(side_effect=call)) as mock_call:
+        result = await async_client.fetch_all_users(page_size=2, max_concurrency=2)
+
+    assert result == rows
+    assert mock_call.await_count == 2 + 4
+
+
+def _fake_in_filter(rows):
+    """Return a fake call() resolving ["code", "in", codes] list filters against rows."""
+
+    def call(method, **kwargs):
+        ((field, op, codes),) = kwargs["filter"]
+        assert (field, op) == ("code", "in")
+        return [row for row in rows if row["code"] in codes]
+
+    return call
+
+
+def test_get_many_tasks_single_request(mock_client):
+    """Test batch get resolves codes with one list call and reports missing ones."""
+    rows = [{"code": "T-2", "name": "Two"}, {"code": "T-1", "name": "One"}]
+
+    with patch.object(mock_client, "call", side_effect=_fake_in_filter(rows)) as call:
+        result = mock_client.get_many_tasks(["T-1", "T-404", "T-2", "T-1"], fields=["name"])
+
+    assert list(result) == ["T-1", "T-404", "T-2"]
+    assert result["T-1"] == {"code": "T-1", "name": "One"}
+    assert result["T-404"] is None
+    call.assert_called_once()
+    method, kwargs = call.call_args.args[0], call.call_args.kwargs
+    assert method == "CmfTask.list"
+    assert kwargs["fields"] == ["code", "name"]
+    assert kwargs["slice"] == [0, 3]
+    assert kwargs["include_archived"] is True
+
+
+def test_get_many_projects_chunks_long_lists(mock_client):
+    """Test batch get splits long code lists into chunks."""
+    rows = [{"code": f"P-{i}"} for i in range(5)]
+
+    with patch.object(mock_client, "call", side_effect=_fake_in_filter(rows)) as call:
+        result = mock_client.get_many_projects([f"P-{i}" for i in range(5)], chunk_size=2)
+
+    assert all(result[f"P-{i}"] == {"code": f"P-{i}"} for i in range(5))
+    assert [len(c.kwargs["filter"][0][2]) for c in call.call_args_list] == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_async_get_many_users(async_client):
+    """Test async batch get resolves chunks concurrently."""
+    table = _fake_in_filter([{"code": "U-1"}, {"code": "U-3"}])
+
+    async def call(method, **kwargs):
+        return table(method, **kwargs)
+
+    with patch.object(async_client, "call", new=AsyncMock(side_effect=call)) as mock_call:
+        result = await async_client.get_many_users(["U-1", "U-2", "U-3"], chunk_size=2)
+
+    assert result == {"U-1": {"code": "U-1"}, "U-2": None, "U-3": {"code": "U-3"}}
+    assert mock_call.await_count == 2
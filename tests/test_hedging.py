@@ -0,0 +1,125 @@
+"""Tests for hedged reads."""
+
+import asyncio
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from eva_client import AsyncEvaClient, EvaAPIError
+from hedging import HedgePolicy
+
+
+def _policy(**kwargs):
+    kwargs.setdefault("min_samples", 5)
+    kwargs.setdefault("min_delay", 0)
+    policy = HedgePolicy(**kwargs)
+    for _ in range(20):
+        policy.observe("CmfTask.get", 0.01)
+    return policy
+
+
+def test_delay_is_latency_percentile():
+    """Hedge delay follows the configured percentile of recent latencies."""
+    policy = HedgePolicy(percentile=90, min_samples=10, min_delay=0)
+    assert policy.delay("CmfTask.get") is None
+
+    for i in range(1, 11):
+        policy.observe("CmfTask.get", i / 100)
+
+    assert policy.delay("CmfTask.get") == pytest.approx(0.09)
+    assert policy.delay("CmfPerson.get") is None
+
+
+def test_budget_caps_extra_load():
+    """Hedges never exceed the burst plus budget_ratio of requests."""
+    policy = HedgePolicy(budget_ratio=0.1, budget_burst=2)
+
+    hedges = 0
+    for _ in range(100):
+        policy.delay("CmfTask.get")
+        hedges += policy.try_hedge()
+
+    assert hedges <= 2 + 10
+    assert policy.stats()["budget_denied"] == 100 - hedges
+
+
+def test_from_env_is_opt_in(monkeypatch):
+    """Hedging is disabled unless EVA_HEDGE=true."""
+    monkeypatch.delenv("EVA_HEDGE", raising=False)
+    assert HedgePolicy.from_env() is None
+
+    monkeypatch.setenv("EVA_HEDGE", "true")
+    monkeypatch.setenv("EVA_HEDGE_METHODS", "CmfTask.get")
+    assert HedgePolicy.from_env().methods == {"CmfTask.get"}
+
+
+@pytest.fixture
+async def client():
+    client = AsyncEvaClient(
+        api_url="https://test.eva.com/api", api_token="test_token", coalesce=False
+    )
+    yield client
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_slow_request_is_hedged_and_loser_cancelled(client):
+    """A request slower than the hedge delay is duplicated; the fast one wins."""
+    client.hedging = _policy()
+    delays = iter([1.0, 0.0])
+    cancelled = []
+
+    async def post(method, kwargs):
+        delay = next(delays)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(delay)
+            raise
+        return {"code": kwargs["code"], "delay": delay}
+
+    with patch.object(client, "_post", side_effect=post):
+        result = await asyncio.wait_for(client.get_task("TASK-1"), timeout=0.5)
+
+    assert result == {"code": "TASK-1", "delay": 0.0}
+    assert cancelled == [1.0]
+    assert client.stats()["hedging"]["hedge_wins"] == 1
+    # The cancelled original records at least the hedge delay, the fast hedge ~0
+    await asyncio.sleep(0)
+    latencies = list(client.hedging._latencies["CmfTask.get"])[20:]
+    assert len(latencies) == 2 and max(latencies) >= 0.01
+
+
+@pytest.mark.asyncio
+async def test_fast_request_not_hedged(client):
+    """Requests answering within the delay are sent once."""
+    client.hedging = _policy(min_delay=0.2)
+
+    with patch.object(client, "_post", return_value={"code": "TASK-1"}) as post:
+        await client.get_task("TASK-1")
+        await client.list_tasks()
+
+    assert post.await_count == 2
+    assert client.hedging.stats()["hedged"] == 0
+
+
+@pytest.mark.asyncio
+async def test_hedge_error_waits_for_other_request(client):
+    """A failing request does not win over a slower successful one."""
+    client.hedging = _policy()
+    client.retry.max_retries = 0
+    outcomes = iter([(0.05, None), (0.0, EvaAPIError("boom"))])
+
+    async def post(method, kwargs):
+        delay, error = next(outcomes)
+        await asyncio.sleep(delay)
+        if error:
+            raise error
+        return {"code": "TASK-1"}
+
+    with patch.object(client, "_post", side_effect=post):
+        assert await client.get_task("TASK-1") == {"code": "TASK-1"}
@@ -0,0 +1,182 @@
+"""Tests for per-tool and per-API-method metrics."""
+
+import asyncio
+import json
+import os
+import sys
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from cache import MemoryCache
+from eva_client import AsyncEvaClient, EvaAPIError, EvaClient, EvaTransientError
+from metrics import Histogram, Metrics, MetricsExporter, error_code, is_error_response
+from resilience import CircuitBreaker, RetryPolicy
+
+
+def _client(make_client, responses, cls=EvaClient, **kwargs):
+    """Client recording into a fresh Metrics, whose transport replays (status, body) in order."""
+
+    def handler(request):
+        status, body = responses.pop(0) if responses else (200, {"result": {"code": "T-1"}})
+        return httpx.Response(status, json=body)
+
+    metrics = Metrics()
+    kwargs.setdefault("retry", RetryPolicy(max_retries=2, base_delay=0))
+    kwargs.setdefault("breaker", CircuitBreaker(failure_threshold=10))
+    client = make_client(handler, cls, read_only=False, metrics=metrics, **kwargs)
+    return client, metrics
+
+
+def test_histogram_quantiles_interpolate_within_buckets():
+    hist = Histogram(buckets=(0.01, 0.1, 1.0))
+    for seconds in [0.005] * 50 + [0.05] * 49 + [2.0]:
+        hist.observe(seconds)
+
+    assert hist.counts == [50, 49, 0, 1]
+    assert hist.quantile(0.25) == pytest.approx(0.005)
+    assert hist.quantile(0.95) == pytest.approx(0.01 + 0.09 * 45 / 49)
+    assert hist.quantile(0.999) == 2.0
+    assert Histogram().snapshot() == {"count": 0}
+
+
+def test_error_code_and_error_response_detection():
+    assert error_code(EvaAPIError("denied", code=-32001)) == "-32001"
+    assert error_code(EvaTransientError("busy", status=503)) == "http_503"
+    assert error_code(EvaAPIError("HTTP error: 404", details={"status": 404})) == "http_404"
+    assert error_code(EvaTransientError("Request error")) == "EvaTransientError"
+
+    assert is_error_response('{"success":false,"error":"x"}')
+    assert is_error_response('{\n  "success": false,\n  "error": "x"\n}')
+    assert not is_error_response('{"success":true,"tasks":[]}')
+
+
+def test_client_records_calls_retries_errors_and_bytes(make_client):
+    client, metrics = _client(
+        make_client,
+        [
+            (503, {}),
+            (200, {"result": {"code": "T-1"}}),
+            (200, {"error": {"code": -32602, "message": "Invalid params"}}),
+        ],
+    )
+
+    client.get_task("T-1")
+    with pytest.raises(EvaAPIError):
+        client.get_task("T-2")
+
+    method = metrics.snapshot()["methods"]["CmfTask.get"]
+    assert method["calls"] == 2
+    assert method["retries"] == 1
+    assert method["requests"] == 3
+    assert method["errors"] == {"-32602": 1}
+    assert method["request_bytes"] > 0
+    assert method["response_bytes"] == sum(
+        len(json.dumps(body, separators=(",", ":")))
+        for body in (
+            {},
+            {"result": {"code": "T-1"}},
+            {"error": {"code": -32602, "message": "Invalid params"}},
+        )
+    )
+    assert method["latency"]["count"] == 2
+
+
+def test_cache_hits_and_read_only_rejections_are_counted(make_client):
+    client, metrics = _client(make_client, [], cache=MemoryCache(default_ttl=60))
+    client.read_only = True
+
+    client.get_task("T-1")
+    client.get_task("T-1")
+    with pytest.raises(EvaAPIError):
+        client.update_task("T-1", name="x")
+
+    methods = metrics.snapshot()["methods"]
+    assert methods["CmfTask.get"]["calls"] == 2
+    assert methods["CmfTask.get"]["cache_hits"] == 1
+    assert methods["CmfTask.get"]["requests"] == 1
+    assert methods["CmfTask.update"]["errors"] == {"-32001": 1}
+
+
+@pytest.mark.asyncio
+async def test_async_client_records_calls(make_client):
+    client, metrics = _client(make_client, [], cls=AsyncEvaClient)
+
+    await asyncio.gather(client.get_task("T-1"), client.count_tasks())
+
+    methods = metrics.snapshot()["methods"]
+    assert methods["CmfTask.get"]["calls"] == 1
+    assert methods["CmfTask.count"]["requests"] == 1
+
+
+def test_prometheus_text_format():
+    metrics = Metrics()
+    metrics.observe_tool("eva_get_task", 0.02, error=True, response_bytes=120)
+    metrics.observe_call("CmfTask.get", 0.015, EvaAPIError("denied", code=-32001))
+
+    text = metrics.prometheus()
+
+    assert 'eva_tool_calls_total{tool="eva_get_task"} 1' in text
+    assert 'eva_tool_errors_total{tool="eva_get_task"} 1' in text
+    assert 'eva_tool_response_bytes_total{tool="eva_get_task"} 120' in text
+    assert 'eva_tool_duration_seconds_bucket{tool="eva_get_task",le="0.01"} 0' in text
+    assert 'eva_tool_duration_seconds_bucket{tool="eva_get_task",le="0.025"} 1' in text
+    assert 'eva_tool_duration_seconds_count{tool="eva_get_task"} 1' in text
+    assert 'eva_api_errors_total{method="CmfTask.get",code="-32001"} 1' in text
+    assert "# TYPE eva_api_call_duration_seconds histogram" in text
+
+
+def test_prometheus_reports_circuit_breaker(make_client):
+    client, metrics = _client(
+        make_client,
+        [(503, {})],
+        retry=RetryPolicy(max_retries=0),
+        breaker=CircuitBreaker(failure_threshold=1),
+    )
+    assert "eva_api_circuit" not in Metrics().prometheus()
+
+    for _ in range(2):
+        with pytest.raises(EvaAPIError):
+            client.get_task("T-1")
+    text = metrics.prometheus()
+
+    assert "# TYPE eva_api_circuit_trips_total counter" in text
+    assert "eva_api_circuit_trips_total 1" in text
+    assert "eva_api_circuit_rejected_total 1" in text
+    assert "# TYPE eva_api_circuit_state gauge" in text
+    assert 'eva_api_circuit_state{state="open"} 1' in text
+    assert 'eva_api_circuit_state{state="closed"} 0' in text
+
+
+@pytest.mark.asyncio
+async def test_exporter_writes_file_and_serves_http(tmp_path):
+    metrics = Metrics()
+    metrics.observe_tool("eva_list_projects", 0.1)
+    path = tmp_path / "eva.prom"
+    exporter = MetricsExporter(metrics, path=str(path), port=0, interval=60)
+
+    await exporter.start()
+    try:
+        port = exporter._server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        response = (await reader.read()).decode()
+        writer.close()
+    finally:
+        await exporter.stop()
+
+    assert response.startswith("HTTP/1.1 200 OK")
+    assert 'eva_tool_calls_total{tool="eva_list_projects"} 1' in response
+    assert 'eva_tool_calls_total{tool="eva_list_projects"} 1' in path.read_text()
+
+
+def test_exporter_from_env(monkeypatch):
+    monkeypatch.delenv("EVA_METRICS_FILE", raising=False)
+    monkeypatch.delenv("EVA_METRICS_PORT", raising=False)
+    assert MetricsExporter.from_env(Metrics()) is None
+
+    monkeypatch.setenv("EVA_METRICS_PORT", "9464")
+    exporter = MetricsExporter.from_env(Metrics())
+    assert exporter.port == 9464 and exporter.path is None
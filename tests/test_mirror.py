@@ -0,0 +1,392 @@
+"""Tests for the local SQLite mirror."""
+
+import json
+import os
+import sys
+import threading
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from mirror import Mirror, html_to_text, match_expression
+from tools import AsyncEvaTools, EvaTools
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+TASKS = [
+    {
+        "code": "T-1",
+        "name": "Починить вход",
+        "parent": "P-1",
+        "status": "open",
+        "cmf_modified_at": "2024-01-01 10:00:00",
+    },
+    {
+        "code": "T-2",
+        "name": "Fix login page",
+        "parent": "P-1",
+        "status": "closed",
+        "cmf_modified_at": "2024-01-02 10:00:00",
+    },
+    {
+        "code": "T-3",
+        "name": "Write docs",
+        "parent": "P-2",
+        "status": "open",
+        "cmf_modified_at": "2024-01-03 10:00:00",
+    },
+]
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def client():
+    client = Mock()
+    client.fetch_all_tasks.return_value = list(TASKS)
+    client.list_tasks.return_value = []
+    return client
+
+
+@pytest.fixture
+def mirror(tmp_path, client, clock):
+    mirror = Mirror(
+        client,
+        str(tmp_path / "mirror.sqlite3"),
+        entities=["CmfTask"],
+        max_staleness=60,
+        clock=clock,
+    )
+    yield mirror
+    mirror.close()
+
+
+@pytest.mark.asyncio
+async def test_relation_filters_match_codes_and_objects(mirror, client):
+    """Relation fields returned as objects match filters by their code."""
+    client.fetch_all_tasks.return_value = [
+        {"code": "T-1", "parent": {"code": "P-1", "name": "Portal"}, "responsible": "U-1"},
+        {"code": "T-2", "parent": "P-1", "responsible": {"code": "U-2", "name": "Ann"}},
+        {"code": "T-3", "parent": {"code": "P-2"}, "responsible": {"code": "U-1"}},
+    ]
+    await mirror.sync_once()
+
+    assert mirror.count("CmfTask", [["parent", "=", "P-1"]]) == 2
+    rows = mirror.query("CmfTask", [["responsible", "in", ["U-1"]]], fields=["code"])
+    assert rows == [{"code": "T-1"}, {"code": "T-3"}]
+    assert mirror.count("CmfTask", [["responsible", "!=", "U-1"]]) == 1
+    assert mirror.query("CmfTask", [["parent", "=", "P-2"]])[0]["parent"] == {"code": "P-2"}
+
+
+@pytest.mark.asyncio
+async def test_backfill_then_query_and_count(mirror):
+    """Backfilled rows answer filtered, ordered and paged queries."""
+    assert await mirror.sync_once() == {"CmfTask": 3}
+
+    rows = mirror.query("CmfTask", [["parent", "=", "P-1"]], limit=10)
+    assert [row["code"] for row in rows] == ["T-1", "T-2"]
+
+    rows = mirror.query(
+        "CmfTask", order_by=["-cmf_modified_at"], limit=2, offset=1, fields=["code"]
+    )
+    assert rows == [{"code": "T-2"}, {"code": "T-1"}]
+
+    assert mirror.count("CmfTask", [["status", "=", "open"]]) == 2
+    assert mirror.count("CmfTask", [["status", "in", ["open", "closed"]]]) == 3
+
+
+@pytest.mark.asyncio
+async def test_ilike_is_case_insensitive_for_cyrillic(mirror):
+    await mirror.backfill("CmfTask")
+
+    assert [r["code"] for r in mirror.query("CmfTask", [["name", "ilike", "%ПОЧИНИТЬ%"]])] == [
+        "T-1"
+    ]
+    assert [r["code"] for r in mirror.query("CmfTask", [["name", "ilike", "%LOGIN%"]])] == ["T-2"]
+
+
+@pytest.mark.asyncio
+async def test_refresh_pulls_rows_modified_since_high_water_mark(mirror, client):
+    await mirror.backfill("CmfTask")
+    client.list_tasks.return_value = [
+        {
+            "code": "T-3",
+            "name": "Write docs",
+            "parent": "P-2",
+            "status": "closed",
+            "cmf_modified_at": "2024-01-04 10:00:00",
+        },
+    ]
+
+    assert await mirror.sync_once() == {"CmfTask": 1}
+
+    kwargs = client.list_tasks.call_args.kwargs
+    assert kwargs["filters"] == [["cmf_modified_at", ">=", "2024-01-03 10:00:00"]]
+    assert kwargs["order_by"] == ["cmf_modified_at"]
+    assert mirror.count("CmfTask", [["status", "=", "open"]]) == 1
+
+    await mirror.refresh("CmfTask")
+    assert client.list_tasks.call_args.kwargs["filters"] == [
+        ["cmf_modified_at", ">=", "2024-01-04 10:00:00"]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_indexed_fields_are_requested_explicitly(mirror, client):
+    await mirror.sync_once()
+    await mirror.refresh("CmfTask")
+
+    for call in (client.fetch_all_tasks, client.list_tasks):
+        fields = call.call_args.kwargs["fields"]
+        assert {"*", "code", "name", "text", "parent", "status", "cmf_modified_at"} <= set(fields)
+
+
+@pytest.mark.asyncio
+async def test_empty_backfill_persists_a_mark(mirror, client, clock):
+    client.fetch_all_tasks.return_value = []
+    await mirror.backfill("CmfTask")
+
+    since_backfill = [["cmf_modified_at", ">=", "1970-01-01 00:16:40"]]
+    await mirror.refresh("CmfTask")
+    assert client.list_tasks.call_args.kwargs["filters"] == since_backfill
+
+    clock.now += 60
+    await mirror.refresh("CmfTask")
+    assert client.list_tasks.call_args.kwargs["filters"] == since_backfill
+
+
+@pytest.mark.asyncio
+async def test_refresh_pages_through_large_change_sets(tmp_path, client, clock):
+    mirror = Mirror(
+        client, str(tmp_path / "m.sqlite3"), entities=["CmfTask"], page_size=2, clock=clock
+    )
+    await mirror.backfill("CmfTask")
+    client.list_tasks.side_effect = [TASKS[:2], TASKS[2:]]
+
+    assert await mirror.refresh("CmfTask") == 3
+    assert [call.kwargs["offset"] for call in client.list_tasks.call_args_list] == [0, 2]
+    mirror.close()
+
+
+@pytest.mark.asyncio
+async def test_full_resync_drops_deleted_rows(mirror, client, clock):
+    await mirror.backfill("CmfTask")
+    client.fetch_all_tasks.return_value = TASKS[:1]
+    clock.now += mirror.resync_interval
+
+    await mirror.sync_once()
+
+    assert mirror.count("CmfTask") == 1
+    client.list_tasks.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_async_client_and_persistence(tmp_path, clock):
+    client = AsyncMock()
+    client.fetch_all_tasks.return_value = list(TASKS)
+    path = str(tmp_path / "mirror.sqlite3")
+
+    first = Mirror(client, path, entities=["CmfTask"], clock=clock)
+    await first.sync_once()
+    first.close()
+
+    second = Mirror(client, path, entities=["CmfTask"], clock=clock)
+    assert second.count("CmfTask") == 3
+    assert second.stats()["entities"]["CmfTask"] == {"rows": 3, "age_s": 0.0}
+    second.close()
+
+
+@pytest.mark.asyncio
+async def test_stale_or_unsupported_queries_return_none(mirror, clock):
+    assert mirror.query("CmfTask") is None  # never synced
+
+    await mirror.backfill("CmfTask")
+    assert mirror.query("CmfTask", [["cmf_created_at", ">", "2024"]]) is None
+    assert mirror.count("CmfTask", [["name; DROP TABLE rows", "=", "x"]]) is None
+
+    clock.now += 61
+    assert mirror.count("CmfTask") is None
+    assert mirror.stats()["misses"] == 4
+
+
+@pytest.mark.asyncio
+async def test_tools_answer_from_mirror_unless_strong(mirror, client):
+    await mirror.backfill("CmfTask")
+    client.count_tasks.return_value = 42
+    tools = EvaTools(client, mirror=mirror)
+
+    result = json.loads(tools.search_tasks(project="P-1", view="minimal"))
+    assert result["source"] == "mirror"
+    assert [task["code"] for task in result["tasks"]] == ["T-1", "T-2"]
+    client.list_tasks.assert_not_called()
+
+    assert json.loads(tools.count_tasks_by_filter(status="open"))["count"] == 2
+    assert (
+        json.loads(tools.count_tasks_by_filter(status="open", consistency="strong"))["count"] == 42
+    )
+
+    result = json.loads(tools.count_tasks_by_filter(consistency="linearizable"))
+    assert result["success"] is False
+
+
+@pytest.mark.asyncio
+async def test_async_tools_fall_back_to_api_when_stale(mirror, clock):
+    await mirror.backfill("CmfTask")
+    clock.now += 61
+    client = AsyncMock()
+    client.list_tasks.return_value = [{"code": "T-9"}]
+    tools = AsyncEvaTools(client, mirror=mirror)
+
+    result = json.loads(await tools.search_tasks(query="docs"))
+
+    assert "source" not in result
+    assert result["tasks"] == [{"code": "T-9"}]
+
+
+def test_html_to_text_and_match_expression():
+    assert html_to_text("<p>Hello&nbsp;<b>world</b></p><script>x()</script>") == "Hello world"
+    assert html_to_text(None) == ""
+    assert match_expression('login "page" OR') == '"login"* "page"* "OR"*'
+    assert match_expression(" -- ") is None
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_name_matches_above_body_matches(mirror, client):
+    client.fetch_all_tasks.return_value = [
+        {
+            "code": "T-1",
+            "name": "Update docs",
+            "text": "<p>Mention <i>login</i> flow</p>",
+            "parent": "P-1",
+        },
+        {"code": "T-2", "name": "Login timeout", "text": "<p>Session expires</p>", "parent": "P-1"},
+        {
+            "code": "T-3",
+            "name": "Вход в систему",
+            "text": "<p>Ошибка авторизации</p>",
+            "parent": "P-2",
+        },
+    ]
+    await mirror.backfill("CmfTask")
+
+    assert [r["code"] for r in mirror.search("CmfTask", "login")] == ["T-2", "T-1"]
+    assert [
+        r["code"] for r in mirror.search("CmfTask", "log", [["parent", "=", "P-1"]], limit=1)
+    ] == ["T-2"]
+    assert [r["code"] for r in mirror.search("CmfTask", "авторизац")] == ["T-3"]
+    assert mirror.search("CmfTask", "login flow") == [client.fetch_all_tasks.return_value[0]]
+    assert mirror.search("CmfProject", "login") is None
+
+
+@pytest.mark.asyncio
+async def test_search_index_follows_updates_and_resyncs(mirror, client, clock):
+    client.fetch_all_tasks.return_value = [
+        {"code": "T-1", "name": "Old title", "cmf_modified_at": "1"}
+    ]
+    await mirror.backfill("CmfTask")
+    client.list_tasks.return_value = [{"code": "T-1", "name": "New title", "cmf_modified_at": "2"}]
+
+    await mirror.refresh("CmfTask")
+
+    assert mirror.search("CmfTask", "old") == []
+    assert [r["name"] for r in mirror.search("CmfTask", "new")] == ["New title"]
+
+    client.fetch_all_tasks.return_value = []
+    await mirror.backfill("CmfTask")
+    assert mirror.search("CmfTask", "new") == []
+
+
+@pytest.mark.asyncio
+async def test_ranked_mode_in_tools(mirror, client):
+    client.fetch_all_tasks.return_value = [
+        {"code": "T-1", "name": "Deploy", "text": "<p>Rollout plan</p>"}
+    ]
+    await mirror.backfill("CmfTask")
+    tools = EvaTools(client, mirror=mirror)
+
+    result = json.loads(tools.search_tasks(query="rollout", mode="ranked"))
+    assert result["source"] == "mirror"
+    assert [task["code"] for task in result["tasks"]] == ["T-1"]
+
+    result = json.loads(tools.search_tasks(query="rollout", mode="fuzzy"))
+    assert result["success"] is False
+
+    # Documents are not mirrored here, so ranked mode falls back to the API
+    client.list_documents.return_value = []
+    result = json.loads(tools.search_documents(query="rollout", mode="ranked"))
+    assert "source" not in result
+    assert client.list_documents.call_args.kwargs["filters"] == [["name", "ilike", "%rollout%"]]
+
+
+@pytest.mark.asyncio
+async def test_audited_changes_drop_deleted_and_refresh_updated_rows(mirror, client):
+    await mirror.backfill("CmfTask")
+    renamed = dict(TASKS[1], name="Fix logout page")
+    client.list_tasks.return_value = [renamed]
+
+    for code in ("T-1", "T-2", "OTHER-1"):
+        mirror.on_audit_entry({"object_code": code})
+    assert mirror.query("CmfTask") is None  # checks pending
+    await mirror._check_task
+
+    assert client.list_tasks.call_args.kwargs["filters"] == [["code", "in", ["T-1", "T-2"]]]
+    assert [row["code"] for row in mirror.query("CmfTask")] == ["T-2", "T-3"]
+    assert [row["code"] for row in mirror.search("CmfTask", "logout")] == ["T-2"]
+    assert mirror.search("CmfTask", "вход") == []
+    assert mirror.stats()["pending_changes"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cursor_keeps_the_source_of_its_first_page(mirror, client, clock):
+    from paging import ResponseBudget
+
+    await mirror.backfill("CmfTask")
+    tools = EvaTools(client, budget=ResponseBudget(max_rows=1), mirror=mirror)
+
+    first = json.loads(tools.search_tasks(limit=2))
+    assert first["source"] == "mirror"
+    clock.now += 61
+    result = json.loads(tools.search_tasks(cursor=first["next_cursor"]))
+    assert result["success"] is False
+    client.list_tasks.assert_not_called()
+
+    client.list_tasks.return_value = [{"code": "T-9"}]
+    first = json.loads(tools.search_tasks(limit=2))
+    assert "source" not in first
+    clock.now -= 61  # the mirror is fresh again, but the API answered the first page
+    result = json.loads(tools.search_tasks(cursor=first["next_cursor"]))
+    assert "source" not in result
+    assert client.list_tasks.call_args.kwargs["offset"] == 1
+
+
+@pytest.mark.asyncio
+async def test_index_writes_and_ranked_search_run_off_the_event_loop(mirror, client):
+    loop_thread = threading.get_ident()
+    threads = []
+    for name in ("_upsert", "search"):
+        method = getattr(mirror, name)
+
+        def record(*args, _method=method, **kwargs):
+            threads.append(threading.get_ident())
+            return _method(*args, **kwargs)
+
+        setattr(mirror, name, record)
+    await mirror.backfill("CmfTask")
+    tools = AsyncEvaTools(AsyncMock(), mirror=mirror)
+
+    result = json.loads(await tools.search_tasks(query="docs", mode="ranked"))
+
+    assert [task["code"] for task in result["tasks"]] == ["T-3"]
+    assert len(threads) == 2 and loop_thread not in threads
@@ -0,0 +1,93 @@
+"""Tests for the mock Eva API used by the benchmarks."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from eva_client import EvaAPIError, EvaClient
+from mock_eva import (
+    INVALID_PARAMS,
+    METHOD_NOT_FOUND,
+    Dataset,
+    EvaBackend,
+    MockEvaServer,
+    serve_in_thread,
+)
+from resilience import RetryPolicy
+
+
+@pytest.fixture(scope="module")
+def data():
+    return Dataset(tasks=200, seed=1)
+
+
+def test_dataset_is_deterministic(data):
+    assert Dataset(tasks=200, seed=1).rows["CmfTask"] == data.rows["CmfTask"]
+    assert len(data.rows["CmfTask"]) == 200
+    task = data.rows["CmfTask"][0]
+    assert task["code"] == "TASK-000001"
+    assert task["parent"] in data.by_code["CmfProject"]
+
+
+def test_backend_filters_orders_and_projects(data):
+    backend = EvaBackend(data)
+    project = data.rows["CmfTask"][0]["parent"]
+
+    rows = backend.call(
+        "CmfTask.list",
+        {
+            "filter": [["parent", "=", project], ["priority", ">=", 2]],
+            "order_by": ["-cmf_modified_at"],
+            "fields": ["priority"],
+            "slice": [0, 5],
+        },
+    )
+
+    expected = [
+        row for row in data.rows["CmfTask"] if row["parent"] == project and row["priority"] >= 2
+    ]
+    assert [row["code"] for row in rows] == [row["code"] for row in expected[::-1][:5]]
+    assert all(set(row) == {"code", "priority"} for row in rows)
+    assert backend.call("CmfTask.count", {"filter": [["parent", "=", project]]}) == sum(
+        row["parent"] == project for row in data.rows["CmfTask"]
+    )
+    assert backend.call("CmfTask.get", {"code": "TASK-999999"}) is None
+
+
+def test_backend_rejects_methods_and_arguments_outside_the_spec(data):
+    backend = EvaBackend(data)
+
+    unknown = backend.handle({"method": "CmfTask.delete", "callid": "1", "kwargs": {}})
+    invalid = backend.handle({"method": "CmfTask.list", "callid": "2", "kwargs": {"limit": 5}})
+
+    assert unknown["error"]["code"] == METHOD_NOT_FOUND
+    assert invalid["callid"] == "2"
+    assert invalid["error"] == {
+        "code": INVALID_PARAMS,
+        "message": "Unexpected arguments for CmfTask.list: limit",
+    }
+
+
+def test_client_round_trip_with_injected_errors(data):
+    server = MockEvaServer(data, token="secret", error_rate=1.0)
+    with serve_in_thread(server):
+        client = EvaClient(
+            api_url=server.url,
+            api_token="secret",
+            read_only=False,
+            retry=RetryPolicy(max_retries=0),
+        )
+        with pytest.raises(EvaAPIError, match="Injected error"):
+            client.get_task("TASK-000001")
+
+        server.error_rate = 0.0
+        assert client.get_task("TASK-000001")["code"] == "TASK-000001"
+        assert len(client.list_tasks(limit=10, offset=195)) == 5
+        assert client.update_task("TASK-000002", name="Renamed")["name"] == "Renamed"
+        client.close()
+
+    assert server.stats()["requests"] == 4
@@ -0,0 +1,124 @@
+"""Tests for response budgets and continuation cursors."""
+
+import base64
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from paging import ResponseBudget, decode_cursor, encode_cursor
+from serialization import JSONSerializer
+
+
+def test_cursor_round_trip():
+    """Cursor keeps tool arguments, offset and remaining rows."""
+    cursor = encode_cursor("eva_search_tasks", {"query": "отчёт", "view": None}, 200, 300)
+
+    args, offset, remaining = decode_cursor(cursor, "eva_search_tasks")
+
+    assert args == {"query": "отчёт", "view": None}
+    assert (offset, remaining) == (200, 300)
+
+
+def test_cursor_for_other_tool_rejected():
+    """Cursor cannot be replayed against another tool."""
+    cursor = encode_cursor("eva_list_users", {}, 50, 10)
+
+    with pytest.raises(ValueError, match="eva_list_users"):
+        decode_cursor(cursor, "eva_list_projects")
+
+
+def _raw_cursor(state):
+    return base64.urlsafe_b64encode(json.dumps(state).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not-a-cursor",
+        "e30",
+        "!!!",
+        _raw_cursor([1]),
+        _raw_cursor({"t": "eva_list_users", "a": {}, "o": 50}),
+        _raw_cursor({"t": "eva_list_users", "a": {}, "o": 50, "r": 10, "x": 1}),
+        _raw_cursor({"t": "eva_list_users", "a": [], "o": 50, "r": 10}),
+    ],
+)
+def test_invalid_cursor_rejected(cursor):
+    """Malformed cursors raise ValueError."""
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor, "eva_list_users")
+
+
+def test_page_capped_by_row_budget():
+    """Page size is the smaller of the requested limit and the row budget."""
+    budget = ResponseBudget(max_rows=100, tool_rows={"eva_list_users": 10})
+
+    assert budget.page("eva_search_tasks", None, 500, query="x").size == 100
+    assert budget.page("eva_search_tasks", None, 20, query="x").size == 20
+    assert budget.page("eva_list_users", None, 50).size == 10
+
+
+def test_cursor_resumes_query():
+    """Cursor arguments fill in omitted ones and advance the offset."""
+    budget = ResponseBudget(max_rows=100)
+    first = budget.page("eva_search_tasks", None, 250, query="bug", view=None)
+
+    cursor = budget.next_cursor(first, 100, 100)
+    second = budget.page("eva_search_tasks", cursor, 20, query=None, view=None)
+    repeated = budget.page("eva_search_tasks", cursor, 20, query="bug", view=None)
+
+    assert second.args == repeated.args == {"query": "bug", "view": None}
+    assert (second.offset, second.remaining, second.size) == (100, 150, 100)
+
+
+def test_cursor_must_match_the_call():
+    """A cursor is rejected when its arguments differ from or do not fit the current call."""
+    budget = ResponseBudget(max_rows=100)
+    cursor = budget.next_cursor(budget.page("eva_search_tasks", None, 250, query="bug"), 100, 100)
+
+    with pytest.raises(ValueError, match="Cursor does not match arguments: query"):
+        budget.page("eva_search_tasks", cursor, 20, query="other")
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        budget.page("eva_search_tasks", cursor, 20, query=None, project=None)
+
+
+def test_no_cursor_when_complete():
+    """No cursor once the limit is reached or the API ran out of rows."""
+    budget = ResponseBudget(max_rows=100)
+    page = budget.page("eva_search_tasks", None, 100)
+    assert budget.next_cursor(page, 100, 100) is None
+
+    page = budget.page("eva_search_tasks", None, 500)
+    assert budget.next_cursor(page, 40, 40) is None
+    assert budget.next_cursor(page, 30, 40) is not None
+
+
+def test_trim_keeps_rows_within_bytes():
+    """Rows are trimmed to the byte budget but never to zero."""
+    budget = ResponseBudget(max_bytes=2048)
+    page = budget.page("eva_search_tasks", None, 50)
+    rows = [{"code": f"T-{i}", "text": "x" * 300} for i in range(10)]
+
+    kept = budget.trim(page, rows, JSONSerializer())
+
+    assert 0 < len(kept) < len(rows)
+    assert kept == rows[: len(kept)]
+    assert budget.trim(page, [{"text": "x" * 5000}], JSONSerializer()) == [{"text": "x" * 5000}]
+
+
+def test_from_env(monkeypatch):
+    """Budgets are read from environment variables."""
+    monkeypatch.setenv("EVA_RESPONSE_MAX_ROWS", "50")
+    monkeypatch.setenv("EVA_RESPONSE_MAX_BYTES", "4096")
+    monkeypatch.setenv("EVA_TOOL_MAX_ROWS", "eva_get_audit_log=20")
+    monkeypatch.setenv("EVA_TOOL_MAX_BYTES", "eva_search_documents=1024")
+
+    budget = ResponseBudget.from_env()
+
+    assert (budget.max_rows, budget.max_bytes) == (50, 4096)
+    assert budget.page("eva_get_audit_log", None, 100).size == 20
+    assert budget.page("eva_search_documents", None, 100).max_bytes == 1024
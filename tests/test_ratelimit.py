@@ -0,0 +1,159 @@
+"""Tests for the rate limiter and bulkheads."""
+
+import asyncio
+import os
+import sys
+import threading
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from eva_client import AsyncEvaClient, EvaClient
+from ratelimit import (
+    AsyncBulkheads,
+    Bulkheads,
+    RateLimiter,
+    TokenBucket,
+    bulk,
+    current_pool,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_burst_then_rate():
+    """Bucket allows a burst, then spaces requests at the configured rate."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=2, clock=clock)
+
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+    clock.now = 2.0
+    assert bucket.reserve() == 0.0
+
+
+def test_family_rate_applies_on_top_of_global():
+    """Most specific family bucket applies in addition to the global one."""
+    clock = FakeClock()
+    limiter = RateLimiter(rate=100, family_rates={"CmfAudit": 1, "CmfTask.get": 50}, clock=clock)
+
+    assert limiter.reserve("CmfAudit.list") == 0.0
+    assert limiter.reserve("CmfAudit.count") == pytest.approx(1.0)
+    assert limiter.reserve("CmfTask.get") == 0.0
+    assert limiter.stats()["throttled"] == 1
+
+
+def test_unlimited_by_default():
+    """Without configuration no request is delayed."""
+    limiter = RateLimiter()
+
+    assert all(limiter.reserve("CmfTask.get") == 0.0 for _ in range(1000))
+
+
+def test_from_env(monkeypatch):
+    """Rates are read from environment variables."""
+    monkeypatch.setenv("EVA_RATE_LIMIT", "5")
+    monkeypatch.setenv("EVA_RATE_LIMITS", "CmfAudit=0.5")
+    limiter = RateLimiter.from_env()
+
+    assert limiter._global.rate == 5
+    assert limiter._family("CmfAudit.list").rate == 0.5
+
+
+def test_bulk_context_selects_pool():
+    """Calls inside bulk() use the bulk pool."""
+    assert current_pool() == "interactive"
+    with bulk():
+        assert current_pool() == "bulk"
+    assert current_pool() == "interactive"
+
+
+def test_bulkhead_limits_bulk_pool_only():
+    """A saturated bulk pool does not block interactive calls."""
+    bulkheads = Bulkheads(bulk_limit=1, interactive_limit=0)
+    release = threading.Event()
+
+    def hold():
+        with bulkheads.slot("bulk"):
+            release.wait()
+
+    worker = threading.Thread(target=hold)
+    worker.start()
+    while bulkheads.in_flight["bulk"] == 0:
+        pass
+
+    with bulkheads.slot("interactive"):
+        assert bulkheads.stats()["interactive"]["in_flight"] == 1
+    assert not bulkheads._semaphores["bulk"].acquire(blocking=False)
+    release.set()
+    worker.join()
+
+
+def test_fetch_all_runs_in_bulk_pool():
+    """Bulk fetch slices are tagged as bulk even on worker threads."""
+    client = EvaClient(api_url="https://test.eva.com/api", api_token="test_token")
+    pools = []
+
+    def call(method, **kwargs):
+        pools.append(current_pool())
+        if method.endswith(".count"):
+            return 4
+        if method.endswith(".get"):
+            return {}
+        start, end = kwargs["slice"]
+        return [{"code": f"T-{i}"} for i in range(start, min(end, 4))]
+
+    with patch.object(client, "call", side_effect=call):
+        client.fetch_all_tasks(page_size=2, max_concurrency=2)
+        client.get_task("T-1")
+
+    assert pools[:-1] == ["bulk"] * (len(pools) - 1)
+    assert pools[-1] == "interactive"
+    client.close()
+
+
+def test_send_waits_for_rate_limiter(monkeypatch):
+    """Requests sleep for the time reserved on the limiter."""
+    slept = []
+    monkeypatch.setattr("eva_client.time.sleep", slept.append)
+    client = EvaClient(
+        api_url="https://test.eva.com/api",
+        api_token="test_token",
+        limiter=RateLimiter(rate=1, burst=1, clock=lambda: 0.0),
+    )
+
+    with patch.object(client, "_post", return_value={}):
+        client.get_task("T-1")
+        client.get_task("T-2")
+
+    assert slept == [1.0]
+    assert client.stats()["rate_limit"]["throttled"] == 1
+    client.close()
+
+
+@pytest.mark.asyncio
+async def test_async_bulkhead_caps_concurrency():
+    """Async bulk calls never exceed the bulk pool size."""
+    client = AsyncEvaClient(api_url="https://test.eva.com/api", api_token="test_token")
+    client.bulkheads = AsyncBulkheads(bulk_limit=2, interactive_limit=0)
+    peak = 0
+
+    async def post(method, kwargs):
+        nonlocal peak
+        peak = max(peak, client.bulkheads.in_flight["bulk"])
+        await asyncio.sleep(0.01)
+        return []
+
+    with patch.object(client, "_post", side_effect=post):
+        with bulk():
+            await asyncio.gather(*(client.list_audit(offset=i) for i in range(6)))
+
+    assert peak == 2
+    await client.close()
@@ -0,0 +1,136 @@
+"""Tests for the tool and API method registry."""
+
+import inspect
+import json
+import os
+import sys
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import api_methods
+from eva_client import EvaAPIError, EvaClient
+from registry import (
+    REGISTRY,
+    ToolRegistry,
+    ToolSpec,
+    generate_methods,
+    is_read_method,
+    is_write_method,
+)
+from tools import AsyncEvaTools, EvaTools
+
+SPEC_PATH = os.path.join(os.path.dirname(__file__), "..", "oas_evateam_v1_9_22.json")
+
+
+def test_generated_methods_match_spec():
+    """src/api_methods.py is up to date with the bundled OpenAPI spec."""
+    with open(api_methods.__file__, encoding="utf-8") as f:
+        assert f.read() == generate_methods(SPEC_PATH)
+
+
+@pytest.mark.parametrize(
+    "method,read,write",
+    [
+        ("CmfTask.get", True, False),
+        ("CmfTimeTrackerHistory.count", True, False),
+        ("CmfTask.create", False, True),
+        ("CmfTask.fix_versions.append", False, True),
+        ("CmfDocument.do_publish", False, True),
+        ("CmfDocument.download_all_attachment", True, False),
+        # Not in the spec: classified by name
+        ("CmfSprint.list", True, False),
+        ("CmfTask.delete", False, True),
+        ("CmfTask.whoami", False, False),
+    ],
+)
+def test_method_classification(method, read, write):
+    assert is_read_method(method) is read
+    assert is_write_method(method) is write
+
+
+def test_read_only_client_allows_downloads():
+    """Listed read-only spec methods are not blocked in read-only mode."""
+    client = EvaClient(api_url="https://test.eva.com/api", api_token="test_token", read_only=True)
+    client._check_write_operation("CmfDocument.download_all_attachment")
+    with pytest.raises(EvaAPIError, match="not allowed in read-only mode"):
+        client._check_write_operation("CmfDocument.do_publish")
+    client.close()
+
+
+def test_tool_read_only_flags():
+    assert REGISTRY.get("eva_search_tasks").read_only is True
+    assert REGISTRY.get("eva_create_task").read_only is False
+    assert REGISTRY.get("eva_add_comment").read_only is False
+    assert REGISTRY.get("eva_unknown") is None
+
+
+def test_generic_entities_exposed_for_methods_in_spec():
+    names = {spec.name for spec in REGISTRY}
+    assert {
+        "eva_list_attachments",
+        "eva_get_attachment",
+        "eva_list_status_history",
+        "eva_get_status_change",
+        "eva_list_time_entries",
+    } <= names
+    # CmfTimeTrackerHistory.get is not part of the spec
+    assert "eva_get_time_entry" not in names
+
+
+@pytest.mark.parametrize("tools_class", [EvaTools, AsyncEvaTools])
+def test_every_tool_binds_to_a_handler_accepting_its_arguments(tools_class):
+    handlers = REGISTRY.bind(tools_class(Mock()))
+
+    assert set(handlers) == {spec.name for spec in REGISTRY}
+    for spec in REGISTRY:
+        parameters = inspect.signature(handlers[spec.name]).parameters
+        assert set(spec.input_schema["properties"]) <= set(parameters), spec.name
+        assert set(spec.input_schema.get("required", [])) <= set(parameters), spec.name
+
+
+def test_duplicate_tool_names_rejected():
+    spec = ToolSpec(
+        "eva_x", "get_task_details", "CmfTask.get", "x", {"type": "object", "properties": {}}
+    )
+    with pytest.raises(ValueError):
+        ToolRegistry([spec, spec])
+
+
+@pytest.mark.asyncio
+async def test_generic_list_tool_builds_filters_and_pages():
+    client = AsyncMock()
+    client.list_objects.return_value = [{"code": "ATT-1"}]
+    handlers = REGISTRY.bind(AsyncEvaTools(client))
+
+    result = json.loads(
+        await handlers["eva_list_attachments"](
+            parent="TASK-1", filters=[["name", "ilike", "%.pdf"]], limit=5
+        )
+    )
+
+    assert result["attachments"] == [{"code": "ATT-1"}]
+    client.list_objects.assert_awaited_once_with(
+        "CmfAttachment",
+        filters=[["parent", "=", "TASK-1"], ["name", "ilike", "%.pdf"]],
+        limit=5,
+        offset=0,
+        fields=None,
+        order_by=None,
+    )
+
+    result = json.loads(await handlers["eva_list_attachments"](filters=[["name", "="]]))
+    assert result["success"] is False
+
+
+def test_generic_get_tool():
+    client = Mock()
+    client.get_object.return_value = {"code": "SH-1"}
+    handlers = REGISTRY.bind(EvaTools(client))
+
+    result = json.loads(handlers["eva_get_status_change"](code="SH-1", fields=["code"]))
+
+    assert result == {"success": True, "status_change": {"code": "SH-1"}}
+    client.get_object.assert_called_once_with("CmfStatusHistory", "SH-1", fields=["code"])
@@ -0,0 +1,184 @@
+"""Tests for retries and the circuit breaker."""
+
+import asyncio
+import os
+import sys
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from eva_client import AsyncEvaClient, EvaAPIError, EvaCircuitOpenError, EvaClient
+from resilience import CircuitBreaker, RetryPolicy, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _client(make_client, responses, cls=EvaClient, **kwargs):
+    """Client whose transport replays responses (status, headers) in order."""
+    posts = []
+
+    def handler(request):
+        posts.append(request)
+        status, headers = responses.pop(0) if responses else (200, {})
+        if status == "reset":
+            raise httpx.ConnectError("Connection reset", request=request)
+        return httpx.Response(status, headers=headers, json={"result": {"code": "TASK-1"}})
+
+    kwargs.setdefault("retry", RetryPolicy(max_retries=3, base_delay=0, rng=lambda: 0.5))
+    kwargs.setdefault("breaker", CircuitBreaker(failure_threshold=3, reset_timeout=10))
+    return make_client(handler, cls, read_only=False, **kwargs), posts
+
+
+def test_backoff_grows_with_jitter():
+    """Delays are a jittered fraction of an exponentially growing cap."""
+    policy = RetryPolicy(max_retries=5, base_delay=1, max_delay=5, rng=lambda: 0.5)
+
+    assert [policy.next_delay(n) for n in range(5)] == [0.5, 1.0, 2.0, 2.5, 2.5]
+    assert policy.next_delay(5) is None
+    assert policy.stats() == {"retries": 5, "exhausted": 1}
+
+
+def test_retry_after_honored_or_exceeding_gives_up():
+    """Retry-After replaces the backoff unless it is longer than max_delay."""
+    policy = RetryPolicy(max_delay=10)
+
+    assert policy.next_delay(0, retry_after=3) == 3
+    assert policy.next_delay(0, retry_after=30) is None
+    assert parse_retry_after("7") == 7
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:10 GMT", clock=lambda: 1445412480) == 10
+    assert parse_retry_after("soon") is None
+
+
+def test_read_call_retried_after_transient_errors(make_client):
+    """Connection resets and 502s on reads are retried."""
+    client, posts = _client(make_client, [("reset", {}), (502, {}), (200, {})])
+
+    assert client.get_task("TASK-1") == {"code": "TASK-1"}
+    assert len(posts) == 3
+    assert client.stats()["retry"]["retries"] == 2
+
+
+def test_write_call_not_retried(make_client):
+    """Writes fail on the first transient error."""
+    client, posts = _client(make_client, [(503, {}), (200, {})])
+
+    with pytest.raises(EvaAPIError, match="HTTP error: 503"):
+        client.update_task("TASK-1", name="x")
+    assert len(posts) == 1
+
+
+def test_non_transient_status_not_retried(make_client):
+    """Statuses outside the retry list fail immediately."""
+    client, posts = _client(make_client, [(404, {}), (200, {})])
+
+    with pytest.raises(EvaAPIError, match="HTTP error: 404"):
+        client.get_task("TASK-1")
+    assert len(posts) == 1
+
+
+def test_retry_after_header_used(make_client, monkeypatch):
+    """The delay from Retry-After is slept before the retry."""
+    slept = []
+    monkeypatch.setattr("eva_client.time.sleep", slept.append)
+    client, posts = _client(make_client, [(429, {"Retry-After": "2"}), (200, {})])
+
+    client.get_task("TASK-1")
+
+    assert slept == [2.0]
+
+
+def test_breaker_opens_fails_fast_and_recovers(make_client):
+    """After the threshold the circuit opens, then a probe closes it."""
+    clock = FakeClock()
+    client, posts = _client(
+        make_client,
+        [(503, {})] * 3,
+        retry=RetryPolicy(max_retries=0),
+        breaker=CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=clock),
+    )
+    for _ in range(3):
+        with pytest.raises(EvaAPIError):
+            client.get_task("TASK-1")
+
+    with pytest.raises(EvaCircuitOpenError):
+        client.get_task("TASK-1")
+    assert len(posts) == 3
+    assert client.stats()["breaker"] == {"state": "open", "failures": 3, "trips": 1, "rejected": 1}
+
+    clock.now = 10
+    assert client.breaker.state == "half_open"
+    assert client.get_task("TASK-1") == {"code": "TASK-1"}
+    assert client.breaker.state == "closed"
+
+
+def test_failed_probe_reopens_circuit():
+    """A failing half-open probe opens the circuit again."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5, half_open_max=1, clock=clock)
+    breaker.record_failure()
+    clock.now = 5
+
+    assert breaker.allow() is True
+    assert breaker.allow() is False
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.trips == 2
+
+
+def test_json_rpc_errors_do_not_trip_breaker(make_client):
+    """JSON-RPC errors mean Eva is up and reset the failure count."""
+    breaker = CircuitBreaker(failure_threshold=2)
+    client, _ = _client(make_client, [], breaker=breaker)
+    client._record_outcome(EvaAPIError("Not found", code=404))
+    breaker.record_failure()
+    client._record_outcome(EvaAPIError("Not found", code=404))
+    breaker.record_failure()
+
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_async_retry(make_client):
+    """Async reads retry with asyncio.sleep."""
+    client, posts = _client(make_client, [(504, {}), (200, {})], cls=AsyncEvaClient)
+
+    assert await client.count_tasks() == {"code": "TASK-1"}
+    assert len(posts) == 2
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_half_open_probe_frees_its_slot(make_client):
+    """A probe cancelled before Eva answers lets the next call probe instead."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5, half_open_max=1, clock=clock)
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def handler(request):
+        started.set()
+        await release.wait()
+        return httpx.Response(200, json={"result": {"code": "TASK-1"}})
+
+    client = make_client(handler, AsyncEvaClient, read_only=False, breaker=breaker, coalesce=False)
+    breaker.record_failure()
+    clock.now = 5
+
+    probe = asyncio.create_task(client.get_task("TASK-1"))
+    await started.wait()
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    assert breaker.state == "half_open"
+    release.set()
+    assert await client.get_task("TASK-1") == {"code": "TASK-1"}
+    assert breaker.state == "closed"
+    await client.close()
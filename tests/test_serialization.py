@@ -0,0 +1,61 @@
+"""Tests for tool response serialization."""
+
+import json
+import pytest
+from unittest.mock import Mock
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import serialization
+from serialization import JSONSerializer, OrjsonSerializer, get_serializer
+from tools import EvaTools
+from eva_client import EvaClient
+
+PAYLOAD = {"success": True, "tasks": [{"code": "T-1", "name": "Задача"}], "count": 1}
+
+
+def test_json_serializer_is_compact_and_keeps_unicode():
+    """Test compact stdlib output without ASCII escaping."""
+    text = JSONSerializer().dumps(PAYLOAD)
+
+    assert "\n" not in text
+    assert ", " not in text
+    assert "Задача" in text
+    assert json.loads(text) == PAYLOAD
+
+
+def test_json_serializer_indent():
+    """Test pretty output when indent is configured."""
+    assert JSONSerializer(indent=2).dumps({"a": 1}) == '{\n  "a": 1\n}'
+
+
+@pytest.mark.skipif(serialization.orjson is None, reason="orjson not installed")
+def test_orjson_serializer_matches_json():
+    """Test orjson output decodes to the same payload."""
+    text = OrjsonSerializer().dumps(PAYLOAD)
+
+    assert json.loads(text) == PAYLOAD
+    assert text == JSONSerializer().dumps(PAYLOAD)
+
+
+def test_get_serializer_backends(monkeypatch):
+    """Test backend selection and validation."""
+    assert isinstance(get_serializer("json"), JSONSerializer)
+    with pytest.raises(ValueError, match="Unknown JSON backend"):
+        get_serializer("yaml")
+
+    monkeypatch.setattr(serialization, "orjson", None)
+    assert isinstance(get_serializer("auto"), JSONSerializer)
+
+
+def test_tools_use_configured_serializer():
+    """Test tool responses go through the injected serializer."""
+    client = Mock(spec=EvaClient)
+    client.get_task.return_value = {"code": "T-1"}
+    tools = EvaTools(client, serializer=JSONSerializer(indent=2))
+
+    result = tools.get_task_details("T-1")
+
+    assert result.startswith('{\n  "success": true')
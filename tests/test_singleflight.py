@@ -0,0 +1,116 @@
+"""Tests for request coalescing."""
+
+import asyncio
+import threading
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from eva_client import AsyncEvaClient, EvaAPIError
+from singleflight import AsyncSingleFlight, SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_async_identical_calls_share_result():
+    """Test concurrent callers with one key trigger a single call."""
+    flight = AsyncSingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"code": "T-1"}
+
+    results = await asyncio.gather(*(flight.do("k", fetch) for _ in range(5)))
+
+    assert calls == 1
+    assert results == [{"code": "T-1"}] * 5
+    assert flight.stats() == {"executed": 1, "shared": 4, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_async_error_is_shared():
+    """Test waiters receive the leader's exception."""
+    flight = AsyncSingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise EvaAPIError("Not found", code=404)
+
+    results = await asyncio.gather(
+        *(flight.do("k", fetch) for _ in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(r, EvaAPIError) and r.code == 404 for r in results)
+    assert flight.stats()["executed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_async_cancelled_waiter_does_not_cancel_others():
+    """Test cancelling one caller leaves the shared request running."""
+    flight = AsyncSingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return 42
+
+    first = asyncio.ensure_future(flight.do("k", fetch))
+    second = asyncio.ensure_future(flight.do("k", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == 42
+
+
+def test_sync_identical_calls_share_result():
+    """Test thread-based coalescing."""
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = 0
+
+    def fetch():
+        nonlocal calls
+        calls += 1
+        release.wait(1)
+        return "result"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flight.do("k", fetch))) for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    while flight.stats()["shared"] < 3:
+        pass
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == 1
+    assert results == ["result"] * 4
+
+
+@pytest.mark.asyncio
+async def test_client_coalesces_identical_reads():
+    """Test AsyncEvaClient issues one POST for identical concurrent reads."""
+    client = AsyncEvaClient(api_url="https://test.eva.com/api", api_token="test_token")
+    response = Mock()
+    response.json.return_value = {"result": [{"code": "T-1"}]}
+    response.raise_for_status = Mock()
+
+    async def post(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return response
+
+    with patch.object(client.client, "post", new=AsyncMock(side_effect=post)) as mock_post:
+        results = await asyncio.gather(
+            *(client.list_tasks(filters=[["parent", "=", "P-1"]], limit=10) for _ in range(5))
+        )
+
+        assert mock_post.await_count == 1
+        assert results == [[{"code": "T-1"}]] * 5
+    await client.close()
@@ -1,15 +1,17 @@
 """Tests for Eva MCP tools."""
 
 import pytest
+import inspect
 import json
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock
 import sys
 import os
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
-from tools import EvaTools
+from tools import EvaTools, AsyncEvaTools
 from eva_client import EvaClient, EvaAPIError
+from paging import ResponseBudget, encode_cursor
 
 
 @pytest.fixture
@@ -30,12 +32,12 @@ def test_search_tasks_success(eva_tools, mock_client):
     """Test successful task search."""
     mock_client.list_tasks.return_value = [
         {"code": "TASK-1", "name": "Task 1"},
-        {"code": "TASK-2", "name": "Task 2"}
+        {"code": "TASK-2", "name": "Task 2"},
     ]
-    
+
     result = eva_tools.search_tasks(query="test", limit=10)
     result_data = json.loads(result)
-    
+
     assert result_data["success"] is True
     assert result_data["count"] == 2
     assert len(result_data["tasks"]) == 2
@@ -44,25 +46,21 @@ def test_search_tasks_success(eva_tools, mock_client):
 def test_search_tasks_error(eva_tools, mock_client):
     """Test task search with error."""
     mock_client.list_tasks.side_effect = EvaAPIError("API Error", code=-32600)
-    
+
     result = eva_tools.search_tasks(query="test")
     result_data = json.loads(result)
-    
+
     assert result_data["success"] is False
     assert "API Error" in result_data["error"]
 
 
 def test_get_task_details_success(eva_tools, mock_client):
     """Test getting task details."""
-    mock_client.get_task.return_value = {
-        "code": "TASK-123",
-        "name": "Test Task",
-        "status": "open"
-    }
-    
+    mock_client.get_task.return_value = {"code": "TASK-123", "name": "Test Task", "status": "open"}
+
     result = eva_tools.get_task_details("TASK-123")
     result_data = json.loads(result)
-    
+
     assert result_data["success"] is True
     assert result_data["task"]["code"] == "TASK-123"
 
@@ -70,38 +68,38 @@ def test_get_task_details_success(eva_tools, mock_client):
 def test_count_tasks_success(eva_tools, mock_client):
     """Test counting tasks."""
     mock_client.count_tasks.return_value = 42
-    
+
     result = eva_tools.count_tasks_by_filter(project="PROJECT-1")
     result_data = json.loads(result)
-    
+
     assert result_data["success"] is True
     assert result_data["count"] == 42
+    mock_client.count_tasks.assert_called_once_with(
+        filters=[["parent", "=", "PROJECT-1"]], include_archived=False
+    )
 
 
 def test_list_projects_success(eva_tools, mock_client):
     """Test listing projects."""
     mock_client.list_projects.return_value = [
         {"code": "PROJ-1", "name": "Project 1"},
-        {"code": "PROJ-2", "name": "Project 2"}
+        {"code": "PROJ-2", "name": "Project 2"},
     ]
-    
+
     result = eva_tools.list_projects(limit=10)
     result_data = json.loads(result)
-    
+
     assert result_data["success"] is True
     assert result_data["count"] == 2
 
 
 def test_get_project_details_success(eva_tools, mock_client):
     """Test getting project details."""
-    mock_client.get_project.return_value = {
-        "code": "PROJ-1",
-        "name": "Test Project"
-    }
-    
+    mock_client.get_project.return_value = {"code": "PROJ-1", "name": "Test Project"}
+
     result = eva_tools.get_project_details("PROJ-1")
     result_data = json.loads(result)
-    
+
     assert result_data["success"] is True
     assert result_data["project"]["code"] == "PROJ-1"
 
@@ -110,51 +108,45 @@ def test_list_users_success(eva_tools, mock_client):
     """Test listing users."""
     mock_client.list_users.return_value = [
         {"code": "user1", "name": "User 1"},
-        {"code": "user2", "name": "User 2"}
+        {"code": "user2", "name": "User 2"},
     ]
-    
+
     result = eva_tools.list_users(limit=50)
     result_data = json.loads(result)
-    
+
     assert result_data["success"] is True
     assert result_data["count"] == 2
 
 
 def test_search_documents_success(eva_tools, mock_client):
     """Test searching documents."""
-    mock_client.list_documents.return_value = [
-        {"code": "DOC-1", "name": "Document 1"}
-    ]
-    
+    mock_client.list_documents.return_value = [{"code": "DOC-1", "name": "Document 1"}]
+
     result = eva_tools.search_documents(query="test")
     result_data = json.loads(result)
-    
+
     assert result_data["success"] is True
     assert result_data["count"] == 1
 
 
 def test_get_comments_success(eva_tools, mock_client):
     """Test getting comments."""
-    mock_client.list_comments.return_value = [
-        {"code": "COMM-1", "text": "Comment 1"}
-    ]
-    
+    mock_client.list_comments.return_value = [{"code": "COMM-1", "text": "Comment 1"}]
+
     result = eva_tools.get_comments("TASK-123")
     result_data = json.loads(result)
-    
+
     assert result_data["success"] is True
     assert result_data["count"] == 1
 
 
 def test_list_sprints_success(eva_tools, mock_client):
     """Test listing sprints."""
-    mock_client.list_lists.return_value = [
-        {"code": "SPR-1", "name": "Sprint 1"}
-    ]
-    
+    mock_client.list_lists.return_value = [{"code": "SPR-1", "name": "Sprint 1"}]
+
     result = eva_tools.list_sprints(limit=50)
     result_data = json.loads(result)
-    
+
     assert result_data["success"] is True
     assert result_data["count"] == 1
 
@@ -164,12 +156,12 @@ def test_create_list_success(eva_tools, mock_client):
     mock_client.create_list.return_value = {
         "code": "SPR-1",
         "name": "Sprint 1",
-        "parent": "CmfProject:proj"
+        "parent": "CmfProject:proj",
     }
-    
+
     result = eva_tools.create_list(name="Sprint 1", project_code="CmfProject:proj")
     result_data = json.loads(result)
-    
+
     assert result_data["success"] is True
     assert result_data["list"]["code"] == "SPR-1"
     mock_client.create_list.assert_called_once_with(name="Sprint 1", parent="CmfProject:proj")
@@ -178,10 +170,10 @@ def test_create_list_success(eva_tools, mock_client):
 def test_create_list_error(eva_tools, mock_client):
     """Test creating list with error."""
     mock_client.create_list.side_effect = EvaAPIError("API Error", code=-32600)
-    
+
     result = eva_tools.create_list(name="Sprint 1", project_code="CmfProject:proj")
     result_data = json.loads(result)
-    
+
     assert result_data["success"] is False
     assert "API Error" in result_data["error"]
 
@@ -190,7 +182,7 @@ def test_create_list_validation_empty_name(eva_tools, mock_client):
     """Test creating list with empty name."""
     result = eva_tools.create_list(name="", project_code="CmfProject:proj")
     result_data = json.loads(result)
-    
+
     assert result_data["success"] is False
     assert "required" in result_data["error"].lower()
 
@@ -199,20 +191,217 @@ def test_create_list_validation_empty_project(eva_tools, mock_client):
     """Test creating list with empty project_code."""
     result = eva_tools.create_list(name="Sprint 1", project_code="")
     result_data = json.loads(result)
-    
+
     assert result_data["success"] is False
     assert "required" in result_data["error"].lower()
 
 
 def test_get_audit_log_success(eva_tools, mock_client):
     """Test getting audit log."""
-    mock_client.list_audit.return_value = [
-        {"code": "AUD-1", "action": "created"}
-    ]
-    
+    mock_client.list_audit.return_value = [{"code": "AUD-1", "action": "created"}]
+
     result = eva_tools.get_audit_log(entity_code="TASK-123")
     result_data = json.loads(result)
-    
+
     assert result_data["success"] is True
     assert result_data["count"] == 1
 
+
+@pytest.fixture
+def async_mock_client():
+    """Create a mock async Eva client."""
+    client = AsyncMock()
+    client.read_only = True
+    return client
+
+
+@pytest.fixture
+def async_eva_tools(async_mock_client):
+    """Create async Eva tools instance with mock client."""
+    return AsyncEvaTools(async_mock_client)
+
+
+@pytest.mark.asyncio
+async def test_async_search_tasks_success(async_eva_tools, async_mock_client):
+    """Test successful async task search."""
+    async_mock_client.list_tasks.return_value = [
+        {"code": "TASK-1", "name": "Task 1"},
+        {"code": "TASK-2", "name": "Task 2"},
+    ]
+
+    result = await async_eva_tools.search_tasks(query="test", project="PROJ-1", limit=10)
+    result_data = json.loads(result)
+
+    assert result_data["success"] is True
+    assert result_data["count"] == 2
+    async_mock_client.list_tasks.assert_awaited_once_with(
+        filters=[["parent", "=", "PROJ-1"], ["name", "ilike", "%test%"]],
+        limit=10,
+        offset=0,
+        fields=None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_get_task_details_error(async_eva_tools, async_mock_client):
+    """Test async task details with API error."""
+    async_mock_client.get_task.side_effect = EvaAPIError("Not found", code=404)
+
+    result = await async_eva_tools.get_task_details("TASK-404")
+    result_data = json.loads(result)
+
+    assert result_data["success"] is False
+    assert result_data["code"] == 404
+
+
+@pytest.mark.asyncio
+async def test_async_create_list_validation(async_eva_tools, async_mock_client):
+    """Test async list creation validates input before calling API."""
+    result = await async_eva_tools.create_list(name=" ", project_code="CmfProject:proj")
+    result_data = json.loads(result)
+
+    assert result_data["success"] is False
+    assert "required" in result_data["error"].lower()
+    async_mock_client.create_list.assert_not_called()
+
+
+def test_async_tools_mirror_every_sync_tool():
+    """Every tool has a coroutine counterpart with the same signature."""
+    names = [name for name, method in vars(EvaTools).items() if hasattr(method, "steps")]
+
+    assert "search_tasks" in names and "get_entity" in names
+    for name in names:
+        method = getattr(AsyncEvaTools, name)
+        assert inspect.iscoroutinefunction(method)
+        assert inspect.signature(method) == inspect.signature(getattr(EvaTools, name))
+
+
+def test_search_tasks_view_sets_fields(eva_tools, mock_client):
+    """Test view argument is pushed down as fields."""
+    mock_client.list_tasks.return_value = []
+
+    eva_tools.search_tasks(project="PROJ-1", view="minimal")
+
+    assert mock_client.list_tasks.call_args.kwargs["fields"] == ["code", "name"]
+
+
+def test_get_user_details_default_view(mock_client):
+    """Test default view applies when no view is passed."""
+    tools = EvaTools(mock_client, default_view="summary")
+    mock_client.get_user.return_value = {"code": "user1"}
+
+    tools.get_user_details("user1")
+
+    mock_client.get_user.assert_called_once_with("user1", fields=["code", "name", "login", "email"])
+
+
+def test_unknown_view_returns_error(eva_tools, mock_client):
+    """Test unknown view is rejected before calling the API."""
+    result = eva_tools.list_projects(view="everything")
+    result_data = json.loads(result)
+
+    assert result_data["success"] is False
+    assert "Unknown view" in result_data["error"]
+    mock_client.list_projects.assert_not_called()
+
+
+def test_cursor_for_other_arguments_returns_error(eva_tools, mock_client):
+    """Cursors that do not fit the call are reported as tool errors."""
+    foreign = encode_cursor("eva_search_tasks", {"query": "bug"}, 20, 20)
+    mock_client.list_tasks.return_value = [{"code": "TASK-1"}]
+    first = json.loads(
+        EvaTools(mock_client, budget=ResponseBudget(max_rows=1)).search_tasks(query="bug", limit=3)
+    )
+
+    for result in (
+        eva_tools.search_tasks(cursor=foreign),
+        eva_tools.search_tasks(query="other", cursor=first["next_cursor"]),
+    ):
+        result_data = json.loads(result)
+        assert result_data["success"] is False
+        assert "cursor" in result_data["error"].lower()
+
+
+def test_search_tasks_pages_with_cursor(mock_client):
+    """Large limits are split into pages linked by next_cursor."""
+    tools = EvaTools(mock_client, budget=ResponseBudget(max_rows=2))
+    mock_client.list_tasks.return_value = [{"code": "TASK-1"}, {"code": "TASK-2"}]
+
+    first = json.loads(tools.search_tasks(query="bug", limit=3))
+
+    assert first["truncated"] is True
+    assert mock_client.list_tasks.call_args.kwargs["limit"] == 2
+    assert mock_client.list_tasks.call_args.kwargs["offset"] == 0
+
+    mock_client.list_tasks.return_value = [{"code": "TASK-3"}]
+    second = json.loads(tools.search_tasks(cursor=first["next_cursor"]))
+
+    assert second["tasks"] == [{"code": "TASK-3"}]
+    assert "next_cursor" not in second
+    call = mock_client.list_tasks.call_args.kwargs
+    assert (call["limit"], call["offset"]) == (1, 2)
+    assert call["filters"] == [["name", "ilike", "%bug%"]]
+
+
+def test_list_users_trimmed_to_byte_budget(mock_client):
+    """Rows beyond the byte budget are returned on the next page."""
+    tools = EvaTools(mock_client, budget=ResponseBudget(max_bytes=2048))
+    mock_client.list_users.return_value = [
+        {"code": f"USER-{i}", "name": "x" * 400} for i in range(10)
+    ]
+
+    result = tools.list_users(limit=10)
+    data = json.loads(result)
+
+    assert len(result.encode("utf-8")) <= 2048
+    assert 0 < data["count"] < 10
+    mock_client.list_users.return_value = []
+    tools.list_users(cursor=data["next_cursor"])
+    assert mock_client.list_users.call_args.kwargs["offset"] == data["count"]
+
+
+def test_invalid_cursor_returns_error(eva_tools, mock_client):
+    """Malformed cursor is reported as a tool error."""
+    result = json.loads(eva_tools.list_projects(cursor="garbage"))
+
+    assert result["success"] is False
+    assert "Invalid cursor" in result["error"]
+    mock_client.list_projects.assert_not_called()
+
+
+def test_get_tasks_reports_not_found(eva_tools, mock_client):
+    """Batch get lists found tasks in request order and missing codes."""
+    mock_client.get_many_tasks.return_value = {
+        "TASK-1": {"code": "TASK-1"},
+        "TASK-404": None,
+        "TASK-2": {"code": "TASK-2"},
+    }
+
+    result = json.loads(eva_tools.get_tasks(["TASK-1", "TASK-404", "TASK-2"], view="minimal"))
+
+    assert result["success"] is True
+    assert [t["code"] for t in result["tasks"]] == ["TASK-1", "TASK-2"]
+    assert result["not_found"] == ["TASK-404"]
+    mock_client.get_many_tasks.assert_called_once_with(
+        ["TASK-1", "TASK-404", "TASK-2"], fields=["code", "name"]
+    )
+
+
+def test_get_users_requires_codes(eva_tools, mock_client):
+    """Batch get rejects an empty code list."""
+    result = json.loads(eva_tools.get_users([]))
+
+    assert result["success"] is False
+    assert "user_codes" in result["error"]
+    mock_client.get_many_users.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_async_get_projects(async_eva_tools, async_mock_client):
+    """Test async batch project get."""
+    async_mock_client.get_many_projects.return_value = {"PROJ-1": {"code": "PROJ-1"}}
+
+    result = json.loads(await async_eva_tools.get_projects(["PROJ-1"]))
+
+    assert result["count"] == 1
+    assert result["not_found"] == []
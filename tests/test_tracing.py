@@ -0,0 +1,171 @@
+"""Tests for tracing hooks and span exporters."""
+
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import tracing
+from eva_client import AsyncEvaClient, EvaClient
+from registry import REGISTRY
+from tools import AsyncEvaTools, EvaTools
+
+
+class ListExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+    def shutdown(self):
+        pass
+
+
+@pytest.fixture
+def exporter():
+    exporter = ListExporter()
+    tracing.configure([exporter])
+    yield exporter
+    tracing.shutdown()
+
+
+def _client(make_client, cls=EvaClient):
+    """Client whose transport answers every call and records the JSON-RPC callids it received."""
+    callids = []
+
+    def handler(request):
+        callids.append(json.loads(request.content)["callid"])
+        return httpx.Response(200, json={"result": {"code": "T-1", "name": "Task"}})
+
+    return make_client(handler, cls, read_only=True), callids
+
+
+def _tree(spans):
+    """Return (name, parent name) pairs in finishing order."""
+    by_id = {span.span_id: span for span in spans}
+    return [(span.name, by_id[span.parent_id].name if span.parent_id else None) for span in spans]
+
+
+def test_disabled_tracing_installs_nothing(make_client):
+    assert not tracing.enabled()
+    assert tracing.span("anything") is tracing.NOOP_SPAN
+
+    client, _ = _client(make_client)
+    tools = EvaTools(client)
+    handlers = REGISTRY.bind(tools)
+
+    assert handlers["eva_get_task"] == tools.get_task_details
+    assert not isinstance(tools.serializer, tracing.TracedSerializer)
+
+
+def test_span_tree_from_tool_to_serialization(make_client, exporter):
+    client, callids = _client(make_client)
+    handlers = REGISTRY.bind(EvaTools(client))
+
+    with tracing.span("call_tool", {"mcp.tool": "eva_get_task"}):
+        handlers["eva_get_task"](task_code="T-1")
+
+    assert _tree(exporter.spans) == [
+        ("http.post", "EvaClient.call"),
+        ("json.decode", "EvaClient.call"),
+        ("EvaClient.call", "EvaTools.get_task_details"),
+        ("json.dumps", "EvaTools.get_task_details"),
+        ("EvaTools.get_task_details", "call_tool"),
+        ("call_tool", None),
+    ]
+    assert len({span.trace_id for span in exporter.spans}) == 1
+    http = exporter.spans[0]
+    assert http.attributes == {
+        "rpc.method": "CmfTask.get",
+        "eva.callid": callids[0],
+        "http.status_code": 200,
+    }
+    assert http.kind == tracing.KIND_CLIENT
+
+
+@pytest.mark.asyncio
+async def test_async_spans_follow_the_task_context(make_client, exporter):
+    client, _ = _client(make_client, AsyncEvaClient)
+    handlers = REGISTRY.bind(AsyncEvaTools(client))
+
+    with tracing.span("call_tool"):
+        await handlers["eva_get_task"](task_code="T-1")
+
+    names = dict(_tree(exporter.spans))
+    assert names["AsyncEvaClient.call"] == "AsyncEvaTools.get_task_details"
+    assert names["http.post"] == "AsyncEvaClient.call"
+
+
+def test_errors_mark_span_status(exporter):
+    with pytest.raises(ValueError):
+        with tracing.span("failing"):
+            raise ValueError("boom")
+
+    otlp = exporter.spans[0].to_otlp()
+    assert otlp["status"] == {"code": tracing.STATUS_ERROR, "message": "ValueError: boom"}
+    assert "parentSpanId" not in otlp
+
+
+def test_json_lines_exporter_writes_otlp_spans(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    tracing.configure([tracing.JsonLinesExporter(str(path))])
+    try:
+        with tracing.span("call_tool", {"mcp.tool": "eva_list_projects", "retries": 2}):
+            with tracing.span("json.dumps"):
+                pass
+    finally:
+        tracing.shutdown()
+
+    child, root = [json.loads(line) for line in path.read_text().splitlines()]
+    assert child["parentSpanId"] == root["spanId"]
+    assert child["traceId"] == root["traceId"]
+    assert root["attributes"] == [
+        {"key": "mcp.tool", "value": {"stringValue": "eva_list_projects"}},
+        {"key": "retries", "value": {"intValue": "2"}},
+    ]
+    assert int(root["endTimeUnixNano"]) >= int(root["startTimeUnixNano"])
+
+
+def test_otlp_http_exporter_posts_batches():
+    received = []
+
+    class Collector(BaseHTTPRequestHandler):
+        def do_POST(self):
+            received.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Collector)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        endpoint = f"http://127.0.0.1:{server.server_port}/v1/traces"
+        tracing.configure([tracing.OTLPHttpExporter(endpoint, flush_interval=0.05)])
+        for _ in range(3):
+            with tracing.span("call_tool"):
+                pass
+        tracing.shutdown()
+    finally:
+        server.shutdown()
+
+    spans = [
+        span
+        for payload in received
+        for resource in payload["resourceSpans"]
+        for scope in resource["scopeSpans"]
+        for span in scope["spans"]
+    ]
+    assert len(spans) == 3
+    assert received[0]["resourceSpans"][0]["resource"]["attributes"][0]["value"] == {
+        "stringValue": "eva-mcp-server"
+    }
@@ -0,0 +1,99 @@
+"""Tests for compiled tool argument validation."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from registry import REGISTRY
+from validation import ValidationError, compile_validator
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "code": {"type": "string"},
+        "limit": {"type": "integer", "default": 20},
+        "ratio": {"type": "number"},
+        "archived": {"type": "boolean"},
+        "view": {"type": "string", "enum": ["minimal", "full"]},
+        "codes": {"type": "array", "items": {"type": "string"}},
+        "filters": {"type": "array", "items": {"type": "array", "minItems": 3, "maxItems": 3}},
+    },
+    "required": ["code"],
+}
+
+
+@pytest.fixture
+def validate():
+    return compile_validator("eva_test", SCHEMA)
+
+
+def test_applies_defaults_and_drops_nulls(validate):
+    assert validate({"code": "T-1", "view": None}) == {"code": "T-1", "limit": 20}
+
+
+def test_coerces_loose_types(validate):
+    result = validate(
+        {
+            "code": 42,
+            "limit": "10",
+            "ratio": "0.5",
+            "archived": "true",
+            "codes": [1, "T-2"],
+        }
+    )
+    assert result == {
+        "code": "42",
+        "limit": 10,
+        "ratio": 0.5,
+        "archived": True,
+        "codes": ["1", "T-2"],
+    }
+    assert validate({"code": "x", "limit": 5.0})["limit"] == 5
+
+
+def test_reports_every_problem(validate):
+    with pytest.raises(ValidationError) as error:
+        validate(
+            {"limt": 5, "limit": "many", "view": "huge", "archived": 1, "filters": [["a", "="]]}
+        )
+
+    assert error.value.tool == "eva_test"
+    assert error.value.problems == [
+        "unknown argument 'limt'",
+        "'limit' must be an integer",
+        "'view' must be one of minimal, full",
+        "'archived' must be a boolean",
+        "'filters' must have at least 3 items",
+        "'code' is required",
+    ]
+
+
+def test_required_check_tracks_invalid_arguments_by_name(validate):
+    with pytest.raises(ValidationError) as error:
+        validate({"code": {"id": 1}})
+    assert error.value.problems == ["'code' must be a string"]
+
+    # A problem merely mentioning the name does not hide the missing argument
+    with pytest.raises(ValidationError) as error:
+        validate({"'code'": "T-1"})
+    assert error.value.problems == ["unknown argument ''code''", "'code' is required"]
+
+
+def test_rejects_non_object_arguments(validate):
+    with pytest.raises(ValidationError):
+        validate(["T-1"])
+    with pytest.raises(ValidationError, match="'code' is required"):
+        validate(None)
+
+
+def test_registry_tools_validate_their_own_schemas():
+    spec = REGISTRY.get("eva_search_tasks")
+    assert spec.validate({"query": "login", "limit": "5"}) == {"query": "login", "limit": 5}
+
+    with pytest.raises(ValidationError, match="unknown argument 'task'"):
+        REGISTRY.get("eva_get_task").validate({"task": "T-1"})
+    with pytest.raises(ValidationError, match="'consistency' must be one of eventual, strong"):
+        REGISTRY.get("eva_count_tasks").validate({"consistency": "linearizable"})